@@ -0,0 +1,161 @@
+"""
+Benchmark of the client against a local fake API server.
+
+Starts benchmarks.fake_apiserver in process (a simulated control plane and
+kubelet, so the waits see the pods go from Pending to Running) and measures,
+at each number of objects:
+    create          DeploymentClient.create(wait=True) of a deployment with
+                    that number of replicas
+    list            PodClient.list of its pods, as objects and as dictionaries
+    get_pods        DeploymentClient.get_pods of the deployment
+    field_filter    utils.field_filter of the listed pods
+    convert         utils.convert_obj_to_dict of the listed pods
+    create_from_yaml  K8sClient.create_from_yaml of a file with that number of
+                    secrets and services
+Each result has the seconds (best of 3 for the reads) and the requests and
+the bytes the fake server sent, one json line per result, for regression
+tracking.
+
+Usage:
+    python -m benchmarks.bench_client [number_of_objects ...]
+"""
+import json
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import yaml
+
+from benchmarks.fake_apiserver import FakeApiServer, FakeCluster
+from k8s_client.lite_k8s import K8sClient
+from k8s_client.utils import convert_obj_to_dict, field_filter
+
+SIZES = (100, 1000, 10000)
+# The seconds a pod of the fake cluster takes to run
+POD_START_LATENCY = 0.05
+NODES = 10
+FIELD_SELECTOR = "spec.node_name==node-3,status.phase==Running"
+
+
+def deployment_body(name, replicas):
+    return {"apiVersion": "apps/v1", "kind": "Deployment",
+            "metadata": {"name": name},
+            "spec": {"replicas": replicas,
+                     "selector": {"matchLabels": {"app": name}},
+                     "template": {
+                         "metadata": {"labels": {"app": name}},
+                         "spec": {"containers": [{"name": "main",
+                                                  "image": "nginx"}]}}}}
+
+
+def write_yaml(path, namespace, number_of_objects):
+    resources = []
+    for index in range(number_of_objects):
+        metadata = {"name": f"bench-{index}", "namespace": namespace}
+        if index % 2:
+            resources.append({"apiVersion": "v1", "kind": "Service",
+                              "metadata": metadata,
+                              "spec": {"selector": {"app": "web"},
+                                       "ports": [{"port": 80}]}})
+        else:
+            resources.append({"apiVersion": "v1", "kind": "Secret",
+                              "metadata": metadata,
+                              "stringData": {"password": str(index)}})
+    with open(path, "w") as f:
+        yaml.safe_dump_all(resources, f)
+    return path
+
+
+def measure(cluster, func, *args, repeat=3, **kwargs):
+    """
+    Return the result of the function, its best run time and the requests
+    and the bytes of the fake server in that run
+    """
+    best = None
+    for _ in range(repeat):
+        requests, bytes_sent = cluster.requests, cluster.bytes_sent
+        start_time = perf_counter()
+        result = func(*args, **kwargs)
+        run_time = perf_counter() - start_time
+        if best is None or run_time < best[0]:
+            best = (run_time, cluster.requests - requests,
+                    cluster.bytes_sent - bytes_sent)
+    return (result,) + best
+
+
+def result_line(benchmark, number_of_objects, run_time, requests,
+                bytes_sent, **extra):
+    return dict({"benchmark": benchmark, "objects": number_of_objects,
+                 "seconds": round(run_time, 6), "requests": requests,
+                 "bytes": bytes_sent}, **extra)
+
+
+def run_size(k8s, cluster, number_of_objects, work_dir):
+    namespace = f"bench-{number_of_objects}"
+    k8s.namespace.create(body={"metadata": {"name": namespace}})
+    results = []
+
+    _, run_time, requests, bytes_sent = measure(
+        cluster, k8s.deployment.create, repeat=1, namespace=namespace,
+        body=deployment_body(name="web", replicas=number_of_objects))
+    results.append(result_line("create", number_of_objects, run_time,
+                               requests, bytes_sent))
+
+    pods, run_time, requests, bytes_sent = measure(
+        cluster, k8s.pod.list, namespace=namespace)
+    assert len(pods) == number_of_objects, "Not all the pods were listed"
+    results.append(result_line("list", number_of_objects, run_time, requests,
+                               bytes_sent, dict_output=False))
+    _, run_time, requests, bytes_sent = measure(
+        cluster, k8s.pod.list, namespace=namespace, dict_output=True)
+    results.append(result_line("list", number_of_objects, run_time, requests,
+                               bytes_sent, dict_output=True))
+
+    deployment_pods, run_time, requests, bytes_sent = measure(
+        cluster, k8s.deployment.get_pods, name="web", namespace=namespace)
+    assert len(deployment_pods) == number_of_objects, \
+        "Not all the pods of the deployment were found"
+    results.append(result_line("get_pods", number_of_objects, run_time,
+                               requests, bytes_sent))
+
+    matched, run_time, requests, bytes_sent = measure(
+        cluster, field_filter, obj_list=pods, field_selector=FIELD_SELECTOR)
+    results.append(result_line("field_filter", number_of_objects, run_time,
+                               requests, bytes_sent, matched=len(matched)))
+
+    _, run_time, requests, bytes_sent = measure(
+        cluster, lambda: [convert_obj_to_dict(pod) for pod in pods])
+    results.append(result_line("convert", number_of_objects, run_time,
+                               requests, bytes_sent))
+
+    yaml_path = write_yaml(path=os.path.join(work_dir, f"{namespace}.yaml"),
+                           namespace=namespace,
+                           number_of_objects=number_of_objects)
+    _, run_time, requests, bytes_sent = measure(
+        cluster, k8s.create_from_yaml, repeat=1, yaml_path=yaml_path)
+    results.append(result_line("create_from_yaml", number_of_objects,
+                               run_time, requests, bytes_sent))
+    return results
+
+
+def run(*sizes):
+    cluster = FakeCluster(nodes=NODES, pod_start_latency=POD_START_LATENCY)
+    results = []
+    with FakeApiServer(cluster=cluster) as server, \
+            tempfile.TemporaryDirectory() as work_dir:
+        k8s = K8sClient(kubeconfig_path=server.write_kubeconfig(
+            path=os.path.join(work_dir, "kubeconfig")))
+        try:
+            for number_of_objects in sizes or SIZES:
+                results.extend(run_size(k8s=k8s, cluster=cluster,
+                                        number_of_objects=number_of_objects,
+                                        work_dir=work_dir))
+        finally:
+            k8s.close()
+    return results
+
+
+if __name__ == "__main__":
+    for result in run(*(int(arg) for arg in sys.argv[1:])):
+        print(json.dumps(result))
@@ -0,0 +1,124 @@
+"""
+Benchmark of the conversion of the objects to camelCase dictionaries.
+
+Compares utils.underscore_to_uppercase (memoized key translation, one
+non-mutating walk) with the previous implementation, which rebuilt every key
+and mutated the input before copying it, over the to_dict() dumps of a
+synthetic list of pods and of nodes.
+
+Usage:
+    python -m benchmarks.bench_convert [number_of_pods] [number_of_nodes]
+"""
+import json
+import sys
+from time import perf_counter
+
+from kubernetes.client import (V1Container, V1ContainerPort,
+                               V1ContainerState, V1ContainerStateRunning,
+                               V1ContainerStatus, V1Node, V1NodeAddress,
+                               V1NodeCondition, V1NodeStatus, V1ObjectMeta,
+                               V1OwnerReference, V1Pod, V1PodSpec,
+                               V1PodStatus, V1VolumeMount)
+
+from k8s_client.utils import underscore_to_uppercase
+
+
+def legacy_underscore_to_uppercase(dict_to_edit):
+    if not isinstance(dict_to_edit, (dict, list)):
+        return dict_to_edit
+    if isinstance(dict_to_edit, list):
+        return [value for value in
+                (legacy_underscore_to_uppercase(value) for value in
+                 dict_to_edit) if value]
+    for key in list(dict_to_edit.keys()):
+        new_key = ''.join(word.capitalize() for word in key.split('_'))
+        new_key = new_key[0].lower() + new_key[1:]
+        dict_to_edit[new_key] = dict_to_edit.pop(key)
+    return {key: value for key, value in
+            ((key, legacy_underscore_to_uppercase(value)) for key, value in
+             dict_to_edit.items()) if value}
+
+
+def drop_falsy(value):
+    """Drop the falsy values the legacy implementation drops"""
+    if isinstance(value, dict):
+        return {key: drop_falsy(item) for key, item in value.items()
+                if drop_falsy(item)}
+    if isinstance(value, list):
+        return [drop_falsy(item) for item in value if drop_falsy(item)]
+    return value
+
+
+def make_pods(number_of_pods):
+    pods = []
+    for index in range(number_of_pods):
+        owner = V1OwnerReference(api_version="apps/v1", kind="ReplicaSet",
+                                 name=f"web-{index % 100}", uid=str(index),
+                                 controller=True)
+        container = V1Container(
+            name="main", image="nginx:1.25",
+            ports=[V1ContainerPort(container_port=80)],
+            volume_mounts=[V1VolumeMount(name="data", mount_path="/data",
+                                         read_only=False)])
+        status = V1ContainerStatus(
+            name="main", image="nginx:1.25", image_id="", ready=True,
+            restart_count=0, state=V1ContainerState(
+                running=V1ContainerStateRunning()))
+        pods.append(V1Pod(
+            metadata=V1ObjectMeta(name=f"pod-{index}", namespace="default",
+                                  labels={"app": "web"},
+                                  owner_references=[owner]),
+            spec=V1PodSpec(containers=[container],
+                           node_name=f"node-{index % 10}"),
+            status=V1PodStatus(phase="Running", pod_ip="10.0.0.1",
+                               container_statuses=[status])))
+    return pods
+
+
+def make_nodes(number_of_nodes):
+    return [V1Node(
+        metadata=V1ObjectMeta(name=f"node-{index}",
+                              labels={"kubernetes.io/os": "linux"}),
+        status=V1NodeStatus(
+            addresses=[V1NodeAddress(type="InternalIP",
+                                     address=f"10.0.1.{index % 250}")],
+            capacity={"cpu": "8", "memory": "32Gi"},
+            conditions=[V1NodeCondition(type=condition_type, status="False")
+                        for condition_type in ("MemoryPressure",
+                                               "DiskPressure", "Ready")]))
+        for index in range(number_of_nodes)]
+
+
+def measure(func, dumps, repeat=3):
+    """Return the results of the function on fresh dumps and its best time"""
+    best_time = None
+    for _ in range(repeat):
+        # the legacy implementation mutates its input
+        copies = [json.loads(dump) for dump in dumps]
+        start_time = perf_counter()
+        result = [func(copy) for copy in copies]
+        run_time = perf_counter() - start_time
+        best_time = run_time if best_time is None else min(best_time, run_time)
+    return result, best_time
+
+
+def run(number_of_pods=10000, number_of_nodes=2000):
+    results = []
+    for kind, objects in (("pods", make_pods(number_of_pods)),
+                          ("nodes", make_nodes(number_of_nodes))):
+        dumps = [json.dumps(obj.to_dict()) for obj in objects]
+        legacy, legacy_time = measure(legacy_underscore_to_uppercase, dumps)
+        converted, converted_time = measure(underscore_to_uppercase, dumps)
+        assert legacy == drop_falsy(converted), f"Results differ for {kind}"
+        results.append({"benchmark": "underscore_to_uppercase",
+                        "kind": kind,
+                        "objects": len(objects),
+                        "legacy_seconds": round(legacy_time, 6),
+                        "converted_seconds": round(converted_time, 6),
+                        "speedup": round(legacy_time / converted_time, 1)})
+    return results
+
+
+if __name__ == "__main__":
+    for result in run(*(int(arg) for arg in sys.argv[1:])):
+        print(json.dumps(result))
@@ -0,0 +1,82 @@
+"""
+Benchmark of the startup of short lived scripts that use the client.
+
+Runs each script in a fresh interpreter (so nothing is imported already) and
+measures its wall time, from the import of the client to the first read of
+pods (and of deployments) from benchmarks.fake_apiserver. Each result has the
+best seconds of the runs and the heavy modules the script ended up importing,
+one json line per script, for regression tracking.
+
+Usage:
+    python -m benchmarks.bench_import [number_of_runs]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+from benchmarks.fake_apiserver import FakeApiServer
+
+RUNS = 5
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("kubernetes.client.api.core_v1_api",
+                 "kubernetes.client.api.apps_v1_api",
+                 "kubernetes.client.models.v1_pod", "kubernetes.stream",
+                 "paramiko", "yaml")
+SCRIPTS = (
+    ("interpreter", "pass"),
+    ("import_kubernetes", "import kubernetes"),
+    ("import_client", "from k8s_client.lite_k8s import K8sClient"),
+    ("create_client", "from k8s_client.lite_k8s import K8sClient\n"
+                      "K8sClient(kubeconfig_path={kubeconfig!r}).close()"),
+    ("pod_list", "from k8s_client.lite_k8s import K8sClient\n"
+                 "k8s = K8sClient(kubeconfig_path={kubeconfig!r})\n"
+                 "k8s.pod.list()\n"
+                 "k8s.close()"),
+    ("deployment_list", "from k8s_client.lite_k8s import K8sClient\n"
+                        "k8s = K8sClient(kubeconfig_path={kubeconfig!r})\n"
+                        "k8s.deployment.list()\n"
+                        "k8s.close()"))
+# Printed by each script at its end, the heavy modules it imported
+REPORT = ("\nimport json, sys\n"
+          "print(json.dumps([name for name in {heavy_modules!r} "
+          "if name in sys.modules]))")
+
+
+def run_script(code, runs):
+    """
+    Return the best wall time of the script and the heavy modules it imported
+    """
+    best, modules = None, None
+    for _ in range(runs):
+        start_time = perf_counter()
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR,
+                                check=True, capture_output=True,
+                                text=True).stdout
+        run_time = perf_counter() - start_time
+        best = run_time if best is None else min(best, run_time)
+        modules = json.loads(output.splitlines()[-1])
+    return best, modules
+
+
+def run(runs=RUNS):
+    results = []
+    with FakeApiServer() as server, \
+            tempfile.TemporaryDirectory() as work_dir:
+        server.cluster.seed_pods(namespace="default", count=10)
+        kubeconfig = server.write_kubeconfig(
+            path=os.path.join(work_dir, "kubeconfig"))
+        for name, script in SCRIPTS:
+            code = script.format(kubeconfig=kubeconfig) + REPORT.format(
+                heavy_modules=HEAVY_MODULES)
+            run_time, modules = run_script(code=code, runs=runs)
+            results.append({"benchmark": name, "seconds": round(run_time, 6),
+                            "heavy_modules": modules})
+    return results
+
+
+if __name__ == "__main__":
+    for result in run(*(int(arg) for arg in sys.argv[1:])):
+        print(json.dumps(result))
@@ -0,0 +1,117 @@
+"""
+Benchmark of the client side field selector evaluation.
+
+Compares utils.field_filter (compiled, memoized selectors) with the previous
+implementation, which parsed the selector string for every object, over a
+synthetic list of pods.
+
+Usage:
+    python -m benchmarks.bench_selectors [number_of_pods]
+"""
+import json
+import sys
+from time import perf_counter
+
+from kubernetes.client import (V1ObjectMeta, V1OwnerReference, V1Pod,
+                               V1PodSpec, V1PodStatus, V1Container)
+
+from k8s_client.exceptions import InvalidFieldSelector
+from k8s_client.utils import field_filter
+
+SELECTORS = ["metadata.name==pod-4242",
+             "status.phase!=Running",
+             "metadata.owner_references[0].kind==ReplicaSet, "
+             "metadata.owner_references[0].name==web-7",
+             "spec.node_name==node-3,status.phase==Running"]
+
+
+def legacy_field_filter(obj_list, field_selector):
+    return [obj for obj in obj_list if
+            legacy_selector(obj=obj, field_selector=field_selector)]
+
+
+def legacy_selector(obj, field_selector):
+    return all(legacy_condition(obj=obj, field_selector=field.strip())
+               for field in field_selector.split(","))
+
+
+def legacy_condition(obj, field_selector):
+    obj_selector = obj
+    if "!=" in field_selector:
+        attrs, val = field_selector.split("!=")
+    elif "==" in field_selector:
+        attrs, val = field_selector.split("==")
+    elif "=" in field_selector:
+        attrs, val = field_selector.split("=")
+    else:
+        raise InvalidFieldSelector()
+    for attr in attrs.split("."):
+        index = None
+        if '[' in attr and attr[-1] == ']':
+            try:
+                index = int(attr[attr.index('[') + 1:-1])
+                attr = attr.split('[', 1)[0]
+            except ValueError:
+                raise InvalidFieldSelector()
+        try:
+            obj_selector = getattr(obj_selector, attr)
+        except AttributeError:
+            return False
+        try:
+            if isinstance(obj_selector, list) and index is not None:
+                obj_selector = obj_selector[index]
+        except IndexError:
+            return False
+    if "!=" in field_selector:
+        return obj_selector != str(val)
+    else:
+        return obj_selector == str(val)
+
+
+def make_pods(number_of_pods):
+    pods = []
+    for index in range(number_of_pods):
+        owner = V1OwnerReference(api_version="apps/v1", kind="ReplicaSet",
+                                 name=f"web-{index % 100}", uid=str(index))
+        pods.append(V1Pod(
+            metadata=V1ObjectMeta(name=f"pod-{index}", namespace="default",
+                                  owner_references=[owner]),
+            spec=V1PodSpec(containers=[V1Container(name="main")],
+                           node_name=f"node-{index % 10}"),
+            status=V1PodStatus(phase="Running" if index % 7 else "Pending")))
+    return pods
+
+
+def measure(func, *args, repeat=3, **kwargs):
+    """Return the result of the function and its best run time"""
+    best_time = None
+    for _ in range(repeat):
+        start_time = perf_counter()
+        result = func(*args, **kwargs)
+        run_time = perf_counter() - start_time
+        best_time = run_time if best_time is None else min(best_time, run_time)
+    return result, best_time
+
+
+def run(number_of_pods=50000):
+    pods = make_pods(number_of_pods)
+    results = []
+    for field_selector in SELECTORS:
+        legacy, legacy_time = measure(legacy_field_filter, obj_list=pods,
+                                      field_selector=field_selector)
+        compiled, compiled_time = measure(field_filter, obj_list=pods,
+                                          field_selector=field_selector)
+        assert legacy == compiled, f"Results differ for {field_selector!r}"
+        results.append({"benchmark": "field_filter",
+                        "field_selector": field_selector,
+                        "objects": number_of_pods,
+                        "matched": len(compiled),
+                        "legacy_seconds": round(legacy_time, 6),
+                        "compiled_seconds": round(compiled_time, 6),
+                        "speedup": round(legacy_time / compiled_time, 1)})
+    return results
+
+
+if __name__ == "__main__":
+    for result in run(*(int(arg) for arg in sys.argv[1:])):
+        print(json.dumps(result))
@@ -0,0 +1,1143 @@
+"""
+In-process stand-in for the Kubernetes API server.
+
+It serves the subset of the REST API used by k8s_client (pods, deployments,
+replicasets, daemonsets, namespaces, secrets, services, nodes and events,
+including list pagination, watches and pod logs) and runs a small simulated
+control plane: deployments own replica sets, replica sets and daemon sets own
+pods, and a simulated kubelet moves pods from Pending to Running after a
+configurable latency while emitting the matching events.
+
+Usage:
+    cluster = FakeCluster(nodes=3, pod_start_latency=0.05)
+    with FakeApiServer(cluster=cluster) as server:
+        kubeconfig_path = server.write_kubeconfig(path="/tmp/fake-kubeconfig")
+        k8s = K8sClient(kubeconfig_path=kubeconfig_path)
+"""
+import base64
+import copy
+import hashlib
+import json
+import logging
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+CORE_RESOURCES = {"pods": "Pod", "namespaces": "Namespace",
+                  "secrets": "Secret", "services": "Service",
+                  "events": "Event", "nodes": "Node",
+                  "configmaps": "ConfigMap"}
+APPS_RESOURCES = {"deployments": "Deployment", "replicasets": "ReplicaSet",
+                  "daemonsets": "DaemonSet"}
+CLUSTER_SCOPED = {"namespaces", "nodes"}
+SUPPORTED_FIELDS = {"metadata.name", "metadata.namespace", "status.phase",
+                    "spec.nodeName", "spec.restartPolicy",
+                    "spec.schedulerName", "spec.serviceAccountName",
+                    "status.podIP", "spec.unschedulable", "involvedObject.uid",
+                    "involvedObject.name", "involvedObject.kind",
+                    "involvedObject.namespace", "type", "reason"}
+PULL_FAILURE_MARK = "doesnotexist"
+
+
+def now_timestamp():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def log_timestamp(epoch):
+    moment = datetime.fromtimestamp(epoch, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + \
+        f"{moment.microsecond:06d}000Z"
+
+
+def status_body(code, reason, message):
+    return {"kind": "Status", "apiVersion": "v1", "metadata": {},
+            "status": "Failure", "message": message, "reason": reason,
+            "code": code}
+
+
+class ApiError(Exception):
+    def __init__(self, code, reason, message):
+        super(ApiError, self).__init__(message)
+        self.code = code
+        self.reason = reason
+        self.message = message
+
+
+def get_path(obj, path):
+    for key in path.split("."):
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def split_selector(selector):
+    """Split a selector on commas which are not inside parentheses."""
+    clauses, depth, current = [], 0, ""
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and not depth:
+            clauses.append(current.strip())
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        clauses.append(current.strip())
+    return clauses
+
+
+def field_matcher(field_selector):
+    clauses = []
+    for clause in split_selector(field_selector or ""):
+        for operator in ("!=", "==", "="):
+            if operator in clause:
+                field, value = clause.split(operator, 1)
+                break
+        else:
+            raise ApiError(400, "BadRequest",
+                           f"invalid field selector: {clause}")
+        field = field.strip()
+        if field not in SUPPORTED_FIELDS:
+            raise ApiError(400, "BadRequest",
+                           f'field label not supported: "{field}"')
+        clauses.append((field, operator == "!=", value.strip()))
+
+    def match(obj):
+        for field, negate, value in clauses:
+            actual = get_path(obj, field)
+            actual = "" if actual is None else str(actual).lower() \
+                if isinstance(actual, bool) else str(actual)
+            if (actual == value) == negate:
+                return False
+        return True
+
+    return match
+
+
+def selected_name(field_selector):
+    """The name a field selector of only metadata.name selects, or None."""
+    clauses = split_selector(field_selector or "")
+    if len(clauses) != 1 or "!=" in clauses[0]:
+        return None
+    field, _, value = clauses[0].replace("==", "=").partition("=")
+    return value.strip() if field.strip() == "metadata.name" else None
+
+
+def value_set(values):
+    """The values of a set based requirement, e.g. "(a, b)"."""
+    return {value.strip() for value in values.strip()[1:-1].split(",")}
+
+
+def label_matcher(label_selector):
+    clauses = []
+    for clause in split_selector(label_selector or ""):
+        if " notin " in clause:
+            key, values = clause.split(" notin ", 1)
+            clauses.append(("notin", key.strip(), value_set(values)))
+        elif " in " in clause:
+            key, values = clause.split(" in ", 1)
+            clauses.append(("in", key.strip(), value_set(values)))
+        elif "!=" in clause:
+            key, value = clause.split("!=", 1)
+            clauses.append(("!=", key.strip(), value.strip()))
+        elif "==" in clause or "=" in clause:
+            key, value = clause.replace("==", "=").split("=", 1)
+            clauses.append(("=", key.strip(), value.strip()))
+        elif clause.startswith("!"):
+            clauses.append(("!", clause[1:].strip(), None))
+        else:
+            clauses.append(("exists", clause.strip(), None))
+
+    def match(obj):
+        labels = obj.get("metadata", {}).get("labels") or {}
+        for operator, key, value in clauses:
+            if operator == "=" and labels.get(key) != value:
+                return False
+            if operator == "!=" and labels.get(key) == value:
+                return False
+            if operator == "in" and labels.get(key) not in value:
+                return False
+            if operator == "notin" and labels.get(key) in value:
+                return False
+            if operator == "exists" and key not in labels:
+                return False
+            if operator == "!" and key in labels:
+                return False
+        return True
+
+    return match
+
+
+def merge_patch(target, patch):
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    target = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = merge_patch(target.get(key), value)
+    return target
+
+
+def json_patch(target, operations):
+    target = copy.deepcopy(target)
+    for operation in operations:
+        parts = [part.replace("~1", "/").replace("~0", "~") for part in
+                 operation["path"].lstrip("/").split("/")]
+        parent = target
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else \
+                parent.setdefault(part, {})
+        last = parts[-1]
+        if operation["op"] in ("add", "replace"):
+            if isinstance(parent, list):
+                if last == "-":
+                    parent.append(operation["value"])
+                else:
+                    parent[int(last)] = operation["value"]
+            else:
+                parent[last] = operation["value"]
+        elif operation["op"] == "remove":
+            if isinstance(parent, list):
+                parent.pop(int(last))
+            else:
+                parent.pop(last, None)
+    return target
+
+
+def template_hash(template):
+    encoded = json.dumps(template, sort_keys=True).encode()
+    return hashlib.sha1(encoded).hexdigest()[:10]
+
+
+class FakeCluster(object):
+    """
+    The state of the fake cluster and its simulated controllers.
+    :param nodes: the number of the nodes in the cluster
+    :type nodes: int
+    :param pod_start_latency: seconds between pod creation and Running
+    :type pod_start_latency: float
+    :param pod_stop_latency: seconds between pod deletion request and removal
+    :type pod_stop_latency: float
+    :param namespace_delete_latency: seconds a namespace stays Terminating
+    :type namespace_delete_latency: float
+    :param history_size: number of changes kept for watch resumption, older
+    resource versions get 410 Gone
+    :type history_size: int
+    :param log_interval: seconds between two log lines of a running pod
+    (0 to disable log generation)
+    :type log_interval: float
+    """
+
+    def __init__(self, nodes=3, pod_start_latency=0.05, pod_stop_latency=0.0,
+                 namespace_delete_latency=0.05, history_size=100000,
+                 log_interval=0.0, tick=0.005):
+        self.pod_start_latency = pod_start_latency
+        self.pod_stop_latency = pod_stop_latency
+        self.namespace_delete_latency = namespace_delete_latency
+        self.log_interval = log_interval
+        self.tick = tick
+        self.condition = threading.Condition(threading.RLock())
+        self.resource_version = 0
+        self.store = {plural: {} for plural in
+                      list(CORE_RESOURCES) + list(APPS_RESOURCES)}
+        self.history = deque(maxlen=history_size)
+        self.logs = {}
+        # the stored objects by their plural and the uid of their owner
+        self.owned = {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self._stop = threading.Event()
+        self._controller = None
+        for name in ("default", "kube-system", "kube-public"):
+            self.create("namespaces", None, {"metadata": {"name": name}})
+        for index in range(nodes):
+            self.create("nodes", None, {
+                "metadata": {"name": f"node-{index}",
+                             "labels": {"kubernetes.io/hostname":
+                                        f"node-{index}"}},
+                "spec": {},
+                "status": {"addresses": [
+                    {"type": "InternalIP", "address": f"10.0.0.{index + 1}"},
+                    {"type": "ExternalIP", "address": "127.0.0.1"},
+                    {"type": "Hostname", "address": f"node-{index}"}],
+                    "conditions": [{"type": "Ready", "status": "True"}]}})
+
+    # ---------------------------------------------------------------- store
+    def _commit(self, plural, event_type, obj):
+        self.resource_version += 1
+        obj["metadata"]["resourceVersion"] = str(self.resource_version)
+        key = (obj["metadata"].get("namespace", ""), obj["metadata"]["name"])
+        if event_type == "DELETED":
+            self.store[plural].pop(key, None)
+            self.logs.pop(obj["metadata"].get("uid"), None)
+        else:
+            self.store[plural][key] = obj
+        for owner in obj["metadata"].get("ownerReferences") or []:
+            owned = self.owned.setdefault((plural, owner.get("uid")), {})
+            if event_type == "DELETED":
+                owned.pop(key, None)
+            else:
+                owned[key] = obj
+        self.history.append((self.resource_version, plural, event_type,
+                             copy.deepcopy(obj)))
+        self.condition.notify_all()
+        return obj
+
+    def _key(self, plural, namespace, name):
+        return ("" if plural in CLUSTER_SCOPED else namespace), name
+
+    def get(self, plural, namespace, name):
+        with self.condition:
+            obj = self.store[plural].get(self._key(plural, namespace, name))
+            if obj is None:
+                raise ApiError(404, "NotFound",
+                               f'{plural} "{name}" not found')
+            return copy.deepcopy(obj)
+
+    def select(self, plural, namespace=None, field_selector="",
+               label_selector=""):
+        match_fields = field_matcher(field_selector)
+        match_labels = label_matcher(label_selector)
+        name = selected_name(field_selector)
+        with self.condition:
+            if name is not None and (namespace is not None or
+                                     plural in CLUSTER_SCOPED):
+                # the watch of a single object, without a scan
+                obj = self.store[plural].get(
+                    self._key(plural, namespace, name))
+                candidates = [obj] if obj is not None else []
+            else:
+                candidates = [obj for key, obj in
+                              sorted(self.store[plural].items())
+                              if namespace is None or key[0] == namespace]
+            objects = [obj for obj in candidates
+                       if match_fields(obj) and match_labels(obj)]
+            return objects, self.resource_version
+
+    def create(self, plural, namespace, body):
+        with self.condition:
+            obj = copy.deepcopy(body)
+            metadata = obj.setdefault("metadata", {})
+            if plural not in CLUSTER_SCOPED:
+                namespace = metadata.get("namespace") or namespace
+                if ("", namespace) not in self.store["namespaces"]:
+                    raise ApiError(404, "NotFound",
+                                   f'namespaces "{namespace}" not found')
+                metadata["namespace"] = namespace
+            if not metadata.get("name") and metadata.get("generateName"):
+                metadata["name"] = metadata["generateName"] + \
+                    uuid.uuid4().hex[:5]
+            if not metadata.get("name"):
+                raise ApiError(422, "Invalid", "metadata.name: Required value")
+            key = self._key(plural, namespace, metadata["name"])
+            if key in self.store[plural]:
+                raise ApiError(409, "AlreadyExists",
+                               f'{plural} "{metadata["name"]}" already exists')
+            kind = CORE_RESOURCES.get(plural) or APPS_RESOURCES[plural]
+            obj["kind"] = kind
+            obj["apiVersion"] = "apps/v1" if plural in APPS_RESOURCES else "v1"
+            metadata["uid"] = str(uuid.uuid4())
+            metadata["creationTimestamp"] = now_timestamp()
+            metadata["generation"] = 1
+            metadata.pop("resourceVersion", None)
+            if plural == "pods":
+                obj.setdefault("status", {})["phase"] = "Pending"
+                obj["metadata"]["_created"] = time.time()
+                obj["spec"].setdefault("restartPolicy", "Always")
+            elif plural == "namespaces":
+                obj["status"] = {"phase": "Active"}
+            elif plural == "services":
+                obj.setdefault("spec", {}).setdefault("type", "ClusterIP")
+                obj["spec"]["clusterIP"] = "10.96.0." + \
+                    str(len(self.store["services"]) % 250 + 1)
+                obj["status"] = {"loadBalancer": {}}
+                if obj["spec"]["type"] == "LoadBalancer":
+                    obj["status"]["loadBalancer"] = {
+                        "ingress": [{"ip": "127.0.0.1"}]}
+            elif plural in APPS_RESOURCES:
+                obj.setdefault("status", {})
+                if plural == "daemonsets":
+                    obj["status"] = {"currentNumberScheduled": 0,
+                                     "desiredNumberScheduled": 0,
+                                     "numberMisscheduled": 0,
+                                     "numberReady": 0}
+                if plural == "deployments":
+                    obj["spec"].setdefault("replicas", 1)
+                    obj["spec"].setdefault("progressDeadlineSeconds", 600)
+            return self._public(self._commit(plural, "ADDED", obj))
+
+    @staticmethod
+    def _public(obj):
+        obj = copy.deepcopy(obj)
+        for key in [key for key in obj["metadata"] if key.startswith("_")]:
+            obj["metadata"].pop(key)
+        return obj
+
+    def patch(self, plural, namespace, name, patch):
+        with self.condition:
+            obj = self.store[plural].get(self._key(plural, namespace, name))
+            if obj is None:
+                raise ApiError(404, "NotFound", f'{plural} "{name}" not found')
+            if isinstance(patch, list):
+                patched = json_patch(obj, patch)
+            else:
+                patched = merge_patch(obj, patch)
+            if patched.get("spec") != obj.get("spec"):
+                patched["metadata"]["generation"] = \
+                    obj["metadata"].get("generation", 1) + 1
+            return self._public(self._commit(plural, "MODIFIED", patched))
+
+    def delete(self, plural, namespace, name, propagation_policy=None):
+        with self.condition:
+            key = self._key(plural, namespace, name)
+            obj = self.store[plural].get(key)
+            if obj is None:
+                raise ApiError(404, "NotFound", f'{plural} "{name}" not found')
+            if plural == "namespaces":
+                if obj["status"].get("phase") != "Terminating":
+                    obj = copy.deepcopy(obj)
+                    obj["status"]["phase"] = "Terminating"
+                    obj["metadata"]["deletionTimestamp"] = now_timestamp()
+                    obj["metadata"]["_deleted"] = time.time()
+                    self._commit(plural, "MODIFIED", obj)
+                return self._public(obj)
+            if plural == "pods" and self.pod_stop_latency:
+                if not obj["metadata"].get("deletionTimestamp"):
+                    obj = copy.deepcopy(obj)
+                    obj["metadata"]["deletionTimestamp"] = now_timestamp()
+                    obj["metadata"]["_deleted"] = time.time()
+                    self._commit(plural, "MODIFIED", obj)
+                return self._public(obj)
+            self._commit(plural, "DELETED", copy.deepcopy(obj))
+            if propagation_policy != "Orphan":
+                self._collect_dependents(obj["metadata"]["uid"])
+            return self._public(obj)
+
+    def delete_collection(self, plural, namespace, field_selector="",
+                          label_selector="", propagation_policy=None):
+        with self.condition:
+            objects, _ = self.select(plural, namespace, field_selector,
+                                     label_selector)
+            for obj in objects:
+                self.delete(plural, namespace, obj["metadata"]["name"],
+                            propagation_policy=propagation_policy)
+            return {"kind": "Status", "apiVersion": "v1", "metadata": {},
+                    "status": "Success"}
+
+    def _collect_dependents(self, owner_uid):
+        for plural in ("replicasets", "pods"):
+            for obj in list(self.store[plural].values()):
+                owners = obj["metadata"].get("ownerReferences") or []
+                if any(owner.get("uid") == owner_uid for owner in owners):
+                    self.delete(plural, obj["metadata"]["namespace"],
+                                obj["metadata"]["name"])
+
+    def changes_since(self, resource_version, plural):
+        """
+        Return the changes newer than resource_version, raise ApiError 410
+        when the resource version is older than the kept history.
+        """
+        if self.history and resource_version < self.history[0][0] - 1:
+            raise ApiError(410, "Expired",
+                           f"too old resource version: {resource_version} "
+                           f"({self.history[0][0]})")
+        # the history is in resource version order, the watches are mostly
+        # behind by a few changes
+        changes = []
+        for change in reversed(self.history):
+            if change[0] <= resource_version:
+                break
+            if change[1] == plural:
+                changes.append(change)
+        changes.reverse()
+        return changes
+
+    # ------------------------------------------------------------------ seeds
+    def seed_pods(self, namespace, count, owner=None, labels=None,
+                  phase="Running", prefix="seed"):
+        """
+        Bulk create ready pods without going through the controllers.
+        """
+        with self.condition:
+            if ("", namespace) not in self.store["namespaces"]:
+                self.create("namespaces", None,
+                            {"metadata": {"name": namespace}})
+            nodes = sorted(key[1] for key in self.store["nodes"])
+            for index in range(count):
+                pod = {"metadata": {"name": f"{prefix}-{index}",
+                                    "labels": dict(labels or {"app": prefix}),
+                                    "ownerReferences":
+                                        [owner] if owner else []},
+                       "spec": {"containers": [{"name": "main",
+                                                "image": "alpine"}],
+                                "nodeName": nodes[index % len(nodes)]}}
+                pod = self.create("pods", namespace, pod)
+                stored = self.store["pods"][
+                    (namespace, pod["metadata"]["name"])]
+                self._set_running(stored, emit_events=False)
+
+    # ------------------------------------------------------------ controllers
+    def start(self):
+        self._stop.clear()
+        self._controller = threading.Thread(target=self._control_loop,
+                                            daemon=True)
+        self._controller.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._controller is not None:
+            self._controller.join()
+        with self.condition:
+            self.condition.notify_all()
+
+    def _control_loop(self):
+        while not self._stop.is_set():
+            start = time.time()
+            with self.condition:
+                try:
+                    self.reconcile()
+                except Exception:
+                    logger.exception("Fake controller failed")
+            # leave the requests at least as much time as the reconcile took
+            self._stop.wait(max(self.tick, time.time() - start))
+
+    def reconcile(self):
+        for deployment in list(self.store["deployments"].values()):
+            self._reconcile_deployment(deployment)
+        for replica_set in list(self.store["replicasets"].values()):
+            self._reconcile_replica_set(replica_set)
+        for daemon_set in list(self.store["daemonsets"].values()):
+            self._reconcile_daemon_set(daemon_set)
+        self._run_kubelet()
+        self._reconcile_namespaces()
+
+    def _owned(self, plural, owner):
+        return list(self.owned.get((plural, owner["metadata"]["uid"]),
+                                   {}).values())
+
+    @staticmethod
+    def _owner_reference(owner):
+        return {"apiVersion": owner["apiVersion"], "kind": owner["kind"],
+                "name": owner["metadata"]["name"],
+                "uid": owner["metadata"]["uid"], "controller": True,
+                "blockOwnerDeletion": True}
+
+    def _update_status(self, plural, obj, status):
+        if obj.get("status") != status:
+            obj = copy.deepcopy(obj)
+            obj["status"] = status
+            self._commit(plural, "MODIFIED", obj)
+
+    def _new_pod(self, owner, template, node_name, extra_labels):
+        metadata = copy.deepcopy(template.get("metadata") or {})
+        labels = dict(metadata.get("labels") or {})
+        labels.update(extra_labels)
+        pod = {"metadata": {"name": owner["metadata"]["name"] + "-" +
+                                    uuid.uuid4().hex[:8],
+                            "labels": labels,
+                            "annotations": metadata.get("annotations") or {},
+                            "ownerReferences": [self._owner_reference(owner)]},
+               "spec": copy.deepcopy(template.get("spec") or {})}
+        if node_name:
+            pod["spec"]["nodeName"] = node_name
+        self.create("pods", owner["metadata"]["namespace"], pod)
+
+    def _nodes(self):
+        return sorted(key[1] for key in self.store["nodes"])
+
+    def _reconcile_deployment(self, deployment):
+        namespace = deployment["metadata"]["namespace"]
+        template = deployment["spec"].get("template") or {}
+        pod_hash = template_hash(template)
+        replica_sets = self._owned("replicasets", deployment)
+        current = next((rs for rs in replica_sets if
+                        rs["metadata"]["labels"].get("pod-template-hash") ==
+                        pod_hash), None)
+        replicas = deployment["spec"].get("replicas", 1)
+        if current is None:
+            labels = dict((template.get("metadata") or {}).get("labels") or {})
+            labels["pod-template-hash"] = pod_hash
+            selector = copy.deepcopy(deployment["spec"].get("selector") or {})
+            selector.setdefault("matchLabels", {})["pod-template-hash"] = \
+                pod_hash
+            rs_template = copy.deepcopy(template)
+            rs_template.setdefault("metadata", {})["labels"] = labels
+            current = self.create("replicasets", namespace, {
+                "metadata": {"name": f"{deployment['metadata']['name']}-"
+                                     f"{pod_hash}",
+                             "labels": labels,
+                             "ownerReferences":
+                                 [self._owner_reference(deployment)]},
+                "spec": {"replicas": replicas, "selector": selector,
+                         "template": rs_template}})
+            current = self.store["replicasets"][
+                (namespace, current["metadata"]["name"])]
+        elif current["spec"].get("replicas") != replicas:
+            self.patch("replicasets", namespace, current["metadata"]["name"],
+                       {"spec": {"replicas": replicas}})
+        new_pods = self._owned("pods", current)
+        ready_new = [pod for pod in new_pods if self._pod_ready(pod)]
+        old_pods = []
+        for replica_set in replica_sets:
+            if replica_set["metadata"]["uid"] == current["metadata"]["uid"]:
+                continue
+            old_pods.extend(self._owned("pods", replica_set))
+            # roll the old replica sets down once the new one is available
+            if len(ready_new) >= replicas and \
+                    replica_set["spec"].get("replicas"):
+                self.patch("replicasets", namespace,
+                           replica_set["metadata"]["name"],
+                           {"spec": {"replicas": 0}})
+        all_pods = new_pods + old_pods
+        available = len([pod for pod in all_pods if self._pod_ready(pod)])
+        failed = [pod for pod in new_pods if self._pod_failed(pod)]
+        progressing = {"type": "Progressing", "status": "True",
+                       "reason": "NewReplicaSetAvailable"
+                       if len(ready_new) >= replicas else
+                       "ReplicaSetUpdated",
+                       "message": f'ReplicaSet "{current["metadata"]["name"]}"'
+                                  f' is progressing.'}
+        deadline = deployment["spec"].get("progressDeadlineSeconds", 600)
+        created = deployment["metadata"].get("_progress_since")
+        if failed and created is not None and \
+                time.time() - created > deadline:
+            progressing = {"type": "Progressing", "status": "False",
+                           "reason": "ProgressDeadlineExceeded",
+                           "message": f'ReplicaSet '
+                                      f'"{current["metadata"]["name"]}" has '
+                                      f'timed out progressing.'}
+        if "_progress_since" not in deployment["metadata"]:
+            deployment["metadata"]["_progress_since"] = time.time()
+        status = {"observedGeneration": deployment["metadata"]["generation"],
+                  "replicas": len(all_pods),
+                  "updatedReplicas": len(new_pods),
+                  "readyReplicas": available,
+                  "availableReplicas": available,
+                  "unavailableReplicas": max(len(all_pods) - available, 0),
+                  "conditions": [
+                      {"type": "Available",
+                       "status": "True" if available >= replicas else "False",
+                       "reason": "MinimumReplicasAvailable"},
+                      progressing]}
+        for key in ("readyReplicas", "availableReplicas",
+                    "unavailableReplicas", "updatedReplicas", "replicas"):
+            if not status[key]:
+                status.pop(key)
+        self._update_status("deployments", deployment, status)
+
+    def _reconcile_replica_set(self, replica_set):
+        pods = [pod for pod in self._owned("pods", replica_set)
+                if not pod["metadata"].get("deletionTimestamp")]
+        replicas = replica_set["spec"].get("replicas", 1)
+        nodes = self._nodes()
+        for index in range(len(pods), replicas):
+            self._new_pod(replica_set, replica_set["spec"]["template"],
+                          nodes[index % len(nodes)] if nodes else None, {})
+        for pod in sorted(pods, key=lambda p: p["metadata"]["name"])[
+                   replicas:]:
+            self.delete("pods", pod["metadata"]["namespace"],
+                        pod["metadata"]["name"])
+        pods = self._owned("pods", replica_set)
+        ready = len([pod for pod in pods if self._pod_ready(pod)])
+        status = {"replicas": len(pods), "readyReplicas": ready,
+                  "availableReplicas": ready,
+                  "observedGeneration": replica_set["metadata"]["generation"]}
+        self._update_status("replicasets", replica_set, status)
+
+    def _reconcile_daemon_set(self, daemon_set):
+        template = daemon_set["spec"].get("template") or {}
+        pod_hash = template_hash(template)
+        pods = self._owned("pods", daemon_set)
+        nodes = self._nodes()
+        by_node = {}
+        for pod in pods:
+            by_node.setdefault(pod["spec"].get("nodeName"), []).append(pod)
+        for node in nodes:
+            node_pods = [pod for pod in by_node.get(node, [])
+                         if not pod["metadata"].get("deletionTimestamp")]
+            if not node_pods:
+                self._new_pod(daemon_set, template, node,
+                              {"controller-revision-hash": pod_hash})
+                continue
+            for pod in node_pods:
+                if pod["metadata"]["labels"].get(
+                        "controller-revision-hash") != pod_hash:
+                    self.delete("pods", pod["metadata"]["namespace"],
+                                pod["metadata"]["name"])
+        pods = self._owned("pods", daemon_set)
+        updated = [pod for pod in pods if pod["metadata"]["labels"].get(
+            "controller-revision-hash") == pod_hash]
+        ready = [pod for pod in pods if self._pod_ready(pod)]
+        available = [pod for pod in updated if self._pod_ready(pod)]
+        status = {"desiredNumberScheduled": len(nodes),
+                  "currentNumberScheduled": len({pod["spec"].get("nodeName")
+                                                 for pod in pods}),
+                  "numberMisscheduled": 0,
+                  "numberReady": len(ready),
+                  "updatedNumberScheduled": len(updated),
+                  "numberAvailable": len(available),
+                  "numberUnavailable": len(nodes) - len(available),
+                  "observedGeneration": daemon_set["metadata"]["generation"]}
+        for key in ("numberAvailable", "numberUnavailable",
+                    "updatedNumberScheduled"):
+            if not status[key]:
+                status.pop(key)
+        self._update_status("daemonsets", daemon_set, status)
+
+    @staticmethod
+    def _pod_ready(pod):
+        return pod.get("status", {}).get("phase") == "Running" and \
+            not pod["metadata"].get("deletionTimestamp")
+
+    @staticmethod
+    def _pod_failed(pod):
+        return any(status.get("state", {}).get("waiting") for status in
+                   pod.get("status", {}).get("containerStatuses") or [])
+
+    def _emit_event(self, obj, reason, message, event_type="Normal"):
+        self.create("events", obj["metadata"].get("namespace") or "default", {
+            "metadata": {"name": f"{obj['metadata']['name']}."
+                                 f"{uuid.uuid4().hex[:16]}"},
+            "involvedObject": {"kind": obj["kind"],
+                               "name": obj["metadata"]["name"],
+                               "namespace": obj["metadata"].get("namespace"),
+                               "uid": obj["metadata"]["uid"],
+                               "apiVersion": obj["apiVersion"]},
+            "reason": reason, "message": message, "type": event_type,
+            "count": 1, "firstTimestamp": now_timestamp(),
+            "lastTimestamp": now_timestamp(),
+            "source": {"component": "kubelet"}})
+
+    def _set_running(self, pod, emit_events=True):
+        statuses = []
+        for container in pod["spec"]["containers"]:
+            statuses.append({"name": container["name"],
+                             "image": container.get("image"),
+                             "imageID": f"docker-pullable://"
+                                        f"{container.get('image')}",
+                             "containerID": "containerd://" +
+                                            uuid.uuid4().hex,
+                             "ready": True, "restartCount": 0,
+                             "started": True,
+                             "state": {"running":
+                                       {"startedAt": now_timestamp()}}})
+            if emit_events:
+                self._emit_event(pod, "Started",
+                                 f"Started container {container['name']}")
+        pod = copy.deepcopy(pod)
+        pod["status"] = {"phase": "Running", "podIP": "10.244.0." +
+                         str(len(self.store["pods"]) % 250 + 1),
+                         "hostIP": "10.0.0.1", "startTime": now_timestamp(),
+                         "containerStatuses": statuses,
+                         "conditions": [{"type": "Ready",
+                                         "status": "True"}]}
+        pod["metadata"]["_log_next"] = time.time()
+        self._commit("pods", "MODIFIED", pod)
+
+    def _set_pull_failure(self, pod):
+        statuses = []
+        for container in pod["spec"]["containers"]:
+            message = f'Failed to pull image "{container.get("image")}": ' \
+                      f'pull access denied for {container.get("image")}'
+            statuses.append({"name": container["name"],
+                             "image": container.get("image"), "ready": False,
+                             "restartCount": 0, "imageID": "",
+                             "state": {"waiting": {"reason": "ErrImagePull",
+                                                   "message": message}}})
+            self._emit_event(pod, "Failed", message, event_type="Warning")
+        pod = copy.deepcopy(pod)
+        pod["status"]["containerStatuses"] = statuses
+        self._commit("pods", "MODIFIED", pod)
+
+    def _run_kubelet(self):
+        now = time.time()
+        for pod in list(self.store["pods"].values()):
+            metadata = pod["metadata"]
+            if metadata.get("deletionTimestamp"):
+                if now - metadata.get("_deleted", now) >= \
+                        self.pod_stop_latency:
+                    self._commit("pods", "DELETED", copy.deepcopy(pod))
+                continue
+            if pod["status"].get("phase") == "Pending" and \
+                    not pod["status"].get("containerStatuses") and \
+                    now - metadata.get("_created", now) >= \
+                    self.pod_start_latency:
+                if any(PULL_FAILURE_MARK in (container.get("image") or "")
+                       for container in pod["spec"]["containers"]):
+                    self._set_pull_failure(pod)
+                else:
+                    self._set_running(pod)
+            elif self.log_interval and \
+                    pod["status"].get("phase") == "Running" and \
+                    now >= metadata.get("_log_next", now + 1):
+                lines = self.logs.setdefault(metadata["uid"],
+                                             deque(maxlen=10000))
+                lines.append((now, f"{metadata['name']} line {len(lines)}"))
+                metadata["_log_next"] = now + self.log_interval
+                self.condition.notify_all()
+
+    def _reconcile_namespaces(self):
+        now = time.time()
+        for namespace in list(self.store["namespaces"].values()):
+            metadata = namespace["metadata"]
+            if namespace["status"].get("phase") != "Terminating" or \
+                    now - metadata.get("_deleted", now) < \
+                    self.namespace_delete_latency:
+                continue
+            for plural, objects in self.store.items():
+                if plural in CLUSTER_SCOPED:
+                    continue
+                for key, obj in list(objects.items()):
+                    if key[0] == metadata["name"]:
+                        self._commit(plural, "DELETED", copy.deepcopy(obj))
+            self._commit("namespaces", "DELETED", copy.deepcopy(namespace))
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    @property
+    def cluster(self):
+        return self.server.cluster
+
+    # ------------------------------------------------------------- plumbing
+    def _route(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in
+                 parse_qs(url.query).items()}
+        for flag in ("watch", "follow", "timestamps"):
+            if flag in query:
+                query[flag] = query[flag].lower()
+        parts = [part for part in url.path.split("/") if part]
+        if parts[:2] == ["api", "v1"]:
+            parts = parts[2:]
+            resources = CORE_RESOURCES
+        elif parts[:3] == ["apis", "apps", "v1"]:
+            parts = parts[3:]
+            resources = APPS_RESOURCES
+        else:
+            raise ApiError(404, "NotFound", f"unknown path {url.path}")
+        namespace = name = subresource = None
+        if len(parts) >= 3 and parts[0] == "namespaces":
+            namespace, parts = parts[1], parts[2:]
+        if not parts or parts[0] not in resources:
+            raise ApiError(404, "NotFound", f"unknown path {url.path}")
+        plural = parts[0]
+        if len(parts) > 1:
+            name = parts[1]
+        if len(parts) > 2:
+            subresource = parts[2]
+        return plural, namespace, name, subresource, query
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length))
+
+    def _send_json(self, code, body):
+        data = json.dumps(body).encode()
+        self.cluster.bytes_sent += len(data)
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _client_gone(self):
+        """Return if the client closed the connection of a stream."""
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+    def _handle(self, method):
+        self.cluster.requests += 1
+        try:
+            plural, namespace, name, subresource, query = self._route()
+            handler = getattr(self, f"_{method}")
+            handler(plural, namespace, name, subresource, query)
+        except ApiError as error:
+            self._send_json(error.code, status_body(error.code, error.reason,
+                                                    error.message))
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def do_GET(self):
+        self._handle("get")
+
+    def do_POST(self):
+        self._handle("post")
+
+    def do_PATCH(self):
+        self._handle("patch")
+
+    def do_PUT(self):
+        self._handle("patch")
+
+    def do_DELETE(self):
+        self._handle("delete")
+
+    # ------------------------------------------------------------- handlers
+    def _get(self, plural, namespace, name, subresource, query):
+        if subresource == "log":
+            return self._logs(namespace, name, query)
+        if name is not None and plural not in CLUSTER_SCOPED or \
+                name is not None and namespace is None:
+            return self._send_json(200, FakeCluster._public(
+                self.cluster.get(plural, namespace, name)))
+        if query.get("watch") in ("true", "1"):
+            return self._watch(plural, namespace, query)
+        return self._list(plural, namespace, query)
+
+    def _list(self, plural, namespace, query):
+        objects, resource_version = self.cluster.select(
+            plural, namespace, query.get("fieldSelector", ""),
+            query.get("labelSelector", ""))
+        start = 0
+        if query.get("continue"):
+            token = json.loads(base64.b64decode(query["continue"]))
+            start = token["start"]
+            resource_version = token["rv"]
+        metadata = {"resourceVersion": str(resource_version)}
+        limit = int(query.get("limit") or 0)
+        if limit and start + limit < len(objects):
+            metadata["continue"] = base64.b64encode(json.dumps(
+                {"start": start + limit, "rv": resource_version}).encode()
+                                                   ).decode()
+            metadata["remainingItemCount"] = len(objects) - start - limit
+            objects = objects[start:start + limit]
+        else:
+            objects = objects[start:]
+        kind = CORE_RESOURCES.get(plural) or APPS_RESOURCES[plural]
+        self._send_json(200, {
+            "kind": f"{kind}List",
+            "apiVersion": "apps/v1" if plural in APPS_RESOURCES else "v1",
+            "metadata": metadata,
+            "items": [FakeCluster._public(obj) for obj in objects]})
+
+    def _watch(self, plural, namespace, query):
+        match_fields = field_matcher(query.get("fieldSelector", ""))
+        match_labels = label_matcher(query.get("labelSelector", ""))
+        timeout = float(query.get("timeoutSeconds") or 3600)
+        deadline = time.time() + timeout
+        requested = query.get("resourceVersion")
+
+        def matches(obj):
+            return (namespace is None or
+                    obj["metadata"].get("namespace") == namespace) and \
+                match_fields(obj) and match_labels(obj)
+
+        with self.cluster.condition:
+            if requested in (None, "", "0"):
+                objects, last = self.cluster.select(
+                    plural, namespace, query.get("fieldSelector", ""),
+                    query.get("labelSelector", ""))
+                pending = [("ADDED", obj) for obj in objects]
+            else:
+                last = int(requested)
+                try:
+                    pending = [(change[2], change[3]) for change in
+                               self.cluster.changes_since(last, plural)]
+                    last = self.cluster.resource_version
+                except ApiError as error:
+                    self._start_chunked("application/json")
+                    self._send_chunk(json.dumps(
+                        {"type": "ERROR",
+                         "object": status_body(error.code, error.reason,
+                                               error.message)}).encode()
+                                     + b"\n")
+                    self._send_chunk(b"")
+                    return
+        self._start_chunked("application/json")
+        while True:
+            for event_type, obj in pending:
+                if matches(obj):
+                    data = json.dumps({"type": event_type,
+                                       "object": FakeCluster._public(obj)})
+                    self._send_chunk(data.encode() + b"\n")
+            with self.cluster.condition:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self.server.stopping or \
+                        self._client_gone():
+                    break
+                if self.cluster.resource_version == last:
+                    self.cluster.condition.wait(min(remaining, 0.5))
+                pending = [(change[2], change[3]) for change in
+                           self.cluster.changes_since(last, plural)]
+                last = self.cluster.resource_version
+        self._send_chunk(b"")
+
+    def _logs(self, namespace, name, query):
+        pod = self.cluster.get("pods", namespace, name)
+        uid = pod["metadata"]["uid"]
+        follow = query.get("follow") in ("true", "1")
+        timestamps = query.get("timestamps") in ("true", "1")
+        limit_bytes = int(query.get("limitBytes") or 0)
+        since = float(query.get("sinceSeconds") or 0)
+        with self.cluster.condition:
+            lines = list(self.cluster.logs.get(uid, ()))
+        if since:
+            lines = [line for line in lines if line[0] >= time.time() - since]
+        if query.get("tailLines"):
+            lines = lines[-int(query["tailLines"]):] \
+                if int(query["tailLines"]) else []
+
+        def render(entries):
+            return "".join(
+                (f"{log_timestamp(moment)} " if timestamps else "") +
+                text + "\n" for moment, text in entries).encode()
+
+        if not follow:
+            data = render(lines)
+            if limit_bytes:
+                data = data[:limit_bytes]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        self._start_chunked("text/plain")
+        sent = 0
+        last = lines[-1][0] if lines else 0
+        pending = lines
+        while True:
+            data = render(pending)
+            if limit_bytes and sent + len(data) > limit_bytes:
+                data = data[:limit_bytes - sent]
+            if data:
+                self._send_chunk(data)
+                sent += len(data)
+            if limit_bytes and sent >= limit_bytes:
+                break
+            with self.cluster.condition:
+                if self.server.stopping or self._client_gone() or \
+                        (namespace, name) not in self.cluster.store["pods"]:
+                    break
+                self.cluster.condition.wait(0.5)
+                pending = [line for line in
+                           self.cluster.logs.get(uid, ()) if line[0] > last]
+                if pending:
+                    last = pending[-1][0]
+        self._send_chunk(b"")
+
+    def _post(self, plural, namespace, name, subresource, query):
+        body = self._read_body() or {}
+        self._send_json(201, self.cluster.create(plural, namespace, body))
+
+    def _patch(self, plural, namespace, name, subresource, query):
+        body = self._read_body()
+        self._send_json(200, self.cluster.patch(plural, namespace, name,
+                                                body))
+
+    def _delete(self, plural, namespace, name, subresource, query):
+        body = self._read_body() or {}
+        policy = body.get("propagationPolicy") or \
+            query.get("propagationPolicy")
+        if name is None:
+            return self._send_json(200, self.cluster.delete_collection(
+                plural, namespace, query.get("fieldSelector", ""),
+                query.get("labelSelector", ""), propagation_policy=policy))
+        self._send_json(200, self.cluster.delete(plural, namespace, name,
+                                                 propagation_policy=policy))
+
+
+class FakeApiServer(object):
+    """
+    HTTP front end of a FakeCluster, listening on a local port.
+    :param cluster: the fake cluster to serve (a new one if not given)
+    :type cluster: FakeCluster
+    """
+
+    def __init__(self, cluster=None, host="127.0.0.1", port=0):
+        self.cluster = cluster or FakeCluster()
+        self.httpd = ThreadingHTTPServer((host, port), FakeApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.cluster = self.cluster
+        self.httpd.stopping = False
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.cluster.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.stopping = True
+        self.cluster.stop()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def write_kubeconfig(self, path):
+        """
+        Write a kubeconfig file pointing to this server
+        :param path: where to write the kubeconfig
+        :type path: str
+        :return: the path of the kubeconfig
+        :rtype: str
+        """
+        kubeconfig = {"apiVersion": "v1", "kind": "Config",
+                      "clusters": [{"name": "fake",
+                                    "cluster": {"server": self.url}}],
+                      "users": [{"name": "fake", "user": {"token": "fake"}}],
+                      "contexts": [{"name": "fake",
+                                    "context": {"cluster": "fake",
+                                                "user": "fake"}}],
+                      "current-context": "fake"}
+        with open(path, "w") as f:
+            json.dump(kubeconfig, f)
+        return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    fake_server = FakeApiServer(port=8001).start()
+    print(f"Fake API server listening on {fake_server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        fake_server.stop()
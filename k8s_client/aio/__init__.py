@@ -0,0 +1,7 @@
+try:
+    import kubernetes_asyncio  # noqa: F401
+except ImportError as e:
+    raise ImportError("k8s_client.aio requires the kubernetes_asyncio "
+                      "package (pip install kubernetes_asyncio)") from e
+
+from k8s_client.aio.lite_k8s import AsyncK8sClient  # noqa: E402,F401
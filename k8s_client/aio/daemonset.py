@@ -0,0 +1,308 @@
+import logging
+
+from kubernetes_asyncio.client import V1DaemonSet
+
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.aio.watchers import wait_for_event
+from k8s_client.consts import DEFAULT_NAMESPACE, WAIT_TIMEOUT
+from k8s_client.exceptions import K8sInvalidResourceBody
+from k8s_client.utils import convert_obj_to_dict, field_filter
+from k8s_client.selectors import plan_selector
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDaemonSetClient(object):
+
+    def __init__(self, client_app, pod, deployment):
+        self.client_app = client_app
+        self.pod = pod
+        self.deployment = deployment
+
+    @async_k8s_exceptions
+    async def finished_to_create_ready_replicas(self, name, namespace,
+                                                timeout=WAIT_TIMEOUT):
+        """
+        Wait until the pods of a daemon set are scheduled
+        :param name: the name of the daemon set
+        :type name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: True
+        :rtype: bool
+        """
+
+        def pods_scheduled(event_type, daemon_set_dict):
+            status = daemon_set_dict.get("status", {})
+            return event_type != "DELETED" and \
+                status.get("desiredNumberScheduled", 0) == \
+                status.get("currentNumberScheduled", 0)
+
+        await wait_for_event(list_func=self.client_app.list_namespaced_daemon_set,
+                             condition=pods_scheduled, timeout=timeout,
+                             description=f"the pods of daemon set {name} in "
+                                         f"{namespace} namespace",
+                             namespace=namespace,
+                             field_selector=f"metadata.name={name}")
+        return True
+
+    async def wait_for_daemon_set_to_run(self, daemon_set_name,
+                                         namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the daemon set is running (including their pods...)
+        :param daemon_set_name: the name of the daemon set
+        :type daemon_set_name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        """
+        await self.finished_to_create_ready_replicas(name=daemon_set_name,
+                                                     namespace=namespace)
+        await self.deployment.wait_for_pods_creation_thread_manager(
+            pods=await self.get_pods(name=daemon_set_name, namespace=namespace),
+            namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Create daemon set
+        :param body: daemon set's body
+        :type body: dictionary or V1DaemonSet
+        :param namespace: the namespace to create the daemon set in if there is
+        no namespace in the yaml (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the creation (default value is True)
+        :type wait: bool
+        :return: daemon set name
+        :rtype: str
+        """
+        # check the type of the body and that it contains name
+        # and raise exception if not
+        try:
+            if isinstance(body, V1DaemonSet):
+                daemon_set_name = body.metadata.name
+                namespace = body.metadata.namespace or namespace
+            elif isinstance(body, dict):
+                daemon_set_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            else:
+                raise K8sInvalidResourceBody()
+        except (KeyError, AttributeError):
+            raise K8sInvalidResourceBody()
+        # create the daemon from the body
+        await self.client_app.create_namespaced_daemon_set(body=body,
+                                                           namespace=namespace)
+        logger.info(f"Created the daemon set {daemon_set_name} in {namespace} "
+                    f"namespace")
+        # wait to the daemon set to run
+        if wait:
+            await self.wait_for_daemon_set_to_run(
+                daemon_set_name=daemon_set_name, namespace=namespace)
+        return daemon_set_name
+
+    @async_k8s_exceptions
+    async def delete(self, name, namespace=DEFAULT_NAMESPACE, wait=False):
+        """
+        Delete daemon set
+        :param name: daemon set's name
+        :type name: str
+        :param namespace: the namespace to delete the daemon set from
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        """
+        # get pods before the deleting
+        pods = await self.get_pods(name=name, namespace=namespace)
+
+        # delete the pod from the required namespace
+        await self.client_app.delete_namespaced_daemon_set(name=name,
+                                                           namespace=namespace)
+        logger.info(f"Deleted daemon set {name} from {namespace} namespace")
+        # wait to the pods to be deleted
+        if wait:
+            logger.info(f"Wait to {name} to be deleted")
+            await self.deployment.wait_for_pods_to_be_deleted_thread_manager(
+                pods=pods, namespace=namespace)
+
+    async def wait_for_daemon_set_to_patch(self, name, pods,
+                                           namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the daemon set's pods are patched
+        :param name: the name of the daemon set
+        :type name: str
+        :param pods: the daemon set's pods before the patch
+        :type pods: list
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        """
+        await self.deployment.wait_for_pods_to_be_deleted_thread_manager(
+            pods=pods, namespace=namespace)
+        await self.wait_for_daemon_set_to_run(daemon_set_name=name,
+                                              namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def patch(self, name, body, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Patch daemon set
+        :param name: the name of the daemon set
+        :type name: str
+        :param body: the diff body to patch
+        :type body: dictionary
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the patch is over
+        (default value is True)
+        :type wait: bool
+        """
+        pods = await self.get_pods(name=name, namespace=namespace)
+        await self.client_app.patch_namespaced_daemon_set(name=name,
+                                                          namespace=namespace,
+                                                          body=body)
+        logger.info(f"Patched daemon set {name} from namespace {namespace}")
+        if wait:
+            await self.wait_for_daemon_set_to_patch(name=name, pods=pods,
+                                                    namespace=namespace)
+
+    @async_k8s_exceptions
+    async def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
+        """
+        Return daemon set obj or dictionary
+        :param name: daemon set name
+        :type name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to return dictionary instead of obj
+        :type dict_output: bool
+        :return: the daemon set obj/dictionary
+        :rtype: Union[V1DaemonSet,dictionary]
+        """
+        daemon_set = await self.client_app.read_namespaced_daemon_set(
+            name=name, namespace=namespace)
+        logger.info(f"Got daemon set {name} from {namespace} namespace")
+
+        # convert the obj to dict if required
+        if dict_output:
+            daemon_set = convert_obj_to_dict(daemon_set)
+        else:
+            daemon_set.metadata.resource_version = ''
+
+        return daemon_set
+
+    @async_k8s_exceptions
+    async def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                   dict_output=False, field_selector="", label_selector=""):
+        """
+        Return list of daemon set objects/dictionaries
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the list from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the list to specific daemon sets
+        :type field_selector: str
+        :param label_selector: to filter the list to daemon sets with specific
+        labels
+        :type label_selector: str
+        :return: list of daemon sets
+        :rtype: list
+        """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="daemonsets",
+                             label_selector=label_selector)
+        if all_namespaces:
+            daemon_sets_list = (
+                await self.client_app.list_daemon_set_for_all_namespaces(
+                    **plan.api_kwargs)).items
+            logger.info("Got the daemon sets list from all the namespaces")
+        else:
+            daemon_sets_list = (await self.client_app.list_namespaced_daemon_set(
+                namespace=namespace, **plan.api_kwargs)).items
+            logger.info(f"Got the daemon sets list from {namespace} namespace")
+
+        if plan.remainder:
+            daemon_sets_list = field_filter(obj_list=daemon_sets_list,
+                                            field_selector=plan.remainder)
+
+        # convert the list to list of dicts if required
+        if dict_output:
+            daemon_sets_list = [convert_obj_to_dict(daemon_set) for daemon_set
+                                in daemon_sets_list]
+        else:
+            for daemon_set in daemon_sets_list:
+                daemon_set.metadata.resource_version = ''
+
+        return daemon_sets_list
+
+    async def list_names(self, namespace=DEFAULT_NAMESPACE,
+                         all_namespaces=False, field_selector="",
+                         label_selector=""):
+        return [daemon_set.metadata.name for daemon_set in
+                await self.list(namespace=namespace,
+                                all_namespaces=all_namespaces,
+                                field_selector=field_selector,
+                                label_selector=label_selector)]
+
+    async def get_pods(self, name, namespace=DEFAULT_NAMESPACE,
+                       dict_output=False):
+        """
+        Return the pods of the daemon set
+        :param name: the name of the daemon set
+        :type name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of the daemon set
+        :rtype: list
+        """
+        return await self.pod.list(
+            namespace=namespace,
+            field_selector=f"metadata.owner_references[0].kind==DaemonSet, "
+                           f"metadata.owner_references[0].name=={name}",
+            dict_output=dict_output)
+
+    @async_k8s_exceptions
+    async def events(self, name, namespace=DEFAULT_NAMESPACE,
+                     only_messages=False):
+        """
+        Return the list of the events of a specific daemon set
+        :param name: the name of the daemon set
+        :type name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param only_messages: to get only the events messages instead of
+        getting all the objects
+        :return: the list of the events
+        :rtype: list
+        """
+        daemon_set_uid = (await self.get(name=name,
+                                         namespace=namespace)).metadata.uid
+        events = (await self.pod.client_core.list_namespaced_event(
+            namespace=namespace,
+            field_selector=f"involvedObject.uid=={daemon_set_uid}")).items
+        logger.info(f"Got the events of daemon set {name} from namespace "
+                    f"{namespace}")
+        if only_messages:
+            events = [event.message for event in events if
+                      event.message is not None]
+        return events
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,519 @@
+import asyncio
+import logging
+
+from kubernetes_asyncio.client import V1Deployment
+
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.aio.watchers import wait_for_event
+from k8s_client.utils import (convert_obj_to_dict, field_filter,
+                              controller_uid)
+from k8s_client.selectors import plan_selector, to_label_selector
+from k8s_client.consts import DEFAULT_NAMESPACE, WAIT_TIMEOUT
+from k8s_client.exceptions import K8sInvalidResourceBody
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDeploymentClient(object):
+
+    def __init__(self, client_app, pod):
+        self.client_app = client_app
+        self.pod = pod
+
+    @async_k8s_exceptions
+    async def finished_to_create_ready_replicas(self, name, namespace,
+                                                timeout=WAIT_TIMEOUT):
+        """
+        Wait until the replicas of a deployment are available
+        :param name: the name of the deployment
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: True
+        :rtype: bool
+        """
+
+        def replicas_available(event_type, deployment_dict):
+            return event_type != "DELETED" and \
+                deployment_dict.get("spec", {}).get("replicas", 1) == \
+                deployment_dict.get("status", {}).get("availableReplicas", 0)
+
+        await wait_for_event(list_func=self.client_app.list_namespaced_deployment,
+                             condition=replicas_available, timeout=timeout,
+                             description=f"the replicas of deployment {name} "
+                                         f"in {namespace} namespace",
+                             namespace=namespace,
+                             field_selector=f"metadata.name={name}")
+        return True
+
+    async def wait_for_pods_creation_thread_manager(self, pods,
+                                                    namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the all pods are running (with one watch of the namespace)
+        :param pods:  the deployment's pods
+        :type pods: list
+        :param namespace: the namespace of the deployment
+        :type namespace: str
+        """
+        await self.pod.wait_for_pods_to_run(pods=pods, namespace=namespace)
+
+    async def wait_for_deployment_to_run(self, deployment_name,
+                                         namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the deployment is running (including their pods...)
+        :param deployment_name: the name of the deployment
+        :type deployment_name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        """
+        # the pods exist only after the replica set created them
+        await self.finished_to_create_ready_replicas(name=deployment_name,
+                                                     namespace=namespace)
+        await self.wait_for_pods_creation_thread_manager(
+            pods=await self.get_pods(name=deployment_name, namespace=namespace),
+            namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Create deployment
+        :param body: deployment's body
+        :type body: dictionary or V1Deployment
+        :param namespace: the namespace to create the deployment in if there is
+        no namespace in the yaml (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the creation is over (default value is True)
+        :type wait: bool
+        :return: deployment name
+        :rtype: str
+        """
+        # check the type of the body and that it contains name
+        # and raise exception if not
+        try:
+            if isinstance(body, V1Deployment):
+                deployment_name = body.metadata.name
+                namespace = body.metadata.namespace or namespace
+            elif isinstance(body, dict):
+                deployment_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            else:
+                raise K8sInvalidResourceBody()
+        except (KeyError, AttributeError):
+            raise K8sInvalidResourceBody()
+
+        # create the deployment from the body
+        await self.client_app.create_namespaced_deployment(body=body,
+                                                           namespace=namespace)
+        logger.info(f"Created the deployment {deployment_name} in {namespace} "
+                    "namespace")
+        # wait to the deployment to run
+        if wait:
+            await self.wait_for_deployment_to_run(
+                deployment_name=deployment_name, namespace=namespace)
+        return deployment_name
+
+    async def wait_for_pods_to_be_deleted_thread_manager(
+            self, pods, namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the deployment's pods are deleted (with one watch of the
+        namespace)
+        :param pods: the deployment's pods
+        :type pods: list
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        """
+        await self.pod.wait_for_pods_to_be_deleted(pods=pods,
+                                                   namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def delete(self, name, namespace=DEFAULT_NAMESPACE, wait=False):
+        """
+        Delete deployment
+        :param name: deployment's name
+        :type name: str
+        :param namespace: the namespace to delete the deployment from
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        """
+        # get pods before the deleting
+        pods = await self.get_pods(name=name, namespace=namespace)
+
+        # delete the pod from the required namespace
+        await self.client_app.delete_namespaced_deployment(name=name,
+                                                           namespace=namespace)
+        logger.info(f"Deleted deployment {name} from {namespace} namespace")
+
+        # wait to the pods to be deleted
+        if wait:
+            logger.info(f"Wait to {name} to be deleted")
+            await self.wait_for_pods_to_be_deleted_thread_manager(
+                pods=pods, namespace=namespace)
+
+    async def wait_for_deployment_to_patch(self, name, pods,
+                                           namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the deployment's pods are patched
+        :param name: the name of the deployment
+        :type name: str
+        :param pods: the deployment's pods before the patch
+        :type pods: list
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        """
+        await self.wait_for_pods_to_be_deleted_thread_manager(
+            pods=pods, namespace=namespace)
+        await self.wait_for_deployment_to_run(deployment_name=name,
+                                              namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def patch(self, name, body, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Patch deployment
+        :param name: the name of the deployment
+        :type name: str
+        :param body: the diff body to patch
+        :type body: dictionary
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the patch is over
+        (default value is True)
+        :type wait: bool
+        """
+        pods = await self.get_pods(name=name, namespace=namespace)
+        await self.client_app.patch_namespaced_deployment(name=name,
+                                                          namespace=namespace,
+                                                          body=body)
+        logger.info(f"Patched deployment {name} from namespace {namespace}")
+        if wait:
+            await self.wait_for_deployment_to_patch(name=name, pods=pods,
+                                                    namespace=namespace)
+
+    async def wait_for_deployment_to_scale_up(self, name, pods,
+                                              namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the deployment is scaled up
+        :param name: the name of the deployment
+        :type name: str
+        :param pods: the deployment's pods before the scale
+        :type pods: list
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        """
+        await self.finished_to_create_ready_replicas(name=name,
+                                                     namespace=namespace)
+        uids = {pod.metadata.uid for pod in pods}
+        new_pods = [pod for pod in
+                    await self.get_pods(name=name, namespace=namespace)
+                    if pod.metadata.uid not in uids]
+        await self.wait_for_pods_creation_thread_manager(pods=new_pods,
+                                                         namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def wait_for_deployment_to_scale_down(self, name, new_size,
+                                                namespace=DEFAULT_NAMESPACE):
+        """
+        Wait until the deployment is scaled down
+        :param name: the name of the deployment
+        :type name: str
+        :param new_size: the new amount of replicas
+        :type new_size: int
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        """
+
+        def scaled_down(event_type, deployment_dict):
+            return event_type != "DELETED" and \
+                deployment_dict.get("status", {}).get("replicas", 0) == \
+                new_size
+
+        await wait_for_event(list_func=self.client_app.list_namespaced_deployment,
+                             condition=scaled_down,
+                             description=f"deployment {name} in {namespace} "
+                                         f"namespace to scale down to "
+                                         f"{new_size}",
+                             namespace=namespace,
+                             field_selector=f"metadata.name={name}")
+        return True
+
+    async def scale(self, name, new_size, namespace=DEFAULT_NAMESPACE,
+                    wait=True):
+        """
+        Scale deployment
+        :param name: the name of the deployment
+        :type name: str
+        :param new_size: the new number of replicas for the deployment
+        :type new_size: int
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the scale up is over
+        (default value is True)
+        :type wait: bool
+        """
+        pods = await self.get_pods(name=name, namespace=namespace)
+        body = {"spec": {"replicas": new_size}}
+        await self.patch(name=name, body=body, namespace=namespace,
+                         wait=False)
+        logger.info(f"Scaled deployment {name} from namespace {namespace}")
+        if wait:
+            if new_size > len(pods):
+                await self.wait_for_deployment_to_scale_up(
+                    name=name, pods=pods, namespace=namespace)
+            elif new_size < len(pods):
+                await self.wait_for_deployment_to_scale_down(
+                    name=name, new_size=new_size, namespace=namespace)
+
+    async def scale_down_up(self, name, namespace=DEFAULT_NAMESPACE,
+                            wait=True):
+        """
+        Scale down and up deployment
+        :param name: the name of the deployment
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the scale up is over
+        (default value is True)
+        :type wait: bool
+        """
+        replicas = (await self.get(name=name, namespace=namespace)).spec.replicas
+        await self.scale(name=name, new_size=0, namespace=namespace, wait=wait)
+        await self.scale(name=name, new_size=replicas, namespace=namespace,
+                         wait=wait)
+
+    @async_k8s_exceptions
+    async def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
+        """
+        Return deployment obj or dictionary
+        :param name: deployment name
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to return dictionary instead of obj
+        :type dict_output: bool
+        :return: the deployment obj/dictionary
+        :rtype: Union[V1Deployment,dictionary]
+        """
+        deployment = await self.client_app.read_namespaced_deployment(
+            name=name, namespace=namespace)
+        logger.info(f"Got deployment {name} from {namespace} namespace")
+        # convert the obj to dict if required
+        if dict_output:
+            deployment = convert_obj_to_dict(deployment)
+        else:
+            deployment.metadata.resource_version = ''
+        return deployment
+
+    @async_k8s_exceptions
+    async def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                   dict_output=False, field_selector="", label_selector=""):
+        """
+        Return list of deployments objects/dictionaries
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the list from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the list to specific deployments
+        :type field_selector: str
+        :param label_selector: to filter the list to deployments with specific
+        labels
+        :type label_selector: str
+        :return: list of deployments
+        :rtype: list
+        """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="deployments",
+                             label_selector=label_selector)
+        if all_namespaces:
+            deployments_list = (
+                await self.client_app.list_deployment_for_all_namespaces(
+                    **plan.api_kwargs)).items
+            logger.info("Got the deployments list from all the namespaces")
+        else:
+            deployments_list = (await self.client_app.list_namespaced_deployment(
+                namespace=namespace, **plan.api_kwargs)).items
+            logger.info(f"Got the deployments list from {namespace} namespace")
+
+        if plan.remainder:
+            deployments_list = field_filter(obj_list=deployments_list,
+                                            field_selector=plan.remainder)
+
+        # convert the list to list of dicts if required
+        if dict_output:
+            deployments_list = [convert_obj_to_dict(deployment) for deployment
+                                in deployments_list]
+        else:
+            for deployment in deployments_list:
+                deployment.metadata.resource_version = ''
+
+        return deployments_list
+
+    async def list_names(self, namespace=DEFAULT_NAMESPACE,
+                         all_namespaces=False, field_selector="",
+                         label_selector=""):
+        return [deployment.metadata.name for deployment in
+                await self.list(namespace=namespace,
+                                all_namespaces=all_namespaces,
+                                field_selector=field_selector,
+                                label_selector=label_selector)]
+
+    @async_k8s_exceptions
+    async def resolve_pods(self, deployments, namespace=DEFAULT_NAMESPACE,
+                           dict_output=False):
+        """
+        Return the pods of the deployments, the replica sets and the pods of
+        the namespace are listed once (concurrently) and matched by their
+        owners uid
+        :param deployments: the deployments objects
+        :type deployments: list
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the lists dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of each deployment by the deployment name
+        :rtype: dict
+        """
+        pods_by_deployment = {deployment.metadata.name: [] for deployment in
+                              deployments}
+        if not deployments:
+            return pods_by_deployment
+        # a single deployment lets the api server select by its labels
+        label_selector = to_label_selector(deployments[0].spec.selector) \
+            if len(deployments) == 1 else ""
+        kwargs = {"label_selector": label_selector} if label_selector else {}
+        replica_sets, pods = await asyncio.gather(
+            self.client_app.list_namespaced_replica_set(namespace=namespace,
+                                                        **kwargs),
+            self.pod.list(namespace=namespace, label_selector=label_selector))
+        deployment_names = {deployment.metadata.uid: deployment.metadata.name
+                            for deployment in deployments}
+        replica_set_owners = {}
+        for replica_set in replica_sets.items:
+            owner_uid = controller_uid(replica_set)
+            if owner_uid in deployment_names:
+                replica_set_owners[replica_set.metadata.uid] = \
+                    deployment_names[owner_uid]
+        for pod in pods:
+            deployment_name = replica_set_owners.get(controller_uid(pod))
+            if deployment_name is not None:
+                pods_by_deployment[deployment_name].append(
+                    convert_obj_to_dict(pod) if dict_output else pod)
+        return pods_by_deployment
+
+    async def get_pods(self, name, namespace=DEFAULT_NAMESPACE,
+                       dict_output=False):
+        """
+        Return the pods of the deployment
+        :param name: the name of the deployment
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of the deployment
+        :rtype: list
+        """
+        deployments = await self.list(namespace=namespace,
+                                      field_selector=f"metadata.name=={name}")
+        return (await self.resolve_pods(deployments=deployments,
+                                        namespace=namespace,
+                                        dict_output=dict_output)).get(name, [])
+
+    async def get_pods_for_many(self, names, namespace=DEFAULT_NAMESPACE,
+                                dict_output=False):
+        """
+        Return the pods of many deployments with three list requests
+        :param names: the names of the deployments
+        :type names: list
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the lists dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of each deployment by the deployment name
+        (empty list for a deployment that does not exist)
+        :rtype: dict
+        """
+        names = set(names)
+        deployments = [deployment for deployment in
+                       await self.list(namespace=namespace)
+                       if deployment.metadata.name in names]
+        pods_by_deployment = {name: [] for name in names}
+        pods_by_deployment.update(await self.resolve_pods(
+            deployments=deployments, namespace=namespace,
+            dict_output=dict_output))
+        return pods_by_deployment
+
+    async def get_all_pods(self, namespace=DEFAULT_NAMESPACE,
+                           dict_output=False):
+        """
+        Return the pods of all the deployments of the namespace
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the lists dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of each deployment by the deployment name
+        :rtype: dict
+        """
+        return await self.resolve_pods(
+            deployments=await self.list(namespace=namespace),
+            namespace=namespace, dict_output=dict_output)
+
+    @async_k8s_exceptions
+    async def events(self, name, namespace=DEFAULT_NAMESPACE,
+                     only_messages=False):
+        """
+        Return the list of the events of a specific deployment
+        :param name: the name of the deployment
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param only_messages: to get only the events messages instead of
+        getting all the objects
+        :return: the list of the events
+        :rtype: list
+        """
+        deployment_uid = (await self.get(name=name,
+                                         namespace=namespace)).metadata.uid
+        events = (await self.pod.client_core.list_namespaced_event(
+            namespace=namespace,
+            field_selector=f"involvedObject.uid=={deployment_uid}")).items
+        logger.info(f"Got the events of deployment {name} from namespace "
+                    f"{namespace}")
+        if only_messages:
+            events = [event.message for event in events if
+                      event.message is not None]
+        return events
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,104 @@
+import asyncio
+
+import yaml
+from kubernetes_asyncio import client, config
+
+from k8s_client.aio.pod import AsyncPodClient
+from k8s_client.aio.node import AsyncNodeClient
+from k8s_client.aio.secret import AsyncSecretClient
+from k8s_client.aio.service import AsyncServiceClient
+from k8s_client.aio.namespace import AsyncNamespaceClient
+from k8s_client.aio.daemonset import AsyncDaemonSetClient
+from k8s_client.aio.deployment import AsyncDeploymentClient
+from k8s_client.utils import split_to_apply_tiers
+from k8s_client.consts import DEFAULT_MAX_CONNECTIONS, KUBECONFIG_PATH
+
+
+class AsyncK8sClient(object):
+    """
+    The asyncio version of K8sClient, all the clients share one api client
+    (one aiohttp connection pool) and run on the event loop of the caller.
+    Usage:
+        async with AsyncK8sClient() as k8s:
+            await k8s.deployment.create(body=body)
+    """
+
+    def __init__(self, kubeconfig_path=KUBECONFIG_PATH,
+                 max_connections=DEFAULT_MAX_CONNECTIONS):
+        """
+        :param kubeconfig_path: the path of the kubeconfig file
+        :type kubeconfig_path: str
+        :param max_connections: max number of open connections to the api
+        server (the concurrent requests and watches)
+        :type max_connections: int
+        """
+        self.kubeconfig_path = kubeconfig_path
+        self.max_connections = max_connections
+        self.api_client = None
+
+    async def connect(self):
+        """
+        Load the kubeconfig and create the clients of the resources
+        """
+        # Configure the client to the k8s environment
+        configuration = client.Configuration()
+        await config.load_kube_config(config_file=self.kubeconfig_path,
+                                      client_configuration=configuration)
+        configuration.assert_hostname = False
+        configuration.connection_pool_maxsize = self.max_connections
+        self.api_client = client.ApiClient(configuration=configuration)
+        client_core = client.CoreV1Api(api_client=self.api_client)
+        client_app = client.AppsV1Api(api_client=self.api_client)
+
+        # Create the instances of the resources
+        self.pod = AsyncPodClient(client_core=client_core)
+        self.deployment = AsyncDeploymentClient(client_app=client_app,
+                                                pod=self.pod)
+        self.daemon_set = AsyncDaemonSetClient(client_app=client_app,
+                                               deployment=self.deployment,
+                                               pod=self.pod)
+        self.namespace = AsyncNamespaceClient(client_core=client_core)
+        self.node = AsyncNodeClient(client_core=client_core)
+        self.secret = AsyncSecretClient(client_core=client_core)
+        self.service = AsyncServiceClient(client_core=client_core)
+        return self
+
+    async def close(self):
+        """
+        Close the connections of the client
+        """
+        if self.api_client is not None:
+            await self.api_client.close()
+            self.api_client = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def create_from_yaml(self, yaml_path, wait=True):
+        """
+        Create the resources of a yaml file.
+        The resources are created tier after tier by the order of their kinds
+        (APPLY_ORDER), the resources of a tier are created and waited for
+        together.
+        :param yaml_path: the path of the yaml file
+        :type yaml_path: str
+        :param wait: to wait until each tier is created before creating the
+        next one (default value is True)
+        :type wait: bool
+        """
+        with open(yaml_path, "r") as f:
+            resources = list(yaml.safe_load_all(f.read()))
+        clients = {"Pod": self.pod, "Deployment": self.deployment,
+                   "DaemonSet": self.daemon_set, "Namespace": self.namespace,
+                   "Secret": self.secret, "Service": self.service}
+        for tier in split_to_apply_tiers(resources=resources,
+                                         supported_kinds=clients):
+            await asyncio.gather(*(clients[resource["kind"]].create(
+                body=resource, wait=wait) for resource in tier))
+
+
+if __name__ == "__main__":
+    pass
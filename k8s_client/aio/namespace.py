@@ -0,0 +1,169 @@
+import logging
+
+from kubernetes_asyncio.client import V1Namespace
+
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.aio.watchers import wait_for_event, wait_for_deletion
+from k8s_client.consts import WAIT_TIMEOUT
+from k8s_client.utils import convert_obj_to_dict, field_filter
+from k8s_client.selectors import plan_selector
+from k8s_client.exceptions import K8sInvalidResourceBody
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNamespaceClient(object):
+    def __init__(self, client_core):
+        self.client_core = client_core
+
+    @async_k8s_exceptions
+    async def wait_for_namespace_deletion(self, namespace_name, timeout=None):
+        """
+        Wait until the namespace is deleted
+        :param namespace_name: the name of the namespace
+        :type namespace_name: str
+        :param timeout: wait until time exceed
+        :type timeout: int
+        """
+        return await wait_for_deletion(
+            list_func=self.client_core.list_namespace, name=namespace_name,
+            timeout=timeout or WAIT_TIMEOUT,
+            description=f"namespace {namespace_name} to be deleted")
+
+    @async_k8s_exceptions
+    async def wait_for_namespace_creation(self, namespace_name, timeout=None):
+        """
+        Wait to namespace creation
+        :param namespace_name: the name of the namespace to wait for
+        :type namespace_name: str
+        :param timeout: wait until time exceed
+        :type timeout: int
+        """
+        await wait_for_event(
+            list_func=self.client_core.list_namespace,
+            condition=lambda event_type, _: event_type != "DELETED",
+            timeout=timeout or WAIT_TIMEOUT,
+            description=f"namespace {namespace_name} to be created",
+            field_selector=f"metadata.name={namespace_name}")
+        return True
+
+    @async_k8s_exceptions
+    async def create(self, body, wait=True, timeout=None):
+        """
+        Create namespace
+        :param body: namespace's body
+        :type body: dictionary or V1Namespace
+        :param wait: to wait until the creation is over (default value is True)
+        :type wait: bool
+        :param timeout: time to wait for creation on namespace,
+        this arg is passed to wait method
+        :type: int
+        :return namespace_name: namespace's name to create.
+        :rtype: str
+        """
+        try:
+            if isinstance(body, V1Namespace):
+                namespace_name = body.metadata.name
+            elif isinstance(body, dict):
+                namespace_name = body["metadata"]["name"]
+            else:
+                raise K8sInvalidResourceBody()
+        except (KeyError, AttributeError):
+            raise K8sInvalidResourceBody()
+        # create the namespace from the body
+        await self.client_core.create_namespace(body=body)
+        if wait:
+            # wait to namespace creation
+            await self.wait_for_namespace_creation(
+                namespace_name=namespace_name, timeout=timeout)
+
+        logger.info(f"Created the namespace {namespace_name}")
+
+        return namespace_name
+
+    @async_k8s_exceptions
+    async def delete(self, name, wait=False, timeout=None):
+        """
+        Delete namespace
+        :param name: namespace's name
+        :type name: str
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        :param timeout: time to wait for the deletion of the namespace
+        :type: int
+        """
+        # delete the namespace
+        await self.client_core.delete_namespace(name=name)
+        logger.info(f"Deleted {name} namespace")
+
+        # wait to the namespace to be deleted
+        if wait:
+            await self.wait_for_namespace_deletion(namespace_name=name,
+                                                   timeout=timeout)
+
+    @async_k8s_exceptions
+    async def get(self, name, dict_output=False):
+        """
+        Return namespace obj or dictionary
+        :param name: namespace name
+        :type name: str
+        :param dict_output: to return dictionary instead of obj
+        :type dict_output: bool
+        :return: the namespace obj/dictionary
+        :rtype: Union[V1Namespace,dictionary]
+        """
+        namespace = await self.client_core.read_namespace(name=name)
+        logger.info(f"Got namespace {name}")
+
+        # convert the obj to dict if required
+        if dict_output:
+            namespace = convert_obj_to_dict(namespace)
+        else:
+            namespace.metadata.resource_version = ''
+
+        return namespace
+
+    @async_k8s_exceptions
+    async def list(self, dict_output=False, field_selector="",
+                   label_selector=""):
+        """
+        Return list of namespaces objects/dictionaries
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the list to specific namespaces
+        :type field_selector: str
+        :param label_selector: to filter the list to namespaces with specific
+        labels
+        :type label_selector: str
+        :return: list of namespaces
+        :rtype: list
+        """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="namespaces",
+                             label_selector=label_selector)
+        namespaces_list = (await self.client_core.list_namespace(
+            **plan.api_kwargs)).items
+        logger.info("Got namespaces")
+
+        if plan.remainder:
+            namespaces_list = field_filter(obj_list=namespaces_list,
+                                           field_selector=plan.remainder)
+        # convert the list to list of dicts if required
+        if dict_output:
+            namespaces_list = [convert_obj_to_dict(namespace) for namespace in
+                               namespaces_list]
+        else:
+            for namespace in namespaces_list:
+                namespace.metadata.resource_version = ''
+        return namespaces_list
+
+    async def list_names(self, field_selector="", label_selector=""):
+        return [namespace.metadata.name for namespace in
+                await self.list(field_selector=field_selector,
+                                label_selector=label_selector)]
+
+
+if __name__ == "__main__":
+    pass
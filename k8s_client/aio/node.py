@@ -0,0 +1,157 @@
+import asyncio
+import logging
+
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.consts import KEY_PATH
+from k8s_client.exceptions import K8sException, K8sNotFoundException
+from k8s_client.node import NodeClient
+from k8s_client.utils import convert_obj_to_dict, field_filter
+from k8s_client.selectors import plan_selector
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNodeClient(object):
+    def __init__(self, client_core):
+        self.client_core = client_core
+
+    async def execute(self, name, command):
+        """
+        Execute command on node (the ssh session runs in a thread of the
+        default executor)
+        :param name: the name of the node
+        :type name: str
+        :param command: the command to run on the node
+        :type command: str
+        :return: the response
+        :rtype: str
+        """
+        external_ip = await self.get_external_ip(name=name)
+        if external_ip is None:
+            raise K8sException(message=f"Could not find an external ip of "
+                                       f"node {name}")
+        if KEY_PATH is not None:
+            output = await asyncio.get_running_loop().run_in_executor(
+                None, NodeClient.ssh_execute, external_ip, command)
+            logger.info(f"Executed command {command} on node {name}")
+            return output
+
+    async def get(self, name, dict_output=False):
+        """
+        Return node obj or dictionary
+        :param name: node name
+        :type name: str
+        :param dict_output: to return dictionary instead of obj
+        :type dict_output: bool
+        :return: the node obj/dictionary
+        :rtype: Union[V1Node,dictionary]
+        """
+        nodes_list = await self.list(dict_output=dict_output,
+                                     field_selector=f"metadata.name=={name}")
+        if not nodes_list:
+            raise K8sNotFoundException(message=f"Could not find node {name}")
+        logger.info(f"Got node {name}")
+        return nodes_list[0]
+
+    async def get_address(self, name, kind):
+        node = await self.get(name=name, dict_output=True)
+        addresses = node.get("status", {}).get("addresses", [])
+        return next((address.get("address") for address in addresses
+                     if address.get("type") == kind), None)
+
+    async def get_internal_ip(self, name):
+        logger.info(f"Get the internal ip of node {name}")
+        return await self.get_address(name=name, kind="InternalIP")
+
+    async def get_external_ip(self, name):
+        logger.info(f"Get the external ip of node {name}")
+        return await self.get_address(name=name, kind="ExternalIP")
+
+    @async_k8s_exceptions
+    async def list(self, dict_output=False, field_selector="",
+                   label_selector=""):
+        """
+        Return list of nodes objects/dictionaries
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the list to specific nodes
+        :type field_selector: str
+        :param label_selector: to filter the list to nodes with specific labels
+        :type label_selector: str
+        :return: list of nodes
+        :rtype: list
+        """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="nodes",
+                             label_selector=label_selector)
+        nodes_list = (await self.client_core.list_node(
+            **plan.api_kwargs)).items
+        logger.info("Got nodes")
+
+        if plan.remainder:
+            nodes_list = field_filter(obj_list=nodes_list,
+                                      field_selector=plan.remainder)
+
+        # convert the list to list of dicts if required
+        if dict_output:
+            nodes_list = [convert_obj_to_dict(node) for node in nodes_list]
+        else:
+            for node in nodes_list:
+                node.metadata.resource_version = ''
+
+        return nodes_list
+
+    async def list_names(self, field_selector="", label_selector=""):
+        return [node.metadata.name
+                for node in await self.list(field_selector=field_selector,
+                                            label_selector=label_selector)]
+
+    @async_k8s_exceptions
+    async def events(self, name, only_messages=False):
+        """
+        Return the list of the events of a specific node
+        :param name: the name of the node
+        :type name: str
+        :param only_messages: to get only the events messages instead of
+        getting all the objects
+        :return: the list of the events
+        :rtype: list
+        """
+        node_id = (await self.get(name=name)).metadata.uid
+        events = (await self.client_core.list_event_for_all_namespaces(
+            field_selector=f"involvedObject.uid=={node_id}")).items
+        logger.info(f"Got the events of node {name}")
+        if only_messages:
+            events = [event.message for event in events
+                      if event.message is not None]
+        return events
+
+    @async_k8s_exceptions
+    async def patch(self, name, body):
+        """
+        Patch node
+        :param name: the name of the node
+        :type name: str
+        :param body: the diff body to patch
+        :type body: dictionary
+        """
+        logger.info(f"Patch node {name}")
+        await self.client_core.patch_node(name=name, body=body)
+
+    async def add_label(self, name, label):
+        """
+        Add label to a specific node
+        :param name: the node name
+        :type name: str
+        :param label: the label to add to the node
+        :type label: str
+        """
+        logger.info(f"Add label {label} to node {name}")
+        label_key, label_val = label.split("=", 1)
+        await self.patch(name=name,
+                         body={"metadata": {"labels": {label_key: label_val}}})
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,432 @@
+import logging
+
+from kubernetes_asyncio.client import CoreV1Api, V1Pod
+from kubernetes_asyncio.stream import WsApiClient
+
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.aio.watchers import (wait_for_event, wait_for_objects,
+                                     wait_for_deletion)
+from k8s_client.pod import PodClient
+from k8s_client.utils import convert_obj_to_dict, field_filter
+from k8s_client.selectors import plan_selector
+from k8s_client.exceptions import (K8sInvalidResourceBody, K8sAuthenticationException,
+                                   K8sPullingException, K8sNotFoundException)
+from k8s_client.consts import (DEFAULT_NAMESPACE, AUTHENTICATION_EXCEPTION,
+                               PULLING_EXCEPTION, CREATED_SUCCESSFULLY,
+                               PULLING_FAIL, WAIT_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPodClient(object):
+    def __init__(self, client_core):
+        self.client_core = client_core
+
+    @async_k8s_exceptions
+    async def is_containers_started(self, pod_id, containers_counter,
+                                    namespace=DEFAULT_NAMESPACE):
+        """
+        Check if the all containers started
+        :param pod_id: the id of the pod
+        :type pod_id: str
+        :param containers_counter: the number of the containers that have to
+        start
+        :type containers_counter: int
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :return: True/False
+        :rtype: bool
+        """
+        events_list = await self.client_core.list_namespaced_event(
+            namespace=namespace, field_selector=f"involvedObject.uid=={pod_id}")
+        for event in events_list.items:
+            if AUTHENTICATION_EXCEPTION in event.message:
+                raise K8sAuthenticationException(message=event.message)
+            if PULLING_EXCEPTION in event.message or PULLING_FAIL in event.message:
+                raise K8sPullingException(message=event.message)
+            if CREATED_SUCCESSFULLY in event.message:
+                containers_counter -= 1
+        return not containers_counter
+
+    @async_k8s_exceptions
+    async def wait_for_containers_to_run(self, pod_name, pod_id,
+                                         containers_counter,
+                                         namespace=DEFAULT_NAMESPACE,
+                                         timeout=WAIT_TIMEOUT):
+        """
+        Wait until the containers are running, by watching the pod
+        :param pod_name: the name of the pod
+        :type pod_name: str
+        :param pod_id: the id of the pod
+        :type pod_id: str
+        :param containers_counter: the number of the containers to wait for
+        (the number of the pod's containers)
+        :type containers_counter: int
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        """
+
+        def containers_running(event_type, pod_dict):
+            # skip events of an older pod with the same name
+            if pod_id and pod_dict.get("metadata", {}).get("uid") != pod_id:
+                return False
+            if event_type == "DELETED":
+                raise K8sNotFoundException(
+                    message=f"Pod {pod_name} was deleted while waiting for "
+                            f"its containers to run")
+            return PodClient.are_containers_running(
+                pod_dict=pod_dict, containers_counter=containers_counter)
+
+        await wait_for_event(list_func=self.client_core.list_namespaced_pod,
+                             condition=containers_running, timeout=timeout,
+                             description=f"the containers of pod {pod_name} "
+                                         f"in {namespace} namespace to run",
+                             namespace=namespace,
+                             field_selector=f"metadata.name={pod_name}")
+        logger.info(f"The containers of pod {pod_name} are running")
+        return True
+
+    @async_k8s_exceptions
+    async def wait_for_pods_to_run(self, pods, namespace=DEFAULT_NAMESPACE,
+                                   timeout=WAIT_TIMEOUT):
+        """
+        Wait until the containers of all the pods are running, with one watch
+        of the namespace
+        :param pods: the pods objects
+        :type pods: list
+        :param namespace: the namespace of the pods (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        """
+        containers_counters = {pod.metadata.uid: len(pod.spec.containers)
+                               for pod in pods}
+
+        def containers_running(event_type, pod_dict):
+            if event_type == "DELETED":
+                raise K8sNotFoundException(
+                    message=f"Pod {pod_dict['metadata'].get('name')} was "
+                            f"deleted while waiting for its containers to run")
+            return PodClient.are_containers_running(
+                pod_dict=pod_dict, containers_counter=containers_counters[
+                    pod_dict["metadata"]["uid"]])
+
+        await wait_for_objects(list_func=self.client_core.list_namespaced_pod,
+                               uids=containers_counters,
+                               condition=containers_running, timeout=timeout,
+                               description=f"the containers of {len(pods)} pods"
+                                           f" in {namespace} namespace to run",
+                               namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Create pod
+        :param body: pod's body
+        :type body: dictionary or V1Pod
+        :param namespace: the namespace to create the pod in if there is no
+        namespace in the yaml (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the creation is over (default value is True)
+        :type wait: bool
+        :return: pod name
+        :rtype: str
+        """
+        # check the type of the body and that it contains name
+        # and raise exception if not
+        try:
+            if isinstance(body, V1Pod):
+                pod_name = body.metadata.name
+                namespace = body.metadata.namespace or namespace
+                containers_counter = len(body.spec.containers)
+            elif isinstance(body, dict):
+                pod_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+                containers_counter = len(body["spec"]["containers"])
+            else:
+                raise K8sInvalidResourceBody()
+        except (KeyError, AttributeError):
+            raise K8sInvalidResourceBody()
+
+        # create the pod from the body
+        pod_obj = await self.client_core.create_namespaced_pod(
+            body=body, namespace=namespace)
+        logger.info(f"Created the pod {pod_name} in {namespace} namespace")
+        # wait to the containers to run
+        if wait:
+            await self.wait_for_containers_to_run(
+                pod_name=pod_name, pod_id=pod_obj.metadata.uid,
+                containers_counter=containers_counter, namespace=namespace)
+        return pod_name
+
+    @async_k8s_exceptions
+    async def wait_for_pod_to_be_deleted(self, pod_name,
+                                         namespace=DEFAULT_NAMESPACE,
+                                         timeout=WAIT_TIMEOUT):
+        """
+        Wait until the pod is deleted
+        :param pod_name: the name of the pod
+        :type pod_name: str
+        :param namespace: the namespace of the pod
+        (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        """
+        return await wait_for_deletion(
+            list_func=self.client_core.list_namespaced_pod, name=pod_name,
+            timeout=timeout, description=f"pod {pod_name} in {namespace} "
+                                         f"namespace to be deleted",
+            namespace=namespace)
+
+    @async_k8s_exceptions
+    async def wait_for_pods_to_be_deleted(self, pods,
+                                          namespace=DEFAULT_NAMESPACE,
+                                          timeout=WAIT_TIMEOUT):
+        """
+        Wait until all the pods are deleted, with one watch of the namespace
+        :param pods: the pods objects
+        :type pods: list
+        :param namespace: the namespace of the pods (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        """
+        await wait_for_objects(
+            list_func=self.client_core.list_namespaced_pod,
+            uids=[pod.metadata.uid for pod in pods],
+            condition=lambda event_type, _: event_type == "DELETED",
+            timeout=timeout,
+            description=f"{len(pods)} pods in {namespace} namespace to be "
+                        f"deleted",
+            namespace=namespace)
+        return True
+
+    @async_k8s_exceptions
+    async def delete(self, name, namespace=DEFAULT_NAMESPACE, wait=False):
+        """
+        Delete pod
+        :param name: pod's name
+        :type name: str
+        :param namespace: the namespace to delete the pod from
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        """
+        # delete the pod from the required namespace
+        await self.client_core.delete_namespaced_pod(name=name,
+                                                     namespace=namespace)
+        logger.info(f"Deleted pod {name} from {namespace} namespace")
+        # wait to the pod to be deleted
+        if wait:
+            await self.wait_for_pod_to_be_deleted(pod_name=name,
+                                                  namespace=namespace)
+
+    @async_k8s_exceptions
+    async def execute(self, name, command, command_prefix=None,
+                      namespace=DEFAULT_NAMESPACE, stderr=True, stdin=False,
+                      tty=False, container=None):
+        """
+        Execute command on pod
+        :param name: the name of the pod
+        :type name: str
+        :param command: the command to run on the pod
+        :type command: str
+        :param command_prefix: the prefix to the command
+        (default is ['sh', '-c'])
+        :type command_prefix: list
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param stderr: get the error from the response (default value is True)
+        :type stderr: bool
+        :param stdin: get the input of the response (default value is False)
+        :type stdin: bool
+        :param tty: tty to get the response (default value is False)
+        :type tty: bool
+        :param container: specific container to run the command on
+        (if there is only one it is not relevant)
+        :type container: str
+        :return: the response
+        :rtype: str
+        """
+        command_prefix = command_prefix or ['sh', '-c']
+        command = command_prefix + [command]
+        kwargs = {"container": container} if container is not None else {}
+        # exec runs over a websocket, that needs its own api client
+        async with WsApiClient(
+                configuration=self.client_core.api_client.configuration) \
+                as ws_api_client:
+            resp = await CoreV1Api(api_client=ws_api_client) \
+                .connect_get_namespaced_pod_exec(name=name,
+                                                 namespace=namespace,
+                                                 command=command, stdout=True,
+                                                 stderr=stderr, stdin=stdin,
+                                                 tty=tty, **kwargs)
+        logger.info(f"Executed {command} on pod {name} from namespace "
+                    f"{namespace}"
+                    f"{f' on container {container}' if container else ''}")
+        return resp
+
+    @async_k8s_exceptions
+    async def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
+        """
+        Return pod obj or dictionary
+        :param name: pod name
+        :type name: str
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param dict_output: to return dictionary instead of obj
+        :type dict_output: bool
+        :return: the pod obj/dictionary
+        :rtype: Union[V1Pod,dictionary]
+        """
+        pod = await self.client_core.read_namespaced_pod(name=name,
+                                                         namespace=namespace)
+        logger.info(f"Got pod {name} from {namespace} namespace")
+
+        # convert the obj to dict if required
+        if dict_output:
+            pod = convert_obj_to_dict(pod)
+        else:
+            pod.metadata.resource_version = ''
+
+        return pod
+
+    async def get_ip(self, name, namespace=DEFAULT_NAMESPACE):
+        return (await self.get(name=name, namespace=namespace)).status.pod_ip
+
+    async def get_host_internal_ip(self, name, namespace=DEFAULT_NAMESPACE):
+        return (await self.get(name=name, namespace=namespace)).status.host_ip
+
+    async def get_status(self, name, namespace=DEFAULT_NAMESPACE):
+        return (await self.get(name=name, namespace=namespace)).status.phase
+
+    async def get_uid(self, name, namespace=DEFAULT_NAMESPACE):
+        return (await self.get(name=name, namespace=namespace)).metadata.uid
+
+    async def get_name(self, uid, namespace=None):
+        return await self.list(namespace=namespace,
+                               all_namespaces=namespace is None,
+                               field_selector=f"metadata.uid=={uid}")
+
+    @async_k8s_exceptions
+    async def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                   dict_output=False, field_selector="", label_selector=""):
+        """
+        Return list of pods objects/dictionaries
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the list from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the list to specific pods
+        :type field_selector: str
+        :param label_selector: to filter the list to pods with specific labels
+        :type label_selector: str
+        :return: list of pods
+        :rtype: list
+        """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="pods",
+                             label_selector=label_selector)
+        if all_namespaces:
+            pods_list = (await self.client_core.list_pod_for_all_namespaces(
+                **plan.api_kwargs)).items
+            logger.info("Got the pods list from all the namespaces")
+        else:
+            pods_list = (await self.client_core.list_namespaced_pod(
+                namespace=namespace, **plan.api_kwargs)).items
+            logger.info(f"Got the pods list from {namespace} namespace")
+
+        if plan.remainder:
+            pods_list = field_filter(obj_list=pods_list,
+                                     field_selector=plan.remainder)
+
+        # convert the list to list of dicts if required
+        if dict_output:
+            pods_list = [convert_obj_to_dict(pod) for pod in pods_list]
+        else:
+            for pod in pods_list:
+                pod.metadata.resource_version = ''
+
+        return pods_list
+
+    async def list_names(self, namespace=DEFAULT_NAMESPACE,
+                         all_namespaces=False, field_selector="",
+                         label_selector=""):
+        return [pod.metadata.name for pod in
+                await self.list(namespace=namespace,
+                                all_namespaces=all_namespaces,
+                                field_selector=field_selector,
+                                label_selector=label_selector)]
+
+    @async_k8s_exceptions
+    async def logs(self, name, namespace=DEFAULT_NAMESPACE, container=None):
+        """
+        Return pod's logs
+        :param name: the name of the pod
+        :type name: str
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param container: specific container to get the logs from
+        (if there is only one it is not relevant)
+        :return: the pod's logs
+        :rtype: str
+        """
+        kwargs = {"container": container} if container is not None else {}
+        logs = await self.client_core.read_namespaced_pod_log(
+            name=name, namespace=namespace, **kwargs)
+        logger.info(f"Got logs of pod {name} from namespace {namespace}"
+                    f"{f' of {container}' if container else ''}")
+        return logs
+
+    @async_k8s_exceptions
+    async def events(self, name, namespace=DEFAULT_NAMESPACE,
+                     only_messages=False):
+        """
+        Return the list of the events of a specific pod
+        :param name: the name of the pod
+        :type name: str
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param only_messages: to get only the events messages instead of
+        getting all the objects
+        :return: the list of the events
+        :rtype: list
+        """
+        pod_id = await self.get_uid(name=name, namespace=namespace)
+        events = (await self.client_core.list_namespaced_event(
+            namespace=namespace,
+            field_selector=f"involvedObject.uid=={pod_id}")).items
+        logger.info(f"Got the events of pod {name} from namespace {namespace}")
+        if only_messages:
+            events = [event.message for event in events if
+                      event.message is not None]
+        return events
+
+    @async_k8s_exceptions
+    async def patch(self, name, body, namespace=DEFAULT_NAMESPACE):
+        """
+        Patch pod
+        :param name: the name of the pod
+        :type name: str
+        :param body: the diff body to patch
+        :type body: dictionary
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        """
+        await self.client_core.patch_namespaced_pod(name=name,
+                                                    namespace=namespace,
+                                                    body=body)
+        logger.info(f"Patched pod {name} from namespace {namespace}")
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,268 @@
+import logging
+
+from kubernetes_asyncio.client import V1Service
+
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.aio.watchers import wait_for_event, wait_for_deletion
+from k8s_client.consts import DEFAULT_NAMESPACE, WAIT_TIMEOUT
+from k8s_client.utils import convert_obj_to_dict, field_filter
+from k8s_client.selectors import plan_selector
+from k8s_client.exceptions import K8sInvalidResourceBody, K8sException
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncServiceClient(object):
+    def __init__(self, client_core):
+        self.client_core = client_core
+
+    @async_k8s_exceptions
+    async def wait_to_service_creation(self, service_name, namespace,
+                                       timeout=WAIT_TIMEOUT):
+        """
+        Wait to service creation (and to the ingress of a load balancer)
+        :param service_name: the name of the service to wait for
+        :type service_name: str
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        """
+
+        def service_ready(event_type, service_dict):
+            if event_type == "DELETED":
+                return False
+            if service_dict.get("spec", {}).get("type") != "LoadBalancer":
+                return True
+            return bool(service_dict.get("status", {}).get(
+                "loadBalancer", {}).get("ingress"))
+
+        await wait_for_event(list_func=self.client_core.list_namespaced_service,
+                             condition=service_ready, timeout=timeout,
+                             description=f"service {service_name} in "
+                                         f"{namespace} namespace",
+                             namespace=namespace,
+                             field_selector=f"metadata.name={service_name}")
+        return True
+
+    @async_k8s_exceptions
+    async def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Create service
+        :param body: service's body
+        :type body: dictionary or V1Service
+        :param namespace: the namespace to create the service in if there is no
+        namespace in the yaml (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the creation is over (default value is True)
+        :type wait: bool
+        :return: service name
+        :rtype: str
+        """
+        try:
+            if isinstance(body, V1Service):
+                service_name = body.metadata.name
+                namespace = body.metadata.namespace or namespace
+            elif isinstance(body, dict):
+                service_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            else:
+                raise K8sInvalidResourceBody()
+        except (KeyError, AttributeError):
+            raise K8sInvalidResourceBody()
+
+        # create the service from the body
+        await self.client_core.create_namespaced_service(namespace=namespace,
+                                                         body=body)
+        logger.info(f"Created the service {service_name} in namespace "
+                    f"{namespace}")
+        # wait to service creation
+        if wait:
+            await self.wait_to_service_creation(service_name=service_name,
+                                                namespace=namespace)
+        return service_name
+
+    @async_k8s_exceptions
+    async def wait_to_service_deletion(self, service_name, namespace):
+        """
+        Wait until the service is deleted
+        :param service_name: the name of the service
+        :type service_name: str
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        """
+        return await wait_for_deletion(
+            list_func=self.client_core.list_namespaced_service,
+            name=service_name, description=f"service {service_name} in "
+                                           f"{namespace} namespace to be "
+                                           f"deleted",
+            namespace=namespace)
+
+    @async_k8s_exceptions
+    async def delete(self, name, namespace=DEFAULT_NAMESPACE, wait=True):
+        """
+        Delete service
+        :param name: service's name
+        :type name: str
+        :param namespace: the namespace to delete the service from
+        (default value is 'default')
+        :type namespace: str
+        :param wait: to wait until the deletion is over
+        (default value is True)
+        :type wait: bool
+        """
+        # delete the service
+        await self.client_core.delete_namespaced_service(name=name,
+                                                         namespace=namespace)
+        logger.info(f"Deleted {name} service from namespace {namespace}")
+        # wait to the service to be deleted
+        if wait:
+            await self.wait_to_service_deletion(service_name=name,
+                                                namespace=namespace)
+
+    @async_k8s_exceptions
+    async def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
+        """
+        Return service obj or dictionary
+        :param name: service name
+        :type name: str
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to return dictionary instead of obj
+        :type dict_output: bool
+        :return: the service obj/dictionary
+        :rtype: Union[V1Service,dictionary]
+        """
+        service = await self.client_core.read_namespaced_service(
+            name=name, namespace=namespace)
+        logger.info(f"Got {name} service from namespace {namespace}")
+
+        # convert the obj to dict if required
+        if dict_output:
+            service = convert_obj_to_dict(service)
+        else:
+            service.metadata.resource_version = ''
+
+        return service
+
+    async def get_ports(self, name, namespace):
+        return (await self.get(name=name, namespace=namespace)).spec.ports
+
+    async def get_cluster_ip(self, name, namespace):
+        return (await self.get(name=name, namespace=namespace)).spec.cluster_ip
+
+    async def get_external_ip(self, name, namespace):
+        service = await self.get(name=name, namespace=namespace)
+        if service.spec.type == "LoadBalancer":
+            try:
+                return service.status.load_balancer.ingress[0].ip
+            except (IndexError, AttributeError, TypeError):
+                raise K8sException(message="Could not find the external ip")
+        else:
+            raise K8sException(message="Only service from type load balancer"
+                                       " has external ip")
+
+    @async_k8s_exceptions
+    async def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                   dict_output=False, field_selector="", label_selector=""):
+        """
+        Return list of services objects/dictionaries
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the list from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get the elements of the list dictionaries
+        instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the list to specific services
+        :type field_selector: str
+        :param label_selector: to filter the list to services with specific
+        labels
+        :type label_selector: str
+        :return: list of services
+        :rtype: list
+        """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="services",
+                             label_selector=label_selector)
+        if all_namespaces:
+            services_list = (
+                await self.client_core.list_service_for_all_namespaces(
+                    **plan.api_kwargs)).items
+            logger.info("Got services list from all the namespaces")
+        else:
+            services_list = (await self.client_core.list_namespaced_service(
+                namespace=namespace, **plan.api_kwargs)).items
+            logger.info(f"Got services list from namespace {namespace}")
+        if plan.remainder:
+            services_list = field_filter(obj_list=services_list,
+                                         field_selector=plan.remainder)
+        # convert the list to list of dicts if required
+        if dict_output:
+            services_list = [convert_obj_to_dict(service) for service in
+                             services_list]
+        else:
+            for service in services_list:
+                service.metadata.resource_version = ''
+        return services_list
+
+    async def list_names(self, namespace=DEFAULT_NAMESPACE,
+                         all_namespaces=False, field_selector="",
+                         label_selector=""):
+        return [service.metadata.name for service in
+                await self.list(namespace=namespace,
+                                all_namespaces=all_namespaces,
+                                field_selector=field_selector,
+                                label_selector=label_selector)]
+
+    @async_k8s_exceptions
+    async def events(self, name, namespace=DEFAULT_NAMESPACE,
+                     only_messages=False):
+        """
+        Return the list of the events of a specific service
+        :param name: the name of the service
+        :type name: str
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        :param only_messages: to get only the events messages instead of
+        getting all the objects
+        :return: the list of the events
+        :rtype: list
+        """
+        service_id = (await self.get(name=name,
+                                     namespace=namespace)).metadata.uid
+        events = (await self.client_core.list_namespaced_event(
+            namespace=namespace,
+            field_selector=f"involvedObject.uid=={service_id}")).items
+        logger.info(f"Got the events of service {name} from namespace "
+                    f"{namespace}")
+        if only_messages:
+            events = [event.message for event in events if
+                      event.message is not None]
+        return events
+
+    @async_k8s_exceptions
+    async def patch(self, name, body, namespace=DEFAULT_NAMESPACE):
+        """
+        Patch service
+        :param name: the name of the service
+        :type name: str
+        :param body: the diff body to patch
+        :type body: dictionary
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        """
+        await self.client_core.patch_namespaced_service(name=name,
+                                                        namespace=namespace,
+                                                        body=body)
+        logger.info(f"Patched service {name} from namespace {namespace}")
+
+
+if __name__ == "__main__":
+    pass
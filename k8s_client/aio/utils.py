@@ -0,0 +1,25 @@
+import functools
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from k8s_client.utils import raise_k8s_exception
+
+
+def async_k8s_exceptions(func):
+    """
+    wrapper for k8s api exception of coroutine functions, it catches
+    ApiException and raises K8sException based on the reason in the API.
+    """
+
+    @functools.wraps(func)
+    async def exception_wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except ApiException as e:
+            raise_k8s_exception(func=func, api_exception=e)
+
+    return exception_wrapper
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,176 @@
+import json
+import logging
+from time import monotonic
+
+from kubernetes_asyncio.client.rest import ApiException
+from kubernetes_asyncio.watch import Watch
+
+from k8s_client.consts import WAIT_TIMEOUT
+from k8s_client.exceptions import K8sResourceTimeout
+from k8s_client.watchers import HTTP_GONE
+
+logger = logging.getLogger(__name__)
+
+
+async def wait_for_event(list_func, condition, timeout=WAIT_TIMEOUT,
+                         resource_version=None, description=None,
+                         relist=None, **list_kwargs):
+    """
+    Watch resources until the condition is met on one of the events, the
+    asyncio version of watchers.wait_for_event
+    :param list_func: the api coroutine function that lists the resources
+    (e.g. CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param condition: function of the event type and the raw object (the
+    camelCase dictionary of the api) that returns True when the wait is over,
+    it may raise to stop waiting with an error
+    :type condition: function
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param resource_version: watch the changes after this resourceVersion
+    (default is the current state followed by the changes)
+    :type resource_version: str
+    :param description: what is waited for, for the timeout message
+    :type description: str
+    :param relist: coroutine function that is called when the
+    resourceVersion is gone, it reads the current state of the resources and
+    returns its resourceVersion to watch from, or None when the wait is over
+    :type relist: function
+    :param list_kwargs: the arguments of the list function
+    (e.g. namespace, field_selector)
+    :return: the raw object of the event that met the condition (None when
+    the wait ended on a relist)
+    :rtype: dict
+    """
+    description = description or f"{list_func.__name__} {list_kwargs}"
+    deadline = monotonic() + timeout
+    remaining = timeout
+    gone = False
+    while remaining > 0:
+        if gone and relist is not None:
+            resource_version = await relist()
+            if resource_version is None:
+                return None
+        gone = False
+        kwargs = dict(list_kwargs, timeout_seconds=max(int(remaining), 1))
+        if resource_version:
+            kwargs["resource_version"] = resource_version
+        try:
+            async with Watch() as watcher:
+                async for event in watcher.stream(list_func, **kwargs):
+                    raw_object = event["raw_object"]
+                    resource_version = raw_object.get("metadata", {}).get(
+                        "resourceVersion", resource_version)
+                    if condition(event["type"], raw_object):
+                        watcher.stop()
+                        return raw_object
+        except ApiException as e:
+            if e.status != HTTP_GONE:
+                raise
+            logger.debug(f"Resource version {resource_version} is gone, "
+                         f"watching {description} from the current state")
+            resource_version = None
+            gone = True
+        remaining = deadline - monotonic()
+    logger.error(f"Timeout! Waited {timeout} seconds for {description}")
+    raise K8sResourceTimeout(
+        message=f"Timeout! Waited {timeout} seconds for {description}")
+
+
+async def wait_for_objects(list_func, uids, condition, timeout=WAIT_TIMEOUT,
+                           description=None, **list_kwargs):
+    """
+    Wait until the condition is met for each of the objects, with one list
+    and one watch of all of them
+    :param list_func: the api coroutine function that lists the objects
+    :type list_func: function
+    :param uids: the uids of the objects to wait for
+    :type uids: list
+    :param condition: function of the event type and the raw object that
+    returns True when the wait for the object is over, an object that is not
+    in the list gets a 'DELETED' event with only its uid
+    :type condition: function
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param description: what is waited for, for the timeout message
+    :type description: str
+    :param list_kwargs: the arguments of the list function
+    """
+    deadline = monotonic() + timeout
+    waiting = set(uids)
+
+    async def relist():
+        # the objects that are not in the list were deleted
+        response = await list_func(_preload_content=False, **list_kwargs)
+        try:
+            object_list = json.loads(await response.read())
+        finally:
+            response.release()
+        listed = set()
+        for raw_object in object_list.get("items") or []:
+            uid = raw_object["metadata"]["uid"]
+            listed.add(uid)
+            if uid in waiting and condition("ADDED", raw_object):
+                waiting.discard(uid)
+        for uid in waiting - listed:
+            if condition("DELETED", {"metadata": {"uid": uid}}):
+                waiting.discard(uid)
+        return object_list["metadata"].get("resourceVersion") \
+            if waiting else None
+
+    resource_version = await relist()
+    if not waiting:
+        return
+
+    def all_done(event_type, raw_object):
+        uid = raw_object.get("metadata", {}).get("uid")
+        if uid in waiting and condition(event_type, raw_object):
+            waiting.discard(uid)
+        return not waiting
+
+    await wait_for_event(
+        list_func=list_func, condition=all_done,
+        timeout=max(deadline - monotonic(), 1),
+        resource_version=resource_version,
+        description=description or f"{len(waiting)} objects of "
+                                   f"{list_func.__name__}",
+        relist=relist, **list_kwargs)
+
+
+async def wait_for_deletion(list_func, name, timeout=WAIT_TIMEOUT,
+                            description=None, **list_kwargs):
+    """
+    Wait until the object is deleted, watching from the list that shows it
+    still exists
+    :param list_func: the api coroutine function that lists the objects
+    :type list_func: function
+    :param name: the name of the object
+    :type name: str
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param description: what is waited for, for the timeout message
+    :type description: str
+    :param list_kwargs: the arguments of the list function (e.g. namespace)
+    """
+    field_selector = f"metadata.name={name}"
+
+    async def relist():
+        object_list = await list_func(field_selector=field_selector,
+                                      **list_kwargs)
+        return object_list.metadata.resource_version \
+            if object_list.items else None
+
+    resource_version = await relist()
+    if resource_version is None:
+        return True
+    await wait_for_event(
+        list_func=list_func,
+        condition=lambda event_type, _: event_type == "DELETED",
+        timeout=timeout, resource_version=resource_version,
+        description=description or f"{name} to be deleted",
+        relist=relist, field_selector=field_selector, **list_kwargs)
+    return True
+
+
+if __name__ == "__main__":
+    pass
@@ -8,9 +8,50 @@ ERROR_STATE = "Error"
 AUTHENTICATION_EXCEPTION = "unauthorized"
 PULLING_EXCEPTION = "pull access denied"
 PULLING_FAIL = "Failed to pull"
+PULLING_REASONS = ("ErrImagePull", "ImagePullBackOff")
 CREATED_SUCCESSFULLY = "Started container"
 REPLICAS_THRESHOLD = 1
 DEFAULT_MAX_THREADS = 20
+DEFAULT_MAX_CONNECTIONS = 100
+EXTRA_CONNECTIONS = 10
+KEEP_ALIVE_IDLE = 30
+KEEP_ALIVE_INTERVAL = 10
+KEEP_ALIVE_COUNT = 6
+INFORMER_WATCH_TIMEOUT = 300
+INFORMER_RETRY_INTERVAL = 1
+SELECTOR_CACHE_SIZE = 256
+KEY_CACHE_SIZE = 4096
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_PAGE_SIZE = 500
+# The order create_from_yaml creates the kinds in, tier after tier
+APPLY_ORDER = (("Namespace",), ("Secret", "ConfigMap"), ("Service",),
+               ("Deployment", "DaemonSet"), ("Pod",))
 KEY_PATH = os.environ.get("KEY_PATH")
 KUBECONFIG_PATH = os.environ.get("KUBECONFIG_PATH", "~/.kube/config")
-USER_NAME = os.environ.get("USER_NAME", "")
\ No newline at end of file
+USER_NAME = os.environ.get("USER_NAME", "")
+SSH_PORT = 22
+SSH_TIMEOUT = 10
+SSH_IDLE_TIMEOUT = 300
+SSH_MAX_SESSIONS = 10
+NODE_ADDRESSES_TTL = 60
+EXEC_UPDATE_INTERVAL = 1
+LOG_CHUNK_SIZE = 64 * 1024
+LOG_BUFFER_LINES = 1000
+LOG_MERGE_DELAY = 1
+LOG_REFRESH_INTERVAL = 5
+DELETE_PROPAGATION_POLICY = "Foreground"
+ACTIVE_PHASE = "Active"
+# The default max seconds to wait for a rollout (the default
+# progressDeadlineSeconds of a deployment)
+ROLLOUT_TIMEOUT = 600
+PROGRESS_DEADLINE_EXCEEDED = "ProgressDeadlineExceeded"
+# The server side timeout of the watches of the pods that report the progress
+# of a rollout by node, they end at most this many seconds after the rollout
+ROLLOUT_PODS_WATCH_TIMEOUT = 5
+# The upper bounds (seconds) of the buckets of the latency histograms
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5,
+                           5, 10, 30, 60, 300)
+METRICS_SNAPSHOTS = 100
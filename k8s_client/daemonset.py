@@ -1,20 +1,37 @@
 import logging
+import threading
 
-from kubernetes.client import V1DaemonSet
+from kubernetes import client
 
-from k8s_client.consts import DEFAULT_NAMESPACE, DEFAULT_MAX_THREADS
+from k8s_client.consts import (DEFAULT_NAMESPACE, DEFAULT_MAX_THREADS, DEFAULT_PAGE_SIZE,
+                               DELETE_PROPAGATION_POLICY, ROLLOUT_TIMEOUT,
+                               WAIT_TIMEOUT)
 from k8s_client.exceptions import K8sInvalidResourceBody
-from k8s_client.utils import k8s_exceptions, convert_obj_to_dict, field_filter
+from k8s_client.utils import (k8s_exceptions, convert_obj_to_dict, field_filter,
+                              iter_pages, iter_objects, read_raw,
+                              read_raw_object, read_raw_list,
+                              delete_collection)
+from k8s_client.informer import list_events
+from k8s_client.logs import merge_pod_logs
+from k8s_client.metrics import METRICS
+from k8s_client.rollout import (daemon_set_rollout_status, follow_pods,
+                                track_rollout)
+from k8s_client.selectors import plan_selector, to_label_selector
 
 logger = logging.getLogger(__name__)
 
 
 class DaemonSetClient(object):
 
-    def __init__(self, client_app, pod, deployment):
+    def __init__(self, client_app, pod, deployment, cache=None, pool=None,
+                 event_cache=None, metrics=METRICS):
         self.client_app = client_app
+        self.metrics = metrics
         self.pod = pod
         self.deployment = deployment
+        self.cache = cache
+        self.event_cache = event_cache
+        self.pool = pool or deployment.pool
 
     def finished_to_create_ready_replicas(self, name, namespace):
         """
@@ -31,27 +48,75 @@ class DaemonSetClient(object):
         return (
                 daemon_set.status.desired_number_scheduled == daemon_set.status.current_number_scheduled)
 
+    @k8s_exceptions
+    def wait_for_rollout(self, name, namespace=DEFAULT_NAMESPACE,
+                         timeout=ROLLOUT_TIMEOUT, on_progress=None,
+                         on_node_progress=None):
+        """
+        Wait until the rollout of the daemon set is complete: the daemon set
+        controller observed its current generation and the pods of all the
+        nodes are updated, ready and available.
+        Only the daemon set is watched (one stream whatever the number of the
+        nodes), the pods are watched (with one more stream) only to report the
+        progress by node.
+        :param name: the name of the daemon set
+        :type name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait
+        (default value is ROLLOUT_TIMEOUT)
+        :type timeout: int
+        :param on_progress: function that is called with the daemon set
+        dictionary on each change until the rollout is complete
+        :type on_progress: function
+        :param on_node_progress: function that is called with the node name
+        and the pod dictionary on each change of the pods of the daemon set
+        until the rollout is complete
+        :type on_node_progress: function
+        """
+        stopped = threading.Event()
+        if on_node_progress is not None:
+            # the selector as the api has it (the label keys are not
+            # converted)
+            daemon_set = read_raw(self.client_app.read_namespaced_daemon_set,
+                                  name=name, namespace=namespace)
+            threading.Thread(
+                target=follow_pods, daemon=True,
+                name=f"rollout-pods-{name}",
+                kwargs={"list_func": self.pod.client_core.list_namespaced_pod,
+                        "namespace": namespace,
+                        "label_selector": to_label_selector(
+                            daemon_set["spec"].get("selector")),
+                        "owner_uid": daemon_set["metadata"]["uid"],
+                        "on_pod": on_node_progress,
+                        "stopped": stopped}).start()
+        try:
+            track_rollout(list_func=self.client_app.list_namespaced_daemon_set,
+                          name=name, namespace=namespace,
+                          rollout_status=daemon_set_rollout_status,
+                          kind="daemon set", timeout=timeout,
+                          on_progress=on_progress, metrics=self.metrics)
+        finally:
+            stopped.set()
+        return True
+
     def wait_for_daemon_set_to_run(self, daemon_set_name,
                                    namespace=DEFAULT_NAMESPACE,
                                    max_threads=DEFAULT_MAX_THREADS):
         """
-        Wait until the daemon set is running (including their pods...)
+        Wait until the daemon set is running (its rollout is complete)
         :param daemon_set_name: the name of the daemon set
         :type daemon_set_name: str
         :param namespace: the namespace of the daemon set
         (default value is 'default')
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used, the rollout is tracked by the status of
+        the daemon set (kept for compatibility)
         :type max_threads: int
         """
-        if not self.finished_to_create_ready_replicas(name=daemon_set_name,
-                                                      namespace=namespace):
-            return False
-        self.deployment.wait_for_pods_creation_thread_manager(
-            pods=self.get_pods(name=daemon_set_name, namespace=namespace),
-            namespace=namespace, max_threads=max_threads)
-        return True
+        return self.wait_for_rollout(name=daemon_set_name,
+                                     namespace=namespace)
 
     @k8s_exceptions
     def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True,
@@ -74,14 +139,14 @@ class DaemonSetClient(object):
         # check the type of the body and that it contains name
         # and raise exception if not
         try:
-            if isinstance(body, V1DaemonSet):
+            if isinstance(body, dict):
+                daemon_set_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            elif isinstance(body, client.V1DaemonSet):
                 daemon_set_name = body.metadata.name
                 if hasattr(body, "metadata") and hasattr(body.metadata,
                                                          "namespace"):
                     namespace = body.metadata.namespace
-            elif isinstance(body, dict):
-                daemon_set_name = body["metadata"]["name"]
-                namespace = body.get("metadata", {}).get("namespace", namespace)
             else:
                 raise K8sInvalidResourceBody()
         except (KeyError, AttributeError):
@@ -132,25 +197,20 @@ class DaemonSetClient(object):
                                      namespace=DEFAULT_NAMESPACE,
                                      max_threads=DEFAULT_MAX_THREADS):
         """
-        Wait until the daemon set's pods are patched
+        Wait until the daemon set's pods are patched (the rollout of the
+        patched daemon set is complete)
         :param name: the name of the daemon set
         :type name: str
-        :param pods: the daemon set's pods
+        :param pods: not used, the rollout is tracked by the status of the
+        daemon set (kept for compatibility)
         :type pods: list
         :param namespace: the namespace of the daemon set
         (default value is 'default')
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used (kept for compatibility)
         :type max_threads: int
         """
-        self.deployment.wait_for_pods_to_be_deleted_thread_manager(pods=pods,
-                                                                   namespace=namespace,
-                                                                   max_threads=max_threads)
-        self.wait_for_daemon_set_to_run(daemon_set_name=name,
-                                        namespace=namespace,
-                                        max_threads=max_threads)
-        return True
+        return self.wait_for_rollout(name=name, namespace=namespace)
 
     @k8s_exceptions
     def patch(self, name, body, namespace=DEFAULT_NAMESPACE, wait=True,
@@ -164,22 +224,59 @@ class DaemonSetClient(object):
         :param namespace: the namespace of the daemon set
         (default value is 'default')
         :type namespace: str
-        :param wait: to wait until the patch is over
-        (default value is True)
+        :param wait: to wait until the patch is over (the rollout of the
+        patched daemon set is complete, default value is True)
         :type wait: bool
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used (kept for compatibility)
         :type: max_threads: int
         """
-        pods = self.get(name=name, namespace=namespace)
         self.client_app.patch_namespaced_daemon_set(name=name,
                                                     namespace=namespace,
                                                     body=body)
         logger.info(f"Patched daemon set {name} from namespace {namespace}")
         if wait:
-            self.wait_for_daemon_set_to_patch(name=name, pods=pods,
-                                              namespace=namespace,
-                                              max_threads=max_threads)
+            self.wait_for_rollout(name=name, namespace=namespace)
+
+    @k8s_exceptions
+    def delete_collection(self, namespace=DEFAULT_NAMESPACE, field_selector="",
+                          label_selector="",
+                          propagation_policy=DELETE_PROPAGATION_POLICY,
+                          grace_period_seconds=None, wait=False,
+                          timeout=WAIT_TIMEOUT):
+        """
+        Delete all the daemon sets of the namespace that match the selectors with
+        one request, and wait for their deletion with one watch
+        :param namespace: the namespace of the daemon sets
+        (default value is 'default')
+        :type namespace: str
+        :param field_selector: to delete specific daemon sets, only the fields the
+        api server supports (all the daemon sets of the namespace by default)
+        :type field_selector: str
+        :param label_selector: to delete daemon sets with specific labels
+        :type label_selector: str
+        :param propagation_policy: how to delete the dependents
+        (default value is DELETE_PROPAGATION_POLICY)
+        (with 'Foreground' the daemon set is deleted after its pods)
+        :type propagation_policy: str
+        :param grace_period_seconds: the termination grace period of the pods
+        (default is the grace period of each pod)
+        :type grace_period_seconds: int
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: the names of the deleted daemon sets
+        :rtype: list
+        """
+        return delete_collection(
+            delete_func=self.client_app.delete_collection_namespaced_daemon_set,
+            list_func=self.client_app.list_namespaced_daemon_set, namespace=namespace,
+            kind="daemonsets", field_selector=field_selector,
+            label_selector=label_selector,
+            propagation_policy=propagation_policy,
+            grace_period_seconds=grace_period_seconds, wait=wait,
+            timeout=timeout, metrics=self.metrics)
 
     @k8s_exceptions
     def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
@@ -195,8 +292,20 @@ class DaemonSetClient(object):
         :return: the daemon set obj/dictionary
         :rtype: Union[V1DaemonSet,dictionary]
         """
-        daemon_set = self.client_app.read_namespaced_daemon_set(name=name,
-                                                                namespace=namespace)
+        daemon_set = None
+        if self.cache is not None:
+            daemon_set = self.cache.get(kind="daemonsets", name=name,
+                                        namespace=namespace)
+        if daemon_set is None and dict_output:
+            # read the dictionary from the json, without building the model
+            daemon_set = read_raw_object(
+                self.client_app.read_namespaced_daemon_set, name=name,
+                namespace=namespace)
+            logger.info(f"Got daemon set {name} from {namespace} namespace")
+            return daemon_set
+        if daemon_set is None:
+            daemon_set = self.client_app.read_namespaced_daemon_set(
+                name=name, namespace=namespace)
         logger.info(f"Got deployment {name} from {namespace} namespace")
 
         # convert the obj to dict if required
@@ -209,7 +318,7 @@ class DaemonSetClient(object):
 
     @k8s_exceptions
     def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-             dict_output=False, field_selector=""):
+             dict_output=False, field_selector="", label_selector=""):
         """
         Return list of daemon set objects/dictionaries
         :param namespace: the namespace of the daemon set
@@ -222,20 +331,44 @@ class DaemonSetClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific daemon sets
         :type field_selector: str
+        :param label_selector: to filter the list to daemon sets with specific
+        labels
+        :type label_selector: str
         :return: list of daemon sets
         :rtype: list
         """
-        if all_namespaces:
-            daemon_sets_list = self.client_app.list_daemon_set_for_all_namespaces().items
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="daemonsets",
+                             label_selector=label_selector)
+        if dict_output and self.cache is None and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            if all_namespaces:
+                daemon_sets_list = read_raw_list(
+                    self.client_app.list_daemon_set_for_all_namespaces,
+                    **plan.api_kwargs)
+            else:
+                daemon_sets_list = read_raw_list(
+                    self.client_app.list_namespaced_daemon_set,
+                    namespace=namespace, **plan.api_kwargs)
+            logger.info("Got the daemon sets list")
+            return daemon_sets_list
+        if self.cache is not None:
+            daemon_sets_list = plan.apply_server_part(self.cache.list(
+                kind="daemonsets",
+                namespace=None if all_namespaces else namespace))
+            logger.info("Got the daemon sets list from the cache")
+        elif all_namespaces:
+            daemon_sets_list = self.client_app.list_daemon_set_for_all_namespaces(
+                **plan.api_kwargs).items
             logger.info("Got the daemon sets list from all the namespaces")
         else:
             daemon_sets_list = self.client_app.list_namespaced_daemon_set(
-                namespace=namespace).items
+                namespace=namespace, **plan.api_kwargs).items
             logger.info(f"Got the daemon sets list from {namespace} namespace")
 
-        if field_selector:
+        if plan.remainder:
             daemon_sets_list = field_filter(obj_list=daemon_sets_list,
-                                            field_selector=field_selector)
+                                            field_selector=plan.remainder)
 
         # convert the list to list of dicts if required
         if dict_output:
@@ -248,10 +381,52 @@ class DaemonSetClient(object):
         return daemon_sets_list
 
     def list_names(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-                   field_selector=""):
+                   field_selector="", label_selector=""):
         return [daemon_set.metadata.name for daemon_set in
                 self.list(namespace=namespace, all_namespaces=all_namespaces,
-                          field_selector=field_selector)]
+                          field_selector=field_selector,
+                          label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                  dict_output=False, field_selector="", label_selector="",
+                  page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the daemon sets objects/dictionaries page by page, the next page is
+        requested only after the objects of the previous one were consumed
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the daemon sets from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the daemon sets to specific daemon sets
+        :type field_selector: str
+        :param label_selector: to filter the daemon sets to daemon sets with specific
+        labels
+        :type label_selector: str
+        :param page_size: the max number of daemon sets in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of daemon sets
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector, kind="daemonsets",
+                             label_selector=label_selector)
+        raw = dict_output and not plan.remainder
+        if self.cache is not None:
+            pages = [plan.apply_server_part(self.cache.list(
+                kind="daemonsets", namespace=None if all_namespaces else namespace))]
+        elif all_namespaces:
+            pages = iter_pages(self.client_app.list_daemon_set_for_all_namespaces,
+                               page_size=page_size, raw=raw, **plan.api_kwargs)
+        else:
+            pages = iter_pages(self.client_app.list_namespaced_daemon_set,
+                               page_size=page_size, raw=raw,
+                               namespace=namespace, **plan.api_kwargs)
+        yield from iter_objects(pages=pages, field_selector=plan.remainder,
+                                dict_output=dict_output)
 
     def get_pods(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
         """
@@ -273,6 +448,70 @@ class DaemonSetClient(object):
                                   dict_output=dict_output)
         return pods_list
 
+    def execute_many(self, name, command, namespace=DEFAULT_NAMESPACE,
+                     container=None, concurrency=DEFAULT_MAX_THREADS,
+                     timeout=None, on_output=None):
+        """
+        Execute command on all the pods of the daemon set at the same time, the
+        results are yielded as the commands complete
+        :param name: the name of the daemon set
+        :type name: str
+        :param command: the command to run on the pods
+        :type command: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param container: specific container to run the command on
+        :type container: str
+        :param concurrency: max number of pods to run the command on at the
+        same time (default value is DEFAULT_MAX_THREADS)
+        :type concurrency: int
+        :param timeout: max seconds to wait for each command
+        :type timeout: float
+        :param on_output: function that is called with the name of the pod,
+        the channel and the data of each chunk of the output as it arrives
+        :type on_output: function
+        :return: generator of PodExecResult
+        """
+        return self.pod.execute_many(
+            command=command,
+            pods=self.get_pods(name=name, namespace=namespace,
+                               dict_output=True),
+            namespace=namespace, container=container,
+            concurrency=concurrency, timeout=timeout, on_output=on_output)
+
+    def follow_logs(self, name, namespace=DEFAULT_NAMESPACE, containers=None,
+                    since_seconds=None, tail_lines=None, follow=True):
+        """
+        Yield the logs of all the pods of the daemon set merged by their
+        timestamps, the pods that are created while following (e.g. by a
+        rollout) are followed too
+        :param name: the name of the daemon set
+        :type name: str
+        :param namespace: the namespace of the daemon set
+        (default value is 'default')
+        :type namespace: str
+        :param containers: the names of the containers to follow (default is
+        all the containers)
+        :type containers: list
+        :param since_seconds: only the lines of the last seconds
+        :type since_seconds: int
+        :param tail_lines: the number of lines from the end of the logs of
+        each container
+        :type tail_lines: int
+        :param follow: to keep yielding the new lines until the generator is
+        closed, otherwise the logs that exist are yielded
+        :type follow: bool
+        :return: generator of LogLine (str() of a line has the pod and the
+        container as a prefix)
+        """
+        return merge_pod_logs(
+            pod_client=self.pod,
+            list_pods=lambda: self.get_pods(name=name, namespace=namespace,
+                                            dict_output=True),
+            namespace=namespace, containers=containers,
+            since_seconds=since_seconds, tail_lines=tail_lines, follow=follow)
+
     @k8s_exceptions
     def events(self, name, namespace=DEFAULT_NAMESPACE, only_messages=False):
         """
@@ -288,13 +527,15 @@ class DaemonSetClient(object):
         :rtype: list
         """
         daemon_set_uid = self.get(name=name, namespace=namespace).metadata.uid
-        events = self.client_app.list_namespaced_event(namespace=namespace,
-                                                       field_selector=f"involvedObject.uid=={daemon_set_uid}").items
+        # the events are in the core api
+        events = list_events(client_core=self.pod.client_core,
+                             uid=daemon_set_uid, namespace=namespace,
+                             event_cache=self.event_cache)
         logger.info(f"Got the events of daemon set {name} from namespace "
                     f"{namespace}")
         if only_messages:
-            events = [event["message"] for event in events if
-                      event.get("message") is not None]
+            events = [event.message for event in events if
+                      event.message is not None]
         return events
 
 
@@ -1,10 +1,20 @@
 import logging
-import threading
-from kubernetes.client import V1Deployment
-
-from k8s_client.utils import (convert_obj_to_dict, split_list_to_chunks, field_filter,
-                              k8s_exceptions, retry)
-from k8s_client.consts import (DEFAULT_NAMESPACE, REPLICAS_THRESHOLD, DEFAULT_MAX_THREADS)
+from kubernetes import client
+
+from k8s_client.utils import (convert_obj_to_dict, field_filter,
+                              k8s_exceptions, retry, controller_uid,
+                              iter_pages, iter_objects, read_raw_object,
+                              read_raw_list,
+                              delete_collection)
+from k8s_client.informer import list_events
+from k8s_client.logs import merge_pod_logs
+from k8s_client.metrics import METRICS
+from k8s_client.rollout import deployment_rollout_status, track_rollout
+from k8s_client.selectors import plan_selector, to_label_selector
+from k8s_client.workers import WorkerPool
+from k8s_client.consts import (DEFAULT_NAMESPACE, DEFAULT_MAX_THREADS, DEFAULT_PAGE_SIZE,
+                               DELETE_PROPAGATION_POLICY, ROLLOUT_TIMEOUT,
+                               WAIT_TIMEOUT)
 
 from k8s_client.exceptions import K8sInvalidResourceBody
 
@@ -13,9 +23,14 @@ logger = logging.getLogger(__name__)
 
 class DeploymentClient(object):
 
-    def __init__(self, client_app, pod):
+    def __init__(self, client_app, pod, cache=None, pool=None,
+                 event_cache=None, metrics=METRICS):
         self.client_app = client_app
+        self.metrics = metrics
         self.pod = pod
+        self.cache = cache
+        self.event_cache = event_cache
+        self.pool = pool or WorkerPool()
 
     @retry
     def finished_to_create_ready_replicas(self, name, namespace):
@@ -32,77 +47,74 @@ class DeploymentClient(object):
         deployment = self.get(name=name, namespace=namespace)
         return deployment.spec.replicas == deployment.status.available_replicas
 
-    @staticmethod
-    def wait_for_pods_thread(pod_wait_func, pod_kwargs_list):
-        """
-        Thread function that runs the input function with the input vars
-        :param pod_wait_func: function to run in thread
-        :type pod_wait_func: function
-        :param pod_kwargs_list: list of kwargs
-        :type pod_kwargs_list: list
-        """
-        for kwargs in pod_kwargs_list:
-            pod_wait_func(**kwargs)
-
     def wait_for_pods_creation_thread_manager(self, pods,
                                               namespace=DEFAULT_NAMESPACE,
                                               max_threads=DEFAULT_MAX_THREADS):
         """
         Wait until the all pods are running
-        (if there are enough pods opens threads)
+        (the pods are waited for in the threads of the worker pool)
         :param pods:  the deployment's pods
         :type pods: list
         :param namespace: the namespace of the deployment
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
+        :param max_threads: max number of threads to use during waiting
         (default value is DEFAULT_MAX_THREADS)
         :type max_threads: int
         """
-        if len(pods) > REPLICAS_THRESHOLD:
-            threads = []
-            kwargs_list = []
-            for pod in pods:
-                kwargs = {"pod_name": pod.metadata.name,
-                          "pod_id": pod.metadata.uid,
-                          "containers_counter": len(pod.spec.containers),
-                          "namespace": namespace}
-                kwargs_list.append(kwargs)
-            for pods_kwargs in split_list_to_chunks(list_to_slice=kwargs_list,
-                                                    number_of_chunks=max_threads):
-                threads.append(
-                    threading.Thread(target=self.wait_for_pods_thread, args=(
-                        self.pod.wait_for_containers_to_run, pods_kwargs)))
-                threads[len(threads) - 1].start()
-            for thread in threads:
-                thread.join()
-        else:
-            for pod in pods:
-                self.pod.wait_for_containers_to_run(pod_name=pod.metadata.name,
-                                                    pod_id=pod.metadata.uid,
-                                                    containers_counter=len(
-                                                        pod.spec.containers),
-                                                    namespace=namespace)
+        kwargs_list = [{"pod_name": pod.metadata.name,
+                        "pod_id": pod.metadata.uid,
+                        "containers_counter": len(pod.spec.containers),
+                        "namespace": namespace} for pod in pods]
+        self.pool.map(func=self.pod.wait_for_containers_to_run,
+                      kwargs_list=kwargs_list, max_threads=max_threads)
+
+    @k8s_exceptions
+    def wait_for_rollout(self, name, namespace=DEFAULT_NAMESPACE,
+                         timeout=ROLLOUT_TIMEOUT, on_progress=None):
+        """
+        Wait until the rollout of the deployment is complete: the deployment
+        controller observed its current generation, all its replicas are
+        updated and available and no old replica is left.
+        Only the deployment is watched (one stream whatever the number of its
+        pods), and a deployment that exceeded its progress deadline
+        (spec.progressDeadlineSeconds) fails the wait at once.
+        :param name: the name of the deployment
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param timeout: max seconds to wait
+        (default value is ROLLOUT_TIMEOUT)
+        :type timeout: int
+        :param on_progress: function that is called with the deployment
+        dictionary on each change until the rollout is complete
+        :type on_progress: function
+        :raises K8sRolloutException: the deployment exceeded its progress
+        deadline
+        """
+        track_rollout(list_func=self.client_app.list_namespaced_deployment,
+                      name=name, namespace=namespace,
+                      rollout_status=deployment_rollout_status,
+                      kind="deployment", timeout=timeout,
+                      on_progress=on_progress, metrics=self.metrics)
+        return True
 
     def wait_for_deployment_to_run(self, deployment_name,
                                    namespace=DEFAULT_NAMESPACE,
                                    max_threads=DEFAULT_MAX_THREADS):
         """
-        Wait until the deployment is running (including their pods...)
+        Wait until the deployment is running (its rollout is complete)
         :param deployment_name: the name of the deployment
         :type deployment_name: str
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used, the rollout is tracked by the status of
+        the deployment (kept for compatibility)
         :type max_threads: int
         """
-        self.wait_for_pods_creation_thread_manager(
-            pods=self.get_pods(name=deployment_name, namespace=namespace),
-            namespace=namespace, max_threads=max_threads)
-        self.finished_to_create_ready_replicas(name=deployment_name,
-                                               namespace=namespace)
-        return True
+        return self.wait_for_rollout(name=deployment_name,
+                                     namespace=namespace)
 
     @k8s_exceptions
     def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True,
@@ -125,14 +137,14 @@ class DeploymentClient(object):
         # check the type of the body and that it contains name
         # and raise exception if not
         try:
-            if isinstance(body, V1Deployment):
+            if isinstance(body, dict):
+                deployment_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            elif isinstance(body, client.V1Deployment):
                 deployment_name = body.metadata.name
                 if hasattr(body, "metadata") and hasattr(body.metadata,
                                                          "namespace"):
                     namespace = body.metadata.namespace
-            elif isinstance(body, dict):
-                deployment_name = body["metadata"]["name"]
-                namespace = body.get("metadata", {}).get("namespace", namespace)
             else:
                 raise K8sInvalidResourceBody()
         except (KeyError, AttributeError):
@@ -155,33 +167,20 @@ class DeploymentClient(object):
                                                    max_threads=DEFAULT_MAX_THREADS):
         """
         Wait until the deployment's pods are deleted
+        (the pods are waited for in the threads of the worker pool)
         :param pods: the deployment's pods
         :type pods: list
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
+        :param max_threads: max number of threads to use during waiting
         (default value is DEFAULT_MAX_THREADS)
         :type max_threads: int
         """
-        if len(pods) > REPLICAS_THRESHOLD:
-            threads = []
-            kwargs_list = []
-            for pod in pods:
-                kwargs = {"pod_name": pod.metadata.name, "namespace": namespace}
-                kwargs_list.append(kwargs)
-            for pods_kwargs in split_list_to_chunks(list_to_slice=kwargs_list,
-                                                    number_of_chunks=max_threads):
-                threads.append(
-                    threading.Thread(target=self.wait_for_pods_thread, args=(
-                        self.pod.wait_for_pod_to_be_deleted, pods_kwargs)))
-                threads[len(threads) - 1].start()
-            for thread in threads:
-                thread.join()
-        else:
-            for pod in pods:
-                self.pod.wait_for_pod_to_be_deleted(pod_name=pod.metadata.name,
-                                                    namespace=namespace)
+        kwargs_list = [{"pod_name": pod.metadata.name, "namespace": namespace}
+                       for pod in pods]
+        self.pool.map(func=self.pod.wait_for_pod_to_be_deleted,
+                      kwargs_list=kwargs_list, max_threads=max_threads)
         return True
 
     @k8s_exceptions
@@ -220,25 +219,20 @@ class DeploymentClient(object):
                                      namespace=DEFAULT_NAMESPACE,
                                      max_threads=DEFAULT_MAX_THREADS):
         """
-        Wait until the deployment's pods are patched
+        Wait until the deployment's pods are patched (the rollout of the
+        patched deployment is complete, so no old pod is left)
         :param name: the name of the deployment
         :type name: str
-        :param pods: the deployment's pods
+        :param pods: not used, the rollout is tracked by the status of the
+        deployment (kept for compatibility)
         :type pods: list
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used (kept for compatibility)
         :type max_threads: int
         """
-        self.wait_for_pods_to_be_deleted_thread_manager(pods=pods,
-                                                        namespace=namespace,
-                                                        max_threads=max_threads)
-        self.wait_for_deployment_to_run(deployment_name=name,
-                                        namespace=namespace,
-                                        max_threads=max_threads)
-        return True
+        return self.wait_for_rollout(name=name, namespace=namespace)
 
     @k8s_exceptions
     def patch(self, name, body, namespace=DEFAULT_NAMESPACE, wait=True,
@@ -252,67 +246,51 @@ class DeploymentClient(object):
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
-        :param wait: to wait until the patch is over
-        (default value is True)
+        :param wait: to wait until the patch is over (the rollout of the
+        patched deployment is complete, default value is True)
         :type wait: bool
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used (kept for compatibility)
         :type: max_threads: int
         """
-        pods = self.get(name=name, namespace=namespace)
         self.client_app.patch_namespaced_deployment(name=name,
                                                     namespace=namespace,
                                                     body=body)
         logger.info(f"Patched deployment {name} from namespace {namespace}")
         if wait:
-            self.wait_for_deployment_to_patch(name=name, pods=pods,
-                                              namespace=namespace,
-                                              max_threads=max_threads)
+            self.wait_for_rollout(name=name, namespace=namespace)
 
     def wait_for_deployment_to_scale_up(self, name, pods,
                                         namespace=DEFAULT_NAMESPACE,
                                         max_threads=DEFAULT_MAX_THREADS):
         """
-        Wait until the deployment is scaled up
+        Wait until the deployment is scaled up (its rollout is complete)
         :param name: the name of the deployment
         :type name: str
-        :param pods: the deployment's pods
+        :param pods: not used, the rollout is tracked by the status of the
+        deployment (kept for compatibility)
         :type pods: list
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used (kept for compatibility)
         :type max_threads: int
         """
-        if not self.finished_to_create_ready_replicas(name=name,
-                                                      namespace=namespace):
-            return False
-
-        new_pods = [pod for pod in self.get_pods(name=name, namespace=namespace)
-                    if pod not in pods]
-        self.wait_for_pods_creation_thread_manager(pods=new_pods,
-                                                   namespace=namespace,
-                                                   max_threads=max_threads)
-        return True
+        return self.wait_for_rollout(name=name, namespace=namespace)
 
     def wait_for_deployment_to_scale_down(self, name, new_size,
                                           namespace=DEFAULT_NAMESPACE):
         """
-        Wait until the deployment is scaled down
+        Wait until the deployment is scaled down (its rollout is complete)
         :param name: the name of the deployment
         :type name: str
-        :param new_size: the new amount of replicas
+        :param new_size: not used, the rollout is tracked by the status of
+        the deployment (kept for compatibility)
         :type new_size: int
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
         """
-        is_scaled_down = len(
-            self.get_pods(name=name, namespace=namespace)) == new_size
-        if is_scaled_down:
-            return True
-        return is_scaled_down
+        return self.wait_for_rollout(name=name, namespace=namespace)
 
     def scale(self, name, new_size, namespace=DEFAULT_NAMESPACE, wait=True,
               max_threads=DEFAULT_MAX_THREADS):
@@ -325,27 +303,17 @@ class DeploymentClient(object):
         :param namespace: the namespace of the deployment
         (default value is 'default')
         :type namespace: str
-        :param wait: to wait until the scale up is over
-        (default value is True)
+        :param wait: to wait until the scale is over (the rollout of the
+        new size is complete, default value is True)
         :type wait: bool
-        :param max_threads: max number of threads to open during waiting
-        (default value is DEFAULT_MAX_THREADS)
+        :param max_threads: not used (kept for compatibility)
         :type: max_threads: int
         """
-        pods = self.get_pods(name=name, namespace=namespace)
         body = {"spec": {"replicas": new_size}}
-        self.patch(name=name, body=body, namespace=namespace, wait=False,
-                   max_threads=max_threads)
+        self.patch(name=name, body=body, namespace=namespace, wait=False)
         logger.info(f"Scaled deployment {name} from namespace {namespace}")
         if wait:
-            if new_size > len(pods):
-                self.wait_for_deployment_to_scale_up(name=name, pods=pods,
-                                                     namespace=namespace,
-                                                     max_threads=max_threads)
-            elif new_size < len(pods):
-                self.wait_for_deployment_to_scale_down(name=name,
-                                                       new_size=new_size,
-                                                       namespace=namespace)
+            self.wait_for_rollout(name=name, namespace=namespace)
 
     def scale_down_up(self, name, namespace=DEFAULT_NAMESPACE, wait=True,
                       max_threads=DEFAULT_MAX_THREADS):
@@ -369,6 +337,47 @@ class DeploymentClient(object):
         self.scale(name=name, new_size=replicas, namespace=namespace, wait=wait,
                    max_threads=max_threads)
 
+    @k8s_exceptions
+    def delete_collection(self, namespace=DEFAULT_NAMESPACE, field_selector="",
+                          label_selector="",
+                          propagation_policy=DELETE_PROPAGATION_POLICY,
+                          grace_period_seconds=None, wait=False,
+                          timeout=WAIT_TIMEOUT):
+        """
+        Delete all the deployments of the namespace that match the selectors with
+        one request, and wait for their deletion with one watch
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param field_selector: to delete specific deployments, only the fields the
+        api server supports (all the deployments of the namespace by default)
+        :type field_selector: str
+        :param label_selector: to delete deployments with specific labels
+        :type label_selector: str
+        :param propagation_policy: how to delete the dependents
+        (default value is DELETE_PROPAGATION_POLICY)
+        (with 'Foreground' the deployment is deleted after its pods)
+        :type propagation_policy: str
+        :param grace_period_seconds: the termination grace period of the pods
+        (default is the grace period of each pod)
+        :type grace_period_seconds: int
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: the names of the deleted deployments
+        :rtype: list
+        """
+        return delete_collection(
+            delete_func=self.client_app.delete_collection_namespaced_deployment,
+            list_func=self.client_app.list_namespaced_deployment, namespace=namespace,
+            kind="deployments", field_selector=field_selector,
+            label_selector=label_selector,
+            propagation_policy=propagation_policy,
+            grace_period_seconds=grace_period_seconds, wait=wait,
+            timeout=timeout, metrics=self.metrics)
+
     @k8s_exceptions
     def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
         """
@@ -383,8 +392,20 @@ class DeploymentClient(object):
         :return: the deployment obj/dictionary
         :rtype: Union[V1Deployment,dictionary]
         """
-        deployment = self.client_app.read_namespaced_deployment(name=name,
-                                                                namespace=namespace)
+        deployment = None
+        if self.cache is not None:
+            deployment = self.cache.get(kind="deployments", name=name,
+                                        namespace=namespace)
+        if deployment is None and dict_output:
+            # read the dictionary from the json, without building the model
+            deployment = read_raw_object(
+                self.client_app.read_namespaced_deployment, name=name,
+                namespace=namespace)
+            logger.info(f"Got deployment {name} from {namespace} namespace")
+            return deployment
+        if deployment is None:
+            deployment = self.client_app.read_namespaced_deployment(
+                name=name, namespace=namespace)
         logger.info(f"Got deployment {name} from {namespace} namespace")
         # convert the obj to dict if required
         if dict_output:
@@ -395,7 +416,7 @@ class DeploymentClient(object):
 
     @k8s_exceptions
     def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-             dict_output=False, field_selector=""):
+             dict_output=False, field_selector="", label_selector=""):
         """
         Return list of deployments objects/dictionaries
         :param namespace: the namespace of the deployment
@@ -408,20 +429,44 @@ class DeploymentClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific deployments
         :type field_selector: str
+        :param label_selector: to filter the list to deployments with specific
+        labels
+        :type label_selector: str
         :return: list of deployments
         :rtype: list
         """
-        if all_namespaces:
-            deployments_list = self.client_app.list_deployment_for_all_namespaces().items
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="deployments",
+                             label_selector=label_selector)
+        if dict_output and self.cache is None and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            if all_namespaces:
+                deployments_list = read_raw_list(
+                    self.client_app.list_deployment_for_all_namespaces,
+                    **plan.api_kwargs)
+            else:
+                deployments_list = read_raw_list(
+                    self.client_app.list_namespaced_deployment,
+                    namespace=namespace, **plan.api_kwargs)
+            logger.info("Got the deployments list")
+            return deployments_list
+        if self.cache is not None:
+            deployments_list = plan.apply_server_part(self.cache.list(
+                kind="deployments",
+                namespace=None if all_namespaces else namespace))
+            logger.info("Got the deployments list from the cache")
+        elif all_namespaces:
+            deployments_list = self.client_app.list_deployment_for_all_namespaces(
+                **plan.api_kwargs).items
             logger.info("Got the deployments list from all the namespaces")
         else:
             deployments_list = self.client_app.list_namespaced_deployment(
-                namespace=namespace).items
+                namespace=namespace, **plan.api_kwargs).items
             logger.info(f"Got the deployments list from {namespace} namespace")
 
-        if field_selector:
+        if plan.remainder:
             deployments_list = field_filter(obj_list=deployments_list,
-                                            field_selector=field_selector)
+                                            field_selector=plan.remainder)
 
         # convert the list to list of dicts if required
         if dict_output:
@@ -434,12 +479,114 @@ class DeploymentClient(object):
         return deployments_list
 
     def list_names(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-                   field_selector=""):
+                   field_selector="", label_selector=""):
         return [deployment.metadata.name for deployment in
                 self.list(namespace=namespace, all_namespaces=all_namespaces,
-                          field_selector=field_selector)]
+                          field_selector=field_selector,
+                          label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                  dict_output=False, field_selector="", label_selector="",
+                  page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the deployments objects/dictionaries page by page, the next page is
+        requested only after the objects of the previous one were consumed
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the deployments from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the deployments to specific deployments
+        :type field_selector: str
+        :param label_selector: to filter the deployments to deployments with specific
+        labels
+        :type label_selector: str
+        :param page_size: the max number of deployments in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of deployments
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector, kind="deployments",
+                             label_selector=label_selector)
+        raw = dict_output and not plan.remainder
+        if self.cache is not None:
+            pages = [plan.apply_server_part(self.cache.list(
+                kind="deployments", namespace=None if all_namespaces else namespace))]
+        elif all_namespaces:
+            pages = iter_pages(self.client_app.list_deployment_for_all_namespaces,
+                               page_size=page_size, raw=raw, **plan.api_kwargs)
+        else:
+            pages = iter_pages(self.client_app.list_namespaced_deployment,
+                               page_size=page_size, raw=raw,
+                               namespace=namespace, **plan.api_kwargs)
+        yield from iter_objects(pages=pages, field_selector=plan.remainder,
+                                dict_output=dict_output)
+
+    def list_replica_sets(self, namespace=DEFAULT_NAMESPACE,
+                          label_selector=""):
+        """
+        Return the replica sets of the namespace
+        :param namespace: the namespace of the replica sets
+        (default value is 'default')
+        :type namespace: str
+        :param label_selector: to filter the list to replica sets with specific
+        labels
+        :type label_selector: str
+        :return: list of replica sets
+        :rtype: list
+        """
+        plan = plan_selector(kind="replicasets", label_selector=label_selector)
+        if self.cache is not None:
+            return plan.apply_server_part(self.cache.list(kind="replicasets",
+                                                          namespace=namespace))
+        return self.client_app.list_namespaced_replica_set(
+            namespace=namespace, **plan.api_kwargs).items
 
     @k8s_exceptions
+    def resolve_pods(self, deployments, namespace=DEFAULT_NAMESPACE,
+                     dict_output=False):
+        """
+        Return the pods of the deployments, the replica sets and the pods of
+        the namespace are listed once and matched by their owners uid
+        :param deployments: the deployments objects
+        :type deployments: list
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the lists dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of each deployment by the deployment name
+        :rtype: dict
+        """
+        pods_by_deployment = {deployment.metadata.name: [] for deployment in
+                              deployments}
+        if not deployments:
+            return pods_by_deployment
+        # a single deployment lets the api server select by its labels
+        label_selector = to_label_selector(deployments[0].spec.selector) \
+            if len(deployments) == 1 else ""
+        deployment_names = {deployment.metadata.uid: deployment.metadata.name
+                            for deployment in deployments}
+        replica_set_owners = {}
+        for replica_set in self.list_replica_sets(
+                namespace=namespace, label_selector=label_selector):
+            owner_uid = controller_uid(replica_set)
+            if owner_uid in deployment_names:
+                replica_set_owners[replica_set.metadata.uid] = \
+                    deployment_names[owner_uid]
+        for pod in self.pod.list(namespace=namespace,
+                                 label_selector=label_selector):
+            deployment_name = replica_set_owners.get(controller_uid(pod))
+            if deployment_name is not None:
+                pods_by_deployment[deployment_name].append(
+                    convert_obj_to_dict(pod) if dict_output else pod)
+        return pods_by_deployment
+
     def get_pods(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
         """
         Return the pods of the deployment
@@ -454,19 +601,115 @@ class DeploymentClient(object):
         :return: the pods of the deployment
         :rtype: list
         """
-        deploy_replica_sets = self.client_app.list_namespaced_replica_set(
-            namespace=namespace).items
-        deploy_replica_sets = field_filter(obj_list=deploy_replica_sets,
-            field_selector=f"metadata.owner_references[0].kind==Deployment, "
-                           f"metadata.owner_references[0].name=={name}")
-        pods_list = []
-        for deploy_replica_set in deploy_replica_sets:
-            pods_list.extend(self.pod.list(namespace=namespace,
-                                           field_selector=f"metadata.owner_references[0].kind==ReplicaSet,"
-                                                          f"metadata.owner_references[0].name=="
-                                                          f"{deploy_replica_set.metadata.name}",
-                                           dict_output=dict_output))
-        return pods_list
+        deployments = self.list(namespace=namespace,
+                                field_selector=f"metadata.name=={name}")
+        return self.resolve_pods(deployments=deployments, namespace=namespace,
+                                 dict_output=dict_output).get(name, [])
+
+    def get_pods_for_many(self, names, namespace=DEFAULT_NAMESPACE,
+                          dict_output=False):
+        """
+        Return the pods of many deployments with three list requests
+        :param names: the names of the deployments
+        :type names: list
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the lists dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of each deployment by the deployment name
+        (empty list for a deployment that does not exist)
+        :rtype: dict
+        """
+        names = set(names)
+        deployments = [deployment for deployment in
+                       self.list(namespace=namespace)
+                       if deployment.metadata.name in names]
+        pods_by_deployment = {name: [] for name in names}
+        pods_by_deployment.update(self.resolve_pods(
+            deployments=deployments, namespace=namespace,
+            dict_output=dict_output))
+        return pods_by_deployment
+
+    def get_all_pods(self, namespace=DEFAULT_NAMESPACE, dict_output=False):
+        """
+        Return the pods of all the deployments of the namespace
+        :param namespace: the namespace of the deployments
+        (default value is 'default')
+        :type namespace: str
+        :param dict_output: to get the elements of the lists dictionaries
+        instead of objects
+        :type dict_output: bool
+        :return: the pods of each deployment by the deployment name
+        :rtype: dict
+        """
+        return self.resolve_pods(deployments=self.list(namespace=namespace),
+                                 namespace=namespace, dict_output=dict_output)
+
+    def execute_many(self, name, command, namespace=DEFAULT_NAMESPACE,
+                     container=None, concurrency=DEFAULT_MAX_THREADS,
+                     timeout=None, on_output=None):
+        """
+        Execute command on all the pods of the deployment at the same time, the
+        results are yielded as the commands complete
+        :param name: the name of the deployment
+        :type name: str
+        :param command: the command to run on the pods
+        :type command: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param container: specific container to run the command on
+        :type container: str
+        :param concurrency: max number of pods to run the command on at the
+        same time (default value is DEFAULT_MAX_THREADS)
+        :type concurrency: int
+        :param timeout: max seconds to wait for each command
+        :type timeout: float
+        :param on_output: function that is called with the name of the pod,
+        the channel and the data of each chunk of the output as it arrives
+        :type on_output: function
+        :return: generator of PodExecResult
+        """
+        return self.pod.execute_many(
+            command=command,
+            pods=self.get_pods(name=name, namespace=namespace,
+                               dict_output=True),
+            namespace=namespace, container=container,
+            concurrency=concurrency, timeout=timeout, on_output=on_output)
+
+    def follow_logs(self, name, namespace=DEFAULT_NAMESPACE, containers=None,
+                    since_seconds=None, tail_lines=None, follow=True):
+        """
+        Yield the logs of all the pods of the deployment merged by their
+        timestamps, the pods that are created while following (e.g. by a
+        rollout) are followed too
+        :param name: the name of the deployment
+        :type name: str
+        :param namespace: the namespace of the deployment
+        (default value is 'default')
+        :type namespace: str
+        :param containers: the names of the containers to follow (default is
+        all the containers)
+        :type containers: list
+        :param since_seconds: only the lines of the last seconds
+        :type since_seconds: int
+        :param tail_lines: the number of lines from the end of the logs of
+        each container
+        :type tail_lines: int
+        :param follow: to keep yielding the new lines until the generator is
+        closed, otherwise the logs that exist are yielded
+        :type follow: bool
+        :return: generator of LogLine (str() of a line has the pod and the
+        container as a prefix)
+        """
+        return merge_pod_logs(
+            pod_client=self.pod,
+            list_pods=lambda: self.get_pods(name=name, namespace=namespace,
+                                            dict_output=True),
+            namespace=namespace, containers=containers,
+            since_seconds=since_seconds, tail_lines=tail_lines, follow=follow)
 
     @k8s_exceptions
     def events(self, name, namespace=DEFAULT_NAMESPACE, only_messages=False):
@@ -483,13 +726,15 @@ class DeploymentClient(object):
         :rtype: list
         """
         deployment_uid = self.get(name=name, namespace=namespace).metadata.uid
-        events = self.client_app.list_namespaced_event(namespace=namespace,
-                                                       field_selector=f"involvedObject.uid=={deployment_uid}").items
+        # the events are in the core api
+        events = list_events(client_core=self.pod.client_core,
+                             uid=deployment_uid, namespace=namespace,
+                             event_cache=self.event_cache)
         logger.info(f"Got the events of deployment {name} from namespace "
                     f"{namespace}")
         if only_messages:
-            events = [event["message"] for event in events if
-                      event.get("message") is not None]
+            events = [event.message for event in events if
+                      event.message is not None]
         return events
 
 
@@ -1,11 +1,14 @@
 class K8sException(Exception):
-    def __init__(self, message="", reason=None):
+    def __init__(self, message="", reason=None, status=None, headers=None):
         if reason and 'NotFound' in reason:
             raise K8sNotFoundException(message=message)
         if reason and 'AlreadyExists' in reason:
             raise K8sAlreadyExistsException(message=message)
         if reason and 'Invalid' in reason:
             raise InvalidFieldSelector(message=message)
+        # the http status and headers of the failed api call
+        self.status = status
+        self.headers = headers
         super(K8sException, self).__init__(message)
 
 
@@ -49,5 +52,10 @@ class K8sResourceTimeout(K8sException):
         super(K8sResourceTimeout, self).__init__(message)
 
 
+class K8sRolloutException(K8sException):
+    def __init__(self, message="The rollout of the resource failed."):
+        super(K8sRolloutException, self).__init__(message)
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,356 @@
+import copy
+import logging
+import threading
+
+from kubernetes.client.rest import ApiException
+from kubernetes.watch import Watch
+
+from k8s_client.consts import (INFORMER_WATCH_TIMEOUT, INFORMER_RETRY_INTERVAL,
+                               WAIT_TIMEOUT)
+from k8s_client.exceptions import K8sResourceTimeout
+
+logger = logging.getLogger(__name__)
+
+HTTP_GONE = 410
+
+
+class Informer(object):
+    """
+    In-memory copy of one kind of resources (of one namespace or of all the
+    namespaces), filled by a single LIST and kept current by a WATCH that is
+    resumed from the last seen resourceVersion.
+    When the resourceVersion is too old (410 Gone) the informer relists.
+    """
+
+    def __init__(self, list_func, namespace=None,
+                 watch_timeout=INFORMER_WATCH_TIMEOUT, index_func=None):
+        """
+        :param list_func: the api function that lists the resources
+        (e.g. CoreV1Api.list_namespaced_pod)
+        :type list_func: function
+        :param namespace: the namespace to follow (None for a cluster wide
+        list function)
+        :type namespace: str
+        :param watch_timeout: the server side timeout of a single watch
+        request, the watch is resumed after it
+        :type watch_timeout: int
+        :param index_func: function that returns the value to index an
+        object by, for the reads of by_index
+        :type index_func: function
+        """
+        self.list_func = list_func
+        self.namespace = namespace
+        self.watch_timeout = watch_timeout
+        self.index_func = index_func
+        self.resource_version = None
+        self._list_kwargs = {"namespace": namespace} if namespace else {}
+        self._store = {}
+        self._index = {}
+        self._lock = threading.RLock()
+        self._synced = threading.Event()
+        self._stopped = threading.Event()
+        self._watcher = None
+        self._thread = None
+
+    @staticmethod
+    def _key(obj):
+        return obj.metadata.namespace, obj.metadata.name
+
+    @staticmethod
+    def _copy(obj):
+        # the clients blank the resource version of the returned objects,
+        # so never hand out the stored metadata itself
+        obj = copy.copy(obj)
+        obj.metadata = copy.copy(obj.metadata)
+        return obj
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True,
+                                            name=f"informer-"
+                                                 f"{self.list_func.__name__}")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def has_synced(self):
+        return self._synced.is_set()
+
+    def wait_for_sync(self, timeout=WAIT_TIMEOUT):
+        """
+        Wait until the initial list is in the cache
+        :param timeout: max seconds to wait
+        :type timeout: int
+        """
+        if not self._synced.wait(timeout):
+            raise K8sResourceTimeout(
+                message=f"Timeout! Informer of {self.list_func.__name__} did "
+                        f"not sync in {timeout} seconds")
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch()
+            except ApiException as e:
+                if e.status == HTTP_GONE:
+                    logger.info(f"Resource version {self.resource_version} "
+                                f"of {self.list_func.__name__} is gone, "
+                                f"relisting")
+                    self.resource_version = None
+                    continue
+                logger.warning(f"Informer of {self.list_func.__name__} got "
+                               f"an api error: {e.reason}")
+                self._stopped.wait(INFORMER_RETRY_INTERVAL)
+            except Exception:
+                if self._stopped.is_set():
+                    return
+                logger.exception(f"Informer of {self.list_func.__name__} "
+                                 f"failed, restarting the watch")
+                self._stopped.wait(INFORMER_RETRY_INTERVAL)
+
+    def _index_add(self, key, obj):
+        if self.index_func is not None:
+            self._index.setdefault(self.index_func(obj), {})[key] = obj
+
+    def _index_remove(self, key):
+        obj = self._store.get(key)
+        if self.index_func is not None and obj is not None:
+            indexed = self._index.get(self.index_func(obj), {})
+            indexed.pop(key, None)
+            if not indexed:
+                self._index.pop(self.index_func(obj), None)
+
+    def _relist(self):
+        response = self.list_func(**self._list_kwargs)
+        store = {self._key(obj): obj for obj in response.items}
+        with self._lock:
+            self._store = store
+            self._index = {}
+            for key, obj in store.items():
+                self._index_add(key=key, obj=obj)
+        self.resource_version = response.metadata.resource_version
+        self._synced.set()
+        logger.debug(f"Informer of {self.list_func.__name__} listed "
+                     f"{len(store)} objects")
+
+    def _watch(self):
+        self._watcher = Watch()
+        for event in self._watcher.stream(
+                self.list_func, resource_version=self.resource_version,
+                timeout_seconds=self.watch_timeout, **self._list_kwargs):
+            if self._stopped.is_set():
+                break
+            # the keep-alive blank lines of the watch come as None
+            if event is None:
+                continue
+            obj = event["object"]
+            key = self._key(obj)
+            with self._lock:
+                self._index_remove(key=key)
+                if event["type"] == "DELETED":
+                    self._store.pop(key, None)
+                else:
+                    self._store[key] = obj
+                    self._index_add(key=key, obj=obj)
+            self.resource_version = obj.metadata.resource_version
+
+    def list(self, namespace=None):
+        """
+        Return the cached objects
+        :param namespace: return only the objects of this namespace
+        (relevant for a cluster wide informer)
+        :type namespace: str
+        :return: list of objects
+        :rtype: list
+        """
+        with self._lock:
+            objects = list(self._store.values())
+        return [self._copy(obj) for obj in objects
+                if namespace is None or obj.metadata.namespace == namespace]
+
+    def get(self, name, namespace=None):
+        """
+        Return a cached object or None if it is not in the cache
+        :param name: the name of the object
+        :type name: str
+        :param namespace: the namespace of the object
+        :type namespace: str
+        """
+        with self._lock:
+            obj = self._store.get((namespace, name))
+        return self._copy(obj) if obj is not None else None
+
+    def by_index(self, value, namespace=None):
+        """
+        Return the cached objects that index_func maps to the value
+        :param value: the value of the index
+        :param namespace: return only the objects of this namespace
+        (relevant for a cluster wide informer)
+        :type namespace: str
+        :return: list of objects
+        :rtype: list
+        """
+        with self._lock:
+            objects = list(self._index.get(value, {}).values())
+        return [self._copy(obj) for obj in objects
+                if namespace is None or obj.metadata.namespace == namespace]
+
+
+class InformerCache(object):
+    """
+    Shared informers of the K8sClient, one per kind and namespace.
+    An informer is started on the first read of its kind/namespace, reads of
+    a namespace are served by the cluster wide informer when there is one.
+    """
+
+    def __init__(self, client_core, client_app, sync_timeout=WAIT_TIMEOUT):
+        self.sync_timeout = sync_timeout
+        self._list_functions = {
+            "pods": (client_core.list_namespaced_pod,
+                     client_core.list_pod_for_all_namespaces),
+            "deployments": (client_app.list_namespaced_deployment,
+                            client_app.list_deployment_for_all_namespaces),
+            "replicasets": (client_app.list_namespaced_replica_set,
+                            client_app.list_replica_set_for_all_namespaces),
+            "daemonsets": (client_app.list_namespaced_daemon_set,
+                           client_app.list_daemon_set_for_all_namespaces)}
+        self._informers = {}
+        self._lock = threading.Lock()
+
+    def informer(self, kind, namespace=None):
+        """
+        Return the running informer of the kind in the namespace
+        :param kind: the kind of the resources (e.g. 'pods')
+        :type kind: str
+        :param namespace: the namespace (None for all the namespaces)
+        :type namespace: str
+        :return: synced informer
+        :rtype: Informer
+        """
+        with self._lock:
+            informer = self._informers.get((kind, None)) or \
+                       self._informers.get((kind, namespace))
+            if informer is None:
+                namespaced_func, cluster_func = self._list_functions[kind]
+                informer = Informer(
+                    list_func=namespaced_func if namespace else cluster_func,
+                    namespace=namespace)
+                self._informers[(kind, namespace)] = informer.start()
+                logger.info(f"Started informer of {kind} in "
+                            f"{namespace or 'all the namespaces'}")
+        informer.wait_for_sync(timeout=self.sync_timeout)
+        return informer
+
+    def list(self, kind, namespace=None):
+        return self.informer(kind=kind, namespace=namespace).list(
+            namespace=namespace)
+
+    def get(self, kind, name, namespace=None):
+        return self.informer(kind=kind, namespace=namespace).get(
+            name=name, namespace=namespace)
+
+    def stop(self):
+        with self._lock:
+            for informer in self._informers.values():
+                informer.stop()
+            self._informers.clear()
+
+
+def involved_object_uid(event):
+    return event.involved_object.uid
+
+
+class EventCache(object):
+    """
+    Shared events of the K8sClient indexed by the uid of their involved
+    object, one informer (one list+watch) per namespace.
+    An informer is started on the first read of its namespace, so checking
+    the events of many objects costs requests per namespace, not per object.
+    """
+
+    def __init__(self, client_core, sync_timeout=WAIT_TIMEOUT):
+        self.client_core = client_core
+        self.sync_timeout = sync_timeout
+        self._informers = {}
+        self._lock = threading.Lock()
+
+    def informer(self, namespace=None):
+        """
+        Return the running informer of the events of the namespace
+        :param namespace: the namespace (None for all the namespaces)
+        :type namespace: str
+        :return: synced informer
+        :rtype: Informer
+        """
+        with self._lock:
+            informer = self._informers.get(None) or \
+                self._informers.get(namespace)
+            if informer is None:
+                informer = Informer(
+                    list_func=self.client_core.list_namespaced_event
+                    if namespace else
+                    self.client_core.list_event_for_all_namespaces,
+                    namespace=namespace, index_func=involved_object_uid)
+                self._informers[namespace] = informer.start()
+                logger.info(f"Started informer of events in "
+                            f"{namespace or 'all the namespaces'}")
+        informer.wait_for_sync(timeout=self.sync_timeout)
+        return informer
+
+    def events(self, uid, namespace=None):
+        """
+        Return the events of an object
+        :param uid: the uid of the object
+        :type uid: str
+        :param namespace: the namespace of the events (None for all the
+        namespaces)
+        :type namespace: str
+        :return: list of events
+        :rtype: list
+        """
+        return self.informer(namespace=namespace).by_index(
+            value=uid, namespace=namespace)
+
+    def stop(self):
+        with self._lock:
+            for informer in self._informers.values():
+                informer.stop()
+            self._informers.clear()
+
+
+def list_events(client_core, uid, namespace=None, event_cache=None):
+    """
+    Return the events of an object, from the event cache when there is one.
+    The events of all the namespaces are always listed by the uid, a cache of
+    them would watch (and keep) all the events of the cluster.
+    :param client_core: the core api
+    :type client_core: CoreV1Api
+    :param uid: the uid of the object
+    :type uid: str
+    :param namespace: the namespace of the events (None for all the
+    namespaces)
+    :type namespace: str
+    :param event_cache: the event cache of the client
+    :type event_cache: EventCache
+    :return: list of events
+    :rtype: list
+    """
+    if event_cache is not None and namespace is not None:
+        return event_cache.events(uid=uid, namespace=namespace)
+    field_selector = f"involvedObject.uid=={uid}"
+    if namespace is None:
+        return client_core.list_event_for_all_namespaces(
+            field_selector=field_selector).items
+    return client_core.list_namespaced_event(
+        namespace=namespace, field_selector=field_selector).items
+
+
+if __name__ == "__main__":
+    pass
@@ -1,62 +1,226 @@
+import logging
+
 import yaml
-from kubernetes import client, config
+from kubernetes import client
 
 from k8s_client.pod import PodClient
+from k8s_client.informer import EventCache, InformerCache
+from k8s_client.workers import WorkerPool
 from k8s_client.node import NodeClient
 from k8s_client.secret import SecretClient
 from k8s_client.service import ServiceClient
 from k8s_client.namespace import NamespaceClient
 from k8s_client.daemonset import DaemonSetClient
 from k8s_client.deployment import DeploymentClient
-from k8s_client.exceptions import K8sInvalidResourceBody
+from k8s_client.metrics import METRICS
+from k8s_client.retry import DEFAULT_RETRY_POLICY
+from k8s_client.transport import create_api_client
+from k8s_client.utils import lazy_attribute, split_to_apply_tiers
 from k8s_client.consts import (DEFAULT_MAX_THREADS, KUBECONFIG_PATH)
 
+logger = logging.getLogger(__name__)
+
 
 class K8sClient(object):
 
-    def __init__(self, kubeconfig_path=KUBECONFIG_PATH):
-        # Configure the client to the k8s environment
-        config.load_kube_config(kubeconfig_path)
-        configuration = client.Configuration()
-        configuration.assert_hostname = False
-        client.Configuration.set_default(configuration)
-        client_core = client.CoreV1Api()
-        client_app = client.AppsV1Api()
-
-        # Create the instances of the resources
-        self.pod = PodClient(client_core=client_core)
-        self.deployment = DeploymentClient(client_app=client_app, pod=self.pod)
-        self.daemon_set = DaemonSetClient(client_app=client_app,
-                                          deployment=self.deployment,
-                                          pod=self.pod)
-        self.namespace = NamespaceClient(client_core=client_core)
-        self.node = NodeClient(client_core=client_core)
-        self.secret = SecretClient(client_core=client_core)
-        self.service = ServiceClient(client_core=client_core)
+    def __init__(self, kubeconfig_path=KUBECONFIG_PATH, use_informers=False,
+                 max_threads=DEFAULT_MAX_THREADS, max_connections=None,
+                 keep_alive=True, connect_timeout=None, read_timeout=None,
+                 gzip=True, retry_policy=DEFAULT_RETRY_POLICY,
+                 use_event_cache=False, metrics=METRICS):
+        """
+        :param kubeconfig_path: the path of the kubeconfig file
+        :type kubeconfig_path: str
+        :param use_informers: to serve the reads of pods, deployments and
+        daemon sets from the informers cache
+        :type use_informers: bool
+        :param max_threads: the number of threads of the worker pool
+        (default value is DEFAULT_MAX_THREADS)
+        :type max_threads: int
+        :param max_connections: the size of the connection pool to the api
+        server (default is max_threads + EXTRA_CONNECTIONS)
+        :type max_connections: int
+        :param keep_alive: to enable TCP keep alive on the connections
+        :type keep_alive: bool
+        :param connect_timeout: seconds to wait for a connection
+        (default is no timeout)
+        :type connect_timeout: float
+        :param read_timeout: seconds to wait for the response of a request
+        that is not a watch (default is no timeout)
+        :type read_timeout: float
+        :param gzip: to ask the api server for gzip encoded responses
+        :type gzip: bool
+        :param retry_policy: the policy of retrying the requests that failed
+        with throttling, server or connection errors (None for no retries)
+        :type retry_policy: RetryPolicy
+        :param use_event_cache: to serve the events reads of the namespaces
+        (e.g. the checks of the started containers) from one list+watch of
+        the events per namespace, it needs the permission to list and watch
+        the events of the namespaces and keeps them in memory
+        :type use_event_cache: bool
+        :param metrics: the metrics to record the latency, the status and the
+        bytes of the requests in, by kind and verb, and the calls and the
+        waits of the clients (None to not record them)
+        :type metrics: Metrics
+        """
+        # The kubeconfig is loaded, and the apis and the clients of the
+        # resources are built, on their first use (see the lazy attributes
+        # below), so a script that reads pods does not pay for the rest
+        self._api_client_kwargs = {
+            "kubeconfig_path": kubeconfig_path, "max_threads": max_threads,
+            "max_connections": max_connections, "keep_alive": keep_alive,
+            "connect_timeout": connect_timeout, "read_timeout": read_timeout,
+            "gzip": gzip, "retry_policy": retry_policy, "metrics": metrics}
+        self.metrics = metrics
+        self.use_informers = use_informers
+        self.use_event_cache = use_event_cache
+
+        # The threads of the waits of all the clients
+        self.pool = WorkerPool(max_workers=max_threads)
+
+    @lazy_attribute
+    def api_client(self):
+        # Configure the client to the k8s environment, all the apis share
+        # one api client (one connection pool)
+        return create_api_client(**self._api_client_kwargs)
+
+    @lazy_attribute
+    def client_core(self):
+        return client.CoreV1Api(api_client=self.api_client)
+
+    @lazy_attribute
+    def client_app(self):
+        return client.AppsV1Api(api_client=self.api_client)
+
+    @lazy_attribute
+    def cache(self):
+        # Serve the reads of pods/deployments/daemon sets from memory,
+        # using one list+watch per kind and namespace
+        if not self.use_informers:
+            return None
+        return InformerCache(client_core=self.client_core,
+                             client_app=self.client_app)
+
+    @lazy_attribute
+    def event_cache(self):
+        # Serve the events of all the objects of a namespace from one
+        # list+watch of its events
+        if not self.use_event_cache:
+            return None
+        return EventCache(client_core=self.client_core)
+
+    @lazy_attribute
+    def pod(self):
+        return PodClient(client_core=self.client_core, cache=self.cache,
+                         pool=self.pool, event_cache=self.event_cache,
+                         metrics=self.metrics)
+
+    @lazy_attribute
+    def deployment(self):
+        return DeploymentClient(client_app=self.client_app, pod=self.pod,
+                                cache=self.cache, pool=self.pool,
+                                event_cache=self.event_cache,
+                                metrics=self.metrics)
+
+    @lazy_attribute
+    def daemon_set(self):
+        return DaemonSetClient(client_app=self.client_app,
+                               deployment=self.deployment, pod=self.pod,
+                               cache=self.cache, pool=self.pool,
+                               event_cache=self.event_cache,
+                               metrics=self.metrics)
+
+    @lazy_attribute
+    def namespace(self):
+        return NamespaceClient(client_core=self.client_core,
+                               metrics=self.metrics)
+
+    @lazy_attribute
+    def node(self):
+        return NodeClient(client_core=self.client_core, pool=self.pool,
+                          event_cache=self.event_cache, metrics=self.metrics)
+
+    @lazy_attribute
+    def secret(self):
+        return SecretClient(client_core=self.client_core,
+                            metrics=self.metrics)
+
+    @lazy_attribute
+    def service(self):
+        return ServiceClient(client_core=self.client_core,
+                             event_cache=self.event_cache,
+                             metrics=self.metrics)
+
+    def close(self):
+        """
+        Stop the informers of the client (if there are) and the worker pool,
+        and close the connections (only what was built is closed)
+        """
+        if lazy_attribute.is_built(self, "cache") and self.cache is not None:
+            self.cache.stop()
+        if lazy_attribute.is_built(self, "event_cache") and \
+                self.event_cache is not None:
+            self.event_cache.stop()
+        self.pool.shutdown()
+        if lazy_attribute.is_built(self, "node"):
+            self.node.close()
+        if lazy_attribute.is_built(self, "api_client"):
+            self.api_client.close()
+
+    def apply_resource(self, body, wait=True,
+                       max_threads=DEFAULT_MAX_THREADS):
+        """
+        Create a resource by its kind
+        :param body: the body of the resource
+        :type body: dictionary
+        :param wait: to wait until the creation is over (default value is True)
+        :type wait: bool
+        :param max_threads: max number of threads to use during waiting for
+        deployments and daemon sets (default value is DEFAULT_MAX_THREADS)
+        :type max_threads: int
+        :return: the name of the resource
+        :rtype: str
+        """
+        if body["kind"] == "Deployment":
+            return self.deployment.create(body=body, wait=wait,
+                                          max_threads=max_threads)
+        if body["kind"] == "DaemonSet":
+            return self.daemon_set.create(body=body, wait=wait,
+                                          max_threads=max_threads)
+        clients = {"Pod": self.pod, "Namespace": self.namespace,
+                   "Secret": self.secret, "Service": self.service}
+        return clients[body["kind"]].create(body=body, wait=wait)
 
     def create_from_yaml(self, yaml_path, wait=True,
                          max_threads=DEFAULT_MAX_THREADS):
+        """
+        Create the resources of a yaml file.
+        The resources are created tier after tier by the order of their kinds
+        (APPLY_ORDER), the resources of a tier are created and waited for
+        together in the threads of the worker pool.
+        :param yaml_path: the path of the yaml file
+        :type yaml_path: str
+        :param wait: to wait until each tier is created before creating the
+        next one (default value is True)
+        :type wait: bool
+        :param max_threads: max number of threads to use
+        (default value is DEFAULT_MAX_THREADS)
+        :type max_threads: int
+        """
         with open(yaml_path, "r") as f:
-            for resource in yaml.load_all(f.read()):
-                if resource.get("kind") is None:
-                    raise K8sInvalidResourceBody()
-
-                if resource["kind"] == "Pod":
-                    self.pod.create(body=resource, wait=wait)
-                if resource["kind"] == "Deployment":
-                    self.deployment.create(body=resource, wait=wait,
-                                           max_threads=max_threads)
-                if resource["kind"] == "DaemonSet":
-                    self.daemon_set.create(body=resource, wait=wait,
-                                           max_threads=max_threads)
-                if resource["kind"] == "Namespace":
-                    self.namespace.create(body=resource, wait=wait)
-                if resource["kind"] == "Secret":
-                    self.pod.create(body=resource, wait=wait)
-                if resource["kind"] == "Service":
-                    self.service.create(body=resource, wait=wait)
-                else:
-                    raise K8sInvalidResourceBody("unsupported resource type")
+            resources = list(yaml.safe_load_all(f.read()))
+        tiers = split_to_apply_tiers(
+            resources=resources,
+            supported_kinds=("Pod", "Deployment", "DaemonSet", "Namespace",
+                             "Secret", "Service"))
+        for tier in tiers:
+            self.pool.map(func=self.apply_resource,
+                          kwargs_list=[{"body": resource, "wait": wait,
+                                        "max_threads": max_threads}
+                                       for resource in tier],
+                          max_threads=max_threads)
+            logger.info(f"Created {len(tier)} resources of kinds "
+                        f"{sorted({resource['kind'] for resource in tier})}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+import heapq
+import logging
+import queue
+import threading
+from collections import namedtuple
+from time import monotonic
+
+from k8s_client.consts import (LOG_BUFFER_LINES, LOG_MERGE_DELAY,
+                               LOG_REFRESH_INTERVAL)
+from k8s_client.utils import iter_chunks, iter_lines
+
+logger = logging.getLogger(__name__)
+
+# The end of the logs of a follower
+END_OF_LOGS = None
+
+
+class LogLine(namedtuple("LogLine", ["timestamp", "pod", "container",
+                                     "line"])):
+    """
+    A line of the merged logs of many pods, str() is the line with the pod
+    and the container as a prefix
+    """
+
+    def __str__(self):
+        return f"[{self.pod}/{self.container}] {self.line}"
+
+
+def log_sort_key(timestamp):
+    """
+    Return the key to order the RFC3339 timestamps of the logs by.
+    The api server trims the trailing zeros of the nanoseconds, so the
+    fraction is padded to compare the timestamps as strings.
+    :param timestamp: the timestamp of a line (e.g. 2024-05-01T10:00:00.5Z)
+    :type timestamp: str
+    :rtype: str
+    """
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    return f"{seconds}.{fraction:0<9}"
+
+
+class LogFollower(object):
+    """
+    Follows the logs of one container in a thread of its own and buffers at
+    most buffer_lines of them, the thread waits while the buffer is full.
+    """
+
+    def __init__(self, pod_client, pod, container, namespace,
+                 since_seconds=None, tail_lines=None, follow=True,
+                 buffer_lines=LOG_BUFFER_LINES, notify=None):
+        """
+        :param pod_client: the client of the pods
+        :type pod_client: PodClient
+        :param pod: the name of the pod
+        :type pod: str
+        :param container: the name of the container
+        :type container: str
+        :param namespace: the namespace of the pod
+        :type namespace: str
+        :param since_seconds: only the lines of the last seconds
+        :type since_seconds: int
+        :param tail_lines: the number of lines from the end of the logs
+        :type tail_lines: int
+        :param follow: to keep reading the new lines
+        :type follow: bool
+        :param buffer_lines: max number of lines to buffer
+        :type buffer_lines: int
+        :param notify: event to set when a line is buffered
+        :type notify: threading.Event
+        """
+        self.pod_client = pod_client
+        self.pod = pod
+        self.container = container
+        self.namespace = namespace
+        self.since_seconds = since_seconds
+        self.tail_lines = tail_lines
+        self.follow = follow
+        self.lines = queue.Queue(maxsize=buffer_lines)
+        self.notify = notify or threading.Event()
+        self._stopped = threading.Event()
+        self._response = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, daemon=True,
+                name=f"logs-{self.pod}-{self.container}")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        response = self._response
+        if response is not None:
+            # unblock the read of a quiet stream
+            response.shutdown()
+
+    def _put(self, item):
+        while not self._stopped.is_set():
+            try:
+                self.lines.put(item, timeout=LOG_MERGE_DELAY)
+                self.notify.set()
+                return
+            except queue.Full:
+                continue
+
+    def _run(self):
+        try:
+            self._response = self.pod_client.log_response(
+                name=self.pod, namespace=self.namespace,
+                container=self.container, follow=self.follow,
+                since_seconds=self.since_seconds, tail_lines=self.tail_lines,
+                timestamps=True)
+            if self._stopped.is_set():
+                self._response.shutdown()
+            for line in iter_lines(chunks=iter_chunks(
+                    response=self._response)):
+                if self._stopped.is_set():
+                    break
+                timestamp, _, text = line.partition(" ")
+                self._put((log_sort_key(timestamp), timestamp, text))
+        except Exception as e:
+            if not self._stopped.is_set():
+                logger.warning(f"Stopped following the logs of container "
+                               f"{self.container} of pod {self.pod}: {e}")
+        finally:
+            self._put(END_OF_LOGS)
+
+
+def started_containers(pod):
+    """
+    Return the names of the containers of a pod that have logs (running or
+    terminated)
+    :param pod: the pod dictionary
+    :type pod: dictionary
+    :rtype: list
+    """
+    return [container_status["name"] for container_status in
+            pod.get("status", {}).get("containerStatuses") or []
+            if set(container_status.get("state") or {}) &
+            {"running", "terminated"}]
+
+
+def merge_pod_logs(pod_client, list_pods, namespace, containers=None,
+                   since_seconds=None, tail_lines=None, follow=True,
+                   buffer_lines=LOG_BUFFER_LINES, merge_delay=LOG_MERGE_DELAY,
+                   refresh_interval=LOG_REFRESH_INTERVAL):
+    """
+    Follow the logs of many pods at the same time and yield their lines
+    merged by their timestamps (k-way merge of the streams).
+    When following, a line waits for the other streams at most merge_delay
+    seconds, so a quiet pod does not hold back the others, and the pods are
+    listed again every refresh_interval seconds to follow the new pods from
+    the start of their logs.
+    :param pod_client: the client of the pods
+    :type pod_client: PodClient
+    :param list_pods: function that returns the pods dictionaries to follow
+    :type list_pods: function
+    :param namespace: the namespace of the pods
+    :type namespace: str
+    :param containers: the names of the containers to follow (default is all
+    the containers)
+    :type containers: list
+    :param since_seconds: only the lines of the last seconds (of the pods
+    that exist at the start)
+    :type since_seconds: int
+    :param tail_lines: the number of lines from the end of the logs of each
+    container (of the pods that exist at the start)
+    :type tail_lines: int
+    :param follow: to keep yielding the new lines until the generator is
+    closed, otherwise the logs that exist are yielded
+    :type follow: bool
+    :param buffer_lines: max number of lines to buffer for each container
+    :type buffer_lines: int
+    :param merge_delay: max seconds a line waits for the lines of the quiet
+    streams
+    :type merge_delay: float
+    :param refresh_interval: seconds between the lists of the pods
+    :type refresh_interval: float
+    :return: generator of LogLine
+    """
+    notify = threading.Event()
+    followers = {}
+    finished = set()
+    # the first line of each follower that is not merged yet:
+    # (sort key, arrival time, follower key, timestamp, text)
+    heads = []
+    waiting = set()
+    first_list = True
+    next_refresh = monotonic()
+
+    def refresh():
+        for pod in list_pods():
+            pod_name = pod["metadata"]["name"]
+            for container in started_containers(pod=pod):
+                key = (pod_name, container)
+                if key in followers or key in finished or \
+                        containers is not None and container not in containers:
+                    continue
+                followers[key] = LogFollower(
+                    pod_client=pod_client, pod=pod_name, container=container,
+                    namespace=namespace, follow=follow,
+                    since_seconds=since_seconds if first_list else None,
+                    tail_lines=tail_lines if first_list else None,
+                    buffer_lines=buffer_lines, notify=notify).start()
+                waiting.add(key)
+                logger.debug(f"Following the logs of container {container} "
+                             f"of pod {pod_name}")
+
+    try:
+        while True:
+            if monotonic() >= next_refresh and (follow or first_list):
+                try:
+                    refresh()
+                except Exception as e:
+                    if first_list:
+                        raise
+                    logger.warning(f"Failed to list the pods to follow: {e}")
+                first_list = False
+                next_refresh = monotonic() + refresh_interval
+            notify.clear()
+            for key in list(waiting):
+                try:
+                    item = followers[key].lines.get_nowait()
+                except queue.Empty:
+                    continue
+                waiting.discard(key)
+                if item is END_OF_LOGS:
+                    finished.add(key)
+                    del followers[key]
+                else:
+                    heapq.heappush(heads, (item[0], monotonic(), key,
+                                           item[1], item[2]))
+            if not heads and not followers and not follow:
+                return
+            # a line is merged when every stream has a line to compare, or
+            # when it waited long enough for the quiet streams
+            if heads and (not waiting or follow and
+                          monotonic() - heads[0][1] >= merge_delay):
+                _, _, key, timestamp, text = heapq.heappop(heads)
+                waiting.add(key)
+                yield LogLine(timestamp=timestamp, pod=key[0],
+                              container=key[1], line=text)
+                continue
+            timeout = next_refresh - monotonic() if follow else merge_delay
+            if heads and follow:
+                timeout = min(timeout,
+                              heads[0][1] + merge_delay - monotonic())
+            notify.wait(timeout=max(timeout, 0))
+    finally:
+        for follower in followers.values():
+            follower.stop()
+
+
+if __name__ == "__main__":
+    pass
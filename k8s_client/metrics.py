@@ -0,0 +1,412 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import deque
+from time import perf_counter, time
+from urllib.parse import urlsplit
+
+from kubernetes.client.rest import ApiException
+
+from k8s_client.consts import METRICS_LATENCY_BUCKETS, METRICS_SNAPSHOTS
+
+# The metrics of the requests, by the kind and the verb of the request
+REQUEST_SECONDS = "k8s_client_request_seconds"
+REQUESTS_TOTAL = "k8s_client_requests_total"
+RESPONSE_BYTES_TOTAL = "k8s_client_response_bytes_total"
+RETRIES_TOTAL = "k8s_client_retries_total"
+# The seconds of building the models of the responses, by the model
+DESERIALIZE_SECONDS = "k8s_client_deserialize_seconds"
+# The seconds of the methods of the clients, by the method
+CALL_SECONDS = "k8s_client_call_seconds"
+# The waits, by what is waited for and the kind of the loop (watch or poll)
+WAIT_SECONDS = "k8s_client_wait_seconds"
+WAIT_ITERATIONS_TOTAL = "k8s_client_wait_iterations_total"
+
+# The verbs of the methods of the requests, by if they name an object
+NAMED_VERBS = {"GET": "get", "POST": "create", "PUT": "update",
+               "PATCH": "patch", "DELETE": "delete"}
+COLLECTION_VERBS = {"GET": "list", "POST": "create",
+                    "DELETE": "deletecollection"}
+
+
+class Histogram(object):
+    """
+    Counts of observed values in buckets, each bucket counts the values that
+    are not greater than its upper bound (the last bucket is +Inf)
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """
+        Return the cumulative counts of the buckets by their upper bounds
+        :rtype: list
+        """
+        total = 0
+        result = []
+        for upper_bound, count in zip(list(self.buckets) + ["+Inf"],
+                                      self.counts):
+            total += count
+            result.append([upper_bound, total])
+        return result
+
+
+class Metrics(object):
+    """
+    Thread safe registry of counters and histograms with labels.
+    Recording a value costs a dictionary update under a lock, so the
+    registry can stay enabled in production, a snapshot of it is written to
+    a sink (in memory, json lines file, Prometheus text file) with flush.
+    Usage:
+        metrics.inc(REQUESTS_TOTAL, kind="pods", verb="list", status="200")
+        metrics.observe(REQUEST_SECONDS, 0.02, kind="pods", verb="list")
+        metrics.flush(sink=PrometheusSink(path="/var/lib/k8s_client.prom"))
+    """
+
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS, enabled=True):
+        """
+        :param buckets: the upper bounds of the buckets of the histograms
+        (seconds)
+        :type buckets: tuple
+        :param enabled: to record the values (a disabled registry ignores
+        them)
+        :type enabled: bool
+        """
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """
+        Add to a counter
+        :param name: the name of the counter
+        :type name: str
+        :param value: the value to add
+        :type value: float
+        :param labels: the labels of the counter
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        Add a value to a histogram
+        :param name: the name of the histogram
+        :type name: str
+        :param value: the observed value
+        :type value: float
+        :param labels: the labels of the histogram
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(
+                    buckets=self.buckets)
+            histogram.observe(value)
+
+    def counter(self, name, **labels):
+        """
+        Return the value of a counter (0 if it was not counted)
+        :rtype: float
+        """
+        with self._lock:
+            return self._counters.get(
+                (name, tuple(sorted(labels.items()))), 0)
+
+    def histogram(self, name, **labels):
+        """
+        Return a histogram (None if nothing was observed)
+        :rtype: Histogram
+        """
+        with self._lock:
+            return self._histograms.get(
+                (name, tuple(sorted(labels.items()))))
+
+    def snapshot(self):
+        """
+        Return the current values of all the metrics
+        :return: dictionary with the time, the counters and the histograms
+        (with cumulative bucket counts)
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "time": time(),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in
+                    sorted(self._counters.items())],
+                "histograms": [
+                    {"name": name, "labels": dict(labels),
+                     "buckets": histogram.cumulative(),
+                     "count": histogram.count, "sum": histogram.sum}
+                    for (name, labels), histogram in
+                    sorted(self._histograms.items(),
+                           key=lambda item: item[0])]}
+
+    def flush(self, sink):
+        """
+        Write a snapshot of the metrics to a sink
+        :param sink: object with a write(snapshot) method (e.g. MemorySink,
+        JsonLinesSink, PrometheusSink)
+        """
+        sink.write(snapshot=self.snapshot())
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# The default registry of the clients and the waits
+METRICS = Metrics()
+
+
+class MemorySink(object):
+    """
+    Keeps the last max_snapshots snapshots in memory
+    """
+
+    def __init__(self, max_snapshots=METRICS_SNAPSHOTS):
+        self.snapshots = deque(maxlen=max_snapshots)
+
+    def write(self, snapshot):
+        self.snapshots.append(snapshot)
+
+
+class JsonLinesSink(object):
+    """
+    Appends each snapshot to a file as a line of json
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, snapshot):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(snapshot) + "\n")
+
+
+class PrometheusSink(object):
+    """
+    Writes the last snapshot to a file in the Prometheus text format (e.g.
+    for the textfile collector of the node exporter), the file is replaced
+    at once so it is never read half written
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, snapshot):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(prometheus_text(snapshot=snapshot))
+        os.replace(temp_path, self.path)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace(
+        '"', '\\"')
+
+
+def _labels_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"'
+                          for name, value in labels.items()) + "}"
+
+
+def prometheus_text(snapshot):
+    """
+    Return a snapshot of the metrics in the Prometheus text format
+    :param snapshot: a snapshot of Metrics
+    :type snapshot: dict
+    :rtype: str
+    """
+    lines = []
+    typed = set()
+    for counter in snapshot["counters"]:
+        if counter["name"] not in typed:
+            typed.add(counter["name"])
+            lines.append(f"# TYPE {counter['name']} counter")
+        lines.append(f"{counter['name']}{_labels_text(counter['labels'])} "
+                     f"{counter['value']}")
+    for histogram in snapshot["histograms"]:
+        name, labels = histogram["name"], histogram["labels"]
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        for upper_bound, count in histogram["buckets"]:
+            lines.append(f"{name}_bucket"
+                         f"{_labels_text(dict(labels, le=upper_bound))} "
+                         f"{count}")
+        lines.append(f"{name}_sum{_labels_text(labels)} {histogram['sum']}")
+        lines.append(f"{name}_count{_labels_text(labels)} "
+                     f"{histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def request_labels(method, url):
+    """
+    Return the kind and the verb of a request to the api server
+    (e.g. GET /api/v1/namespaces/a/pods is ("pods", "list"))
+    :param method: the http method of the request
+    :type method: str
+    :param url: the url of the request
+    :type url: str
+    :return: the kind (with the subresource, e.g. pods/log) and the verb
+    :rtype: tuple
+    """
+    parts = urlsplit(url)
+    segments = parts.path.strip("/").split("/")
+    # /api/v1/... or /apis/<group>/<version>/...
+    segments = segments[2:] if segments[0] == "api" else segments[3:]
+    if len(segments) > 2 and segments[0] == "namespaces":
+        segments = segments[2:]
+    if not segments or not segments[0]:
+        return "unknown", method.lower()
+    kind = segments[0] if len(segments) < 3 else \
+        f"{segments[0]}/{segments[2]}"
+    method = method.upper()
+    if method == "GET" and "watch=true" in parts.query.lower():
+        return kind, "watch"
+    verbs = NAMED_VERBS if len(segments) > 1 else COLLECTION_VERBS
+    return kind, verbs.get(method, method.lower())
+
+
+def count_response_bytes(response, metrics, kind, verb):
+    """
+    Count the bytes of the body of a response (after decoding) as it is
+    read, by the api client, by a raw read or by a stream
+    """
+    response = getattr(response, "response", response)
+    read, read_chunked = response.read, response.read_chunked
+
+    def counted_read(*args, **kwargs):
+        data = read(*args, **kwargs)
+        metrics.inc(RESPONSE_BYTES_TOTAL, value=len(data), kind=kind,
+                    verb=verb)
+        return data
+
+    def counted_read_chunked(*args, **kwargs):
+        for chunk in read_chunked(*args, **kwargs):
+            metrics.inc(RESPONSE_BYTES_TOTAL, value=len(chunk), kind=kind,
+                        verb=verb)
+            yield chunk
+
+    # the reads of the body (data, stream) go through these methods
+    response.read = counted_read
+    response.read_chunked = counted_read_chunked
+
+
+def record_request(request, metrics, method, url):
+    """
+    Return the function that sends the attempts of one request and records
+    the latency, the status and the bytes of each attempt in the metrics,
+    the attempts after the first one are counted as retries.
+    The latency of a streaming request (watch, followed logs) is the time
+    to its first byte.
+    :param request: the request function of the rest client
+    :type request: function
+    :param metrics: the metrics to record in
+    :type metrics: Metrics
+    :param method: the http method of the request
+    :type method: str
+    :param url: the url of the request
+    :type url: str
+    :rtype: function
+    """
+    kind, verb = request_labels(method=method, url=url)
+    attempts = 0
+
+    def send_request(*args, **kwargs):
+        nonlocal attempts
+        if attempts:
+            metrics.inc(RETRIES_TOTAL, kind=kind, verb=verb)
+        attempts += 1
+        status = "error"
+        start_time = perf_counter()
+        try:
+            response = request(*args, **kwargs)
+            status = response.status
+            count_response_bytes(response=response, metrics=metrics,
+                                 kind=kind, verb=verb)
+            return response
+        except ApiException as e:
+            status = e.status or status
+            raise
+        finally:
+            metrics.observe(REQUEST_SECONDS, perf_counter() - start_time,
+                            kind=kind, verb=verb)
+            metrics.inc(REQUESTS_TOTAL, kind=kind, verb=verb,
+                        status=str(status))
+
+    return send_request
+
+
+def instrument_deserialize(api_client, metrics):
+    """
+    Record the seconds of building the models of the responses of an api
+    client, by the type of the model
+    :param api_client: the api client
+    :type api_client: kubernetes.client.ApiClient
+    :param metrics: the metrics to record in
+    :type metrics: Metrics
+    """
+    deserialize = api_client.deserialize
+
+    def timed_deserialize(response_text, response_type, *args, **kwargs):
+        start_time = perf_counter()
+        try:
+            return deserialize(response_text, response_type, *args, **kwargs)
+        finally:
+            metrics.observe(DESERIALIZE_SECONDS, perf_counter() - start_time,
+                            type=str(response_type))
+
+    api_client.deserialize = timed_deserialize
+
+
+def record_wait(wait, loop, iterations, seconds, result, metrics=METRICS):
+    """
+    Record a wait loop in the metrics
+    :param wait: what was waited for (e.g. the name of the list function)
+    :type wait: str
+    :param loop: the kind of the loop (watch or poll)
+    :type loop: str
+    :param iterations: the number of events (watch) or attempts (poll)
+    :type iterations: int
+    :param seconds: the duration of the wait
+    :type seconds: float
+    :param result: how the wait ended (met, timeout or error)
+    :type result: str
+    :param metrics: the metrics to record in (None to not record the wait)
+    :type metrics: Metrics
+    """
+    if metrics is None:
+        return
+    metrics.inc(WAIT_ITERATIONS_TOTAL, value=iterations, wait=wait,
+                loop=loop)
+    metrics.observe(WAIT_SECONDS, seconds, wait=wait, loop=loop,
+                    result=result)
+
+
+if __name__ == "__main__":
+    pass
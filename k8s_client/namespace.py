@@ -1,77 +1,158 @@
 import logging
-from kubernetes.client import V1Namespace
-from kubernetes.watch import Watch
+from kubernetes import client
 
-from k8s_client.consts import WAIT_TIMEOUT
-from k8s_client.utils import convert_obj_to_dict, field_filter, k8s_exceptions
-from k8s_client.exceptions import K8sInvalidResourceBody, K8sResourceTimeout
+from k8s_client.consts import WAIT_TIMEOUT, DEFAULT_PAGE_SIZE, ACTIVE_PHASE
+from k8s_client.utils import (convert_obj_to_dict, field_filter, k8s_exceptions,
+                              iter_pages, iter_objects, read_raw,
+                              read_raw_object, read_raw_list)
+from k8s_client.selectors import plan_selector
+from k8s_client.metrics import METRICS
+from k8s_client.exceptions import K8sInvalidResourceBody, K8sNotFoundException
+from k8s_client.watchers import wait_for_event
 
 logger = logging.getLogger(__name__)
 
 
 class NamespaceClient(object):
-    def __init__(self, client_core):
+    def __init__(self, client_core, metrics=METRICS):
         self.client_core = client_core
+        self.metrics = metrics
 
+    def current_state(self, namespace_name):
+        """
+        Return the namespace dictionary (None if there is no such namespace)
+        and the resourceVersion to watch its changes from, with one list
+        :param namespace_name: the name of the namespace
+        :type namespace_name: str
+        :rtype: tuple
+        """
+        namespaces_list = read_raw(self.client_core.list_namespace,
+                                   field_selector=f"metadata.name="
+                                                  f"{namespace_name}")
+        namespaces = namespaces_list.get("items") or []
+        return (namespaces[0] if namespaces else None,
+                namespaces_list["metadata"].get("resourceVersion"))
+
+    @staticmethod
+    def report_progress(namespace, on_progress=None):
+        """
+        Log the phase and the conditions of a namespace that is not ready yet
+        (e.g. the content or the finalizers that a Terminating namespace
+        waits for) and pass the namespace to the progress function
+        :param namespace: the namespace dictionary
+        :type namespace: dictionary
+        :param on_progress: function that is called with the namespace
+        dictionary on each change
+        :type on_progress: function
+        """
+        status = namespace.get("status", {})
+        messages = [condition["message"] for condition in
+                    status.get("conditions") or []
+                    if condition.get("status") == "True" and
+                    condition.get("message")]
+        logger.info(f"Namespace {namespace['metadata']['name']} is "
+                    f"{status.get('phase')}"
+                    f"{': ' + '; '.join(messages) if messages else ''}")
+        if on_progress is not None:
+            on_progress(namespace)
+
+    @k8s_exceptions
     def wait_for_namespace_deletion(self, namespace_name, timeout=None,
-                                    number_of_events=None):
+                                    number_of_events=None, on_progress=None):
         """
-        Wait until the namespace is deleted
+        Wait until the namespace is deleted, by watching only the namespace
+        from the resourceVersion of its current state (a namespace that is
+        already gone returns at once). The current state is read again when
+        that resourceVersion is gone.
         :param namespace_name: the name of the namespace
         :type namespace_name: str
         :param timeout: wait until time exceed
         :type timeout: int
-        :param number_of_events: number of events to loop through, as larger
-        the number of events, longer the function execution.
+        :param number_of_events: not used, the watch gets only the events of
+        the namespace (kept for compatibility)
         :type number_of_events: int
+        :param on_progress: function that is called with the namespace
+        dictionary on each change until it is deleted
+        :type on_progress: function
         """
-        timeout = timeout or WAIT_TIMEOUT
-        number_of_events = number_of_events or 10
-        watcher = Watch()
-        for event in watcher.stream(self.client_core.list_namespace,
-                                    timeout_seconds=timeout):
-            logger.debug(f"Event: {event['type']} Namespace: "
-                         f"{event['object'].metadata.name}")
-            number_of_events -= 1
-            if not number_of_events:
-                watcher.stop()
-            elif namespace_name in event[
-                'object'].metadata.name and "DELETED" in event['type']:
-                watcher.stop()
-                return True
-        logger.error(f"Timeout! Failed to Delete Namespace {namespace_name}")
-        raise K8sResourceTimeout(
-            message=f"Timeout! Failed to Delete Namespace {namespace_name}")
+        namespace, resource_version = self.current_state(
+            namespace_name=namespace_name)
+        if namespace is not None:
+            self.report_progress(namespace=namespace, on_progress=on_progress)
+
+            def deleted(event_type, namespace_dict):
+                if event_type == "DELETED":
+                    return True
+                self.report_progress(namespace=namespace_dict,
+                                     on_progress=on_progress)
+                return False
+
+            def relist():
+                current, current_version = self.current_state(
+                    namespace_name=namespace_name)
+                if current is None:
+                    return None
+                self.report_progress(namespace=current,
+                                     on_progress=on_progress)
+                return current_version
+
+            wait_for_event(list_func=self.client_core.list_namespace,
+                           condition=deleted, timeout=timeout or WAIT_TIMEOUT,
+                           resource_version=resource_version,
+                           description=f"the deletion of namespace "
+                                       f"{namespace_name}",
+                           relist=relist,
+                           metrics=self.metrics,
+                           field_selector=f"metadata.name={namespace_name}")
+        logger.info(f"Namespace {namespace_name} is deleted")
+        return True
 
+    @k8s_exceptions
     def wait_for_namespace_creation(self, namespace_name, timeout=None,
-                                    number_of_events=None):
+                                    number_of_events=None, on_progress=None):
         """
-        Wait to namespace creation
+        Wait until the namespace is Active, by watching only the namespace
+        from the resourceVersion of its current state
         :param namespace_name: the name of the namespace to wait for
         :type namespace_name: str
         :param timeout: wait until time exceed
         :type timeout: int
-        :param number_of_events: number of events to loop through, as larger
-        the number of events, longer the function execution.
+        :param number_of_events: not used, the watch gets only the events of
+        the namespace (kept for compatibility)
         :type number_of_events: int
+        :param on_progress: function that is called with the namespace
+        dictionary on each change until it is Active
+        :type on_progress: function
         """
-        timeout = timeout or WAIT_TIMEOUT
-        number_of_events = number_of_events or 10
-        watcher = Watch()
-        for event in watcher.stream(self.client_core.list_namespace,
-                                    timeout_seconds=timeout):
-            logger.debug(f"Event: {event['type']} Namespace: "
-                         f"{event['object'].metadata.name}")
-            number_of_events -= 1
-            if not number_of_events:
-                watcher.stop()
-            elif namespace_name in event['object'].metadata.name and "ADDED" in \
-                    event['type']:
-                watcher.stop()
-                return True
-        logger.error(f"Timeout! Failed to create Namespace {namespace_name}")
-        raise K8sResourceTimeout(
-            message=f"Timeout! Failed to create Namespace {namespace_name}")
+        namespace, resource_version = self.current_state(
+            namespace_name=namespace_name)
+        if namespace is None or \
+                namespace.get("status", {}).get("phase") != ACTIVE_PHASE:
+            if namespace is not None:
+                self.report_progress(namespace=namespace,
+                                     on_progress=on_progress)
+
+            def active(event_type, namespace_dict):
+                if event_type == "DELETED":
+                    raise K8sNotFoundException(
+                        message=f"Namespace {namespace_name} was deleted "
+                                f"while waiting for its creation")
+                if namespace_dict.get("status", {}).get("phase") == \
+                        ACTIVE_PHASE:
+                    return True
+                self.report_progress(namespace=namespace_dict,
+                                     on_progress=on_progress)
+                return False
+
+            wait_for_event(list_func=self.client_core.list_namespace,
+                           condition=active, timeout=timeout or WAIT_TIMEOUT,
+                           resource_version=resource_version,
+                           description=f"the creation of namespace "
+                                       f"{namespace_name}",
+                           metrics=self.metrics,
+                           field_selector=f"metadata.name={namespace_name}")
+        logger.info(f"Namespace {namespace_name} is active")
+        return True
 
     @k8s_exceptions
     def create(self, body, wait=True, timeout=None, number_of_events=None):
@@ -88,10 +169,10 @@ class NamespaceClient(object):
         :type: int
         """
         try:
-            if isinstance(body, V1Namespace):
-                namespace_name = body.metadata.name
-            elif isinstance(body, dict):
+            if isinstance(body, dict):
                 namespace_name = body["metadata"]["name"]
+            elif isinstance(body, client.V1Namespace):
+                namespace_name = body.metadata.name
             else:
                 raise K8sInvalidResourceBody()
         except (KeyError, AttributeError):
@@ -109,7 +190,7 @@ class NamespaceClient(object):
         return namespace_name
 
     @k8s_exceptions
-    def delete(self, name, wait=False):
+    def delete(self, name, wait=False, timeout=None, on_progress=None):
         """
         Delete namespace
         :param name: namespace's name
@@ -117,6 +198,11 @@ class NamespaceClient(object):
         :param wait: to wait until the deletion is over
         (default value is False)
         :type wait: bool
+        :param timeout: time to wait for the deletion of the namespace
+        :type timeout: int
+        :param on_progress: function that is called with the namespace
+        dictionary on each change until it is deleted
+        :type on_progress: function
         """
         # delete the namespace
         self.client_core.delete_namespace(name=name)
@@ -124,7 +210,9 @@ class NamespaceClient(object):
 
         # wait to the namespace to be deleted
         if wait:
-            self.wait_for_namespace_deletion(namespace_name=name)
+            self.wait_for_namespace_deletion(namespace_name=name,
+                                             timeout=timeout,
+                                             on_progress=on_progress)
 
     @k8s_exceptions
     def get(self, name, dict_output=False):
@@ -137,19 +225,19 @@ class NamespaceClient(object):
         :return: the namespace obj/dictionary
         :rtype: Union[V1Namespace,dictionary]
         """
+        if dict_output:
+            # read the dictionary from the json, without building the model
+            namespace = read_raw_object(self.client_core.read_namespace,
+                                        name=name)
+            logger.info(f"Got namespace {name}")
+            return namespace
         namespace = self.client_core.read_namespace(name=name)
         logger.info(f"Got namespace {name}")
-
-        # convert the obj to dict if required
-        if dict_output:
-            namespace = convert_obj_to_dict(namespace)
-        else:
-            namespace.metadata.resource_version = ''
-
+        namespace.metadata.resource_version = ''
         return namespace
 
     @k8s_exceptions
-    def list(self, dict_output=False, field_selector=""):
+    def list(self, dict_output=False, field_selector="", label_selector=""):
         """
         Return list of namespaces objects/dictionaries
         :param dict_output: to get the elements of the list dictionaries
@@ -157,15 +245,28 @@ class NamespaceClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific namespaces
         :type field_selector: str
+        :param label_selector: to filter the list to namespaces with specific
+        labels
+        :type label_selector: str
         :return: list of namespaces
         :rtype: list
         """
-        namespaces_list = self.client_core.list_namespace().items
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="namespaces",
+                             label_selector=label_selector)
+        if dict_output and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            namespaces_list = read_raw_list(self.client_core.list_namespace,
+                                            **plan.api_kwargs)
+            logger.info("Got namespaces")
+            return namespaces_list
+        namespaces_list = self.client_core.list_namespace(
+            **plan.api_kwargs).items
         logger.info("Got namespaces")
 
-        if field_selector:
+        if plan.remainder:
             namespaces_list = field_filter(obj_list=namespaces_list,
-                                           field_selector=field_selector)
+                                           field_selector=plan.remainder)
         # convert the list to list of dicts if required
         if dict_output:
             namespaces_list = [convert_obj_to_dict(namespace) for namespace in
@@ -175,9 +276,38 @@ class NamespaceClient(object):
                 namespace.metadata.resource_version = ''
         return namespaces_list
 
-    def list_names(self, field_selector=""):
+    def list_names(self, field_selector="", label_selector=""):
         return [namespace.metadata.name for namespace in
-                self.list(field_selector=field_selector)]
+                self.list(field_selector=field_selector,
+                          label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self, dict_output=False, field_selector="",
+                  label_selector="", page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the namespaces objects/dictionaries page by page, the next page
+        is requested only after the objects of the previous one were consumed
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the namespaces to specific namespaces
+        :type field_selector: str
+        :param label_selector: to filter the namespaces to namespaces with
+        specific labels
+        :type label_selector: str
+        :param page_size: the max number of namespaces in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of namespaces
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector, kind="namespaces",
+                             label_selector=label_selector)
+        pages = iter_pages(self.client_core.list_namespace,
+                           page_size=page_size,
+                           raw=dict_output and not plan.remainder,
+                           **plan.api_kwargs)
+        yield from iter_objects(pages=pages, field_selector=plan.remainder,
+                                dict_output=dict_output)
 
 
 if __name__ == "__main__":
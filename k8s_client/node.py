@@ -1,47 +1,150 @@
 import logging
-import paramiko
+import threading
+from collections import namedtuple
+from time import monotonic
 
-from k8s_client.consts import KEY_PATH, USER_NAME
+from k8s_client.consts import (KEY_PATH, USER_NAME, DEFAULT_PAGE_SIZE,
+                               DEFAULT_MAX_THREADS, NODE_ADDRESSES_TTL)
 from k8s_client.exceptions import K8sException
-from k8s_client.utils import k8s_exceptions, convert_obj_to_dict, field_filter
+from k8s_client.ssh import SSHPool
+from k8s_client.utils import (k8s_exceptions, convert_obj_to_dict, field_filter,
+                              iter_pages, iter_objects, read_raw_list)
+from k8s_client.informer import list_events
+from k8s_client.metrics import METRICS
+from k8s_client.selectors import plan_selector
+from k8s_client.workers import WorkerPool
 
 logger = logging.getLogger(__name__)
 
+# The result of a command on one of many nodes, error is the exception of a
+# command that could not run (output and exit_status are None then)
+NodeExecResult = namedtuple("NodeExecResult",
+                            ["name", "output", "exit_status", "error"])
+
 
 class NodeClient(object):
     def __init__(self,
-                 client_core):
+                 client_core,
+                 pool=None,
+                 ssh_pool=None,
+                 event_cache=None,
+                 metrics=METRICS):
         self.client_core = client_core
+        self.metrics = metrics
+        self.event_cache = event_cache
+        self.pool = pool or WorkerPool()
+        self.ssh_pool = ssh_pool or SSHPool(username=USER_NAME,
+                                            key_filename=KEY_PATH)
+        self._addresses = {}
+        self._addresses_time = None
+        self._addresses_lock = threading.Lock()
+
+    def execute_with_status(self,
+                            name,
+                            command,
+                            timeout=None):
+        """
+        Execute command on node, over the pooled ssh connection to the node
+        :param name: the name of the node
+        :type name: str
+        :param command: the command to run on the node
+        :type command: str
+        :param timeout: seconds to wait for the output of the command
+        :type timeout: float
+        :return: the output and the exit status of the command
+        :rtype: tuple
+        """
+        external_ip = self.get_external_ip(name=name)
+        if external_ip is None:
+            raise K8sException(message=f"Could not find an external ip of "
+                                       f"node {name}")
+        output, exit_status = self.ssh_execute(host=external_ip,
+                                               command=command,
+                                               timeout=timeout)
+        logger.info(f"Executed command {command} on node {name}")
+        return output, exit_status
 
     def execute(self,
                 name,
-                command):
+                command,
+                timeout=None):
         """
         Execute command on node
         :param name: the name of the node
         :type name: str
         :param command: the command to run on the node
         :type command: str
+        :param timeout: seconds to wait for the output of the command
+        :type timeout: float
         :return: the response
-        :rtype: str
+        :rtype: bytes
         """
-        external_ip = self.get_external_ip(name=name)
-        if external_ip is not None and KEY_PATH is not None:
-            # open session with the node
-            session = paramiko.SSHClient()
-            session.set_missing_host_key_policy(policy=paramiko.AutoAddPolicy())
-            session.connect(hostname=external_ip,
-                            username=USER_NAME,
-                            key_filename=KEY_PATH)
-            _, stdout, stderr = session.exec_command(command)
-            logger.info(f"Executed command {command} on "
-                        "node {name}")
-            # close the session
-            session.close()
-            return stdout.read()
-        elif external_ip is None:
-            raise K8sException(message=f"Could not find an external ip of "
-                                       "node {name}")
+        if KEY_PATH is None:
+            return None
+        output, _ = self.execute_with_status(name=name,
+                                             command=command,
+                                             timeout=timeout)
+        return output
+
+    def execute_many(self,
+                     names,
+                     command,
+                     concurrency=DEFAULT_MAX_THREADS,
+                     timeout=None):
+        """
+        Execute command on many nodes at the same time, the results are
+        yielded as the commands complete
+        :param names: the names of the nodes
+        :type names: list
+        :param command: the command to run on the nodes
+        :type command: str
+        :param concurrency: max number of nodes to run the command on at the
+        same time, more than the threads of the pool are started for the call
+        (default value is DEFAULT_MAX_THREADS)
+        :type concurrency: int
+        :param timeout: seconds to wait for the output of each command
+        :type timeout: float
+        :return: generator of NodeExecResult
+        """
+        # one list of the nodes for the addresses of all of them
+        self.node_addresses()
+        kwargs_list = [{"name": name, "command": command, "timeout": timeout}
+                       for name in names]
+        for kwargs, result, error in self.pool.as_completed(
+                func=self.execute_with_status, kwargs_list=kwargs_list,
+                max_threads=concurrency):
+            output, exit_status = result if error is None else (None, None)
+            if error is not None:
+                logger.warning(f"Failed to execute command {command} on node "
+                               f"{kwargs['name']}: {error}")
+            yield NodeExecResult(name=kwargs["name"], output=output,
+                                 exit_status=exit_status, error=error)
+
+    def ssh_execute(self,
+                    host,
+                    command,
+                    timeout=None):
+        """
+        Execute command on a host over ssh (with the KEY_PATH key), the ssh
+        connections are kept open in the ssh pool and reused
+        :param host: the address of the host
+        :type host: str
+        :param command: the command to run on the host
+        :type command: str
+        :param timeout: seconds to wait for the output of the command
+        :type timeout: float
+        :return: the output and the exit status of the command
+        :rtype: tuple
+        """
+        return self.ssh_pool.execute(host=host,
+                                     command=command,
+                                     timeout=timeout)
+
+    def close(self):
+        """
+        Close the ssh connections to the nodes
+        """
+        self.ssh_pool.close()
 
     def get(self,
             name,
@@ -60,13 +163,36 @@ class NodeClient(object):
         logger.info(f"Got node {name}")
         return nodes_list[0]
 
+    def node_addresses(self,
+                       refresh=False):
+        """
+        Return the addresses of all the nodes, from one list of the nodes
+        that is cached for NODE_ADDRESSES_TTL seconds
+        :param refresh: to list the nodes even if the cache is fresh
+        :type refresh: bool
+        :return: the addresses of each node by their types, by node name
+        :rtype: dict
+        """
+        with self._addresses_lock:
+            if refresh or self._addresses_time is None or \
+                    monotonic() - self._addresses_time > NODE_ADDRESSES_TTL:
+                self._addresses = {
+                    node["metadata"]["name"]: {
+                        address.get("type"): address.get("address")
+                        for address in
+                        node.get("status", {}).get("addresses", [])}
+                    for node in self.list(dict_output=True)}
+                self._addresses_time = monotonic()
+            return self._addresses
+
     def get_address(self,
                     name,
                     kind):
-        addresses = self.get(name=name).get("status", {}).get("addresses", [])
-        return next((address for address in addresses
-                     if address.get("type") == kind),
-                    None)
+        addresses = self.node_addresses().get(name)
+        if addresses is None:
+            # the node may have joined after the last list
+            addresses = self.node_addresses(refresh=True).get(name, {})
+        return addresses.get(kind)
 
     def get_internal_ip(self,
                         name):
@@ -83,7 +209,8 @@ class NodeClient(object):
     @k8s_exceptions
     def list(self,
              dict_output=False,
-             field_selector=""):
+             field_selector="",
+             label_selector=""):
         """
         Return list of nodes objects/dictionaries
         :param dict_output: to get the elements of the list dictionaries
@@ -91,15 +218,27 @@ class NodeClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific nodes
         :type field_selector: str
+        :param label_selector: to filter the list to nodes with specific labels
+        :type label_selector: str
         :return: list of nodes
         :rtype: list
         """
-        nodes_list = self.client_core.list_node().items
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector,
+                             kind="nodes",
+                             label_selector=label_selector)
+        if dict_output and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            nodes_list = read_raw_list(self.client_core.list_node,
+                                       **plan.api_kwargs)
+            logger.info("Got nodes")
+            return nodes_list
+        nodes_list = self.client_core.list_node(**plan.api_kwargs).items
         logger.info("Got nodes")
 
-        if field_selector:
+        if plan.remainder:
             nodes_list = field_filter(obj_list=nodes_list,
-                                      field_selector=field_selector)
+                                      field_selector=plan.remainder)
 
         # convert the list to list of dicts if required
         if dict_output:
@@ -112,9 +251,43 @@ class NodeClient(object):
         return nodes_list
 
     def list_names(self,
-                   field_selector=""):
+                   field_selector="",
+                   label_selector=""):
         return [node.metadata.name
-                for node in self.list(field_selector=field_selector)]
+                for node in self.list(field_selector=field_selector,
+                                      label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self,
+                  dict_output=False,
+                  field_selector="",
+                  label_selector="",
+                  page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the nodes objects/dictionaries page by page, the next page is
+        requested only after the objects of the previous one were consumed
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the nodes to specific nodes
+        :type field_selector: str
+        :param label_selector: to filter the nodes to nodes with specific labels
+        :type label_selector: str
+        :param page_size: the max number of nodes in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of nodes
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector,
+                             kind="nodes",
+                             label_selector=label_selector)
+        pages = iter_pages(self.client_core.list_node,
+                           page_size=page_size,
+                           raw=dict_output and not plan.remainder,
+                           **plan.api_kwargs)
+        yield from iter_objects(pages=pages,
+                                field_selector=plan.remainder,
+                                dict_output=dict_output)
 
     @k8s_exceptions
     def events(self,
@@ -130,12 +303,13 @@ class NodeClient(object):
         :rtype: list
         """
         node_id = self.get(name=name, ).metadata.uid
-        events = self.client_core.list_event_for_all_namespaces(
-            field_selector=f"involvedObject.uid=={node_id}").items
+        # the events of the nodes may be in any namespace
+        events = list_events(client_core=self.client_core, uid=node_id,
+                             event_cache=self.event_cache)
         logger.info(f"Got the events of node {name}")
         if only_messages:
-            events = [event["message"] for event in events
-                      if event.get("message") is not None]
+            events = [event.message for event in events if
+                      event.message is not None]
         return events
 
     @k8s_exceptions
@@ -1,22 +1,108 @@
 import logging
+import threading
+from collections import namedtuple
+from time import monotonic
 
-from kubernetes.client import V1Pod
+from kubernetes import client
 from kubernetes.stream import stream
 
-from k8s_client.utils import convert_obj_to_dict, field_filter, k8s_exceptions
+from k8s_client.utils import (convert_obj_to_dict, field_filter, k8s_exceptions,
+                              iter_pages, iter_objects, read_raw_object,
+                              read_raw_list, iter_chunks, iter_lines,
+                              delete_collection)
+from k8s_client.informer import list_events
+from k8s_client.metrics import METRICS
+from k8s_client.selectors import plan_selector
 from k8s_client.exceptions import (K8sInvalidResourceBody, K8sAuthenticationException,
                                    K8sPullingException, K8sNotFoundException,
-                                   K8sRuntimeException)
+                                   K8sRuntimeException, K8sResourceTimeout)
+from k8s_client.watchers import wait_for_event
+from k8s_client.workers import WorkerPool
 from k8s_client.consts import (DEFAULT_NAMESPACE, COMPLETE_STATE, AUTHENTICATION_EXCEPTION,
                                PULLING_EXCEPTION, CREATED_SUCCESSFULLY, ERROR_STATE,
-                               PULLING_FAIL)
+                               PULLING_FAIL, PULLING_REASONS, WAIT_TIMEOUT,
+                               DEFAULT_PAGE_SIZE, DEFAULT_MAX_THREADS,
+                               EXEC_UPDATE_INTERVAL, DELETE_PROPAGATION_POLICY)
 
 logger = logging.getLogger(__name__)
 
+# The result of a command on one of many pods, error is the exception of a
+# command that could not run (the other fields but the name are None then)
+PodExecResult = namedtuple("PodExecResult",
+                           ["name", "namespace", "output", "error_output",
+                            "exit_status", "error"])
+
+
+def read_exec_stream(resp, on_output=None, timeout=None):
+    """
+    Read the stdout and the stderr of an exec as they arrive, until the
+    command exits
+    :param resp: the websocket client of the exec
+    :type resp: kubernetes.stream.ws_client.WSClient
+    :param on_output: function that is called with the channel ('stdout' or
+    'stderr') and the data of each chunk of the output as it arrives
+    :type on_output: function
+    :param timeout: max seconds to wait for the command (None for no limit)
+    :type timeout: float
+    :return: the stdout, the stderr and the exit status of the command
+    :rtype: tuple
+    """
+    output = {"stdout": [], "stderr": []}
+    start_time = monotonic()
+
+    def read_channels():
+        for channel, read in (("stdout", resp.read_stdout),
+                              ("stderr", resp.read_stderr)):
+            data = read(timeout=0)
+            if data:
+                output[channel].append(data)
+                if on_output is not None:
+                    on_output(channel, data)
+
+    try:
+        while resp.is_open():
+            if timeout is not None and monotonic() - start_time > timeout:
+                raise K8sResourceTimeout(
+                    message=f"Timeout! The command did not exit after "
+                            f"{timeout} seconds")
+            resp.update(timeout=EXEC_UPDATE_INTERVAL)
+            read_channels()
+        # the last chunks that arrived with the close of the stream
+        read_channels()
+        try:
+            exit_status = resp.returncode
+        except (TypeError, KeyError, ValueError):
+            # the stream closed without the status of the command
+            exit_status = None
+    finally:
+        resp.close()
+    return "".join(output["stdout"]), "".join(output["stderr"]), exit_status
+
 
 class PodClient(object):
-    def __init__(self, client_core):
+    def __init__(self, client_core, cache=None, pool=None, event_cache=None,
+                 metrics=METRICS):
         self.client_core = client_core
+        self.metrics = metrics
+        self.cache = cache
+        self.event_cache = event_cache
+        self.pool = pool or WorkerPool()
+        self._local = threading.local()
+
+    def exec_api(self):
+        """
+        Return the api of the execs of the current thread.
+        stream() replaces the call_api of the api client during an exec, so
+        each thread execs through an api client of its own and the requests
+        of the other threads on the shared api client are not affected.
+        :rtype: CoreV1Api
+        """
+        api = getattr(self._local, "exec_api", None)
+        if api is None:
+            api = client.CoreV1Api(api_client=client.ApiClient(
+                configuration=self.client_core.api_client.configuration))
+            self._local.exec_api = api
+        return api
 
     @staticmethod
     def check_container_state(container_status, running_containers):
@@ -68,9 +154,10 @@ class PodClient(object):
         :return: True/False
         :rtype: bool
         """
-        events_list = self.client_core.list_namespaced_event(
-            namespace=namespace, field_selector=f"involvedObject.uid=={pod_id}")
-        for event in events_list.items:
+        events_list = list_events(client_core=self.client_core, uid=pod_id,
+                                  namespace=namespace,
+                                  event_cache=self.event_cache)
+        for event in events_list:
             if AUTHENTICATION_EXCEPTION in event.message:
                 raise K8sAuthenticationException(message=event.message)
             if PULLING_EXCEPTION in event.message or PULLING_FAIL in event.message:
@@ -79,10 +166,60 @@ class PodClient(object):
                 containers_counter -= 1
         return not containers_counter
 
+    @staticmethod
+    def check_pulling_state(container_status):
+        """
+        Raise if the container is waiting for an image it failed to pull
+        :param container_status: the status of the checked container
+        :type container_status: dictionary
+        """
+        waiting = container_status.get("state", {}).get("waiting") or {}
+        if waiting.get("reason") not in PULLING_REASONS:
+            return
+        message = waiting.get("message") or waiting["reason"]
+        if AUTHENTICATION_EXCEPTION in message:
+            raise K8sAuthenticationException(message=message)
+        raise K8sPullingException(message=message)
+
+    @staticmethod
+    def are_containers_running(pod_dict, containers_counter):
+        """
+        Check if all the containers of the pod are running (or completed)
+        :param pod_dict: the pod as the api returns it (camelCase dictionary)
+        :type pod_dict: dictionary
+        :param containers_counter: the number of the pod's containers
+        :type containers_counter: int
+        :return: True/False
+        :rtype: bool
+        """
+        container_statuses = pod_dict.get("status", {}).get(
+            "containerStatuses") or []
+        if len(container_statuses) < containers_counter:
+            return False
+        if not all("state" in container_status for container_status in
+                   container_statuses):
+            return False
+        running_containers = 0
+        for container_status in container_statuses:
+            PodClient.check_pulling_state(container_status=container_status)
+            running_containers_before = running_containers
+            running_containers = PodClient.check_container_state(
+                container_status=container_status["state"],
+                running_containers=running_containers)
+            if running_containers_before == running_containers and container_status.get("lastState"):
+                running_containers = PodClient.check_container_state(
+                    container_status=container_status["lastState"],
+                    running_containers=running_containers)
+            if running_containers_before == running_containers:
+                return False
+        return running_containers == len(container_statuses)
+
+    @k8s_exceptions
     def wait_for_containers_to_run(self, pod_name, pod_id, containers_counter,
-                                   namespace=DEFAULT_NAMESPACE):
+                                   namespace=DEFAULT_NAMESPACE,
+                                   timeout=WAIT_TIMEOUT):
         """
-        Wait until the containers are running
+        Wait until the containers are running, by watching the pod
         :param pod_name: the name of the pod
         :type pod_name: str
         :param pod_id: the id of the pod
@@ -92,37 +229,29 @@ class PodClient(object):
         :type containers_counter: int
         :param namespace: the namespace of the pod (default value is 'default')
         :type namespace: str
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
         """
-        if not self.is_containers_started(pod_id=pod_id,
-                                          containers_counter=containers_counter,
-                                          namespace=namespace):
-            return False
-
-        pod_dict = self.get(name=pod_name, namespace=namespace,
-                            dict_output=True)
-        if not pod_dict.get("status", {}).get("containerStatuses", []):
-            return False
-        container_statuses = pod_dict["status"]["containerStatuses"]
-        if not all("state" in container_status for container_status in
-                   container_statuses):
-            return False
-        else:
-            running_containers = 0
-            container_statuses = pod_dict["status"]["containerStatuses"]
-            for container_status in container_statuses:
-                running_containers_before = running_containers
-                running_containers = PodClient.check_container_state(
-                    container_status=container_status["state"],
-                    running_containers=running_containers)
-                if running_containers_before == running_containers and "lastState" in container_status:
-                    running_containers = PodClient.check_container_state(
-                        container_status=container_status["lastState"],
-                        running_containers=running_containers)
-                if running_containers_before == running_containers:
-                    return False
 
-            if running_containers == len(container_statuses):
-                return True
+        def containers_running(event_type, pod_dict):
+            # skip events of an older pod with the same name
+            if pod_id and pod_dict.get("metadata", {}).get("uid") != pod_id:
+                return False
+            if event_type == "DELETED":
+                raise K8sNotFoundException(
+                    message=f"Pod {pod_name} was deleted while waiting for "
+                            f"its containers to run")
+            return PodClient.are_containers_running(
+                pod_dict=pod_dict, containers_counter=containers_counter)
+
+        wait_for_event(list_func=self.client_core.list_namespaced_pod,
+                       condition=containers_running, timeout=timeout,
+                       description=f"the containers of pod {pod_name} in "
+                                   f"{namespace} namespace to run",
+                       metrics=self.metrics, namespace=namespace,
+                       field_selector=f"metadata.name={pod_name}")
+        logger.info(f"The containers of pod {pod_name} are running")
+        return True
 
     @k8s_exceptions
     def create(self, body, namespace=DEFAULT_NAMESPACE, wait=True):
@@ -141,16 +270,16 @@ class PodClient(object):
         # check the type of the body and that it contains name
         # and raise exception if not
         try:
-            if isinstance(body, V1Pod):
+            if isinstance(body, dict):
+                pod_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+                containers_counter = len(body["spec"]["containers"])
+            elif isinstance(body, client.V1Pod):
                 pod_name = body.metadata.name
                 if hasattr(body, "metadata") and hasattr(body.metadata,
                                                          "namespace"):
                     namespace = body.metadata.namespace
                 containers_counter = len(body.spec.containers)
-            elif isinstance(body, dict):
-                pod_name = body["metadata"]["name"]
-                namespace = body.get("metadata", {}).get("namespace", namespace)
-                containers_counter = len(body["spec"]["containers"])
             else:
                 raise K8sInvalidResourceBody()
         except (KeyError, AttributeError):
@@ -233,7 +362,7 @@ class PodClient(object):
         command_prefix = command_prefix or ['sh', '-c']
         command = command_prefix + [command]
         kwargs = {"container": container} if container is not None else {}
-        resp = stream(func=self.client_core.connect_post_namespaced_pod_exec,
+        resp = stream(func=self.exec_api().connect_post_namespaced_pod_exec,
                       name=name, namespace=namespace, command=command,
                       stdout=True, stderr=stderr, stdin=stdin, tty=tty,
                       **kwargs)
@@ -247,6 +376,168 @@ class PodClient(object):
                                              container_name=container) if container is not None else ""))
         return resp
 
+    @k8s_exceptions
+    def execute_with_status(self, name, command, command_prefix=None,
+                            namespace=DEFAULT_NAMESPACE, container=None,
+                            timeout=None, on_output=None):
+        """
+        Execute command on pod, reading its output as it arrives
+        :param name: the name of the pod
+        :type name: str
+        :param command: the command to run on the pod
+        :type command: str
+        :param command_prefix: the prefix to the command
+        (default is ['sh', '-c'])
+        :type command_prefix: list
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param container: specific container to run the command on
+        (if there is only one it is not relevant)
+        :type container: str
+        :param timeout: max seconds to wait for the command (None for no limit)
+        :type timeout: float
+        :param on_output: function that is called with the channel ('stdout'
+        or 'stderr') and the data of each chunk of the output as it arrives
+        :type on_output: function
+        :return: the stdout, the stderr and the exit status of the command
+        :rtype: tuple
+        """
+        command_prefix = command_prefix or ['sh', '-c']
+        kwargs = {"container": container} if container is not None else {}
+        resp = stream(func=self.exec_api().connect_post_namespaced_pod_exec,
+                      name=name, namespace=namespace,
+                      command=command_prefix + [command], stdout=True,
+                      stderr=True, stdin=False, tty=False,
+                      _preload_content=False, **kwargs)
+        result = read_exec_stream(resp=resp, on_output=on_output,
+                                  timeout=timeout)
+        logger.info(f"Executed {command} on pod {name} from namespace "
+                    f"{namespace}, exit status {result[2]}")
+        return result
+
+    def execute_many(self, command, pods=None, namespace=DEFAULT_NAMESPACE,
+                     field_selector="", label_selector="",
+                     command_prefix=None, container=None,
+                     concurrency=DEFAULT_MAX_THREADS, timeout=None,
+                     on_output=None):
+        """
+        Execute command on many pods at the same time, the results are
+        yielded as the commands complete
+        :param command: the command to run on the pods
+        :type command: str
+        :param pods: the pods (names, objects or dictionaries), default is
+        the pods of the namespace that match the selectors
+        :type pods: list
+        :param namespace: the namespace of the pods (default value is
+        'default')
+        :type namespace: str
+        :param field_selector: to run on specific pods (when pods is None)
+        :type field_selector: str
+        :param label_selector: to run on pods with specific labels (when pods
+        is None)
+        :type label_selector: str
+        :param command_prefix: the prefix to the command
+        (default is ['sh', '-c'])
+        :type command_prefix: list
+        :param container: specific container to run the command on
+        :type container: str
+        :param concurrency: max number of pods to run the command on at the
+        same time, more than the threads of the pool are started for the call
+        (default value is DEFAULT_MAX_THREADS)
+        :type concurrency: int
+        :param timeout: max seconds to wait for each command
+        :type timeout: float
+        :param on_output: function that is called with the name of the pod,
+        the channel ('stdout' or 'stderr') and the data of each chunk of the
+        output as it arrives (from the threads of the pool)
+        :type on_output: function
+        :return: generator of PodExecResult
+        """
+        if pods is None:
+            pods = self.list_names(namespace=namespace,
+                                   field_selector=field_selector,
+                                   label_selector=label_selector)
+        kwargs_list = []
+        for pod in pods:
+            pod_name, pod_namespace = self.pod_key(pod=pod,
+                                                   namespace=namespace)
+            kwargs_list.append({
+                "name": pod_name, "namespace": pod_namespace,
+                "command": command, "command_prefix": command_prefix,
+                "container": container, "timeout": timeout,
+                "on_output": None if on_output is None else
+                (lambda channel, data, pod_name=pod_name:
+                 on_output(pod_name, channel, data))})
+        for kwargs, result, error in self.pool.as_completed(
+                func=self.execute_with_status, kwargs_list=kwargs_list,
+                max_threads=concurrency):
+            output, error_output, exit_status = result if error is None \
+                else (None, None, None)
+            if error is not None:
+                logger.warning(f"Failed to execute {command} on pod "
+                               f"{kwargs['name']}: {error}")
+            yield PodExecResult(name=kwargs["name"],
+                                namespace=kwargs["namespace"], output=output,
+                                error_output=error_output,
+                                exit_status=exit_status, error=error)
+
+    @staticmethod
+    def pod_key(pod, namespace=DEFAULT_NAMESPACE):
+        """
+        Return the name and the namespace of a pod
+        :param pod: the name, the object or the dictionary of the pod
+        :type pod: Union[str,V1Pod,dictionary]
+        :param namespace: the namespace of a pod that does not have one
+        :type namespace: str
+        :rtype: tuple
+        """
+        if isinstance(pod, str):
+            return pod, namespace
+        if isinstance(pod, dict):
+            return pod["metadata"]["name"], pod["metadata"].get("namespace",
+                                                                namespace)
+        return pod.metadata.name, pod.metadata.namespace or namespace
+
+    @k8s_exceptions
+    def delete_collection(self, namespace=DEFAULT_NAMESPACE, field_selector="",
+                          label_selector="",
+                          propagation_policy=DELETE_PROPAGATION_POLICY,
+                          grace_period_seconds=None, wait=False,
+                          timeout=WAIT_TIMEOUT):
+        """
+        Delete all the pods of the namespace that match the selectors with
+        one request, and wait for their deletion with one watch
+        :param namespace: the namespace of the pods
+        (default value is 'default')
+        :type namespace: str
+        :param field_selector: to delete specific pods, only the fields the
+        api server supports (all the pods of the namespace by default)
+        :type field_selector: str
+        :param label_selector: to delete pods with specific labels
+        :type label_selector: str
+        :param propagation_policy: how to delete the dependents
+        (default value is DELETE_PROPAGATION_POLICY)
+        :type propagation_policy: str
+        :param grace_period_seconds: the termination grace period of the pods
+        (default is the grace period of each pod)
+        :type grace_period_seconds: int
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: the names of the deleted pods
+        :rtype: list
+        """
+        return delete_collection(
+            delete_func=self.client_core.delete_collection_namespaced_pod,
+            list_func=self.client_core.list_namespaced_pod, namespace=namespace,
+            kind="pods", field_selector=field_selector,
+            label_selector=label_selector,
+            propagation_policy=propagation_policy,
+            grace_period_seconds=grace_period_seconds, wait=wait,
+            timeout=timeout, metrics=self.metrics)
+
     @k8s_exceptions
     def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
         """
@@ -260,8 +551,18 @@ class PodClient(object):
         :return: the pod obj/dictionary
         :rtype: Union[V1Pod,dictionary]
         """
-        pod = self.client_core.read_namespaced_pod(name=name,
-                                                   namespace=namespace)
+        pod = None
+        if self.cache is not None:
+            pod = self.cache.get(kind="pods", name=name, namespace=namespace)
+        if pod is None and dict_output:
+            # read the dictionary from the json, without building the model
+            pod = read_raw_object(self.client_core.read_namespaced_pod,
+                                  name=name, namespace=namespace)
+            logger.info(f"Got pod {name} from {namespace} namespace")
+            return pod
+        if pod is None:
+            pod = self.client_core.read_namespaced_pod(name=name,
+                                                       namespace=namespace)
         logger.info(f"Got pod {name} from {namespace} namespace")
 
         # convert the obj to dict if required
@@ -290,7 +591,7 @@ class PodClient(object):
 
     @k8s_exceptions
     def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-             dict_output=False, field_selector=""):
+             dict_output=False, field_selector="", label_selector=""):
         """
         Return list of pods objects/dictionaries
         :param namespace: the namespace of the pod (default value is 'default')
@@ -302,20 +603,42 @@ class PodClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific pods
         :type field_selector: str
+        :param label_selector: to filter the list to pods with specific labels
+        :type label_selector: str
         :return: list of pods
         :rtype: list
         """
-        if all_namespaces:
-            pods_list = self.client_core.list_pod_for_all_namespaces().items
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="pods",
+                             label_selector=label_selector)
+        if dict_output and self.cache is None and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            if all_namespaces:
+                pods_list = read_raw_list(
+                    self.client_core.list_pod_for_all_namespaces,
+                    **plan.api_kwargs)
+            else:
+                pods_list = read_raw_list(self.client_core.list_namespaced_pod,
+                                          namespace=namespace,
+                                          **plan.api_kwargs)
+            logger.info("Got the pods list")
+            return pods_list
+        if self.cache is not None:
+            pods_list = plan.apply_server_part(self.cache.list(
+                kind="pods", namespace=None if all_namespaces else namespace))
+            logger.info("Got the pods list from the cache")
+        elif all_namespaces:
+            pods_list = self.client_core.list_pod_for_all_namespaces(
+                **plan.api_kwargs).items
             logger.info("Got the pods list from all the namespaces")
         else:
             pods_list = self.client_core.list_namespaced_pod(
-                namespace=namespace).items
+                namespace=namespace, **plan.api_kwargs).items
             logger.info(f"Got the pods list from {namespace} namespace")
 
-        if field_selector:
+        if plan.remainder:
             pods_list = field_filter(obj_list=pods_list,
-                                     field_selector=field_selector)
+                                     field_selector=plan.remainder)
 
         # convert the list to list of dicts if required
         if dict_output:
@@ -327,10 +650,51 @@ class PodClient(object):
         return pods_list
 
     def list_names(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-                   field_selector=""):
+                   field_selector="", label_selector=""):
         return [pod.metadata.name for pod in
                 self.list(namespace=namespace, all_namespaces=all_namespaces,
-                          field_selector=field_selector)]
+                          field_selector=field_selector,
+                          label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                  dict_output=False, field_selector="", label_selector="",
+                  page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the pods objects/dictionaries page by page, the next page is
+        requested only after the objects of the previous one were consumed
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the pods from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the pods to specific pods
+        :type field_selector: str
+        :param label_selector: to filter the pods to pods with specific
+        labels
+        :type label_selector: str
+        :param page_size: the max number of pods in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of pods
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector, kind="pods",
+                             label_selector=label_selector)
+        raw = dict_output and not plan.remainder
+        if self.cache is not None:
+            pages = [plan.apply_server_part(self.cache.list(
+                kind="pods", namespace=None if all_namespaces else namespace))]
+        elif all_namespaces:
+            pages = iter_pages(self.client_core.list_pod_for_all_namespaces,
+                               page_size=page_size, raw=raw, **plan.api_kwargs)
+        else:
+            pages = iter_pages(self.client_core.list_namespaced_pod,
+                               page_size=page_size, raw=raw,
+                               namespace=namespace, **plan.api_kwargs)
+        yield from iter_objects(pages=pages, field_selector=plan.remainder,
+                                dict_output=dict_output)
 
     @k8s_exceptions
     def logs(self, name, namespace=DEFAULT_NAMESPACE, container=None):
@@ -355,6 +719,102 @@ class PodClient(object):
                                                         namespace=namespace,
                                                         **kwargs)
 
+    def log_response(self, name, namespace=DEFAULT_NAMESPACE, container=None,
+                     follow=False, tail_lines=None, since_seconds=None,
+                     limit_bytes=None, timestamps=False):
+        """
+        Return the streamed response of the logs of a pod (the body is not
+        read yet)
+        :rtype: urllib3.response.HTTPResponse
+        """
+        kwargs = {key: value for key, value in (
+            ("container", container), ("tail_lines", tail_lines),
+            ("since_seconds", since_seconds), ("limit_bytes", limit_bytes))
+            if value is not None}
+        return self.client_core.read_namespaced_pod_log(
+            name=name, namespace=namespace, follow=follow,
+            timestamps=timestamps, _preload_content=False, **kwargs)
+
+    @k8s_exceptions
+    def iter_logs(self, name, namespace=DEFAULT_NAMESPACE, container=None,
+                  follow=False, tail_lines=None, since_seconds=None,
+                  limit_bytes=None, timestamps=False):
+        """
+        Yield the lines of pod's logs as they are read from the response, so
+        the memory does not grow with the size of the logs
+        :param name: the name of the pod
+        :type name: str
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param container: specific container to get the logs from
+        (if there is only one it is not relevant)
+        :type container: str
+        :param follow: to keep yielding the new lines until the container
+        stops or the generator is closed
+        :type follow: bool
+        :param tail_lines: the number of lines from the end of the logs
+        :type tail_lines: int
+        :param since_seconds: only the lines of the last seconds
+        :type since_seconds: int
+        :param limit_bytes: max number of bytes of the logs
+        :type limit_bytes: int
+        :param timestamps: to prefix each line with its RFC3339 timestamp
+        :type timestamps: bool
+        :return: generator of the lines (without the line breaks)
+        """
+        response = self.log_response(name=name, namespace=namespace,
+                                     container=container, follow=follow,
+                                     tail_lines=tail_lines,
+                                     since_seconds=since_seconds,
+                                     limit_bytes=limit_bytes,
+                                     timestamps=timestamps)
+        logger.info(f"Streaming the logs of pod {name} from namespace "
+                    f"{namespace}")
+        yield from iter_lines(chunks=iter_chunks(response=response))
+
+    @k8s_exceptions
+    def write_logs(self, name, output_file, namespace=DEFAULT_NAMESPACE,
+                   container=None, follow=False, tail_lines=None,
+                   since_seconds=None, limit_bytes=None, timestamps=False):
+        """
+        Write pod's logs to a file object chunk by chunk, without holding the
+        logs in memory
+        :param name: the name of the pod
+        :type name: str
+        :param output_file: binary file object to write the logs to
+        :type output_file: io.BufferedIOBase
+        :param namespace: the namespace of the pod (default value is 'default')
+        :type namespace: str
+        :param container: specific container to get the logs from
+        (if there is only one it is not relevant)
+        :type container: str
+        :param follow: to keep writing the new logs until the container stops
+        :type follow: bool
+        :param tail_lines: the number of lines from the end of the logs
+        :type tail_lines: int
+        :param since_seconds: only the logs of the last seconds
+        :type since_seconds: int
+        :param limit_bytes: max number of bytes of the logs
+        :type limit_bytes: int
+        :param timestamps: to prefix each line with its RFC3339 timestamp
+        :type timestamps: bool
+        :return: the number of bytes written
+        :rtype: int
+        """
+        response = self.log_response(name=name, namespace=namespace,
+                                     container=container, follow=follow,
+                                     tail_lines=tail_lines,
+                                     since_seconds=since_seconds,
+                                     limit_bytes=limit_bytes,
+                                     timestamps=timestamps)
+        written = 0
+        for chunk in iter_chunks(response=response):
+            output_file.write(chunk)
+            written += len(chunk)
+        logger.info(f"Wrote {written} bytes of the logs of pod {name} from "
+                    f"namespace {namespace}")
+        return written
+
     @k8s_exceptions
     def events(self, name, namespace=DEFAULT_NAMESPACE, only_messages=False):
         """
@@ -369,12 +829,12 @@ class PodClient(object):
         :rtype: list
         """
         pod_id = self.get_uid(name=name, namespace=namespace)
-        events = self.client_core.list_namespaced_event(namespace=namespace,
-                                                        field_selector=f"involvedObject.uid=={pod_id}").items
+        events = list_events(client_core=self.client_core, uid=pod_id,
+                             namespace=namespace, event_cache=self.event_cache)
         logger.info(f"Got the events of pod {name} from namespace {namespace}")
         if only_messages:
-            events = [event["message"] for event in events if
-                      event.get("message") is not None]
+            events = [event.message for event in events if
+                      event.message is not None]
         return events
 
     @k8s_exceptions
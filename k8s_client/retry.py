@@ -0,0 +1,231 @@
+import logging
+import random
+from time import monotonic, sleep
+
+from kubernetes.client.rest import ApiException
+from urllib3.exceptions import (ConnectTimeoutError, HTTPError,
+                                NewConnectionError)
+
+from k8s_client.consts import (RETRY_ATTEMPTS, RETRY_BASE_DELAY,
+                               RETRY_MAX_DELAY, RETRY_STATUSES,
+                               WAIT_TIMEOUT)
+from k8s_client.exceptions import K8sException, K8sResourceTimeout
+from k8s_client.metrics import METRICS, record_wait
+
+logger = logging.getLogger(__name__)
+
+HTTP_TOO_MANY_REQUESTS = 429
+# The errors of requests that did not reach the api server, safe to retry
+# for any method
+CONNECT_ERRORS = (NewConnectionError, ConnectTimeoutError,
+                  ConnectionRefusedError)
+
+
+class RetryPolicy(object):
+    """
+    When and how long to wait between the attempts of a call.
+    The delays grow exponentially from base_delay up to max_delay with
+    random jitter, a Retry-After header of the api server overrides the
+    delay, and no attempt starts after the deadline.
+    Usage:
+        policy = RetryPolicy(max_attempts=5, deadline=30)
+        pods = policy.call(client_core.list_namespaced_pod, namespace="a")
+        policy.wait_until(is_ready, name="web")
+    """
+
+    def __init__(self, max_attempts=RETRY_ATTEMPTS, deadline=None,
+                 initial_delay=0, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, backoff_factor=2, jitter=0.2,
+                 retry_statuses=RETRY_STATUSES):
+        """
+        :param max_attempts: max number of attempts (None for no limit)
+        :type max_attempts: int
+        :param deadline: max seconds from the first attempt to the start of
+        the last one (None for no limit)
+        :type deadline: float
+        :param initial_delay: seconds to wait before the first attempt
+        :type initial_delay: float
+        :param base_delay: the delay after the first failed attempt
+        :type base_delay: float
+        :param max_delay: the max delay between attempts
+        :type max_delay: float
+        :param backoff_factor: the factor of each delay over the previous one
+        :type backoff_factor: float
+        :param jitter: the random part of a delay (0.2 is +-20%)
+        :type jitter: float
+        :param retry_statuses: the http statuses that are retried
+        :type retry_statuses: tuple
+        """
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+
+    def backoff(self, attempt):
+        """
+        Return the seconds to wait after a failed attempt
+        :param attempt: the number of the failed attempt (from 1)
+        :type attempt: int
+        :rtype: float
+        """
+        delay = min(self.max_delay,
+                    self.base_delay * self.backoff_factor ** (attempt - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    @staticmethod
+    def retry_after(error):
+        """
+        Return the seconds of the Retry-After header of a response or an
+        api exception, or None if there is no such header
+        :rtype: float
+        """
+        headers = getattr(error, "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+    def is_retryable(self, error, idempotent=True):
+        """
+        Return if a call that failed with the error (or returned a response
+        with the error status) may be retried
+        :param error: the exception or the response
+        :param idempotent: if the call may run twice safely, otherwise only
+        the errors of calls the api server did not process are retried
+        :type idempotent: bool
+        :rtype: bool
+        """
+        if isinstance(error, CONNECT_ERRORS) or \
+                isinstance(getattr(error, "reason", None), CONNECT_ERRORS):
+            return True
+        status = getattr(error, "status", None)
+        if isinstance(status, int):
+            if status == HTTP_TOO_MANY_REQUESTS:
+                return status in self.retry_statuses
+            return idempotent and status in self.retry_statuses
+        return idempotent and isinstance(error, (HTTPError, ConnectionError))
+
+    def _attempts(self, description):
+        """
+        Yield the numbers of the attempts, sleeping the delay before each
+        one. The caller sends the Retry-After of a failed attempt (or None).
+        """
+        if self.initial_delay:
+            sleep(self.initial_delay)
+        start_time = monotonic()
+        delay = 0
+        attempt = 0
+        while True:
+            if delay:
+                if self.deadline is not None and \
+                        monotonic() - start_time + delay > self.deadline:
+                    return
+                sleep(delay)
+            attempt += 1
+            retry_after = yield attempt
+            if self.max_attempts is not None and \
+                    attempt >= self.max_attempts:
+                return
+            delay = retry_after if retry_after is not None else \
+                self.backoff(attempt)
+            logger.debug(f"Attempt {attempt} of {description} failed, "
+                         f"retrying in {delay:.2f} seconds")
+
+    def call(self, func, *args, idempotent=True, **kwargs):
+        """
+        Call the function, retrying the retryable errors
+        :param func: the function to call (e.g. an api function)
+        :type func: function
+        :param idempotent: if the call may run twice safely
+        :type idempotent: bool
+        :return: the result of the function
+        """
+        attempts = self._attempts(description=func.__name__)
+        next(attempts)
+        while True:
+            try:
+                result = func(*args, **kwargs)
+            except (ApiException, K8sException, HTTPError,
+                    ConnectionError) as e:
+                if not self.is_retryable(e, idempotent=idempotent):
+                    raise
+                error, result = e, None
+            else:
+                # a response with an error status (the api client raises on
+                # it after the request returned)
+                if not self.is_retryable(result, idempotent=idempotent):
+                    return result
+                error = result
+            try:
+                attempts.send(self.retry_after(error))
+            except StopIteration:
+                if result is not None:
+                    return result
+                raise error
+            release_response(result)
+
+    def wait_until(self, condition, *args, description=None, metrics=METRICS,
+                   **kwargs):
+        """
+        Run the condition until it returns True, retrying the retryable
+        errors too
+        :param condition: function that returns True when the wait is over
+        :type condition: function
+        :param description: what is waited for, for the timeout message
+        :type description: str
+        :param metrics: the metrics to record the wait in (None to not record
+        it)
+        :type metrics: Metrics
+        :return: True
+        :raises K8sResourceTimeout: when the attempts or the deadline are over
+        """
+        description = description or f"{condition.__name__} {kwargs}"
+        attempts = self._attempts(description=description)
+        result = "error"
+        start_time = monotonic()
+        attempt = next(attempts)
+        try:
+            while True:
+                retry_after = None
+                try:
+                    if condition(*args, **kwargs):
+                        result = "met"
+                        return True
+                except (ApiException, K8sException, HTTPError,
+                        ConnectionError) as e:
+                    if not self.is_retryable(e):
+                        raise
+                    retry_after = self.retry_after(e)
+                try:
+                    attempt = attempts.send(retry_after)
+                except StopIteration:
+                    break
+            result = "timeout"
+            raise K8sResourceTimeout(
+                message=f"Timeout! {description} was not met after "
+                        f"{attempt} attempts")
+        finally:
+            record_wait(wait=condition.__name__, loop="poll",
+                        iterations=attempt, seconds=monotonic() - start_time,
+                        result=result, metrics=metrics)
+
+
+def release_response(response):
+    # return the connection of a dropped response to the pool
+    response = getattr(response, "response", response)
+    release = getattr(response, "drain_conn", None) or \
+        getattr(response, "release_conn", None)
+    if release is not None:
+        release()
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+DEFAULT_WAIT_POLICY = RetryPolicy(max_attempts=None, deadline=WAIT_TIMEOUT)
+
+
+if __name__ == "__main__":
+    pass
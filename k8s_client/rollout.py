@@ -0,0 +1,228 @@
+import logging
+
+from kubernetes.client.rest import ApiException
+from kubernetes.watch import Watch
+
+from k8s_client.consts import (INFORMER_RETRY_INTERVAL,
+                               PROGRESS_DEADLINE_EXCEEDED,
+                               ROLLOUT_PODS_WATCH_TIMEOUT, ROLLOUT_TIMEOUT)
+from k8s_client.exceptions import K8sNotFoundException, K8sRolloutException
+from k8s_client.metrics import METRICS
+from k8s_client.utils import read_raw
+from k8s_client.watchers import HTTP_GONE, wait_for_event
+
+logger = logging.getLogger(__name__)
+
+ON_DELETE_STRATEGY = "OnDelete"
+
+
+def deployment_rollout_status(deployment):
+    """
+    Return if the rollout of a deployment is complete and a message of its
+    progress, by the status the deployment controller reported for the
+    current generation of the deployment (the rules of kubectl rollout
+    status)
+    :param deployment: the deployment dictionary (camelCase, as the api
+    returns it)
+    :type deployment: dict
+    :return: complete or not (True/False) and the progress message
+    :rtype: tuple
+    :raises K8sRolloutException: the deployment exceeded its progress
+    deadline
+    """
+    name = deployment["metadata"]["name"]
+    status = deployment.get("status") or {}
+    if deployment["metadata"].get("generation", 0) > \
+            status.get("observedGeneration", 0):
+        return False, f"Waiting for the update of deployment {name} to be " \
+                      f"observed"
+    for condition in status.get("conditions") or []:
+        if condition.get("type") == "Progressing" and \
+                condition.get("reason") == PROGRESS_DEADLINE_EXCEEDED:
+            raise K8sRolloutException(
+                message=f"Deployment {name} exceeded its progress deadline: "
+                        f"{condition.get('message')}")
+    replicas = (deployment.get("spec") or {}).get("replicas", 1)
+    updated_replicas = status.get("updatedReplicas", 0)
+    available_replicas = status.get("availableReplicas", 0)
+    total_replicas = status.get("replicas", 0)
+    if updated_replicas < replicas:
+        return False, f"{updated_replicas} of {replicas} replicas of " \
+                      f"deployment {name} are updated"
+    if total_replicas > updated_replicas:
+        return False, f"{total_replicas - updated_replicas} old replicas " \
+                      f"of deployment {name} are pending termination"
+    if updated_replicas > replicas:
+        return False, f"{updated_replicas - replicas} replicas of " \
+                      f"deployment {name} are pending termination"
+    if available_replicas < updated_replicas:
+        return False, f"{available_replicas} of {updated_replicas} updated " \
+                      f"replicas of deployment {name} are available"
+    return True, f"Deployment {name} rolled out {updated_replicas} replicas"
+
+
+def daemon_set_rollout_status(daemon_set):
+    """
+    Return if the rollout of a daemon set is complete and a message of its
+    progress, by the status the daemon set controller reported for the
+    current generation of the daemon set: all the scheduled pods are updated
+    (unless the update strategy is OnDelete), ready and available
+    :param daemon_set: the daemon set dictionary (camelCase, as the api
+    returns it)
+    :type daemon_set: dict
+    :return: complete or not (True/False) and the progress message
+    :rtype: tuple
+    """
+    name = daemon_set["metadata"]["name"]
+    status = daemon_set.get("status") or {}
+    if daemon_set["metadata"].get("generation", 0) > \
+            status.get("observedGeneration", 0):
+        return False, f"Waiting for the update of daemon set {name} to be " \
+                      f"observed"
+    update_strategy = (daemon_set.get("spec") or {}).get(
+        "updateStrategy") or {}
+    desired = status.get("desiredNumberScheduled", 0)
+    updated = status.get("updatedNumberScheduled", 0)
+    ready = status.get("numberReady", 0)
+    available = status.get("numberAvailable", 0)
+    if update_strategy.get("type") != ON_DELETE_STRATEGY and \
+            updated < desired:
+        return False, f"{updated} of {desired} pods of daemon set {name} " \
+                      f"are updated"
+    if ready < desired:
+        return False, f"{ready} of {desired} pods of daemon set {name} are " \
+                      f"ready"
+    if status.get("numberUnavailable", 0) or available < desired:
+        return False, f"{available} of {desired} pods of daemon set {name} " \
+                      f"are available"
+    return True, f"Daemon set {name} rolled out {desired} pods"
+
+
+def track_rollout(list_func, name, namespace, rollout_status, kind,
+                  timeout=ROLLOUT_TIMEOUT, on_progress=None, metrics=METRICS):
+    """
+    Wait until the rollout of a resource is complete, by watching only the
+    resource from the resourceVersion of its current state, so a rollout
+    costs one list and one watch whatever the number of its pods
+    :param list_func: the api function that lists the resources of a
+    namespace (e.g. AppsV1Api.list_namespaced_deployment)
+    :type list_func: function
+    :param name: the name of the resource
+    :type name: str
+    :param namespace: the namespace of the resource
+    :type namespace: str
+    :param rollout_status: function of the resource dictionary that returns
+    if the rollout is complete and a message of its progress, it may raise to
+    stop waiting with an error (e.g. deployment_rollout_status)
+    :type rollout_status: function
+    :param kind: the kind of the resource, for the messages
+    :type kind: str
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param on_progress: function that is called with the resource dictionary
+    on each change until the rollout is complete
+    :type on_progress: function
+    :param metrics: the metrics to record the wait in (None to not record it)
+    :type metrics: Metrics
+    :return: the resource dictionary of the complete rollout
+    :rtype: dict
+    """
+    field_selector = f"metadata.name={name}"
+    resources_list = read_raw(list_func, namespace=namespace,
+                              field_selector=field_selector)
+    resources = resources_list.get("items") or []
+    if not resources:
+        raise K8sNotFoundException(
+            message=f"Could not find {kind} {name} in {namespace} namespace")
+    last_message = None
+
+    def complete(event_type, resource):
+        nonlocal last_message
+        if event_type == "DELETED":
+            raise K8sNotFoundException(
+                message=f"The {kind} {name} was deleted while waiting for "
+                        f"its rollout")
+        is_complete, message = rollout_status(resource)
+        # the status changes with every pod, log only the new messages
+        if message != last_message:
+            logger.info(message)
+            last_message = message
+        if not is_complete and on_progress is not None:
+            on_progress(resource)
+        return is_complete
+
+    resource = resources[0]
+    if not complete(event_type="ADDED", resource=resource):
+        resource = wait_for_event(
+            list_func=list_func, condition=complete, timeout=timeout,
+            resource_version=resources_list["metadata"].get(
+                "resourceVersion"),
+            description=f"the rollout of {kind} {name}",
+            metrics=metrics, namespace=namespace,
+            field_selector=field_selector)
+    return resource
+
+
+def follow_pods(list_func, namespace, label_selector, owner_uid, on_pod,
+                stopped, watch_timeout=ROLLOUT_PODS_WATCH_TIMEOUT):
+    """
+    Call on_pod with the node name and the dictionary of the pods of an owner
+    on each change of the pods, until stopped (run in a thread of its own).
+    One watch of the pods is reopened every watch_timeout seconds from the
+    last seen resourceVersion, so it ends soon after it is stopped.
+    :param list_func: the api function that lists the pods of a namespace
+    (CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param namespace: the namespace of the pods
+    :type namespace: str
+    :param label_selector: the label selector of the owner
+    :type label_selector: str
+    :param owner_uid: the uid of the owner, the pods of other owners that
+    match the label selector are skipped
+    :type owner_uid: str
+    :param on_pod: function of the node name and the pod dictionary
+    :type on_pod: function
+    :param stopped: set to stop following the pods
+    :type stopped: threading.Event
+    :param watch_timeout: the server side timeout of each watch
+    :type watch_timeout: int
+    """
+    resource_version = None
+    while not stopped.is_set():
+        kwargs = {"namespace": namespace, "label_selector": label_selector,
+                  "timeout_seconds": watch_timeout}
+        if resource_version:
+            kwargs["resource_version"] = resource_version
+        watcher = Watch()
+        try:
+            for event in watcher.stream(list_func, **kwargs):
+                if stopped.is_set():
+                    watcher.stop()
+                    break
+                # the keep-alive blank lines of the watch come as None
+                if event is None:
+                    continue
+                pod = event["raw_object"]
+                metadata = pod.get("metadata", {})
+                resource_version = metadata.get("resourceVersion",
+                                                resource_version)
+                if any(owner.get("uid") == owner_uid for owner in
+                       metadata.get("ownerReferences") or []):
+                    on_pod((pod.get("spec") or {}).get("nodeName"), pod)
+        except ApiException as e:
+            if e.status == HTTP_GONE:
+                resource_version = None
+                continue
+            logger.warning(f"Watch of the pods of {label_selector} got an "
+                           f"api error: {e.reason}")
+            stopped.wait(INFORMER_RETRY_INTERVAL)
+        except Exception:
+            if stopped.is_set():
+                return
+            logger.exception(f"Watch of the pods of {label_selector} "
+                             f"failed, reopening it")
+            stopped.wait(INFORMER_RETRY_INTERVAL)
+
+
+if __name__ == "__main__":
+    pass
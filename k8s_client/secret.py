@@ -1,16 +1,23 @@
 import logging
-from kubernetes.client import V1Secret
+from kubernetes import client
 
-from k8s_client.consts import DEFAULT_NAMESPACE
-from k8s_client.utils import convert_obj_to_dict, field_filter, k8s_exceptions
+from k8s_client.consts import (DEFAULT_NAMESPACE, DEFAULT_PAGE_SIZE,
+                               DELETE_PROPAGATION_POLICY, WAIT_TIMEOUT)
+from k8s_client.utils import (convert_obj_to_dict, field_filter, k8s_exceptions,
+                              iter_pages, iter_objects, read_raw_object,
+                              read_raw_list,
+                              delete_collection)
+from k8s_client.selectors import plan_selector
+from k8s_client.metrics import METRICS
 from k8s_client.exceptions import K8sInvalidResourceBody, K8sNotFoundException
 
 logger = logging.getLogger(__name__)
 
 
 class SecretClient(object):
-    def __init__(self, client_core):
+    def __init__(self, client_core, metrics=METRICS):
         self.client_core = client_core
+        self.metrics = metrics
 
 
     def wait_to_secret_creation(self, secret_name, namespace):
@@ -43,14 +50,14 @@ class SecretClient(object):
         :rtype: str
         """
         try:
-            if isinstance(body, V1Secret):
+            if isinstance(body, dict):
+                secret_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            elif isinstance(body, client.V1Secret):
                 secret_name = body.metadata.name
                 if hasattr(body, "metadata") and hasattr(body.metadata,
                                                          "namespace"):
                     namespace = body.metadata.namespace
-            elif isinstance(body, dict):
-                secret_name = body["metadata"]["name"]
-                namespace = body.get("metadata", {}).get("namespace", namespace)
             else:
                 raise K8sInvalidResourceBody()
         except (KeyError, AttributeError):
@@ -104,6 +111,46 @@ class SecretClient(object):
         if wait:
             self.wait_to_secret_deletion(secret_name=name, namespace=namespace)
 
+    @k8s_exceptions
+    def delete_collection(self, namespace=DEFAULT_NAMESPACE, field_selector="",
+                          label_selector="",
+                          propagation_policy=DELETE_PROPAGATION_POLICY,
+                          grace_period_seconds=None, wait=False,
+                          timeout=WAIT_TIMEOUT):
+        """
+        Delete all the secrets of the namespace that match the selectors with
+        one request, and wait for their deletion with one watch
+        :param namespace: the namespace of the secrets
+        (default value is 'default')
+        :type namespace: str
+        :param field_selector: to delete specific secrets, only the fields the
+        api server supports (all the secrets of the namespace by default)
+        :type field_selector: str
+        :param label_selector: to delete secrets with specific labels
+        :type label_selector: str
+        :param propagation_policy: how to delete the dependents
+        (default value is DELETE_PROPAGATION_POLICY)
+        :type propagation_policy: str
+        :param grace_period_seconds: the termination grace period of the pods
+        (default is the grace period of each pod)
+        :type grace_period_seconds: int
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: the names of the deleted secrets
+        :rtype: list
+        """
+        return delete_collection(
+            delete_func=self.client_core.delete_collection_namespaced_secret,
+            list_func=self.client_core.list_namespaced_secret, namespace=namespace,
+            kind="secrets", field_selector=field_selector,
+            label_selector=label_selector,
+            propagation_policy=propagation_policy,
+            grace_period_seconds=grace_period_seconds, wait=wait,
+            timeout=timeout, metrics=self.metrics)
+
     @k8s_exceptions
     def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
         """
@@ -118,19 +165,21 @@ class SecretClient(object):
         :return: the pod obj/dictionary
         :rtype: Union[V1Secret,dictionary]
         """
+        if dict_output:
+            # read the dictionary from the json, without building the model
+            secret = read_raw_object(self.client_core.read_namespaced_secret,
+                                     name=name, namespace=namespace)
+            logger.info(f"Got {name} secret from namespace {namespace}")
+            return secret
         secret = self.client_core.read_namespaced_secret(name=name,
                                                          namespace=namespace)
         logger.info(f"Got {name} secret from namespace {namespace}")
-        # convert the obj to dict if required
-        if dict_output:
-            secret = convert_obj_to_dict(secret)
-        else:
-            secret.metadata.resource_version = ''
+        secret.metadata.resource_version = ''
         return secret
 
     @k8s_exceptions
     def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-             dict_output=False, field_selector=""):
+             dict_output=False, field_selector="", label_selector=""):
         """
         Return list of secrets objects/dictionaries
         :param namespace: the namespace of the secret
@@ -143,21 +192,40 @@ class SecretClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific secrets
         :type field_selector: str
+        :param label_selector: to filter the list to secrets with specific
+        labels
+        :type label_selector: str
         :return: list of secrets
         :rtype: list
         """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="secrets",
+                             label_selector=label_selector)
+        if dict_output and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            if all_namespaces:
+                secrets_list = read_raw_list(
+                    self.client_core.list_secret_for_all_namespaces,
+                    **plan.api_kwargs)
+            else:
+                secrets_list = read_raw_list(
+                    self.client_core.list_namespaced_secret,
+                    namespace=namespace, **plan.api_kwargs)
+            logger.info("Got secrets list")
+            return secrets_list
         if all_namespaces:
-            secrets_list = self.client_core.list_secret_for_all_namespaces().items
+            secrets_list = self.client_core.list_secret_for_all_namespaces(
+                **plan.api_kwargs).items
             logger.info("Got secrets list from all the namespaces")
         else:
             secrets_list = self.client_core.list_namespaced_secret(
-                namespace=namespace).items
+                namespace=namespace, **plan.api_kwargs).items
             logger.info(f"Got secrets list from namespace "
                         f"{namespace}")
 
-        if field_selector:
+        if plan.remainder:
             secrets_list = field_filter(obj_list=secrets_list,
-                                        field_selector=field_selector)
+                                        field_selector=plan.remainder)
 
         # convert the list to list of dicts if required
         if dict_output:
@@ -170,10 +238,51 @@ class SecretClient(object):
         return secrets_list
 
     def list_names(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-                   field_selector=""):
+                   field_selector="", label_selector=""):
         return [secret.metadata.name for secret in
                 self.list(namespace=namespace, all_namespaces=all_namespaces,
-                          field_selector=field_selector)]
+                          field_selector=field_selector,
+                          label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                  dict_output=False, field_selector="", label_selector="",
+                  page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the secrets objects/dictionaries page by page, the next page is
+        requested only after the objects of the previous one were consumed
+        :param namespace: the namespace of the secret
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the secrets from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the secrets to specific secrets
+        :type field_selector: str
+        :param label_selector: to filter the secrets to secrets with specific
+        labels
+        :type label_selector: str
+        :param page_size: the max number of secrets in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of secrets
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector, kind="secrets",
+                             label_selector=label_selector)
+        if all_namespaces:
+            pages = iter_pages(self.client_core.list_secret_for_all_namespaces,
+                               page_size=page_size,
+                               raw=dict_output and not plan.remainder,
+                               **plan.api_kwargs)
+        else:
+            pages = iter_pages(self.client_core.list_namespaced_secret,
+                               page_size=page_size,
+                               raw=dict_output and not plan.remainder,
+                               namespace=namespace, **plan.api_kwargs)
+        yield from iter_objects(pages=pages, field_selector=plan.remainder,
+                                dict_output=dict_output)
 
     @k8s_exceptions
     def patch(self, name, body, namespace=DEFAULT_NAMESPACE):
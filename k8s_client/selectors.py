@@ -0,0 +1,416 @@
+import logging
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+from k8s_client.consts import SELECTOR_CACHE_SIZE
+from k8s_client.exceptions import InvalidFieldSelector
+
+logger = logging.getLogger(__name__)
+
+LABELS_PREFIX = "metadata.labels."
+
+# The fields every kind supports server side, as (attribute path, api path)
+COMMON_SERVER_FIELDS = (("metadata.name", "metadata.name"),
+                        ("metadata.namespace", "metadata.namespace"))
+
+# Extra fields the api server can select on, per kind
+SERVER_FIELDS = {
+    "pods": (("status.phase", "status.phase"),
+             ("spec.node_name", "spec.nodeName"),
+             ("spec.restart_policy", "spec.restartPolicy"),
+             ("spec.scheduler_name", "spec.schedulerName"),
+             ("spec.service_account_name", "spec.serviceAccountName"),
+             ("status.pod_ip", "status.podIP")),
+    "namespaces": (("status.phase", "status.phase"),),
+    "secrets": (("type", "type"),),
+}
+
+
+def split_clauses(selector):
+    """
+    Split a selector to its clauses, commas inside parentheses (label
+    selector sets, e.g. 'env in (prod, dev)') do not split
+    :param selector: the selector string
+    :type selector: str
+    :return: the stripped clauses
+    :rtype: list
+    """
+    clauses = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(selector):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and not depth:
+            clauses.append(selector[start:index].strip())
+            start = index + 1
+    clauses.append(selector[start:].strip())
+    return [clause for clause in clauses if clause]
+
+
+def parse_clause(clause):
+    """
+    Parse a field selector clause
+    :param clause: clause like 'metadata.name==my-pod' or 'status.phase!=Running'
+    :type clause: str
+    :return: the path, the operator ('==' or '!=') and the value
+    :rtype: tuple
+    """
+    for operator in ("!=", "==", "="):
+        if operator in clause:
+            path, value = clause.split(operator, 1)
+            return path.strip(), "!=" if operator == "!=" else "==", \
+                value.strip()
+    raise InvalidFieldSelector(message=f"Invalid field selector: {clause}")
+
+
+def parse_label_selector(label_selector):
+    """
+    Parse a label selector to a list of (operator, key, values) clauses
+    :param label_selector: label selector like 'app=web,env in (prod,dev)'
+    :type label_selector: str
+    :rtype: list
+    """
+    clauses = []
+    for clause in split_clauses(label_selector):
+        if " notin " in clause or " in " in clause:
+            operator = "notin" if " notin " in clause else "in"
+            key, values = clause.split(f" {operator} ", 1)
+            values = values.strip()
+            if not (values.startswith("(") and values.endswith(")")):
+                raise InvalidFieldSelector(
+                    message=f"Invalid label selector: {clause}")
+            clauses.append((operator, key.strip(),
+                            {value.strip() for value in
+                             values[1:-1].split(",")}))
+        elif "!=" in clause:
+            key, value = clause.split("!=", 1)
+            clauses.append(("!=", key.strip(), value.strip()))
+        elif "=" in clause:
+            key, value = clause.replace("==", "=").split("=", 1)
+            clauses.append(("=", key.strip(), value.strip()))
+        elif clause.startswith("!"):
+            clauses.append(("!", clause[1:].strip(), None))
+        else:
+            clauses.append(("exists", clause, None))
+    return clauses
+
+
+def match_labels(labels, label_clauses):
+    """
+    Return if the labels satisfy the parsed label selector
+    :param labels: the labels of an object
+    :type labels: dict
+    :param label_clauses: the output of parse_label_selector
+    :type label_clauses: list
+    :rtype: bool
+    """
+    labels = labels or {}
+    for operator, key, value in label_clauses:
+        if operator == "=" and labels.get(key) != value:
+            return False
+        if operator == "!=" and labels.get(key) == value:
+            return False
+        if operator == "in" and labels.get(key) not in value:
+            return False
+        if operator == "notin" and labels.get(key) in value:
+            return False
+        if operator == "exists" and key not in labels:
+            return False
+        if operator == "!" and key in labels:
+            return False
+    return True
+
+
+def attr_getter(attrs):
+    """
+    Return a getter of a dotted attributes run
+    :param attrs: list of attribute names
+    :type attrs: list
+    :rtype: function
+    """
+    return attrgetter(".".join(attrs))
+
+
+def compile_path(path):
+    """
+    Compile an attribute path like 'metadata.owner_references[0].kind' to a
+    getter of the value, raising AttributeError/IndexError/KeyError/TypeError
+    when the value is missing. On 'metadata.labels.<key>' the key is a label
+    key (it may contain dots).
+    :param path: the attribute path
+    :type path: str
+    :rtype: function
+    """
+    label_key = None
+    if path.startswith(LABELS_PREFIX):
+        path, label_key = "metadata.labels", path[len(LABELS_PREFIX):]
+    getters = []
+    run = []
+    for attr in path.split("."):
+        index = None
+        if "[" in attr and attr[-1] == "]":
+            try:
+                index = int(attr[attr.index("[") + 1:-1])
+            except ValueError:
+                raise InvalidFieldSelector(
+                    message=f"Invalid field selector path: {path}")
+            attr = attr.split("[", 1)[0]
+        if not attr:
+            raise InvalidFieldSelector(
+                message=f"Invalid field selector path: {path}")
+        run.append(attr)
+        if index is not None:
+            getters.append(attr_getter(run))
+            getters.append(list_item_getter(index))
+            run = []
+    if run:
+        getters.append(attr_getter(run))
+    if label_key is not None:
+        getters.append(itemgetter(label_key))
+
+    if len(getters) == 1:
+        return getters[0]
+
+    def get(obj):
+        for getter in getters:
+            obj = getter(obj)
+        return obj
+
+    return get
+
+
+def list_item_getter(index):
+    def get(obj):
+        # like the original selector, an index of a non list is ignored
+        return obj[index] if isinstance(obj, list) else obj
+
+    return get
+
+
+def compile_clause(clause):
+    """
+    Compile a field selector clause to a predicate of one object, a missing
+    attribute or index does not match (for both '==' and '!=')
+    :param clause: clause like 'metadata.name==my-pod'
+    :type clause: str
+    :rtype: function
+    """
+    path, operator, value = parse_clause(clause)
+    getter = compile_path(path)
+
+    if operator == "!=":
+        def predicate(obj):
+            try:
+                return getter(obj) != value
+            except (AttributeError, IndexError, KeyError, TypeError):
+                return False
+    else:
+        def predicate(obj):
+            try:
+                return getter(obj) == value
+            except (AttributeError, IndexError, KeyError, TypeError):
+                return False
+
+    return predicate
+
+
+class CompiledSelector(object):
+    """
+    A field selector parsed once to a predicate per clause.
+    """
+
+    def __init__(self, field_selector):
+        """
+        :param field_selector: comma separated clauses like
+        'metadata.owner_references[0].kind==ReplicaSet,status.phase!=Failed'
+        :type field_selector: str
+        """
+        self.field_selector = field_selector
+        self.clauses = [compile_clause(clause) for clause in
+                        split_clauses(field_selector)]
+
+    def match(self, obj):
+        return all(clause(obj) for clause in self.clauses)
+
+    def filter_many(self, obj_list):
+        """
+        Return the objects that match the selector, filtering the whole list
+        clause after clause
+        :param obj_list: list of k8s objects
+        :type obj_list: list
+        :rtype: list
+        """
+        obj_list = list(obj_list)
+        for clause in self.clauses:
+            obj_list = [obj for obj in obj_list if clause(obj)]
+        return obj_list
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def compile_selector(field_selector):
+    """
+    Return the compiled selector of the field selector, memoized by the
+    selector string
+    :param field_selector: the field selector
+    :type field_selector: str
+    :rtype: CompiledSelector
+    """
+    return CompiledSelector(field_selector=field_selector)
+
+
+def label_filter(obj_list, label_selector):
+    label_clauses = parse_label_selector(label_selector)
+    return [obj for obj in obj_list
+            if match_labels(obj.metadata.labels, label_clauses)]
+
+
+def to_label_selector(selector):
+    """
+    Convert the label selector of a workload spec (matchLabels and
+    matchExpressions) to a label selector string
+    :param selector: the selector of the spec
+    :type selector: Union[V1LabelSelector,dictionary]
+    :return: label selector like 'app=web,tier in (front,back)'
+    :rtype: str
+    """
+    if selector is None:
+        return ""
+    if isinstance(selector, dict):
+        match_labels = selector.get("matchLabels") or \
+            selector.get("match_labels") or {}
+        expressions = [(expression.get("key"), expression.get("operator"),
+                        expression.get("values") or []) for expression in
+                       selector.get("matchExpressions") or
+                       selector.get("match_expressions") or []]
+    else:
+        match_labels = selector.match_labels or {}
+        expressions = [(expression.key, expression.operator,
+                        expression.values or []) for expression in
+                       selector.match_expressions or []]
+    clauses = [f"{key}={value}" for key, value in match_labels.items()]
+    for key, operator, values in expressions:
+        if operator == "In":
+            clauses.append(f"{key} in ({','.join(values)})")
+        elif operator == "NotIn":
+            clauses.append(f"{key} notin ({','.join(values)})")
+        elif operator == "Exists":
+            clauses.append(key)
+        elif operator == "DoesNotExist":
+            clauses.append(f"!{key}")
+        else:
+            raise InvalidFieldSelector(
+                message=f"Invalid label selector operator: {operator}")
+    return ",".join(clauses)
+
+
+class SelectorPlan(object):
+    """
+    A field selector split to the part the api server can evaluate
+    (field and label selectors sent with the list request) and the remainder
+    that is filtered client side with a compiled selector.
+    """
+
+    def __init__(self, field_selector="", label_selector="", remainder="",
+                 local_field_selector=""):
+        """
+        :param field_selector: the field selector to send to the api server
+        :type field_selector: str
+        :param label_selector: the label selector to send to the api server
+        :type label_selector: str
+        :param remainder: the clauses left for the client side filter
+        :type remainder: str
+        :param local_field_selector: the server side field clauses written as
+        attribute paths, used when the list comes from the cache
+        :type local_field_selector: str
+        """
+        self.field_selector = field_selector
+        self.label_selector = label_selector
+        self.remainder = remainder
+        self.local_field_selector = local_field_selector
+
+    @property
+    def api_kwargs(self):
+        """
+        The selectors kwargs of the list api call
+        :rtype: dict
+        """
+        kwargs = {}
+        if self.field_selector:
+            kwargs["field_selector"] = self.field_selector
+        if self.label_selector:
+            kwargs["label_selector"] = self.label_selector
+        return kwargs
+
+    def apply_server_part(self, obj_list):
+        """
+        Apply the server side part of the plan on a list that did not come
+        from the api server (e.g. from the informers cache)
+        :param obj_list: list of k8s objects
+        :type obj_list: list
+        :rtype: list
+        """
+        if self.local_field_selector:
+            obj_list = compile_selector(
+                self.local_field_selector).filter_many(obj_list)
+        if self.label_selector:
+            obj_list = label_filter(obj_list=obj_list,
+                                    label_selector=self.label_selector)
+        return obj_list
+
+    def __repr__(self):
+        return f"SelectorPlan(field_selector={self.field_selector!r}, " \
+               f"label_selector={self.label_selector!r}, " \
+               f"remainder={self.remainder!r})"
+
+
+def plan_selector(field_selector="", kind=None, label_selector=""):
+    """
+    Split a field selector to server side field/label selectors and a client
+    side remainder
+    :param field_selector: the field selector of the list method, clauses on
+    'metadata.labels.<key>' become label selectors
+    :type field_selector: str
+    :param kind: the kind of the listed resources (e.g. 'pods'), decides
+    which fields the api server supports
+    :type kind: str
+    :param label_selector: label selector to send as is
+    :type label_selector: str
+    :return: the plan of the selection
+    :rtype: SelectorPlan
+    """
+    server_fields = {}
+    for attr_path, api_path in COMMON_SERVER_FIELDS + SERVER_FIELDS.get(kind,
+                                                                        ()):
+        server_fields[attr_path] = (attr_path, api_path)
+        server_fields[api_path] = (attr_path, api_path)
+
+    server_clauses = []
+    local_clauses = []
+    label_clauses = [label_selector] if label_selector else []
+    remainder = []
+    for clause in split_clauses(field_selector or ""):
+        path, operator, value = parse_clause(clause)
+        if path.startswith(LABELS_PREFIX):
+            label_operator = "!=" if operator == "!=" else "="
+            label_clauses.append(
+                f"{path[len(LABELS_PREFIX):]}{label_operator}{value}")
+        elif path in server_fields:
+            attr_path, api_path = server_fields[path]
+            server_clauses.append(f"{api_path}{operator}{value}")
+            local_clauses.append(f"{attr_path}{operator}{value}")
+        else:
+            remainder.append(clause)
+
+    plan = SelectorPlan(field_selector=",".join(server_clauses),
+                        label_selector=",".join(label_clauses),
+                        remainder=",".join(remainder),
+                        local_field_selector=",".join(local_clauses))
+    logger.debug(f"Planned {field_selector!r} of {kind}: {plan}")
+    return plan
+
+
+if __name__ == "__main__":
+    pass
@@ -1,8 +1,15 @@
 import logging
-from kubernetes.client import V1Service
+from kubernetes import client
 
-from k8s_client.consts import DEFAULT_NAMESPACE
-from k8s_client.utils import convert_obj_to_dict, field_filter, k8s_exceptions
+from k8s_client.consts import (DEFAULT_NAMESPACE, DEFAULT_PAGE_SIZE,
+                               DELETE_PROPAGATION_POLICY, WAIT_TIMEOUT)
+from k8s_client.utils import (convert_obj_to_dict, field_filter, k8s_exceptions,
+                              iter_pages, iter_objects, read_raw_object,
+                              read_raw_list,
+                              delete_collection)
+from k8s_client.informer import list_events
+from k8s_client.metrics import METRICS
+from k8s_client.selectors import plan_selector
 from k8s_client.exceptions import K8sInvalidResourceBody, K8sException, \
     K8sNotFoundException
 
@@ -10,8 +17,10 @@ logger = logging.getLogger(__name__)
 
 
 class ServiceClient(object):
-    def __init__(self, client_core):
+    def __init__(self, client_core, event_cache=None, metrics=METRICS):
         self.client_core = client_core
+        self.metrics = metrics
+        self.event_cache = event_cache
 
 
     def wait_to_service_creation(self, service_name, namespace):
@@ -55,14 +64,14 @@ class ServiceClient(object):
         :rtype: str
         """
         try:
-            if isinstance(body, V1Service):
+            if isinstance(body, dict):
+                service_name = body["metadata"]["name"]
+                namespace = body.get("metadata", {}).get("namespace", namespace)
+            elif isinstance(body, client.V1Service):
                 service_name = body.metadata.name
                 if hasattr(body, "metadata") and hasattr(body.metadata,
                                                          "namespace"):
                     namespace = body.metadata.namespace
-            elif isinstance(body, dict):
-                service_name = body["metadata"]["name"]
-                namespace = body.get("metadata", {}).get("namespace", namespace)
             else:
                 raise K8sInvalidResourceBody()
         except (KeyError, AttributeError):
@@ -117,6 +126,46 @@ class ServiceClient(object):
             self.wait_to_service_deletion(service_name=name,
                                           namespace=namespace)
 
+    @k8s_exceptions
+    def delete_collection(self, namespace=DEFAULT_NAMESPACE, field_selector="",
+                          label_selector="",
+                          propagation_policy=DELETE_PROPAGATION_POLICY,
+                          grace_period_seconds=None, wait=False,
+                          timeout=WAIT_TIMEOUT):
+        """
+        Delete all the services of the namespace that match the selectors with
+        one request, and wait for their deletion with one watch
+        :param namespace: the namespace of the services
+        (default value is 'default')
+        :type namespace: str
+        :param field_selector: to delete specific services, only the fields the
+        api server supports (all the services of the namespace by default)
+        :type field_selector: str
+        :param label_selector: to delete services with specific labels
+        :type label_selector: str
+        :param propagation_policy: how to delete the dependents
+        (default value is DELETE_PROPAGATION_POLICY)
+        :type propagation_policy: str
+        :param grace_period_seconds: the termination grace period of the pods
+        (default is the grace period of each pod)
+        :type grace_period_seconds: int
+        :param wait: to wait until the deletion is over
+        (default value is False)
+        :type wait: bool
+        :param timeout: max seconds to wait (default value is WAIT_TIMEOUT)
+        :type timeout: int
+        :return: the names of the deleted services
+        :rtype: list
+        """
+        return delete_collection(
+            delete_func=self.client_core.delete_collection_namespaced_service,
+            list_func=self.client_core.list_namespaced_service, namespace=namespace,
+            kind="services", field_selector=field_selector,
+            label_selector=label_selector,
+            propagation_policy=propagation_policy,
+            grace_period_seconds=grace_period_seconds, wait=wait,
+            timeout=timeout, metrics=self.metrics)
+
     @k8s_exceptions
     def get(self, name, namespace=DEFAULT_NAMESPACE, dict_output=False):
         """
@@ -131,16 +180,16 @@ class ServiceClient(object):
         :return: the pod obj/dictionary
         :rtype: Union[V1Service,dictionary]
         """
+        if dict_output:
+            # read the dictionary from the json, without building the model
+            service = read_raw_object(self.client_core.read_namespaced_service,
+                                      name=name, namespace=namespace)
+            logger.info(f"Got {name} service from namespace {namespace}")
+            return service
         service = self.client_core.read_namespaced_service(name=name,
                                                            namespace=namespace)
         logger.info(f"Got {name} service from namespace {namespace}")
-
-        # convert the obj to dict if required
-        if dict_output:
-            service = convert_obj_to_dict(service)
-        else:
-            service.metadata.resource_version = ''
-
+        service.metadata.resource_version = ''
         return service
 
     def get_ports(self, name, namespace):
@@ -164,7 +213,7 @@ class ServiceClient(object):
 
     @k8s_exceptions
     def list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-             dict_output=False, field_selector=""):
+             dict_output=False, field_selector="", label_selector=""):
         """
         Return list of services objects/dictionaries
         :param namespace: the namespace of the service
@@ -177,20 +226,38 @@ class ServiceClient(object):
         :type dict_output: bool
         :param field_selector: to filter the list to specific services
         :type field_selector: str
+        :param label_selector: to filter the list to services with specific
+        labels
+        :type label_selector: str
         :return: list of services
         :rtype: list
         """
+        # send the selectors the api server supports with the request
+        plan = plan_selector(field_selector=field_selector, kind="services",
+                             label_selector=label_selector)
+        if dict_output and not plan.remainder:
+            # read the dictionaries from the json, without building the models
+            if all_namespaces:
+                services_list = read_raw_list(
+                    self.client_core.list_service_for_all_namespaces,
+                    **plan.api_kwargs)
+            else:
+                services_list = read_raw_list(
+                    self.client_core.list_namespaced_service,
+                    namespace=namespace, **plan.api_kwargs)
+            logger.info("Got services list")
+            return services_list
         if all_namespaces:
-            services_list = self.client_core.list_service_for_all_namespaces().items
+            services_list = self.client_core.list_service_for_all_namespaces(
+                **plan.api_kwargs).items
             logger.info("Got services list from all the namespaces")
         else:
             services_list = self.client_core.list_namespaced_service(
-                namespace=namespace).items
-            logger.info(f"Got services list from namespace "
-                        "{namespace}")
-        if field_selector:
+                namespace=namespace, **plan.api_kwargs).items
+            logger.info(f"Got services list from namespace {namespace}")
+        if plan.remainder:
             services_list = field_filter(obj_list=services_list,
-                                         field_selector=field_selector)
+                                         field_selector=plan.remainder)
         # convert the list to list of dicts if required
         if dict_output:
             services_list = [convert_obj_to_dict(service) for service in
@@ -201,10 +268,51 @@ class ServiceClient(object):
         return services_list
 
     def list_names(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
-                   field_selector=""):
+                   field_selector="", label_selector=""):
         return [service.metadata.name for service in
                 self.list(namespace=namespace, all_namespaces=all_namespaces,
-                          field_selector=field_selector)]
+                          field_selector=field_selector,
+                          label_selector=label_selector)]
+
+    @k8s_exceptions
+    def iter_list(self, namespace=DEFAULT_NAMESPACE, all_namespaces=False,
+                  dict_output=False, field_selector="", label_selector="",
+                  page_size=DEFAULT_PAGE_SIZE):
+        """
+        Yield the services objects/dictionaries page by page, the next page is
+        requested only after the objects of the previous one were consumed
+        :param namespace: the namespace of the service
+        (default value is 'default')
+        :type namespace: str
+        :param all_namespaces: to get the services from all the namespaces
+        :type all_namespaces: bool
+        :param dict_output: to get dictionaries instead of objects
+        :type dict_output: bool
+        :param field_selector: to filter the services to specific services
+        :type field_selector: str
+        :param label_selector: to filter the services to services with specific
+        labels
+        :type label_selector: str
+        :param page_size: the max number of services in a page
+        (default value is DEFAULT_PAGE_SIZE)
+        :type page_size: int
+        :return: generator of services
+        """
+        # send the selectors the api server supports with the requests
+        plan = plan_selector(field_selector=field_selector, kind="services",
+                             label_selector=label_selector)
+        if all_namespaces:
+            pages = iter_pages(self.client_core.list_service_for_all_namespaces,
+                               page_size=page_size,
+                               raw=dict_output and not plan.remainder,
+                               **plan.api_kwargs)
+        else:
+            pages = iter_pages(self.client_core.list_namespaced_service,
+                               page_size=page_size,
+                               raw=dict_output and not plan.remainder,
+                               namespace=namespace, **plan.api_kwargs)
+        yield from iter_objects(pages=pages, field_selector=plan.remainder,
+                                dict_output=dict_output)
 
     @k8s_exceptions
     def events(self, name, namespace=DEFAULT_NAMESPACE, only_messages=False):
@@ -221,13 +329,13 @@ class ServiceClient(object):
         :rtype: list
         """
         service_id = self.get(name=name, namespace=namespace).metadata.uid
-        events = self.client_core.list_namespaced_event(namespace=namespace,
-            field_selector=f"involvedObject.uid=={service_id}").items
+        events = list_events(client_core=self.client_core, uid=service_id,
+                             namespace=namespace, event_cache=self.event_cache)
         logger.info(f"Got the events of service {name} from namespace "
                     f"{namespace}")
         if only_messages:
-            events = [event["message"] for event in events if
-                      event.get("message") is not None]
+            events = [event.message for event in events if
+                      event.message is not None]
         return events
 
     @k8s_exceptions
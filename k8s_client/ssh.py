@@ -0,0 +1,182 @@
+import logging
+import threading
+from time import monotonic
+
+from k8s_client.consts import (SSH_IDLE_TIMEOUT, SSH_MAX_SESSIONS, SSH_PORT,
+                               SSH_TIMEOUT)
+
+logger = logging.getLogger(__name__)
+
+
+def _paramiko():
+    # paramiko (and its crypto) is imported on the first connection, so the
+    # clients that never run a command on a node do not pay for it
+    import paramiko
+    return paramiko
+
+
+class SSHConnection(object):
+    """
+    An open ssh connection to a host, running at most max_sessions commands
+    at the same time (the MaxSessions of the ssh server).
+    """
+
+    def __init__(self, session, max_sessions=SSH_MAX_SESSIONS):
+        self.session = session
+        self.sessions = threading.BoundedSemaphore(max_sessions)
+        self.last_used = monotonic()
+        self.running = 0
+        self._lock = threading.Lock()
+
+    def is_active(self):
+        transport = self.session.get_transport()
+        return transport is not None and transport.is_active()
+
+    def execute(self, command, timeout=None):
+        """
+        Run a command on the connection
+        :param command: the command to run
+        :type command: str
+        :param timeout: seconds to wait for the output of the command
+        :type timeout: float
+        :return: the output and the exit status of the command
+        :rtype: tuple
+        """
+        with self.sessions:
+            with self._lock:
+                self.running += 1
+            try:
+                _, stdout, _ = self.session.exec_command(command,
+                                                         timeout=timeout)
+                # read the output before the channel is closed
+                output = stdout.read()
+                exit_status = stdout.channel.recv_exit_status()
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.last_used = monotonic()
+        return output, exit_status
+
+    def close(self):
+        self.session.close()
+
+
+class SSHPool(object):
+    """
+    Open ssh connections, one per host, reused by the commands on the
+    host. A connection that was not used for idle_timeout seconds is
+    closed, a connection that was dropped is reopened.
+    """
+
+    def __init__(self, username, key_filename, port=SSH_PORT,
+                 idle_timeout=SSH_IDLE_TIMEOUT, max_sessions=SSH_MAX_SESSIONS,
+                 timeout=SSH_TIMEOUT):
+        """
+        :param username: the user to connect with
+        :type username: str
+        :param key_filename: the path of the private key
+        :type key_filename: str
+        :param port: the ssh port of the hosts
+        :type port: int
+        :param idle_timeout: seconds to keep an unused connection open
+        :type idle_timeout: float
+        :param max_sessions: max number of commands to run at the same time
+        on a connection
+        :type max_sessions: int
+        :param timeout: seconds to wait for a connection
+        :type timeout: float
+        """
+        self.username = username
+        self.key_filename = key_filename
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.timeout = timeout
+        self._connections = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _close_idle(self):
+        now = monotonic()
+        with self._lock:
+            idle = [host for host, connection in self._connections.items()
+                    if not connection.running and
+                    now - connection.last_used > self.idle_timeout]
+            connections = [self._connections.pop(host) for host in idle]
+        for connection in connections:
+            connection.close()
+        if connections:
+            logger.debug(f"Closed the idle ssh connections to {idle}")
+
+    def _connect(self, host):
+        paramiko = _paramiko()
+        session = paramiko.SSHClient()
+        session.set_missing_host_key_policy(policy=paramiko.AutoAddPolicy())
+        session.connect(hostname=host, port=self.port,
+                        username=self.username,
+                        key_filename=self.key_filename, timeout=self.timeout)
+        logger.debug(f"Opened an ssh connection to {host}")
+        return SSHConnection(session=session, max_sessions=self.max_sessions)
+
+    def connection(self, host):
+        """
+        Return the open connection to the host, connecting if there is none
+        :param host: the address of the host
+        :type host: str
+        :rtype: SSHConnection
+        """
+        self._close_idle()
+        with self._lock:
+            lock = self._locks.setdefault(host, threading.Lock())
+        # connect to each host once, without blocking the other hosts
+        with lock:
+            connection = self._connections.get(host)
+            if connection is None or not connection.is_active():
+                if connection is not None:
+                    connection.close()
+                connection = self._connect(host=host)
+                with self._lock:
+                    self._connections[host] = connection
+        return connection
+
+    def execute(self, host, command, timeout=None):
+        """
+        Run a command on a host
+        :param host: the address of the host
+        :type host: str
+        :param command: the command to run
+        :type command: str
+        :param timeout: seconds to wait for the output of the command
+        :type timeout: float
+        :return: the output and the exit status of the command
+        :rtype: tuple
+        """
+        connection = self.connection(host=host)
+        try:
+            return connection.execute(command=command, timeout=timeout)
+        except (_paramiko().SSHException, EOFError, OSError):
+            if connection.is_active():
+                raise
+            # the server dropped the connection since it was last used
+            logger.debug(f"The ssh connection to {host} was dropped, "
+                         f"reconnecting")
+            self.discard(host=host)
+            return self.connection(host=host).execute(command=command,
+                                                      timeout=timeout)
+
+    def discard(self, host):
+        with self._lock:
+            connection = self._connections.pop(host, None)
+        if connection is not None:
+            connection.close()
+
+    def close(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,157 @@
+import logging
+import socket
+
+from kubernetes import client, config
+from urllib3.connection import HTTPConnection
+
+from k8s_client.consts import (DEFAULT_MAX_THREADS, EXTRA_CONNECTIONS,
+                               KEEP_ALIVE_IDLE, KEEP_ALIVE_INTERVAL,
+                               KEEP_ALIVE_COUNT, KUBECONFIG_PATH)
+from k8s_client.metrics import (METRICS, instrument_deserialize,
+                                record_request)
+from k8s_client.retry import DEFAULT_RETRY_POLICY
+
+logger = logging.getLogger(__name__)
+
+# The query parameters of the requests that stream their response
+STREAMING_PARAMS = ("watch", "follow")
+# The methods that are safe to send twice
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT")
+
+
+def keep_alive_socket_options():
+    """
+    Return the socket options of the connections with TCP keep alive, so
+    idle pooled connections and long watches are not dropped silently by
+    proxies and load balancers
+    :rtype: list
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (("TCP_KEEPIDLE", KEEP_ALIVE_IDLE),
+                        ("TCP_KEEPINTVL", KEEP_ALIVE_INTERVAL),
+                        ("TCP_KEEPCNT", KEEP_ALIVE_COUNT)):
+        # not every platform has all of them
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+def is_streaming(url, query_params=None):
+    """
+    Return if a request streams its response (a watch or a followed log)
+    :param url: the url of the request
+    :type url: str
+    :param query_params: the query parameters, when they are not in the url
+    :type query_params: list
+    :rtype: bool
+    """
+    for key, value in query_params or []:
+        if key in STREAMING_PARAMS and str(value).lower() == "true":
+            return True
+    return any(f"{param}=true" in url.lower() for param in STREAMING_PARAMS)
+
+
+def tune_requests(rest_client, request_timeout=None, gzip=False,
+                  retry_policy=None, metrics=None):
+    """
+    Add a default timeout, gzip encoding and retries to the requests of a
+    rest client.
+    Streaming requests get no timeout and no gzip: a read timeout would cut
+    an idle watch and gzip would break the line by line reading of its
+    events.
+    :param rest_client: the rest client of an api client
+    :type rest_client: kubernetes.client.rest.RESTClientObject
+    :param request_timeout: (connect, read) timeout of the requests that do
+    not set their own
+    :type request_timeout: tuple
+    :param gzip: to ask for gzip encoded responses
+    :type gzip: bool
+    :param retry_policy: the policy of retrying the failed requests (only the
+    requests the api server did not process are retried for the methods
+    that are not idempotent)
+    :type retry_policy: RetryPolicy
+    :param metrics: the metrics to record the attempts of the requests in
+    :type metrics: Metrics
+    """
+    request = rest_client.request
+
+    def tuned_request(method, url, *args, **kwargs):
+        send_request = request if metrics is None else record_request(
+            request=request, metrics=metrics, method=method, url=url)
+        if not is_streaming(url=url, query_params=kwargs.get("query_params")):
+            if request_timeout is not None and \
+                    kwargs.get("_request_timeout") is None:
+                kwargs["_request_timeout"] = request_timeout
+            if gzip:
+                kwargs["headers"] = dict(kwargs.get("headers") or {},
+                                         **{"Accept-Encoding": "gzip"})
+        if retry_policy is None:
+            return send_request(method, url, *args, **kwargs)
+        return retry_policy.call(
+            send_request, method, url, *args,
+            idempotent=method.upper() in IDEMPOTENT_METHODS, **kwargs)
+
+    rest_client.request = tuned_request
+
+
+def create_api_client(kubeconfig_path=KUBECONFIG_PATH,
+                      max_threads=DEFAULT_MAX_THREADS, max_connections=None,
+                      keep_alive=True, connect_timeout=None,
+                      read_timeout=None, gzip=True,
+                      retry_policy=DEFAULT_RETRY_POLICY, metrics=METRICS):
+    """
+    Create the api client all the apis of a K8sClient share (one connection
+    pool to the api server)
+    :param kubeconfig_path: the path of the kubeconfig file
+    :type kubeconfig_path: str
+    :param max_threads: the number of threads that use the client
+    :type max_threads: int
+    :param max_connections: the size of the connection pool
+    (default is max_threads + EXTRA_CONNECTIONS)
+    :type max_connections: int
+    :param keep_alive: to enable TCP keep alive on the connections
+    :type keep_alive: bool
+    :param connect_timeout: seconds to wait for a connection
+    (default is no timeout)
+    :type connect_timeout: float
+    :param read_timeout: seconds to wait for the response of a request that
+    is not a watch (default is no timeout)
+    :type read_timeout: float
+    :param gzip: to ask for gzip encoded responses
+    :type gzip: bool
+    :param retry_policy: the policy of retrying the failed requests
+    (None for no retries)
+    :type retry_policy: RetryPolicy
+    :param metrics: the metrics to record the requests and the building of
+    the models in (None to not record them)
+    :type metrics: Metrics
+    :rtype: kubernetes.client.ApiClient
+    """
+    configuration = client.Configuration()
+    config.load_kube_config(config_file=kubeconfig_path,
+                            client_configuration=configuration)
+    configuration.assert_hostname = False
+    # every thread may hold a connection (e.g. the watch of a wait), next
+    # to the caller's requests and the watches of the informers
+    configuration.connection_pool_maxsize = max_connections or \
+        max_threads + EXTRA_CONNECTIONS
+    if keep_alive:
+        configuration.socket_options = keep_alive_socket_options()
+    client.Configuration.set_default(configuration)
+
+    api_client = client.ApiClient(configuration=configuration)
+    request_timeout = (connect_timeout, read_timeout) \
+        if connect_timeout is not None or read_timeout is not None else None
+    tune_requests(rest_client=api_client.rest_client,
+                  request_timeout=request_timeout, gzip=gzip,
+                  retry_policy=retry_policy, metrics=metrics)
+    if metrics is not None:
+        instrument_deserialize(api_client=api_client, metrics=metrics)
+    logger.debug(f"Created an api client with "
+                 f"{configuration.connection_pool_maxsize} connections")
+    return api_client
+
+
+if __name__ == "__main__":
+    pass
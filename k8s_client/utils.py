@@ -1,79 +1,165 @@
+import codecs
+import functools
+import inspect
 import json
 import logging
-from time import sleep
+import threading
+import typing
+from datetime import datetime
+from functools import lru_cache
+from time import perf_counter
 
 from kubernetes.client.rest import ApiException
-from k8s_client.exceptions import InvalidFieldSelector, K8sException, K8sResourceTimeout
+from k8s_client.consts import (APPLY_ORDER, DEFAULT_PAGE_SIZE, KEY_CACHE_SIZE,
+                               LOG_CHUNK_SIZE, DELETE_PROPAGATION_POLICY,
+                               WAIT_TIMEOUT)
+from k8s_client.exceptions import (K8sException, K8sInvalidResourceBody,
+                                   InvalidFieldSelector)
+from k8s_client.metrics import CALL_SECONDS, METRICS
+from k8s_client.retry import DEFAULT_WAIT_POLICY, release_response
+from k8s_client.selectors import compile_selector, plan_selector
+from k8s_client.watchers import wait_for_deletion
+
+try:
+    # a faster json parser, used for the raw responses when it is installed
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
 
+def client_metrics(args):
+    """
+    Return the metrics of the client of a method by its arguments (the
+    metrics attribute of self, None when the client records nothing), the
+    default metrics for functions and clients without metrics
+    :param args: the positional arguments of the call
+    :type args: tuple
+    :rtype: Metrics
+    """
+    return getattr(args[0], "metrics", METRICS) if args else METRICS
+
+
 def k8s_exceptions(func):
     """
     wrapper for k8s api exception, it catches ApiException and raises
     K8sException based on the reason in the API.
+    The seconds of the calls (not of the generators) are recorded in the
+    metrics of the client by the method and if it failed.
     """
+    method = func.__qualname__
 
     def exception_wrapper(*args, **kwargs):
+        result = "error"
+        start_time = perf_counter()
+        try:
+            value = func(*args, **kwargs)
+            result = "ok"
+            return value
+        except ApiException as e:
+            raise_k8s_exception(func=func, api_exception=e)
+        finally:
+            metrics = client_metrics(args)
+            if metrics is not None:
+                metrics.observe(CALL_SECONDS, perf_counter() - start_time,
+                                method=method, result=result)
+
+    def generator_exception_wrapper(*args, **kwargs):
+        # the requests of a generator run while it is iterated
         try:
-            return func(*args, **kwargs)
+            yield from func(*args, **kwargs)
         except ApiException as e:
-            error = json.loads(e.body)
-            raise K8sException(
-                message=f"Executed {func.__module__!r}.{func.__name__!r}"
-                        f" \nFailed with error:\n {error.get('message')}",
-                reason=error.get('reason'))
+            raise_k8s_exception(func=func, api_exception=e)
 
+    if inspect.isgeneratorfunction(func):
+        return generator_exception_wrapper
     return exception_wrapper
 
 
-def retry(func):
+def raise_k8s_exception(func, api_exception):
+    """
+    Raise the K8sException of an api exception that the function got
+    :param func: the function that got the api exception
+    :type func: function
+    :param api_exception: the api exception
+    :type api_exception: ApiException
+    """
+    try:
+        error = json.loads(api_exception.body)
+    except (TypeError, ValueError):
+        # the errors of watch streams come without a body
+        error = {"message": api_exception.reason}
+    raise K8sException(
+        message=f"Executed {func.__module__!r}.{func.__name__!r}"
+                f" \nFailed with error:\n {error.get('message')}",
+        reason=error.get('reason'), status=api_exception.status,
+        headers=api_exception.headers)
+
+
+def retry(func=None, policy=None):
     """
-    Decorator to retry runs of a function, 3 iteration with 3 seconds sleep
-    between each attempts.
-    After all iterations, if failed, returns False. True if the function
-    retries true, while running the loop.
+    Decorator to run a function until it returns True, by a retry policy
+    (default is DEFAULT_WAIT_POLICY: no delay before the first attempt,
+    exponential backoff between the next ones, up to WAIT_TIMEOUT seconds).
+    Retryable api errors (throttling, server errors) are retried too, other
+    errors are raised.
+    If the function did not return True in time raises K8sResourceTimeout.
+    The wait is recorded in the metrics of the client of a method.
     func: function that return true or false only.
     """
+    if func is None:
+        return lambda func: retry(func=func, policy=policy)
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        attempts = 3
-        while False or attempts > 0:
-            try:
-                attempts -= 1
-                sleep(3)
-                if func(*args, **kwargs):
-                    return True
-            except K8sException:
-                continue
-        else:
-            raise K8sResourceTimeout(
-                message=f"Failed to get success response after {attempts}"
-                f"while running {func.__module__!r}.{func.__name__!r} args: "
-                        f"{args} kwargs: {kwargs}")
+        return (policy or DEFAULT_WAIT_POLICY).wait_until(
+            func, *args,
+            description=f"{func.__module__!r}.{func.__name__!r} args: "
+                        f"{args} kwargs: {kwargs}",
+            metrics=client_metrics(args), **kwargs)
 
     return wrapper
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def to_camel_case(key):
+    """
+    Return the camelCase version of an underscore key, memoized by the key
+    (the keys of the k8s objects repeat on every object)
+    :param key: key like 'owner_references'
+    :type key: str
+    :return: key like 'ownerReferences'
+    :rtype: str
+    """
+    new_key = ''.join(word.capitalize() for word in key.split('_'))
+    return new_key[:1].lower() + new_key[1:] if new_key else key
+
+
+def is_empty(value):
+    # unset fields (None) and containers left without values are dropped,
+    # falsy values like 0 and False are kept
+    return value is None or (not value and isinstance(value, (dict, list)))
+
+
 def underscore_to_uppercase(dict_to_edit):
     """
     This function convert underscore convention to uppercase convention
     input: dictionary
-    output: dictionary with uppercase convention
+    output: new dictionary with uppercase convention, without the unset
+    (None) values and the empty dictionaries and lists
     """
-    if not isinstance(dict_to_edit, (dict, list)):
-        return dict_to_edit
+    if isinstance(dict_to_edit, dict):
+        converted = {}
+        for key, value in dict_to_edit.items():
+            value = underscore_to_uppercase(value)
+            if not is_empty(value):
+                converted[to_camel_case(key)] = value
+        return converted
     if isinstance(dict_to_edit, list):
-        return [value for value in
-                (underscore_to_uppercase(value) for value in dict_to_edit) if
-                value]
-    for key in list(dict_to_edit.keys()):
-        new_key = ''.join(word.capitalize() for word in key.split('_'))
-        new_key = new_key[0].lower() + new_key[1:]
-        dict_to_edit[new_key] = dict_to_edit.pop(key)
-    return {key: value for key, value in
-            ((key, underscore_to_uppercase(value)) for key, value in
-             dict_to_edit.items()) if value}
+        return [value for value in map(underscore_to_uppercase, dict_to_edit)
+                if not is_empty(value)]
+    return dict_to_edit
 
 
 def convert_obj_to_dict(obj):
@@ -83,56 +169,428 @@ def convert_obj_to_dict(obj):
     return obj
 
 
+def response_model(api_func):
+    """
+    Return the model of the objects an api function returns, by its return
+    annotation (the model of the items for the list functions)
+    :param api_func: the api function (e.g. CoreV1Api.list_namespaced_pod)
+    :type api_func: function
+    :return: the model class (e.g. V1Pod)
+    """
+    model = getattr(api_func, "__annotations__", {}).get("return")
+    if isinstance(model, str):
+        from kubernetes.client import models
+        model = getattr(models, model, None)
+    if not hasattr(model, "model_fields"):
+        raise TypeError(f"{getattr(api_func, '__name__', api_func)} has no "
+                        f"model in its return annotation")
+    if model.__name__.endswith("List") and "items" in model.model_fields:
+        model = typing.get_args(model.model_fields["items"].annotation)[0]
+    return model
+
+
+def parse_timestamp(value):
+    """
+    Return the datetime of an RFC 3339 timestamp of the api, as the models
+    have it
+    :param value: timestamp like '2024-01-02T03:04:05Z'
+    :type value: str
+    :rtype: datetime
+    """
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def raw_value_converter(annotation):
+    """
+    Return the function that converts a json value of the api to the value
+    to_dict() of the models has for a field of this type, or None when the
+    json value is that value already
+    :param annotation: the type annotation of the field of the model
+    :rtype: function
+    """
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        args = [arg for arg in args if arg is not type(None)]
+        # the values of the unions of types are kept as the json has them
+        return raw_value_converter(args[0]) if len(args) == 1 else None
+    if origin is typing.Annotated:
+        return raw_value_converter(args[0])
+    if origin is list:
+        convert_item = raw_value_converter(args[0])
+        if convert_item is None:
+            return None
+        return lambda values: [convert_item(value) for value in values]
+    if origin is dict:
+        convert_item = raw_value_converter(args[1])
+        if convert_item is None:
+            return None
+        return lambda values: {key: convert_item(value) for key, value in
+                               values.items()}
+    if annotation is datetime:
+        return parse_timestamp
+    if hasattr(annotation, "model_fields"):
+        return lambda raw_obj: raw_to_model_dict(raw_obj, annotation)
+    return None
+
+
+@lru_cache(maxsize=None)
+def raw_model_fields(model):
+    """
+    Return the fields of a model as the json key, the attribute name and the
+    converter of the value of each field, by the order of the model
+    :param model: the model class (e.g. V1Pod)
+    :rtype: tuple
+    """
+    return tuple((field.serialization_alias or attribute, attribute,
+                  raw_value_converter(field.annotation))
+                 for attribute, field in model.model_fields.items())
+
+
+def raw_to_model_dict(raw_obj, model):
+    """
+    Return the dictionary to_dict() returns for the model of a raw json
+    object (underscore attribute names, datetime timestamps), without
+    building the model
+    :param raw_obj: the object as the api returned it
+    :type raw_obj: dict
+    :param model: the model class of the object (e.g. V1Pod)
+    :rtype: dict
+    """
+    obj = {}
+    for key, attribute, convert in raw_model_fields(model):
+        value = raw_obj.get(key)
+        if value is not None and convert is not None:
+            value = convert(value)
+        obj[attribute] = value
+    return obj
+
+
+def raw_obj_to_dict(raw_obj, model):
+    """
+    Return the raw json object of the api (camelCase dictionary) as the
+    dictionaries of the clients, the same dictionary convert_obj_to_dict
+    returns for its model
+    :param raw_obj: the object as the api returned it
+    :type raw_obj: dict
+    :param model: the model class of the object (e.g. V1Pod)
+    :rtype: dict
+    """
+    obj = raw_to_model_dict(raw_obj, model)
+    (obj.get("metadata") or {}).pop("resource_version", None)
+    return underscore_to_uppercase(obj)
+
+
+def read_raw(api_func, **kwargs):
+    """
+    Call an api function without deserializing the response to the kubernetes
+    models, the json of the response is parsed once to dictionaries (the
+    timestamps stay strings)
+    :param api_func: the api function (e.g. CoreV1Api.read_namespaced_pod)
+    :type api_func: function
+    :param kwargs: the arguments of the api function
+    :return: the parsed json of the response
+    :rtype: dict
+    """
+    response = api_func(_preload_content=False, **kwargs)
+    try:
+        return json_loads(response.data)
+    finally:
+        response.release_conn()
+
+
+def read_raw_object(read_func, **kwargs):
+    """
+    Return the dictionary of the object a read api function returns (the
+    dictionary convert_obj_to_dict returns), without building its model
+    :param read_func: the api function that reads the object
+    (e.g. CoreV1Api.read_namespaced_pod)
+    :type read_func: function
+    :param kwargs: the arguments of the read function
+    :rtype: dict
+    """
+    return raw_obj_to_dict(read_raw(read_func, **kwargs),
+                           model=response_model(read_func))
+
+
+def read_raw_list(list_func, **kwargs):
+    """
+    Return the dictionaries of the objects a list api function returns (the
+    dictionaries convert_obj_to_dict returns), without building their models
+    :param list_func: the api function that lists the objects
+    (e.g. CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param kwargs: the arguments of the list function
+    :rtype: list
+    """
+    model = response_model(list_func)
+    return [raw_obj_to_dict(raw_obj, model=model) for raw_obj in
+            read_raw(list_func, **kwargs).get("items") or []]
+
+
+def iter_chunks(response, chunk_size=LOG_CHUNK_SIZE):
+    """
+    Yield the body of a streamed response (_preload_content=False) chunk by
+    chunk, the connection is returned to the pool when the generator ends
+    or is closed
+    :param response: the response of the api
+    :type response: urllib3.response.HTTPResponse
+    :param chunk_size: the max number of bytes in a chunk
+    (default value is LOG_CHUNK_SIZE)
+    :type chunk_size: int
+    :return: generator of bytes
+    """
+    try:
+        yield from response.stream(chunk_size)
+    finally:
+        response.release_conn()
+
+
+def iter_lines(chunks):
+    """
+    Yield the lines of a stream of utf-8 chunks (without the line breaks),
+    only the last partial line is held in memory
+    :param chunks: the chunks of the stream
+    :type chunks: iterable of bytes
+    :return: generator of str
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    partial_line = ""
+    for chunk in chunks:
+        lines = (partial_line + decoder.decode(chunk)).split("\n")
+        partial_line = lines.pop()
+        yield from lines
+    partial_line += decoder.decode(b"", final=True)
+    if partial_line:
+        yield partial_line
+
+
+def delete_collection(delete_func, list_func, namespace, kind,
+                      field_selector="", label_selector="",
+                      propagation_policy=DELETE_PROPAGATION_POLICY,
+                      grace_period_seconds=None, wait=True,
+                      timeout=WAIT_TIMEOUT, metrics=METRICS):
+    """
+    Delete all the resources that match the selectors with one request, and
+    wait for their deletion with one watch
+    :param delete_func: the api function that deletes a collection
+    (e.g. CoreV1Api.delete_collection_namespaced_pod)
+    :type delete_func: function
+    :param list_func: the api function that lists the resources
+    (e.g. CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param namespace: the namespace of the resources
+    :type namespace: str
+    :param kind: the kind of the resources (e.g. 'pods')
+    :type kind: str
+    :param field_selector: to delete specific resources, only the fields the
+    api server supports (all the resources of the namespace by default)
+    :type field_selector: str
+    :param label_selector: to delete resources with specific labels
+    :type label_selector: str
+    :param propagation_policy: how to delete the dependents ('Foreground',
+    'Background' or 'Orphan'), with 'Foreground' a resource is deleted
+    after its dependents (e.g. the pods of a deployment)
+    :type propagation_policy: str
+    :param grace_period_seconds: the termination grace period of the pods
+    (default is the grace period of each pod)
+    :type grace_period_seconds: int
+    :param wait: to wait until the resources are deleted
+    :type wait: bool
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param metrics: the metrics to record the wait in (None to not record it)
+    :type metrics: Metrics
+    :return: the names of the resources that were deleted
+    :rtype: list
+    """
+    plan = plan_selector(field_selector=field_selector, kind=kind,
+                         label_selector=label_selector)
+    if plan.remainder:
+        raise InvalidFieldSelector(
+            message=f"The api server can not select {kind} by "
+                    f"{plan.remainder}, delete the resources one by one")
+    # the resources to wait for and the version to watch their deletion from
+    current = read_raw(list_func, namespace=namespace, **plan.api_kwargs)
+    names = sorted(item["metadata"]["name"] for item in
+                   current.get("items") or [])
+    kwargs = {"grace_period_seconds": grace_period_seconds} \
+        if grace_period_seconds is not None else {}
+    # the response lists the deleted resources, there is no need to read it
+    release_response(delete_func(namespace=namespace,
+                                 propagation_policy=propagation_policy,
+                                 _preload_content=False, **kwargs,
+                                 **plan.api_kwargs))
+    logger.info(f"Deleted {len(names)} {kind} from {namespace} namespace")
+    if wait:
+        wait_for_deletion(list_func=list_func, names=names,
+                          resource_version=current["metadata"].get(
+                              "resourceVersion"),
+                          timeout=timeout, metrics=metrics,
+                          namespace=namespace, **plan.api_kwargs)
+    return names
+
+
 def split_list_to_chunks(list_to_slice, number_of_chunks):
-    if len(list_to_slice) <= number_of_chunks:
-        return list_to_slice
-    else:
-        begining = list_to_slice[number_of_chunks:]
-        remaining = list_to_slice[:number_of_chunks]
-        return begining + split_list_to_chunks(remaining, number_of_chunks)
+    """
+    Split a list to at most number_of_chunks chunks of about the same size
+    :param list_to_slice: the list to split
+    :type list_to_slice: list
+    :param number_of_chunks: max number of chunks
+    :type number_of_chunks: int
+    :return: the chunks
+    :rtype: list
+    """
+    return [chunk for chunk in (list_to_slice[index::number_of_chunks]
+                                for index in range(number_of_chunks)) if chunk]
+
+
+def split_to_apply_tiers(resources, supported_kinds):
+    """
+    Split the resources of a yaml to the tiers they are created in, by the
+    order of their kinds (APPLY_ORDER). All the resources are checked before
+    anything is created.
+    :param resources: the documents of the yaml
+    :type resources: list
+    :param supported_kinds: the kinds the client can create
+    :type supported_kinds: iterable
+    :return: the resources of each tier, without the empty tiers
+    :rtype: list
+    """
+    tier_of_kind = {kind: index for index, kinds in enumerate(APPLY_ORDER)
+                    for kind in kinds}
+    tiers = [[] for _ in APPLY_ORDER]
+    for resource in resources:
+        if not resource:
+            continue
+        kind = resource.get("kind") if isinstance(resource, dict) else None
+        if kind is None:
+            raise K8sInvalidResourceBody()
+        if kind not in supported_kinds or kind not in tier_of_kind:
+            raise K8sInvalidResourceBody(
+                message=f"unsupported resource type {kind}")
+        tiers[tier_of_kind[kind]].append(resource)
+    return [tier for tier in tiers if tier]
+
+
+def iter_pages(list_func, page_size=DEFAULT_PAGE_SIZE, raw=False, **kwargs):
+    """
+    Yield the pages of a list api function, requesting the next page
+    (limit and continue) only after the previous one was consumed
+    :param list_func: the api function that lists the resources
+    (e.g. CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param page_size: the max number of objects in a page
+    :type page_size: int
+    :param raw: to yield pages of dictionaries read from the raw json of the
+    responses (the dictionaries convert_obj_to_dict returns) instead of pages
+    of objects
+    :type raw: bool
+    :param kwargs: the arguments of the list function
+    :return: generator of lists of objects
+    """
+    model = response_model(list_func) if raw else None
+    _continue = None
+    while True:
+        if _continue:
+            kwargs["_continue"] = _continue
+        if raw:
+            response = read_raw(list_func, limit=page_size, **kwargs)
+            yield [raw_obj_to_dict(raw_obj, model=model) for raw_obj in
+                   response.get("items") or []]
+            _continue = response.get("metadata", {}).get("continue")
+        else:
+            response = list_func(limit=page_size, **kwargs)
+            yield response.items
+            _continue = response.metadata._continue
+        if not _continue:
+            return
+
+
+def iter_objects(pages, field_selector="", dict_output=False):
+    """
+    Yield the objects of the pages, filtered by the field selector page by
+    page
+    :param pages: iterable of lists of objects
+    :param field_selector: the client side field selector
+    :type field_selector: str
+    :param dict_output: to yield dictionaries instead of objects
+    :type dict_output: bool
+    :return: generator of objects/dictionaries
+    """
+    for objects in pages:
+        if field_selector:
+            objects = field_filter(obj_list=objects,
+                                   field_selector=field_selector)
+        for obj in objects:
+            if isinstance(obj, dict):
+                # the objects of raw pages are dictionaries already
+                yield obj
+            elif dict_output:
+                yield convert_obj_to_dict(obj)
+            else:
+                obj.metadata.resource_version = ''
+                yield obj
+
+
+def controller_uid(obj):
+    """
+    Return the uid of the controller (the managing owner) of an object
+    :param obj: k8s object
+    :return: the uid of the owner or None if the object has no owner
+    :rtype: str
+    """
+    owner_references = obj.metadata.owner_references or []
+    for owner_reference in owner_references:
+        if owner_reference.controller:
+            return owner_reference.uid
+    return owner_references[0].uid if owner_references else None
 
 
 def field_filter(obj_list, field_selector):
-    return [obj for obj in obj_list if
-            selector(obj=obj, field_selector=field_selector)]
+    return compile_selector(field_selector).filter_many(obj_list)
 
 
 def selector(obj, field_selector):
-    return all(condition(obj=obj, field_selector=field.strip()) for field in
-               field_selector.split(","))
+    return compile_selector(field_selector).match(obj)
 
 
 def condition(obj, field_selector):
-    obj_selector = obj
-    if "!=" in field_selector:
-        attrs, val = field_selector.split("!=")
-    elif "==" in field_selector:
-        attrs, val = field_selector.split("==")
-    elif "=" in field_selector:
-        attrs, val = field_selector.split("=")
-    else:
-        raise InvalidFieldSelector()
-    for attr in attrs.split("."):
-        index = None
-        if '[' in attr and attr[-1] == ']':
-            try:
-                index = int(attr[attr.index('[') + 1:-1])
-                attr = attr.split('[', 1)[0]
-            except ValueError:
-                raise InvalidFieldSelector()
-        try:
-            obj_selector = getattr(obj_selector, attr)
-        except AttributeError:
-            return False
-        try:
-            if isinstance(obj_selector, list) and index is not None:
-                obj_selector = obj_selector[index]
-        except IndexError:
-            return False
-    if "!=" in field_selector:
-        return obj_selector != str(val)
-    else:
-        return obj_selector == str(val)
+    return compile_selector(field_selector.strip()).match(obj)
+
+
+class lazy_attribute(object):
+    """
+    Attribute of an instance that is built by the decorated method on its
+    first read and stored on the instance (like functools.cached_property,
+    but built once also when threads read it together)
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        # reentrant, an attribute may be built from the other lazy attributes
+        with self._lock:
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.func(instance)
+        return instance.__dict__[self.name]
+
+    @staticmethod
+    def is_built(instance, name):
+        """
+        Return True if the lazy attribute of the instance was built
+        :param instance: the instance of the attribute
+        :param name: the name of the attribute
+        :type name: str
+        :rtype: bool
+        """
+        return name in instance.__dict__
 
 
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+import logging
+from time import monotonic, sleep
+
+from kubernetes.client.rest import ApiException
+from kubernetes.watch import Watch
+from urllib3.exceptions import HTTPError
+
+from k8s_client.consts import WAIT_TIMEOUT
+from k8s_client.exceptions import K8sResourceTimeout
+from k8s_client.metrics import METRICS, record_wait
+from k8s_client.retry import DEFAULT_RETRY_POLICY
+
+logger = logging.getLogger(__name__)
+
+HTTP_GONE = 410
+
+
+def wait_for_event(list_func, condition, timeout=WAIT_TIMEOUT,
+                   resource_version=None, description=None,
+                   retry_policy=DEFAULT_RETRY_POLICY, relist=None,
+                   metrics=METRICS, **list_kwargs):
+    """
+    Watch resources until the condition is met on one of the events.
+    The watch is reopened from the last seen resourceVersion when the server
+    closes it before the timeout or it breaks with a retryable error (after
+    the backoff of the retry policy), and from the current state when that
+    resourceVersion is too old (410 Gone).
+    The watch from the current state has no events of the resources that
+    were deleted meanwhile, waits that end with deletions pass relist to
+    read the current state instead.
+    :param list_func: the api function that lists the resources
+    (e.g. CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param condition: function of the event type and the raw object (the
+    camelCase dictionary of the api) that returns True when the wait is over,
+    it may raise to stop waiting with an error
+    :type condition: function
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param resource_version: watch the changes after this resourceVersion
+    (default is the current state followed by the changes)
+    :type resource_version: str
+    :param description: what is waited for, for the timeout message
+    :type description: str
+    :param retry_policy: the backoff between reopening broken watches
+    :type retry_policy: RetryPolicy
+    :param relist: function that is called when the resourceVersion is gone,
+    it reads the current state of the resources and returns its
+    resourceVersion to watch from, or None when the wait is over
+    :type relist: function
+    :param metrics: the metrics to record the wait in (None to not record it)
+    :type metrics: Metrics
+    :param list_kwargs: the arguments of the list function
+    (e.g. namespace, field_selector)
+    :return: the raw object of the event that met the condition (None when
+    the wait ended on a relist)
+    :rtype: dict
+    """
+    events = 0
+
+    def counted_condition(event_type, raw_object):
+        nonlocal events
+        events += 1
+        return condition(event_type, raw_object)
+
+    result = "error"
+    start_time = monotonic()
+    try:
+        raw_object = _wait_for_event(
+            list_func=list_func, condition=counted_condition,
+            timeout=timeout, resource_version=resource_version,
+            description=description, retry_policy=retry_policy,
+            relist=relist, **list_kwargs)
+        result = "met"
+        return raw_object
+    except K8sResourceTimeout:
+        result = "timeout"
+        raise
+    finally:
+        record_wait(wait=list_func.__name__, loop="watch",
+                    iterations=events, seconds=monotonic() - start_time,
+                    result=result, metrics=metrics)
+
+
+def _wait_for_event(list_func, condition, timeout, resource_version,
+                    description, retry_policy, relist, **list_kwargs):
+    description = description or f"{list_func.__name__} {list_kwargs}"
+    deadline = monotonic() + timeout
+    remaining = timeout
+    failures = 0
+    gone = False
+    while remaining > 0:
+        watcher = Watch()
+        try:
+            if gone and relist is not None:
+                resource_version = relist()
+                if resource_version is None:
+                    return None
+            gone = False
+            kwargs = dict(list_kwargs, timeout_seconds=max(int(remaining), 1))
+            if resource_version:
+                kwargs["resource_version"] = resource_version
+            for event in watcher.stream(list_func, **kwargs):
+                failures = 0
+                # the keep-alive blank lines of the watch come as None
+                if event is None:
+                    continue
+                raw_object = event["raw_object"]
+                resource_version = raw_object.get("metadata", {}).get(
+                    "resourceVersion", resource_version)
+                logger.debug(f"Event: {event['type']} "
+                             f"{raw_object.get('kind')} "
+                             f"{raw_object.get('metadata', {}).get('name')}")
+                if condition(event["type"], raw_object):
+                    watcher.stop()
+                    return raw_object
+        except ApiException as e:
+            if e.status != HTTP_GONE:
+                if not retry_policy.is_retryable(e):
+                    raise
+                failures = backoff(retry_policy=retry_policy, error=e,
+                                   failures=failures, deadline=deadline,
+                                   description=description)
+            else:
+                logger.debug(f"Resource version {resource_version} is gone, "
+                             f"watching {description} from the current "
+                             f"state")
+                resource_version = None
+                gone = True
+        except (HTTPError, ConnectionError) as e:
+            if not retry_policy.is_retryable(e):
+                raise
+            failures = backoff(retry_policy=retry_policy, error=e,
+                               failures=failures, deadline=deadline,
+                               description=description)
+        remaining = deadline - monotonic()
+    logger.error(f"Timeout! Waited {timeout} seconds for {description}")
+    raise K8sResourceTimeout(
+        message=f"Timeout! Waited {timeout} seconds for {description}")
+
+
+def wait_for_deletion(list_func, names, resource_version=None,
+                      timeout=WAIT_TIMEOUT, metrics=METRICS, **list_kwargs):
+    """
+    Wait until all the named resources are deleted, with a single watch.
+    When the resourceVersion of the watch is gone the resources are listed
+    again, the names that are not in the list were deleted meanwhile.
+    :param list_func: the api function that lists the resources
+    (e.g. CoreV1Api.list_namespaced_pod)
+    :type list_func: function
+    :param names: the names of the resources that are being deleted
+    :type names: iterable
+    :param resource_version: the resourceVersion of a list the resources
+    were in (the watch starts after it)
+    :type resource_version: str
+    :param timeout: max seconds to wait
+    :type timeout: int
+    :param metrics: the metrics to record the wait in (None to not record it)
+    :type metrics: Metrics
+    :param list_kwargs: the arguments of the list function
+    (e.g. namespace, label_selector)
+    """
+    remaining = set(names)
+    if not remaining:
+        return True
+
+    def deleted(event_type, raw_object):
+        if event_type == "DELETED":
+            remaining.discard(raw_object["metadata"]["name"])
+        return not remaining
+
+    def relist():
+        current = list_func(**list_kwargs)
+        remaining.intersection_update(item.metadata.name for item in
+                                      current.items)
+        return current.metadata.resource_version if remaining else None
+
+    wait_for_event(list_func=list_func, condition=deleted, timeout=timeout,
+                   resource_version=resource_version,
+                   description=f"the deletion of {len(remaining)} resources "
+                               f"of {list_func.__name__} {list_kwargs}",
+                   relist=relist, metrics=metrics, **list_kwargs)
+    return True
+
+
+def backoff(retry_policy, error, failures, deadline, description):
+    """
+    Sleep before reopening a watch that failed, by the retry policy and
+    without passing the deadline of the wait
+    :return: the number of the failures of the watch so far
+    :rtype: int
+    """
+    failures += 1
+    delay = retry_policy.retry_after(error)
+    if delay is None:
+        delay = retry_policy.backoff(failures)
+    logger.debug(f"Watch of {description} failed ({error}), reopening it in "
+                 f"{delay:.2f} seconds")
+    sleep(max(0, min(delay, deadline - monotonic())))
+    return failures
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,157 @@
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from k8s_client.consts import DEFAULT_MAX_THREADS
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool(object):
+    """
+    Bounded pool of threads shared by the clients of a K8sClient.
+    A call runs its tasks in at most max_threads threads of the pool, the
+    first exception of a task is raised to the caller and the tasks that did
+    not start yet are cancelled. A call that asks for more threads than the
+    pool has runs in threads of its own, started for the call.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_THREADS):
+        """
+        :param max_workers: the number of threads of the pool
+        (default value is DEFAULT_MAX_THREADS)
+        :type max_workers: int
+        """
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="k8s-client")
+        self._local = threading.local()
+
+    def _call_executor(self, max_threads):
+        """
+        Return the executor of a call and if it was started for the call
+        (and should be shut down at its end)
+        :param max_threads: the number of threads the call asked for
+        :type max_threads: int
+        :rtype: tuple
+        """
+        if not max_threads or max_threads <= self.max_workers:
+            return self._executor, False
+        return ThreadPoolExecutor(max_workers=max_threads,
+                                  thread_name_prefix="k8s-client-call"), True
+
+    def _run_task(self, func, kwargs):
+        self._local.in_worker = True
+        try:
+            return func(**kwargs)
+        finally:
+            self._local.in_worker = False
+
+    def map(self, func, kwargs_list, max_threads=None):
+        """
+        Run the function with each of the kwargs and return the results
+        :param func: the function to run
+        :type func: function
+        :param kwargs_list: the kwargs of each run
+        :type kwargs_list: list
+        :param max_threads: max number of threads to use for this call
+        (default is the size of the pool, more threads than the pool has are
+        started for the call)
+        :type max_threads: int
+        :return: the results by the order of the kwargs
+        :rtype: list
+        """
+        kwargs_list = list(kwargs_list)
+        # a task of the pool that runs tasks would wait for threads it may
+        # hold itself, so nested calls (and single tasks) run in the caller
+        if len(kwargs_list) <= 1 or getattr(self._local, "in_worker", False):
+            return [func(**kwargs) for kwargs in kwargs_list]
+
+        executor, own_executor = self._call_executor(max_threads)
+        window = max_threads or self.max_workers
+        tasks = iter(enumerate(kwargs_list))
+        results = [None] * len(kwargs_list)
+        pending = {}
+
+        def submit_next():
+            for index, kwargs in tasks:
+                pending[executor.submit(self._run_task, func, kwargs)] = index
+                return
+
+        for _ in range(window):
+            submit_next()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                    submit_next()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            logger.debug(f"Cancelled the remaining runs of {func.__name__}")
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=False)
+        return results
+
+    def as_completed(self, func, kwargs_list, max_threads=None):
+        """
+        Run the function with each of the kwargs and yield the runs as they
+        complete. The error of a run is yielded with it instead of being
+        raised, the runs that did not start yet are cancelled when the
+        generator is closed.
+        :param func: the function to run
+        :type func: function
+        :param kwargs_list: the kwargs of each run
+        :type kwargs_list: list
+        :param max_threads: max number of concurrent runs
+        (default is the size of the pool, more threads than the pool has are
+        started for the call)
+        :type max_threads: int
+        :return: generator of (kwargs, result, error) of the runs
+        """
+        kwargs_list = list(kwargs_list)
+        # nested calls run in the caller, like in map
+        if len(kwargs_list) <= 1 or getattr(self._local, "in_worker", False):
+            for kwargs in kwargs_list:
+                try:
+                    yield kwargs, func(**kwargs), None
+                except Exception as e:
+                    yield kwargs, None, e
+            return
+
+        executor, own_executor = self._call_executor(max_threads)
+        window = max_threads or self.max_workers
+        tasks = iter(kwargs_list)
+        pending = {}
+
+        def submit_next():
+            for kwargs in tasks:
+                pending[executor.submit(self._run_task, func,
+                                        kwargs)] = kwargs
+                return
+
+        for _ in range(window):
+            submit_next()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kwargs = pending.pop(future)
+                    submit_next()
+                    error = future.exception()
+                    yield kwargs, None if error else future.result(), error
+        finally:
+            for future in pending:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+if __name__ == "__main__":
+    pass
@@ -64,11 +64,7 @@ def delete_all_namespaces(orc):
 
 
 def delete_all_deployments(orc):
+    # one delete request and one watch per namespace
     namespaces_names = list_allowed_namespaces_for_delete(orc)
     for ns_name in namespaces_names:
-        deployments_names = orc.deployment.list_names(namespace=ns_name)
-        if not deployments_names:
-            return
-        deployment_name = iter(deployments_names)
-        delete_deployment(orc=orc, deployment_name=deployment_name,
-                          deployment_namespace=ns_name)
+        orc.deployment.delete_collection(namespace=ns_name, wait=True)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+from kubernetes_asyncio.client.rest import ApiException
+
+from benchmarks.fake_apiserver import (PULL_FAILURE_MARK, FakeApiServer,
+                                       FakeCluster)
+from k8s_client.aio import AsyncK8sClient
+from k8s_client.aio.utils import async_k8s_exceptions
+from k8s_client.exceptions import (K8sAlreadyExistsException, K8sException,
+                                   K8sNotFoundException, K8sPullingException)
+from tests.asserts_wrapper import assert_equal
+
+
+def pod_body(name, image="nginx"):
+    return {"apiVersion": "v1", "kind": "Pod", "metadata": {"name": name},
+            "spec": {"containers": [{"name": "main", "image": image}]}}
+
+
+def deployment_body(name, replicas):
+    labels = {"app": name}
+    return {"apiVersion": "apps/v1", "kind": "Deployment",
+            "metadata": {"name": name, "labels": labels},
+            "spec": {"replicas": replicas,
+                     "selector": {"matchLabels": labels},
+                     "template": {"metadata": {"labels": labels},
+                                  "spec": {"containers": [
+                                      {"name": "main", "image": "nginx"}]}}}}
+
+
+class TestAsyncClients(object):
+    """
+    Test class for the asyncio clients, against the fake api server of the
+    benchmarks (a simulated control plane), no cluster is required.
+    """
+
+    def setup_method(self):
+        self.server = FakeApiServer(cluster=FakeCluster(
+            nodes=2, pod_start_latency=0.05)).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.kubeconfig_path = self.server.write_kubeconfig(
+            path=os.path.join(self.directory.name, "kubeconfig"))
+
+    def teardown_method(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def run(self, scenario):
+        async def with_client():
+            async with AsyncK8sClient(
+                    kubeconfig_path=self.kubeconfig_path) as k8s:
+                return await asyncio.wait_for(scenario(k8s), timeout=30)
+
+        return asyncio.run(with_client())
+
+    def test_pod_create_wait_delete(self):
+        async def scenario(k8s):
+            assert_equal(actual_result=await k8s.pod.create(
+                body=pod_body(name="web")), expected_result="web")
+            assert_equal(actual_result=await k8s.pod.get_status(name="web"),
+                         expected_result="Running")
+            with pytest.raises(K8sAlreadyExistsException):
+                await k8s.pod.create(body=pod_body(name="web"), wait=False)
+            await k8s.pod.delete(name="web", wait=True)
+            with pytest.raises(K8sNotFoundException):
+                await k8s.pod.get(name="web")
+            with pytest.raises(K8sNotFoundException):
+                await k8s.pod.delete(name="web")
+
+        self.run(scenario)
+
+    def test_pod_pull_failure(self):
+        async def scenario(k8s):
+            with pytest.raises(K8sPullingException):
+                await k8s.pod.create(body=pod_body(
+                    name="broken", image=f"{PULL_FAILURE_MARK}/app"))
+
+        self.run(scenario)
+
+    def test_deployment_create_wait_delete(self):
+        async def scenario(k8s):
+            await k8s.deployment.create(body=deployment_body(name="web",
+                                                             replicas=3))
+            pods = await k8s.deployment.get_pods(name="web")
+            assert_equal(actual_result=sorted(
+                pod.status.phase for pod in pods),
+                expected_result=["Running"] * 3)
+            await k8s.deployment.delete(name="web", wait=True)
+            assert_equal(actual_result=await k8s.pod.list_names(
+                label_selector="app=web"), expected_result=[])
+            with pytest.raises(K8sNotFoundException):
+                await k8s.deployment.get(name="web")
+
+        self.run(scenario)
+
+    def test_exception_mapping(self):
+        @async_k8s_exceptions
+        async def fail(error):
+            raise error
+
+        not_found = ApiException(status=404, reason="Not Found")
+        not_found.body = json.dumps({"kind": "Status", "reason": "NotFound",
+                                     "message": 'pods "web" not found'})
+        with pytest.raises(K8sNotFoundException):
+            asyncio.run(fail(error=not_found))
+        # the errors of watch streams come without a body
+        with pytest.raises(K8sException) as error:
+            asyncio.run(fail(error=ApiException(status=500,
+                                                reason="Internal error")))
+        assert_equal(actual_result=error.value.status, expected_result=500)
+        assert "Internal error" in str(error.value)
@@ -0,0 +1,153 @@
+from kubernetes.client import (V1Deployment, V1DeploymentList,
+                               V1DeploymentSpec, V1LabelSelector, V1ListMeta,
+                               V1ObjectMeta, V1OwnerReference, V1Pod,
+                               V1PodList, V1PodTemplateSpec, V1ReplicaSet,
+                               V1ReplicaSetList, V1ReplicaSetSpec)
+
+from k8s_client.deployment import DeploymentClient
+from k8s_client.pod import PodClient
+from tests.asserts_wrapper import assert_equal
+
+
+def make_metadata(name, uid, labels, owner=None):
+    owner_references = None
+    if owner is not None:
+        kind, owner_name, owner_uid = owner
+        owner_references = [V1OwnerReference(
+            api_version="apps/v1", kind=kind, name=owner_name, uid=owner_uid,
+            controller=True)]
+    return V1ObjectMeta(name=name, namespace="default", uid=uid,
+                        labels=labels, owner_references=owner_references)
+
+
+def make_deployment(name, uid):
+    return V1Deployment(
+        metadata=make_metadata(name=name, uid=uid, labels={"app": name}),
+        spec=V1DeploymentSpec(
+            selector=V1LabelSelector(match_labels={"app": name}),
+            template=V1PodTemplateSpec()))
+
+
+def make_replica_set(name, uid, app, owner_name, owner_uid):
+    return V1ReplicaSet(
+        metadata=make_metadata(name=name, uid=uid, labels={"app": app},
+                               owner=("Deployment", owner_name, owner_uid)),
+        spec=V1ReplicaSetSpec(selector=V1LabelSelector(
+            match_labels={"app": app})))
+
+
+def make_pod(name, app, owner=None):
+    return V1Pod(metadata=make_metadata(name=name, uid=f"uid-{name}",
+                                        labels={"app": app}, owner=owner))
+
+
+def select(objects, field_selector="", label_selector=""):
+    """
+    the equality selectors of the api server, enough for the fake
+    """
+    for requirement in filter(None, label_selector.split(",")):
+        key, value = requirement.split("=")
+        objects = [obj for obj in objects
+                   if (obj.metadata.labels or {}).get(key) == value]
+    for requirement in filter(None, field_selector.split(",")):
+        key, value = requirement.replace("==", "=").split("=")
+        assert key == "metadata.name"
+        objects = [obj for obj in objects if obj.metadata.name == value]
+    return objects
+
+
+class FakeAppsApi(object):
+    def __init__(self, deployments, replica_sets, calls):
+        self.deployments = deployments
+        self.replica_sets = replica_sets
+        self.calls = calls
+
+    def list_namespaced_deployment(self, namespace, **kwargs):
+        self.calls.append(("deployments", kwargs.get("label_selector", "")))
+        return V1DeploymentList(items=select(self.deployments, **kwargs),
+                                metadata=V1ListMeta())
+
+    def list_namespaced_replica_set(self, namespace, **kwargs):
+        self.calls.append(("replicasets", kwargs.get("label_selector", "")))
+        return V1ReplicaSetList(items=select(self.replica_sets, **kwargs),
+                                metadata=V1ListMeta())
+
+
+class FakeCoreApi(object):
+    def __init__(self, pods, calls):
+        self.pods = pods
+        self.calls = calls
+
+    def list_namespaced_pod(self, namespace, **kwargs):
+        self.calls.append(("pods", kwargs.get("label_selector", "")))
+        return V1PodList(items=select(self.pods, **kwargs),
+                         metadata=V1ListMeta())
+
+
+class TestDeploymentPods(object):
+    """
+    Test class for resolving the pods of the deployments through their
+    replica sets, against a fake api, no cluster is required.
+    """
+
+    def setup_method(self):
+        self.calls = []
+        client_app = FakeAppsApi(
+            deployments=[make_deployment(name="web", uid="d-web"),
+                         make_deployment(name="api", uid="d-api")],
+            replica_sets=[
+                make_replica_set(name="web-1", uid="rs-web-1", app="web",
+                                 owner_name="web", owner_uid="d-web"),
+                make_replica_set(name="web-0", uid="rs-web-0", app="web",
+                                 owner_name="web", owner_uid="d-web"),
+                make_replica_set(name="api-1", uid="rs-api-1", app="api",
+                                 owner_name="api", owner_uid="d-api"),
+                # a replica set of another deployment with the same labels
+                make_replica_set(name="web-copy-1", uid="rs-copy", app="web",
+                                 owner_name="web-copy", owner_uid="d-copy")],
+            calls=self.calls)
+        client_core = FakeCoreApi(pods=[
+            make_pod(name="web-1-a", app="web",
+                     owner=("ReplicaSet", "web-1", "rs-web-1")),
+            make_pod(name="web-0-a", app="web",
+                     owner=("ReplicaSet", "web-0", "rs-web-0")),
+            make_pod(name="api-1-a", app="api",
+                     owner=("ReplicaSet", "api-1", "rs-api-1")),
+            # pods with the labels of web that web does not own
+            make_pod(name="web-copy-1-a", app="web",
+                     owner=("ReplicaSet", "web-copy-1", "rs-copy")),
+            make_pod(name="web-job-a", app="web",
+                     owner=("Job", "web-job", "job-uid")),
+            make_pod(name="web-bare", app="web")], calls=self.calls)
+        self.deployment = DeploymentClient(
+            client_app=client_app, pod=PodClient(client_core=client_core))
+
+    def test_get_pods(self):
+        pods = self.deployment.get_pods(name="web")
+        assert_equal(actual_result=sorted(pod.metadata.name for pod in pods),
+                     expected_result=["web-0-a", "web-1-a"])
+        # the replica sets and the pods are selected by the deployment labels
+        assert_equal(actual_result=self.calls,
+                     expected_result=[("deployments", ""),
+                                      ("replicasets", "app=web"),
+                                      ("pods", "app=web")])
+
+    def test_get_pods_for_many(self):
+        pods_by_deployment = self.deployment.get_pods_for_many(
+            names=["web", "api", "missing"])
+        assert_equal(actual_result={
+            name: sorted(pod.metadata.name for pod in pods)
+            for name, pods in pods_by_deployment.items()},
+            expected_result={"web": ["web-0-a", "web-1-a"],
+                             "api": ["api-1-a"], "missing": []})
+        # one list of each kind for all the deployments
+        assert_equal(actual_result=self.calls,
+                     expected_result=[("deployments", ""),
+                                      ("replicasets", ""), ("pods", "")])
+
+    def test_list_replica_sets(self):
+        replica_sets = self.deployment.list_replica_sets(
+            label_selector="app=web")
+        assert_equal(actual_result=[replica_set.metadata.name for replica_set
+                                    in replica_sets],
+                     expected_result=["web-1", "web-0", "web-copy-1"])
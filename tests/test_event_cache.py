@@ -0,0 +1,102 @@
+import threading
+import time
+
+from kubernetes.client import (CoreV1Event, CoreV1EventList, V1ListMeta,
+                               V1ObjectMeta, V1ObjectReference)
+
+from k8s_client.informer import EventCache, list_events
+from tests.asserts_wrapper import assert_equal
+from tests.utils import FakeResponse
+
+
+def make_event(name, uid, resource_version, message="Started"):
+    return CoreV1Event(metadata=V1ObjectMeta(name=name, namespace="default",
+                                             resource_version=resource_version),
+                       involved_object=V1ObjectReference(uid=uid),
+                       message=message)
+
+
+class FakeEventsApi(object):
+    def __init__(self, events, watch_events):
+        self.events = events
+        self.watch_events = watch_events
+        self.released = threading.Event()
+        self.list_calls = 0
+        self.watch_calls = 0
+
+    def list_namespaced_event(self, namespace, watch=False,
+                              field_selector=None,
+                              **kwargs) -> CoreV1EventList:
+        if watch:
+            self.watch_calls += 1
+            events, self.watch_events = self.watch_events, []
+            return FakeResponse(events=events, released=self.released)
+        self.list_calls += 1
+        items = [event for event in self.events if field_selector is None or
+                 field_selector == f"involvedObject.uid=="
+                                   f"{event.involved_object.uid}"]
+        return CoreV1EventList(items=items,
+                               metadata=V1ListMeta(resource_version="10"))
+
+
+class TestEventCache(object):
+    """
+    Test class for the events of the objects from the shared event cache,
+    against a fake api, no cluster is required.
+    """
+
+    def test_events_of_objects(self):
+        client_core = FakeEventsApi(
+            events=[make_event(name="a-1", uid="a", resource_version="1"),
+                    make_event(name="a-2", uid="a", resource_version="2"),
+                    make_event(name="b-1", uid="b", resource_version="3")],
+            watch_events=[
+                ("ADDED", make_event(name="b-2", uid="b",
+                                     resource_version="11")),
+                ("DELETED", make_event(name="a-1", uid="a",
+                                       resource_version="12"))])
+        event_cache = EventCache(client_core=client_core)
+        try:
+            deadline = time.monotonic() + 5
+            while len(event_cache.events(uid="b", namespace="default")) < 2 \
+                    and time.monotonic() < deadline:
+                time.sleep(0.01)
+            for uid, names in (("a", ["a-2"]), ("b", ["b-1", "b-2"]),
+                               ("c", [])):
+                events = list_events(client_core=client_core, uid=uid,
+                                     namespace="default",
+                                     event_cache=event_cache)
+                assert_equal(actual_result=sorted(
+                    event.metadata.name for event in events),
+                    expected_result=names)
+        finally:
+            event_cache.stop()
+            client_core.released.set()
+        # all the reads of the namespace came from a single list
+        assert_equal(actual_result=client_core.list_calls, expected_result=1)
+
+    def test_list_events_without_cache(self):
+        client_core = FakeEventsApi(
+            events=[make_event(name="a-1", uid="a", resource_version="1"),
+                    make_event(name="b-1", uid="b", resource_version="2")],
+            watch_events=[])
+        events = list_events(client_core=client_core, uid="b",
+                             namespace="default")
+        assert_equal(actual_result=[event.metadata.name for event in events],
+                     expected_result=["b-1"])
+        assert_equal(actual_result=client_core.watch_calls, expected_result=0)
+
+    def test_events_of_all_namespaces_without_cache(self):
+        client_core = FakeEventsApi(events=[], watch_events=[])
+        client_core.list_event_for_all_namespaces = \
+            lambda field_selector: CoreV1EventList(items=[make_event(
+                name="node-1", uid="n", resource_version="1")])
+        event_cache = EventCache(client_core=client_core)
+        events = list_events(client_core=client_core, uid="n",
+                             event_cache=event_cache)
+        assert_equal(actual_result=[event.metadata.name for event in events],
+                     expected_result=["node-1"])
+        # no watch of all the events of the cluster was started
+        assert_equal(actual_result=client_core.watch_calls,
+                     expected_result=0)
+        event_cache.stop()
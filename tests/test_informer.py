@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+
+from kubernetes.client import (ApiClient, V1ListMeta, V1ObjectMeta, V1Pod,
+                               V1PodList)
+
+from k8s_client.informer import Informer, InformerCache
+from tests.asserts_wrapper import assert_equal
+from tests.utils import FakeResponse
+
+
+def make_pod(name, resource_version, labels=None, namespace="default"):
+    return V1Pod(metadata=V1ObjectMeta(name=name, namespace=namespace,
+                                       resource_version=resource_version,
+                                       labels=labels))
+
+
+def watch_event(event_type, pod):
+    return {"type": event_type,
+            "object": ApiClient().sanitize_for_serialization(pod)}
+
+
+def gone_event():
+    return {"type": "ERROR", "object": {"code": 410, "reason": "Gone",
+                                        "message": "too old resource version"}}
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timeout of the test wait"
+        time.sleep(0.01)
+
+
+class FakePodsApi(object):
+    """
+    list+watch of pods, each watch sends the next events the test puts in
+    the watches queue (a watch without events waits until released)
+    """
+
+    def __init__(self, lists):
+        self.lists = list(lists)
+        self.watches = queue.Queue()
+        self.released = threading.Event()
+        self.list_calls = []
+        self.watch_versions = []
+
+    def list_namespaced_pod(self, namespace, watch=False,
+                            resource_version=None, **kwargs) -> V1PodList:
+        if not watch:
+            self.list_calls.append(namespace)
+            resource_version, pods = self.lists.pop(0)
+            return V1PodList(items=pods, metadata=V1ListMeta(
+                resource_version=resource_version))
+        self.watch_versions.append(resource_version)
+        while not self.released.is_set():
+            try:
+                return FakeResponse(events=self.watches.get(
+                    timeout=0.01))
+            except queue.Empty:
+                pass
+        return FakeResponse(events=[])
+
+    def list_pod_for_all_namespaces(self, **kwargs) -> V1PodList:
+        return self.list_namespaced_pod(namespace=None, **kwargs)
+
+
+class FakeAppsApi(object):
+    def list_namespaced_deployment(self, **kwargs):
+        pass
+
+    list_deployment_for_all_namespaces = list_namespaced_replica_set = \
+        list_replica_set_for_all_namespaces = list_namespaced_daemon_set = \
+        list_daemon_set_for_all_namespaces = list_namespaced_deployment
+
+
+def names(informer):
+    return sorted(pod.metadata.name for pod in informer.list())
+
+
+class TestInformer(object):
+    """
+    Test class for the informers of the resources, against a fake list and
+    watch, no cluster is required.
+    """
+
+    def test_sync_events_resume_and_relist(self):
+        client_core = FakePodsApi(lists=[
+            ("10", [make_pod(name="a", resource_version="1"),
+                    make_pod(name="b", resource_version="2")]),
+            ("20", [make_pod(name="a", resource_version="15"),
+                    make_pod(name="d", resource_version="19")])])
+        informer = Informer(list_func=client_core.list_namespaced_pod,
+                            namespace="default",
+                            index_func=lambda pod: (pod.metadata.labels or
+                                                    {}).get("app"))
+        informer.start()
+        try:
+            assert informer.wait_for_sync(timeout=5)
+            assert_equal(actual_result=names(informer),
+                         expected_result=["a", "b"])
+
+            # a keep-alive line does not break the watch
+            client_core.watches.put([
+                None,
+                watch_event("ADDED", make_pod(name="c", resource_version="11",
+                                              labels={"app": "web"})),
+                watch_event("MODIFIED", make_pod(
+                    name="a", resource_version="12", labels={"app": "web"})),
+                watch_event("DELETED", make_pod(name="b",
+                                                resource_version="13"))])
+            wait_until(lambda: informer.resource_version == "13")
+            assert_equal(actual_result=names(informer),
+                         expected_result=["a", "c"])
+            assert_equal(actual_result=sorted(
+                pod.metadata.name for pod in informer.by_index("web")),
+                expected_result=["a", "c"])
+            assert_equal(actual_result=informer.get(
+                name="a", namespace="default").metadata.labels,
+                expected_result={"app": "web"})
+
+            # the watch is resumed from the last seen resourceVersion, and
+            # the informer relists when that version is gone
+            client_core.watches.put([gone_event()])
+            wait_until(lambda: len(client_core.watch_versions) == 3)
+            assert_equal(actual_result=client_core.watch_versions,
+                         expected_result=["10", "13", "20"])
+            assert_equal(actual_result=len(client_core.list_calls),
+                         expected_result=2)
+            assert_equal(actual_result=names(informer),
+                         expected_result=["a", "d"])
+            assert_equal(actual_result=informer.by_index("web"),
+                         expected_result=[])
+        finally:
+            informer.stop()
+            client_core.released.set()
+        informer._thread.join(timeout=5)
+        assert not informer._thread.is_alive()
+
+    def test_returned_objects_are_copies(self):
+        client_core = FakePodsApi(lists=[
+            ("10", [make_pod(name="a", resource_version="1")])])
+        informer = Informer(list_func=client_core.list_namespaced_pod,
+                            namespace="default").start()
+        try:
+            informer.wait_for_sync(timeout=5)
+            informer.get(name="a", namespace="default").metadata.\
+                resource_version = ""
+            assert_equal(actual_result=informer.get(
+                name="a", namespace="default").metadata.resource_version,
+                expected_result="1")
+        finally:
+            informer.stop()
+            client_core.released.set()
+
+    def test_informer_cache_shares_informers(self):
+        client_core = FakePodsApi(lists=[
+            ("10", [make_pod(name="a", resource_version="1"),
+                    make_pod(name="b", resource_version="2",
+                             namespace="other")])])
+        cache = InformerCache(client_core=client_core,
+                              client_app=FakeAppsApi(), sync_timeout=5)
+        try:
+            # the cluster wide informer serves the reads of the namespaces
+            cache.informer(kind="pods")
+            assert_equal(actual_result=[pod.metadata.name for pod in
+                                        cache.list(kind="pods",
+                                                   namespace="default")],
+                         expected_result=["a"])
+            assert_equal(actual_result=cache.get(
+                kind="pods", name="b", namespace="other").metadata.name,
+                expected_result="b")
+            assert_equal(actual_result=client_core.list_calls,
+                         expected_result=[None])
+        finally:
+            cache.stop()
+            client_core.released.set()
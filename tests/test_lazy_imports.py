@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from k8s_client.utils import lazy_attribute
+from tests.asserts_wrapper import assert_equal
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Creates a client with a kubeconfig that does not exist (it is not loaded
+# before the first request) and prints the heavy modules it imported
+CREATE_CLIENT_SCRIPT = """
+import json, sys
+from k8s_client.lite_k8s import K8sClient
+k8s = K8sClient(kubeconfig_path="/no/such/kubeconfig")
+k8s.close()
+print(json.dumps([name for name in ("paramiko",
+                                    "kubernetes.client.api.core_v1_api",
+                                    "kubernetes.client.api.apps_v1_api",
+                                    "kubernetes.client.models.v1_pod")
+                  if name in sys.modules]))
+"""
+
+
+class Counter(object):
+    def __init__(self):
+        self.builds = 0
+
+    @lazy_attribute
+    def value(self):
+        self.builds += 1
+        return object()
+
+
+class TestLazyImports(object):
+    """
+    Test class for the lazy imports and the lazy clients of the K8sClient,
+    no cluster is required.
+    """
+
+    def test_create_client_imports(self):
+        output = subprocess.run([sys.executable, "-c", CREATE_CLIENT_SCRIPT],
+                                cwd=ROOT_DIR, check=True, capture_output=True,
+                                text=True).stdout
+        assert_equal(actual_result=json.loads(output.splitlines()[-1]),
+                     expected_result=[])
+
+    def test_lazy_attribute(self):
+        counter = Counter()
+        assert not lazy_attribute.is_built(counter, "value")
+        values = []
+        threads = [threading.Thread(target=lambda: values.append(
+            counter.value)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert lazy_attribute.is_built(counter, "value")
+        assert_equal(actual_result=counter.builds, expected_result=1)
+        assert all(value is values[0] for value in values)
@@ -0,0 +1,176 @@
+import os
+import tempfile
+
+from benchmarks.fake_apiserver import FakeApiServer, FakeCluster
+from k8s_client.lite_k8s import K8sClient
+from k8s_client.metrics import (CALL_SECONDS, METRICS, REQUEST_SECONDS,
+                                REQUESTS_TOTAL, RESPONSE_BYTES_TOTAL,
+                                RETRIES_TOTAL, WAIT_ITERATIONS_TOTAL,
+                                WAIT_SECONDS, Metrics, prometheus_text,
+                                request_labels)
+from k8s_client.retry import RetryPolicy
+from k8s_client.transport import tune_requests
+from tests.asserts_wrapper import assert_equal
+
+
+class FakeResponse(object):
+    def __init__(self, status, body=b""):
+        self.status = status
+        self.body = body
+        self.headers = {}
+
+    def read(self):
+        return self.body
+
+    def read_chunked(self):
+        yield self.body
+
+    def release_conn(self):
+        pass
+
+
+class FakeRestClient(object):
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def request(self, method, url, **kwargs):
+        return FakeResponse(status=self.statuses.pop(0),
+                            body=b'{"items": []}')
+
+
+class TestMetrics(object):
+    """
+    Test class for the metrics of the requests and the waits, no cluster is
+    required.
+    """
+
+    def test_request_labels(self):
+        for method, url, labels in (
+                ("GET", "https://k8s/api/v1/namespaces/a/pods",
+                 ("pods", "list")),
+                ("GET", "https://k8s/api/v1/namespaces/a/pods?watch=true",
+                 ("pods", "watch")),
+                ("GET", "https://k8s/api/v1/namespaces/a/pods/web/log",
+                 ("pods/log", "get")),
+                ("DELETE", "https://k8s/apis/apps/v1/namespaces/a/"
+                           "deployments", ("deployments", "deletecollection")),
+                ("PATCH", "https://k8s/apis/apps/v1/namespaces/a/"
+                          "deployments/web", ("deployments", "patch")),
+                ("GET", "https://k8s/api/v1/namespaces/a",
+                 ("namespaces", "get")),
+                ("POST", "https://k8s/api/v1/nodes", ("nodes", "create"))):
+            assert_equal(actual_result=request_labels(method=method, url=url),
+                         expected_result=labels)
+
+    def test_histogram_and_prometheus_text(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        for seconds in (0.05, 0.5, 0.7, 3):
+            metrics.observe(REQUEST_SECONDS, seconds, kind="pods",
+                            verb="list")
+        metrics.inc(REQUESTS_TOTAL, kind="pods", verb="list", status="200")
+        assert_equal(actual_result=metrics.histogram(
+            REQUEST_SECONDS, kind="pods", verb="list").cumulative(),
+            expected_result=[[0.1, 1], [1, 3], ["+Inf", 4]])
+        text = prometheus_text(snapshot=metrics.snapshot())
+        assert 'k8s_client_requests_total{kind="pods",status="200",' \
+               'verb="list"} 1\n' in text
+        assert 'k8s_client_request_seconds_bucket{kind="pods",verb="list",' \
+               'le="1"} 3\n' in text
+        assert 'k8s_client_request_seconds_count{kind="pods",' \
+               'verb="list"} 4\n' in text
+        metrics.enabled = False
+        metrics.inc(REQUESTS_TOTAL, kind="pods", verb="list", status="200")
+        assert_equal(actual_result=metrics.counter(
+            REQUESTS_TOTAL, kind="pods", verb="list", status="200"),
+            expected_result=1)
+
+    def test_record_requests(self):
+        metrics = Metrics()
+        rest_client = FakeRestClient(statuses=[503, 200])
+        tune_requests(rest_client=rest_client, metrics=metrics,
+                      retry_policy=RetryPolicy(base_delay=0))
+        response = rest_client.request(
+            "GET", "https://k8s/api/v1/namespaces/a/pods")
+        assert_equal(actual_result=response.read(),
+                     expected_result=b'{"items": []}')
+        labels = {"kind": "pods", "verb": "list"}
+        for status in ("503", "200"):
+            assert_equal(actual_result=metrics.counter(
+                REQUESTS_TOTAL, status=status, **labels), expected_result=1)
+        assert_equal(actual_result=metrics.counter(RETRIES_TOTAL, **labels),
+                     expected_result=1)
+        assert_equal(actual_result=metrics.counter(
+            RESPONSE_BYTES_TOTAL, **labels), expected_result=13)
+        assert_equal(actual_result=metrics.histogram(
+            REQUEST_SECONDS, **labels).count, expected_result=2)
+
+    def test_record_poll_wait(self):
+        attempts = iter([False, False, True])
+
+        def condition_of_test_wait():
+            return next(attempts)
+
+        RetryPolicy(max_attempts=None, base_delay=0).wait_until(
+            condition_of_test_wait)
+        assert_equal(actual_result=METRICS.counter(
+            WAIT_ITERATIONS_TOTAL, wait="condition_of_test_wait",
+            loop="poll"), expected_result=3)
+
+
+def recorded(metrics):
+    snapshot = metrics.snapshot()
+    return snapshot["counters"], snapshot["histograms"]
+
+
+class TestClientMetrics(object):
+    """
+    Test class for the metrics of the calls and the waits of the clients,
+    against the fake api server of the benchmarks, no cluster is required.
+    """
+
+    def setup_method(self):
+        self.server = FakeApiServer(cluster=FakeCluster(
+            nodes=1, pod_start_latency=0.05)).start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.kubeconfig_path = self.server.write_kubeconfig(
+            path=os.path.join(self.directory.name, "kubeconfig"))
+
+    def teardown_method(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def create_and_delete_pod(self, metrics):
+        k8s = K8sClient(kubeconfig_path=self.kubeconfig_path,
+                        metrics=metrics)
+        try:
+            k8s.pod.create(body={
+                "apiVersion": "v1", "kind": "Pod",
+                "metadata": {"name": "web", "labels": {"app": "web"}},
+                "spec": {"containers": [{"name": "main",
+                                         "image": "nginx"}]}})
+            k8s.pod.delete_collection(label_selector="app=web", wait=True)
+        finally:
+            k8s.close()
+
+    def test_no_metrics_records_nothing(self):
+        before = recorded(metrics=METRICS)
+        self.create_and_delete_pod(metrics=None)
+        assert_equal(actual_result=recorded(metrics=METRICS),
+                     expected_result=before)
+
+    def test_client_metrics(self):
+        before = recorded(metrics=METRICS)
+        metrics = Metrics()
+        self.create_and_delete_pod(metrics=metrics)
+        # the requests, the calls and the waits of a client are recorded
+        # in its metrics only
+        assert_equal(actual_result=recorded(metrics=METRICS),
+                     expected_result=before)
+        assert_equal(actual_result=metrics.histogram(
+            CALL_SECONDS, method="PodClient.create", result="ok").count,
+            expected_result=1)
+        assert_equal(actual_result=metrics.histogram(
+            WAIT_SECONDS, wait="list_namespaced_pod", loop="watch",
+            result="met").count, expected_result=2)
+        assert metrics.counter(REQUESTS_TOTAL, kind="pods", verb="create",
+                               status="201")
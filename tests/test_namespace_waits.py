@@ -0,0 +1,74 @@
+from kubernetes.client import V1NamespaceList
+
+from k8s_client.namespace import NamespaceClient
+from tests.asserts_wrapper import assert_equal
+from tests.utils import FakeResponse
+
+
+class FakeCoreApi(object):
+    """
+    list of the namespaces and watches that send the scripted events, each
+    watch script has the namespaces that exist after its events
+    """
+
+    def __init__(self, namespaces, watches=()):
+        self.namespaces = namespaces
+        self.watches = list(watches)
+        self.calls = []
+
+    def list_namespace(self, field_selector, _preload_content=True,
+                       watch=False, resource_version=None,
+                       **kwargs) -> V1NamespaceList:
+        if watch:
+            self.calls.append(("watch", resource_version))
+            events, self.namespaces = self.watches.pop(0)
+            return FakeResponse(events=events)
+        self.calls.append(field_selector)
+        name = field_selector.split("=")[-1]
+        return FakeResponse(body={
+            "metadata": {"resourceVersion": str(12 + len(self.calls))},
+            "items": [namespace for namespace in self.namespaces
+                      if namespace["metadata"]["name"] == name]})
+
+
+class TestNamespaceWaits(object):
+    """
+    Test class for the waits of the namespaces that are already over, no
+    cluster is required.
+    """
+
+    def test_already_deleted(self):
+        client_core = FakeCoreApi(namespaces=[{"metadata": {"name": "shop"}}])
+        namespace = NamespaceClient(client_core=client_core)
+        assert namespace.wait_for_namespace_deletion(namespace_name="sho")
+        # only the namespace itself is listed, not the namespaces that
+        # contain its name
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=["metadata.name=sho"])
+
+    def test_already_active(self):
+        progress = []
+        namespace = NamespaceClient(client_core=FakeCoreApi(namespaces=[
+            {"metadata": {"name": "shop"}, "status": {"phase": "Active"}}]))
+        assert namespace.wait_for_namespace_creation(
+            namespace_name="shop", on_progress=progress.append)
+        assert_equal(actual_result=progress, expected_result=[])
+
+    def test_deleted_while_gone(self):
+        progress = []
+        terminating = {"metadata": {"name": "shop"},
+                       "status": {"phase": "Terminating"}}
+        gone = {"type": "ERROR", "object": {
+            "code": 410, "reason": "Gone",
+            "message": "too old resource version"}}
+        client_core = FakeCoreApi(namespaces=[terminating], watches=[
+            # the namespace is deleted while the watch is gone, the watch
+            # from the current state would never send its deletion
+            ([{"type": "MODIFIED", "object": terminating}, gone], [])])
+        namespace = NamespaceClient(client_core=client_core)
+        assert namespace.wait_for_namespace_deletion(
+            namespace_name="shop", timeout=5, on_progress=progress.append)
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=["metadata.name=shop", ("watch", "13"),
+                                      "metadata.name=shop"])
+        assert_equal(actual_result=len(progress), expected_result=2)
@@ -0,0 +1,108 @@
+import time
+
+from k8s_client.pod import PodClient, read_exec_stream
+from k8s_client.workers import WorkerPool
+from tests.asserts_wrapper import assert_equal
+
+
+class FakeWSClient(object):
+    """
+    websocket client of an exec that receives a chunk per update
+    """
+
+    def __init__(self, chunks, returncode):
+        self.chunks = list(chunks)
+        self.channels = {}
+        self.returncode = returncode
+        self.closed = False
+
+    def is_open(self):
+        return bool(self.chunks)
+
+    def update(self, timeout=0):
+        if self.chunks:
+            channel, data = self.chunks.pop(0)
+            self.channels[channel] = self.channels.get(channel, "") + data
+
+    def read_stdout(self, timeout=None):
+        return self.channels.pop("stdout", "")
+
+    def read_stderr(self, timeout=None):
+        return self.channels.pop("stderr", "")
+
+    def close(self):
+        self.closed = True
+
+
+class SlowExecPodClient(PodClient):
+    """
+    pod client whose commands take EXEC_SECONDS on any pod
+    """
+    EXEC_SECONDS = 0.2
+
+    def execute_with_status(self, name, command, command_prefix=None,
+                            namespace="default", container=None,
+                            timeout=None, on_output=None):
+        time.sleep(self.EXEC_SECONDS)
+        if name == "broken":
+            raise RuntimeError("no such container")
+        on_output("stdout", f"{command} on {name}")
+        return f"{command} on {name}", "", 0
+
+
+class TestPodExec(object):
+    """
+    Test class for streaming the output of execs on pods, no cluster is
+    required.
+    """
+
+    def test_read_exec_stream(self):
+        resp = FakeWSClient(chunks=[("stdout", "a"), ("stderr", "oops"),
+                                    ("stdout", "b")], returncode=3)
+        chunks = []
+        result = read_exec_stream(
+            resp=resp, on_output=lambda channel, data:
+            chunks.append((channel, data)))
+        assert_equal(actual_result=result, expected_result=("ab", "oops", 3))
+        assert_equal(actual_result=chunks,
+                     expected_result=[("stdout", "a"), ("stderr", "oops"),
+                                      ("stdout", "b")])
+        assert resp.closed
+
+    def test_execute_many(self):
+        pool = WorkerPool(max_workers=10)
+        pod = SlowExecPodClient(client_core=None, pool=pool)
+        names = [f"web-{index}" for index in range(10)] + ["broken"]
+        chunks = []
+        start_time = time.monotonic()
+        results = list(pod.execute_many(
+            command="date", pods=names, concurrency=11,
+            on_output=lambda name, channel, data: chunks.append(name)))
+        elapsed = time.monotonic() - start_time
+        pool.shutdown()
+        # the commands ran together, not one after the other
+        assert elapsed < 3 * SlowExecPodClient.EXEC_SECONDS
+        results = {result.name: result for result in results}
+        assert_equal(actual_result=sorted(results), expected_result=sorted(names))
+        assert_equal(actual_result=results["web-3"].output,
+                     expected_result="date on web-3")
+        assert_equal(actual_result=results["web-3"].exit_status,
+                     expected_result=0)
+        assert isinstance(results["broken"].error, RuntimeError)
+        assert_equal(actual_result=sorted(chunks),
+                     expected_result=sorted(names[:-1]))
+
+    def test_execute_many_beyond_the_pool(self):
+        pool = WorkerPool(max_workers=4)
+        pod = SlowExecPodClient(client_core=None, pool=pool)
+        names = [f"web-{index}" for index in range(40)]
+        start_time = time.monotonic()
+        results = list(pod.execute_many(
+            command="date", pods=names, concurrency=40,
+            on_output=lambda name, channel, data: None))
+        elapsed = time.monotonic() - start_time
+        pool.shutdown()
+        # all the commands ran together, not 4 at a time
+        assert elapsed < 3 * SlowExecPodClient.EXEC_SECONDS
+        assert_equal(actual_result=sorted(result.name for result in results),
+                     expected_result=sorted(names))
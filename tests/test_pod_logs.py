@@ -0,0 +1,106 @@
+import io
+
+from k8s_client.logs import log_sort_key, merge_pod_logs
+from k8s_client.pod import PodClient
+from tests.asserts_wrapper import assert_equal
+
+
+class FakeStreamResponse(object):
+    def __init__(self, data):
+        self.data = data
+        self.released = False
+
+    def stream(self, chunk_size):
+        for index in range(0, len(self.data), chunk_size):
+            yield self.data[index:index + chunk_size]
+
+    def release_conn(self):
+        self.released = True
+
+    def shutdown(self):
+        pass
+
+
+class FakeCoreApi(object):
+    def __init__(self, data):
+        self.data = data
+        self.responses = []
+        self.calls = []
+
+    def read_namespaced_pod_log(self, name, namespace, **kwargs):
+        self.calls.append(kwargs)
+        self.responses.append(FakeStreamResponse(data=self.data))
+        return self.responses[-1]
+
+
+class TestPodLogs(object):
+    """
+    Test class for streaming pod's logs, no cluster is required.
+    """
+
+    def test_iter_logs(self):
+        client_core = FakeCoreApi(data=b"".join(
+            f"line {index}\n".encode() for index in range(10000)))
+        pod = PodClient(client_core=client_core)
+        lines = pod.iter_logs(name="web", tail_lines=10000)
+        assert_equal(actual_result=[next(lines), next(lines)],
+                     expected_result=["line 0", "line 1"])
+        lines.close()
+        # closing the generator returns the connection
+        assert client_core.responses[0].released
+        assert_equal(actual_result=client_core.calls[0],
+                     expected_result={"follow": False, "timestamps": False,
+                                      "_preload_content": False,
+                                      "tail_lines": 10000})
+
+    def test_write_logs(self):
+        data = b"".join(f"line {index}\n".encode() for index in range(10000))
+        pod = PodClient(client_core=FakeCoreApi(data=data))
+        output_file = io.BytesIO()
+        assert_equal(actual_result=pod.write_logs(name="web",
+                                                  output_file=output_file),
+                     expected_result=len(data))
+        assert_equal(actual_result=output_file.getvalue(),
+                     expected_result=data)
+
+
+class FakeLogsPodClient(object):
+    def __init__(self, logs):
+        self.logs = logs
+
+    def log_response(self, name, namespace, container, **kwargs):
+        return FakeStreamResponse(data="".join(
+            f"{timestamp} {line}\n" for timestamp, line in
+            self.logs[name]).encode())
+
+
+def running_pod(name):
+    return {"metadata": {"name": name},
+            "status": {"containerStatuses": [
+                {"name": "main", "state": {"running": {}}},
+                {"name": "init", "state": {"waiting": {}}}]}}
+
+
+class TestMergePodLogs(object):
+    """
+    Test class for merging the logs of many pods by their timestamps, no
+    cluster is required.
+    """
+
+    def test_sort_key(self):
+        assert log_sort_key("2024-05-01T10:00:00.5Z") > \
+            log_sort_key("2024-05-01T10:00:00.123456789Z")
+
+    def test_merge_by_timestamp(self):
+        pod_client = FakeLogsPodClient(logs={
+            "web-1": [("2024-05-01T10:00:00.1Z", "a"),
+                      ("2024-05-01T10:00:00.5Z", "c")],
+            "web-2": [("2024-05-01T10:00:00.25Z", "b"),
+                      ("2024-05-01T10:00:01Z", "d")]})
+        lines = merge_pod_logs(
+            pod_client=pod_client, namespace="default", follow=False,
+            list_pods=lambda: [running_pod(name="web-1"),
+                               running_pod(name="web-2")])
+        assert_equal(actual_result=[str(line) for line in lines],
+                     expected_result=["[web-1/main] a", "[web-2/main] b",
+                                      "[web-1/main] c", "[web-2/main] d"])
@@ -0,0 +1,118 @@
+from time import sleep
+
+import pytest
+from kubernetes.client import V1PodList
+
+from k8s_client.exceptions import (K8sNotFoundException, K8sPullingException,
+                                   K8sResourceTimeout)
+from k8s_client.pod import PodClient
+from k8s_client.watchers import wait_for_event
+from tests.asserts_wrapper import assert_equal
+from tests.utils import FakeResponse
+
+
+def container_status(name, state):
+    return {"name": name, "image": "nginx", "imageID": "", "ready": False,
+            "restartCount": 0, "state": state}
+
+
+def make_pod(resource_version, states, uid="uid-1"):
+    return {"metadata": {"name": "web", "namespace": "default", "uid": uid,
+                         "resourceVersion": resource_version},
+            "status": {"containerStatuses": [
+                container_status(name=f"c{index}", state=state)
+                for index, state in enumerate(states)]}}
+
+
+RUNNING = {"running": {}}
+CREATING = {"waiting": {"reason": "ContainerCreating"}}
+
+
+class FakeCoreApi(object):
+    """
+    Watch of pods, each watch sends the next scripted events and then the
+    server closes it, a watch after the scripted ones lasts its timeout
+    """
+
+    def __init__(self, watches):
+        self.watches = list(watches)
+        self.calls = []
+
+    def list_namespaced_pod(self, namespace, field_selector, watch=False,
+                            resource_version=None, timeout_seconds=None,
+                            **kwargs) -> V1PodList:
+        self.calls.append((field_selector, resource_version))
+        if self.watches:
+            return FakeResponse(events=self.watches.pop(0))
+        sleep(timeout_seconds)
+        return FakeResponse(events=[])
+
+
+class TestPodWaits(object):
+    """
+    Test class for the watch based waits of the containers of the pods,
+    against a fake watch, no cluster is required.
+    """
+
+    def wait(self, client_core, containers_counter=1, timeout=5):
+        return PodClient(client_core=client_core).wait_for_containers_to_run(
+            pod_name="web", pod_id="uid-1",
+            containers_counter=containers_counter, timeout=timeout)
+
+    def test_containers_running(self):
+        client_core = FakeCoreApi(watches=[[
+            ("ADDED", make_pod("1", states=[CREATING, CREATING])),
+            # a former pod with the same name is skipped
+            ("MODIFIED", make_pod("2", states=[RUNNING, RUNNING],
+                                  uid="uid-0")),
+            ("MODIFIED", make_pod("3", states=[RUNNING, CREATING])),
+            ("MODIFIED", make_pod("4", states=[RUNNING, RUNNING]))]])
+        assert self.wait(client_core=client_core, containers_counter=2)
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=[("metadata.name=web", None)])
+
+    def test_image_pull_failure(self):
+        client_core = FakeCoreApi(watches=[[
+            ("ADDED", make_pod("1", states=[CREATING])),
+            ("MODIFIED", make_pod("2", states=[{"waiting": {
+                "reason": "ErrImagePull",
+                "message": "pull access denied for nginx"}}])),
+            ("MODIFIED", make_pod("3", states=[RUNNING]))]])
+        with pytest.raises(K8sPullingException):
+            self.wait(client_core=client_core)
+
+    def test_pod_deleted(self):
+        client_core = FakeCoreApi(watches=[[
+            ("ADDED", make_pod("1", states=[CREATING])),
+            ("DELETED", make_pod("2", states=[CREATING]))]])
+        with pytest.raises(K8sNotFoundException):
+            self.wait(client_core=client_core)
+
+    def test_reopen_closed_watch(self):
+        client_core = FakeCoreApi(watches=[
+            [("ADDED", make_pod("1", states=[CREATING]))],
+            [],
+            [("MODIFIED", make_pod("5", states=[RUNNING]))]])
+        assert self.wait(client_core=client_core)
+        # the watch is reopened from the last seen resourceVersion
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=[("metadata.name=web", None),
+                                      ("metadata.name=web", "1"),
+                                      ("metadata.name=web", "1")])
+
+    def test_timeout(self):
+        client_core = FakeCoreApi(watches=[
+            [("ADDED", make_pod("1", states=[CREATING]))]])
+        with pytest.raises(K8sResourceTimeout):
+            self.wait(client_core=client_core, timeout=1)
+
+    def test_wait_for_event_returns_the_object(self):
+        client_core = FakeCoreApi(watches=[[
+            ("ADDED", make_pod("1", states=[CREATING])),
+            ("MODIFIED", make_pod("2", states=[RUNNING]))]])
+        pod = wait_for_event(
+            list_func=client_core.list_namespaced_pod,
+            condition=lambda event_type, pod_dict: event_type == "MODIFIED",
+            timeout=5, namespace="default", field_selector="metadata.name=web")
+        assert_equal(actual_result=pod["metadata"]["resourceVersion"],
+                     expected_result="2")
@@ -0,0 +1,82 @@
+from kubernetes.client.rest import ApiException
+
+from k8s_client.exceptions import K8sResourceTimeout
+from k8s_client.retry import RetryPolicy
+from tests.asserts_wrapper import assert_equal
+
+
+class FakeResponse(object):
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    def release_conn(self):
+        pass
+
+
+def failing_calls(*results):
+    results = list(results)
+    calls = []
+
+    def call():
+        calls.append(len(calls))
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return call, calls
+
+
+class TestRetryPolicy(object):
+    """
+    Test class for the retry policy of the api calls and the waits, no
+    cluster is required.
+    """
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+    def test_retry_throttling_with_retry_after(self):
+        call, calls = failing_calls(
+            FakeResponse(status=429, headers={"Retry-After": "0.01"}),
+            FakeResponse(status=200))
+        assert_equal(actual_result=self.policy.call(call).status,
+                     expected_result=200)
+        assert_equal(actual_result=len(calls), expected_result=2)
+
+    def test_not_retry_client_errors(self):
+        call, calls = failing_calls(ApiException(status=404),
+                                    FakeResponse(status=200))
+        try:
+            self.policy.call(call)
+            raise AssertionError("Did not get exception ApiException")
+        except ApiException:
+            pass
+        assert_equal(actual_result=len(calls), expected_result=1)
+
+    def test_not_retry_server_errors_of_not_idempotent_calls(self):
+        call, calls = failing_calls(FakeResponse(status=503),
+                                    FakeResponse(status=200))
+        assert_equal(actual_result=self.policy.call(call,
+                                                     idempotent=False).status,
+                     expected_result=503)
+        assert_equal(actual_result=len(calls), expected_result=1)
+
+    def test_return_last_response_after_max_attempts(self):
+        call, calls = failing_calls(*[FakeResponse(status=500)] * 3)
+        assert_equal(actual_result=self.policy.call(call).status,
+                     expected_result=500)
+        assert_equal(actual_result=len(calls), expected_result=3)
+
+    def test_wait_until(self):
+        call, calls = failing_calls(False, ApiException(status=503), True)
+        assert self.policy.wait_until(call)
+        assert_equal(actual_result=len(calls), expected_result=3)
+
+    def test_wait_until_deadline(self):
+        policy = RetryPolicy(max_attempts=None, deadline=0.05,
+                             base_delay=0.01, max_delay=0.01)
+        try:
+            policy.wait_until(lambda: False)
+            raise AssertionError("Did not get exception K8sResourceTimeout")
+        except K8sResourceTimeout:
+            pass
@@ -0,0 +1,181 @@
+import threading
+
+import pytest
+from kubernetes.client import V1DeploymentList, V1PodList
+
+from k8s_client.deployment import DeploymentClient
+from k8s_client.exceptions import K8sNotFoundException, K8sRolloutException
+from k8s_client.rollout import (daemon_set_rollout_status,
+                                deployment_rollout_status, follow_pods)
+from tests.asserts_wrapper import assert_equal
+from tests.utils import FakeResponse
+
+
+def make_deployment(generation=1, observed_generation=1, replicas=3,
+                    updated_replicas=3, available_replicas=3,
+                    total_replicas=3,
+                    progressing_reason="NewReplicaSetAvailable"):
+    return {"metadata": {"name": "web", "namespace": "default",
+                         "generation": generation, "resourceVersion": "5"},
+            "spec": {"replicas": replicas,
+                     "selector": {"matchLabels": {"app": "web"}},
+                     "template": {
+                         "metadata": {"labels": {"app": "web"}},
+                         "spec": {"containers": [{"name": "main",
+                                                  "image": "nginx"}]}}},
+            "status": {"observedGeneration": observed_generation,
+                       "replicas": total_replicas,
+                       "updatedReplicas": updated_replicas,
+                       "availableReplicas": available_replicas,
+                       "conditions": [{"type": "Progressing",
+                                       "status": "True",
+                                       "reason": progressing_reason,
+                                       "message": "progressing"}]}}
+
+
+def make_daemon_set(generation=1, observed_generation=1, desired=4,
+                    updated=4, ready=4, available=4, unavailable=0,
+                    update_strategy="RollingUpdate"):
+    status = {"observedGeneration": observed_generation,
+              "desiredNumberScheduled": desired,
+              "updatedNumberScheduled": updated, "numberReady": ready,
+              "numberAvailable": available}
+    if unavailable:
+        status["numberUnavailable"] = unavailable
+    return {"metadata": {"name": "agent", "generation": generation},
+            "spec": {"updateStrategy": {"type": update_strategy}},
+            "status": status}
+
+
+def make_pod(name, node_name, owner_uid):
+    return {"metadata": {"name": name, "namespace": "default",
+                         "resourceVersion": "7",
+                         "ownerReferences": [{"apiVersion": "apps/v1",
+                                              "kind": "DaemonSet",
+                                              "name": owner_uid,
+                                              "uid": owner_uid}]},
+            "spec": {"nodeName": node_name,
+                     "containers": [{"name": "main", "image": "agent"}]}}
+
+
+class FakeAppsApi(object):
+    def __init__(self, deployment, events=()):
+        self.deployment = deployment
+        self.events = events
+        self.calls = []
+
+    def list_namespaced_deployment(self, namespace, field_selector,
+                                   watch=False, resource_version=None,
+                                   **kwargs) -> V1DeploymentList:
+        self.calls.append(("watch" if watch else "list", field_selector,
+                           resource_version))
+        if watch:
+            return FakeResponse(events=self.events)
+        return FakeResponse(body={
+            "metadata": {"resourceVersion": "5"},
+            "items": [self.deployment] if self.deployment else []})
+
+
+class FakeCoreApi(object):
+    def __init__(self, pods):
+        self.pods = pods
+        self.calls = []
+
+    def list_namespaced_pod(self, namespace, label_selector, watch=False,
+                            **kwargs) -> V1PodList:
+        self.calls.append(label_selector)
+        return FakeResponse(events=[("ADDED", pod) for pod in self.pods])
+
+
+class TestRollout(object):
+    """
+    Test class for the rollout trackers of the deployments and the daemon
+    sets, against a fake api, no cluster is required.
+    """
+
+    def test_deployment_rollout_status(self):
+        for deployment, complete in (
+                (make_deployment(), True),
+                (make_deployment(generation=2), False),
+                (make_deployment(updated_replicas=2, total_replicas=2),
+                 False),
+                (make_deployment(total_replicas=4), False),
+                (make_deployment(replicas=2), False),
+                (make_deployment(available_replicas=1), False),
+                (make_deployment(replicas=0, updated_replicas=0,
+                                 available_replicas=0, total_replicas=0),
+                 True)):
+            assert_equal(actual_result=deployment_rollout_status(
+                deployment)[0], expected_result=complete)
+        with pytest.raises(K8sRolloutException):
+            deployment_rollout_status(make_deployment(
+                updated_replicas=1,
+                progressing_reason="ProgressDeadlineExceeded"))
+
+    def test_wait_for_rollout(self):
+        progress = []
+        client_app = FakeAppsApi(
+            deployment=make_deployment(generation=2),
+            events=[("MODIFIED", make_deployment(
+                        generation=2, observed_generation=2,
+                        updated_replicas=1, available_replicas=1)),
+                    ("MODIFIED", make_deployment(generation=2,
+                                                 observed_generation=2))])
+        deployment = DeploymentClient(client_app=client_app, pod=None)
+        assert deployment.wait_for_rollout(name="web",
+                                           on_progress=progress.append)
+        # one list and one watch of the deployment, no read of its pods
+        assert_equal(actual_result=client_app.calls,
+                     expected_result=[("list", "metadata.name=web", None),
+                                      ("watch", "metadata.name=web", "5")])
+        assert_equal(actual_result=len(progress), expected_result=2)
+
+    def test_rollout_failures(self):
+        deployment = DeploymentClient(client_app=FakeAppsApi(
+            deployment=make_deployment(updated_replicas=1),
+            events=[("MODIFIED", make_deployment(
+                updated_replicas=1,
+                progressing_reason="ProgressDeadlineExceeded"))]), pod=None)
+        with pytest.raises(K8sRolloutException):
+            deployment.wait_for_rollout(name="web")
+        deployment = DeploymentClient(client_app=FakeAppsApi(deployment=None),
+                                      pod=None)
+        with pytest.raises(K8sNotFoundException):
+            deployment.wait_for_rollout(name="web")
+
+    def test_daemon_set_rollout_status(self):
+        for daemon_set, complete in (
+                (make_daemon_set(), True),
+                (make_daemon_set(generation=2), False),
+                (make_daemon_set(updated=3), False),
+                (make_daemon_set(updated=3, update_strategy="OnDelete"),
+                 True),
+                (make_daemon_set(ready=3), False),
+                (make_daemon_set(available=3, unavailable=1), False),
+                (make_daemon_set(desired=0, updated=0, ready=0,
+                                 available=0), True)):
+            assert_equal(actual_result=daemon_set_rollout_status(
+                daemon_set)[0], expected_result=complete)
+
+    def test_follow_pods(self):
+        client_core = FakeCoreApi(pods=[
+            make_pod(name="agent-a", node_name="node-1", owner_uid="agent"),
+            make_pod(name="other", node_name="node-1", owner_uid="other"),
+            make_pod(name="agent-b", node_name="node-2", owner_uid="agent")])
+        stopped = threading.Event()
+        nodes = []
+
+        def on_pod(node_name, pod):
+            nodes.append((node_name, pod["metadata"]["name"]))
+            if len(nodes) == 2:
+                stopped.set()
+
+        follow_pods(list_func=client_core.list_namespaced_pod,
+                    namespace="default", label_selector="app=agent",
+                    owner_uid="agent", on_pod=on_pod, stopped=stopped)
+        # the pods of other owners that match the labels are skipped
+        assert_equal(actual_result=nodes,
+                     expected_result=[("node-1", "agent-a"),
+                                      ("node-2", "agent-b")])
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=["app=agent"])
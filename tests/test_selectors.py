@@ -0,0 +1,122 @@
+from kubernetes.client import (V1LabelSelector,
+                               V1LabelSelectorRequirement, V1ObjectMeta,
+                               V1OwnerReference, V1Pod, V1PodStatus)
+
+from k8s_client.exceptions import InvalidFieldSelector
+from k8s_client.selectors import (plan_selector, compile_selector,
+                                  to_label_selector)
+from k8s_client.utils import field_filter
+from tests.asserts_wrapper import assert_equal
+
+
+def make_pod(name, phase="Running", owner_kind=None, labels=None):
+    owners = [V1OwnerReference(api_version="apps/v1", kind=owner_kind,
+                               name=f"{name}-owner", uid=name)] \
+        if owner_kind else None
+    return V1Pod(metadata=V1ObjectMeta(name=name, labels=labels,
+                                       owner_references=owners),
+                 status=V1PodStatus(phase=phase))
+
+
+class TestSelectorPlan(object):
+    """
+    Test class for splitting field selectors to the server side part and the
+    client side remainder, no cluster is required.
+    """
+
+    def test_plan_server_fields(self):
+        plan = plan_selector(field_selector="metadata.name==web, "
+                                            "spec.node_name=node-1",
+                             kind="pods")
+        assert_equal(actual_result=plan.field_selector,
+                     expected_result="metadata.name==web,spec.nodeName==node-1")
+        assert_equal(actual_result=plan.local_field_selector,
+                     expected_result="metadata.name==web,spec.node_name==node-1")
+        assert_equal(actual_result=plan.remainder, expected_result="")
+
+    def test_plan_remainder(self):
+        plan = plan_selector(field_selector="metadata.owner_references[0].kind"
+                                            "==ReplicaSet,status.phase!=Failed",
+                             kind="pods")
+        assert_equal(actual_result=plan.field_selector,
+                     expected_result="status.phase!=Failed")
+        assert_equal(actual_result=plan.remainder,
+                     expected_result="metadata.owner_references[0].kind"
+                                     "==ReplicaSet")
+
+    def test_plan_kind_specific_fields(self):
+        plan = plan_selector(field_selector="status.phase==Running",
+                             kind="deployments")
+        assert_equal(actual_result=plan.api_kwargs, expected_result={})
+        assert_equal(actual_result=plan.remainder,
+                     expected_result="status.phase==Running")
+
+    def test_plan_labels(self):
+        plan = plan_selector(field_selector="metadata.labels.app==web,"
+                                            "metadata.labels.tier!=db",
+                             kind="services", label_selector="env in (a,b)")
+        assert_equal(actual_result=plan.api_kwargs,
+                     expected_result={"label_selector":
+                                      "env in (a,b),app=web,tier!=db"})
+
+    def test_workload_label_selector(self):
+        selector = V1LabelSelector(
+            match_labels={"app": "web"},
+            match_expressions=[
+                V1LabelSelectorRequirement(key="tier", operator="In",
+                                           values=["front", "back"]),
+                V1LabelSelectorRequirement(key="canary",
+                                           operator="DoesNotExist")])
+        expected_result = "app=web,tier in (front,back),!canary"
+        assert_equal(actual_result=to_label_selector(selector),
+                     expected_result=expected_result)
+        assert_equal(actual_result=to_label_selector(
+            {"matchLabels": {"app": "web"},
+             "matchExpressions": [{"key": "tier", "operator": "In",
+                                   "values": ["front", "back"]},
+                                  {"key": "canary",
+                                   "operator": "DoesNotExist"}]}),
+            expected_result=expected_result)
+
+
+class TestCompiledSelector(object):
+    """
+    Test class for the compiled client side field selectors.
+    """
+    pods = [make_pod(name="web", owner_kind="ReplicaSet",
+                     labels={"app.kubernetes.io/name": "web"}),
+            make_pod(name="db", phase="Pending", owner_kind="StatefulSet"),
+            make_pod(name="job", phase="Succeeded")]
+
+    def test_filter_equal_and_not_equal(self):
+        names = [pod.metadata.name for pod in
+                 field_filter(obj_list=self.pods,
+                              field_selector="status.phase!=Pending, "
+                                             "metadata.name==web")]
+        assert_equal(actual_result=names, expected_result=["web"])
+
+    def test_filter_index_path(self):
+        names = [pod.metadata.name for pod in
+                 field_filter(obj_list=self.pods,
+                              field_selector="metadata.owner_references[0]"
+                                             ".kind!=ReplicaSet")]
+        # a missing owner reference does not match '!=' either
+        assert_equal(actual_result=names, expected_result=["db"])
+
+    def test_filter_label_key_with_dots(self):
+        names = [pod.metadata.name for pod in
+                 field_filter(obj_list=self.pods,
+                              field_selector="metadata.labels."
+                                             "app.kubernetes.io/name==web")]
+        assert_equal(actual_result=names, expected_result=["web"])
+
+    def test_selector_is_memoized(self):
+        assert compile_selector("metadata.name==web") is \
+               compile_selector("metadata.name==web")
+
+    def test_invalid_selector(self):
+        try:
+            field_filter(obj_list=self.pods, field_selector="metadata.name")
+            raise AssertionError("Did not get exception InvalidFieldSelector")
+        except InvalidFieldSelector:
+            pass
@@ -0,0 +1,126 @@
+import json
+import socket
+import threading
+import time
+
+import paramiko
+import pytest
+from kubernetes.client import V1NodeList
+
+from k8s_client.node import NodeClient
+from k8s_client.ssh import SSHPool
+from tests.asserts_wrapper import assert_equal
+
+
+class StubServer(paramiko.ServerInterface):
+    """
+    ssh server that accepts any key and answers 'ran <command>' to every
+    command, the exit status is the number at the end of the command
+    """
+
+    def check_auth_publickey(self, username, key):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "publickey"
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel, command):
+        def run():
+            # answer after the transport replied to the exec request
+            time.sleep(0.05)
+            channel.sendall(b"ran " + command)
+            channel.send_exit_status(int(command.split()[-1]))
+            channel.close()
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+
+@pytest.fixture(scope="module")
+def ssh_server(tmp_path_factory):
+    host_key = paramiko.RSAKey.generate(bits=1024)
+    key_path = str(tmp_path_factory.mktemp("ssh") / "id_rsa")
+    paramiko.RSAKey.generate(bits=1024).write_private_key_file(key_path)
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(16)
+    connections = []
+
+    def serve():
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(sock)
+            transport.add_server_key(host_key)
+            transport.start_server(server=StubServer())
+            connections.append(transport)
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield {"port": listener.getsockname()[1], "key_path": key_path,
+           "connections": connections}
+    listener.close()
+
+
+class FakeResponse(object):
+    def __init__(self, body):
+        self.data = json.dumps(body).encode()
+
+    def release_conn(self):
+        pass
+
+
+class FakeCoreApi(object):
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.list_calls = 0
+
+    def list_node(self, _preload_content) -> V1NodeList:
+        self.list_calls += 1
+        return FakeResponse(body={"items": [
+            {"metadata": {"name": name}, "status": {"addresses": [
+                {"type": "ExternalIP", "address": address}]}}
+            for name, address in self.nodes.items()]})
+
+
+class TestSSHPool(object):
+    """
+    Test class for the pooled ssh execution on nodes, against a local stub
+    ssh server, no cluster is required.
+    """
+
+    def test_reuse_connection(self, ssh_server):
+        pool = SSHPool(username="root", key_filename=ssh_server["key_path"],
+                       port=ssh_server["port"])
+        connections_before = len(ssh_server["connections"])
+        for exit_status in range(3):
+            assert_equal(actual_result=pool.execute(
+                host="127.0.0.1", command=f"exit {exit_status}"),
+                expected_result=(f"ran exit {exit_status}".encode(),
+                                 exit_status))
+        pool.close()
+        assert_equal(actual_result=len(ssh_server["connections"]) -
+                     connections_before, expected_result=1)
+
+    def test_execute_many(self, ssh_server):
+        client_core = FakeCoreApi(nodes={f"node-{index}": "127.0.0.1"
+                                         for index in range(6)})
+        node = NodeClient(client_core=client_core,
+                          ssh_pool=SSHPool(username="root",
+                                           key_filename=ssh_server["key_path"],
+                                           port=ssh_server["port"]))
+        results = list(node.execute_many(names=list(client_core.nodes),
+                                         command="exit 0", concurrency=3))
+        node.close()
+        node.pool.shutdown()
+        assert_equal(actual_result=sorted(result.name for result in results),
+                     expected_result=sorted(client_core.nodes))
+        assert all(result.output == b"ran exit 0" and
+                   result.exit_status == 0 and result.error is None
+                   for result in results)
+        # the addresses of all the nodes come from a single list
+        assert_equal(actual_result=client_core.list_calls, expected_result=1)
@@ -0,0 +1,40 @@
+from k8s_client.transport import is_streaming, tune_requests
+from tests.asserts_wrapper import assert_equal
+
+
+class FakeRestClient(object):
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, headers=None, _request_timeout=None,
+                **kwargs):
+        self.calls.append((url, headers, _request_timeout))
+
+
+class TestTransport(object):
+    """
+    Test class for the tuning of the requests of the api client, no cluster
+    is required.
+    """
+
+    def test_is_streaming(self):
+        assert is_streaming(url="/api/v1/pods?watch=true")
+        assert is_streaming(url="/api/v1/namespaces/a/pods/b/log",
+                            query_params=[("follow", True)])
+        assert not is_streaming(url="/api/v1/pods?limit=500")
+
+    def test_tune_requests(self):
+        rest_client = FakeRestClient()
+        tune_requests(rest_client=rest_client, request_timeout=(2, 30),
+                      gzip=True)
+        rest_client.request("GET", "/api/v1/pods",
+                            headers={"Accept": "application/json"})
+        rest_client.request("GET", "/api/v1/pods?watch=true", headers={})
+        rest_client.request("GET", "/api/v1/nodes", _request_timeout=5)
+        assert_equal(actual_result=rest_client.calls,
+                     expected_result=[
+                         ("/api/v1/pods", {"Accept": "application/json",
+                                           "Accept-Encoding": "gzip"},
+                          (2, 30)),
+                         ("/api/v1/pods?watch=true", {}, None),
+                         ("/api/v1/nodes", {"Accept-Encoding": "gzip"}, 5)])
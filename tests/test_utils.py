@@ -0,0 +1,358 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from kubernetes.client import (ApiClient, V1ListMeta, V1ObjectMeta, V1Pod,
+                               V1PodList)
+from kubernetes.client.rest import ApiException
+
+from k8s_client.exceptions import (InvalidFieldSelector, K8sException,
+                                   K8sInvalidResourceBody)
+from k8s_client.pod import PodClient
+from k8s_client.utils import convert_obj_to_dict, delete_collection, \
+    iter_lines, iter_objects, iter_pages, read_raw_list, read_raw_object, \
+    split_list_to_chunks, split_to_apply_tiers, underscore_to_uppercase
+from tests.asserts_wrapper import assert_equal
+
+
+class FakeResponse(object):
+    def __init__(self, body):
+        self.data = json.dumps(body).encode()
+        self.released = False
+
+    def release_conn(self):
+        self.released = True
+
+
+def raw_pod(name):
+    return {"metadata": {"name": name, "namespace": "default",
+                         "resourceVersion": "7",
+                         "creationTimestamp": "2024-01-02T03:04:05Z",
+                         "labels": {"app_name": "web"}},
+            "spec": {"nodeName": "node-1", "terminationGracePeriodSeconds": 0,
+                     "hostNetwork": False, "volumes": [],
+                     "containers": [{"name": "main", "image": "nginx",
+                                     "ports": [{"containerPort": 80}]}]},
+            "status": {"phase": "Running", "podIP": "10.0.0.1",
+                       "startTime": "2024-01-02T03:04:06Z",
+                       "containerStatuses": [{
+                           "name": "main", "image": "nginx",
+                           "imageID": "docker://nginx", "ready": True,
+                           "restartCount": 0, "lastState": {},
+                           "state": {"running": {
+                               "startedAt": "2024-01-02T03:04:06Z"}}}]}}
+
+
+class FakePodsApi(object):
+    """
+    read and list of pods, raw json with _preload_content=False and models
+    otherwise, like the api functions
+    """
+
+    def __init__(self, pods):
+        self.pods = pods
+        self.responses = []
+
+    def respond(self, body, model, _preload_content):
+        if _preload_content:
+            return ApiClient()._ApiClient__deserialize(body, model)
+        response = FakeResponse(body=body)
+        self.responses.append(response)
+        return response
+
+    def read_namespaced_pod(self, name, namespace,
+                            _preload_content=True) -> V1Pod:
+        return self.respond(body=self.pods[0], model="V1Pod",
+                            _preload_content=_preload_content)
+
+    def list_namespaced_pod(self, namespace, _preload_content=True,
+                            **kwargs) -> V1PodList:
+        body = {"metadata": {"resourceVersion": "9"}, "items": self.pods}
+        return self.respond(body=body, model="V1PodList",
+                            _preload_content=_preload_content)
+
+
+class TestRawResponses(object):
+    """
+    Test class for reading the dictionaries from the raw json of the api
+    responses, no cluster is required.
+    """
+
+    def test_read_raw_object(self):
+        client_core = FakePodsApi(pods=[raw_pod(name="web")])
+        pod = read_raw_object(client_core.read_namespaced_pod, name="web",
+                              namespace="default")
+        # the dictionary of the model: keys of its attributes, timestamps
+        # as datetime and without the resourceVersion
+        assert_equal(actual_result=pod["metadata"],
+                     expected_result={"name": "web", "namespace": "default",
+                                      "creationTimestamp": datetime(
+                                          2024, 1, 2, 3, 4, 5,
+                                          tzinfo=timezone.utc),
+                                      "labels": {"appName": "web"}})
+        assert_equal(actual_result=pod["status"]["podIp"],
+                     expected_result="10.0.0.1")
+        assert_equal(actual_result=pod["status"]["containerStatuses"][0][
+            "imageId"], expected_result="docker://nginx")
+        assert client_core.responses[0].released
+
+    def test_read_raw_list(self):
+        client_core = FakePodsApi(pods=[raw_pod(name="web"),
+                                        raw_pod(name="db")])
+        pods = read_raw_list(client_core.list_namespaced_pod,
+                             namespace="default")
+        assert_equal(actual_result=[pod["metadata"]["name"] for pod in pods],
+                     expected_result=["web", "db"])
+
+    def test_raw_and_model_paths_match(self):
+        client_core = FakePodsApi(pods=[raw_pod(name="web"),
+                                        raw_pod(name="db")])
+        pod = PodClient(client_core=client_core)
+        model_pods = [convert_obj_to_dict(obj) for obj in
+                      client_core.list_namespaced_pod(
+                          namespace="default").items]
+        # the raw json path, and the path of the models that the client
+        # side selectors take
+        assert_equal(actual_result=pod.list(dict_output=True),
+                     expected_result=model_pods)
+        assert_equal(actual_result=pod.list(
+            dict_output=True, field_selector="metadata.uid!=other"),
+            expected_result=model_pods)
+        assert_equal(actual_result=list(pod.iter_list(dict_output=True)),
+                     expected_result=model_pods)
+        assert_equal(actual_result=pod.get(name="web", dict_output=True),
+                     expected_result=model_pods[0])
+        # list, iter_list and get read the raw json
+        assert_equal(actual_result=len(client_core.responses),
+                     expected_result=3)
+
+    def test_iter_raw_pages(self):
+        bodies = {None: {"metadata": {"continue": "next"},
+                         "items": [raw_pod(name="web")]},
+                  "next": {"metadata": {}, "items": [raw_pod(name="db")]}}
+
+        def list_func(_preload_content, limit, _continue=None) -> V1PodList:
+            return FakeResponse(body=bodies[_continue])
+
+        pods = iter_objects(pages=iter_pages(list_func, page_size=1,
+                                             raw=True),
+                            dict_output=True)
+        assert_equal(actual_result=[pod["metadata"]["name"] for pod in pods],
+                     expected_result=["web", "db"])
+
+
+class FakePagesApi(object):
+    """
+    list of pods by pages, the continue token of the last page is expired
+    when expire is set
+    """
+
+    def __init__(self, pages, expire=False):
+        self.pages = pages
+        self.expire = expire
+        self.calls = []
+
+    def list_namespaced_pod(self, namespace, limit, _continue=None):
+        self.calls.append(_continue)
+        index = int(_continue or 0)
+        if self.expire and index == len(self.pages) - 1:
+            error = ApiException(status=410, reason="Gone")
+            error.body = json.dumps({"kind": "Status", "reason": "Expired",
+                                     "message": "The provided continue "
+                                                "parameter is too old"})
+            raise error
+        return V1PodList(
+            items=[V1Pod(metadata=V1ObjectMeta(name=name,
+                                               resource_version="7"))
+                   for name in self.pages[index]],
+            metadata=V1ListMeta(_continue=str(index + 1) if index + 1 < len(
+                self.pages) else None))
+
+
+class TestPages(object):
+    """
+    Test class for listing the objects page by page, no cluster is required.
+    """
+
+    def test_iter_model_pages(self):
+        client_core = FakePagesApi(pages=[["web", "db"], ["cache"], ["queue"]])
+        pods = iter_objects(pages=iter_pages(client_core.list_namespaced_pod,
+                                             page_size=2, namespace="default"))
+        assert_equal(actual_result=[(pod.metadata.name,
+                                     pod.metadata.resource_version)
+                                    for pod in pods],
+                     expected_result=[("web", ""), ("db", ""), ("cache", ""),
+                                      ("queue", "")])
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=[None, "1", "2"])
+
+    def test_iter_list_requests_pages_lazily(self):
+        client_core = FakePagesApi(pages=[["web", "db"], ["cache"]])
+        pods = PodClient(client_core=client_core).iter_list(page_size=2)
+        assert_equal(actual_result=next(pods).metadata.name,
+                     expected_result="web")
+        assert_equal(actual_result=client_core.calls, expected_result=[None])
+        assert_equal(actual_result=[pod.metadata.name for pod in pods],
+                     expected_result=["db", "cache"])
+
+    def test_iter_list_raises_k8s_exceptions(self):
+        client_core = FakePagesApi(pages=[["web", "db"], ["cache"]],
+                                   expire=True)
+        pods = PodClient(client_core=client_core).iter_list(page_size=2)
+        names = []
+        # the error of a later page is raised while iterating, as the
+        # K8sException of the api error
+        with pytest.raises(K8sException) as error:
+            for pod in pods:
+                names.append(pod.metadata.name)
+        assert_equal(actual_result=error.value.status, expected_result=410)
+        assert_equal(actual_result=names, expected_result=["web", "db"])
+
+
+class TestUnderscoreToUppercase(object):
+    """
+    Test class for the conversion of the to_dict() dictionaries to camelCase,
+    no cluster is required.
+    """
+
+    def test_convert_keys(self):
+        obj = {"owner_references": [{"api_version": "apps/v1",
+                                     "block_owner_deletion": None}],
+               "pod_ip": "10.0.0.1"}
+        assert_equal(actual_result=underscore_to_uppercase(obj),
+                     expected_result={"ownerReferences": [
+                         {"apiVersion": "apps/v1"}], "podIp": "10.0.0.1"})
+
+    def test_keep_falsy_values(self):
+        obj = {"replicas": 0, "read_only": False, "selector": None,
+               "volumes": [], "status": {"conditions": None}}
+        assert_equal(actual_result=underscore_to_uppercase(obj),
+                     expected_result={"replicas": 0, "readOnly": False})
+
+    def test_input_is_not_mutated(self):
+        obj = {"spec": {"node_name": "node-1"}}
+        underscore_to_uppercase(obj)
+        assert_equal(actual_result=obj,
+                     expected_result={"spec": {"node_name": "node-1"}})
+
+
+class TestApplyTiers(object):
+    """
+    Test class for ordering the resources of a yaml to creation tiers, no
+    cluster is required.
+    """
+    supported_kinds = ("Pod", "Deployment", "DaemonSet", "Namespace",
+                       "Secret", "Service")
+
+    def test_split_by_kind_order(self):
+        resources = [{"kind": "Deployment", "metadata": {"name": "web"}},
+                     None,
+                     {"kind": "Service", "metadata": {"name": "web"}},
+                     {"kind": "DaemonSet", "metadata": {"name": "agent"}},
+                     {"kind": "Namespace", "metadata": {"name": "shop"}}]
+        tiers = split_to_apply_tiers(resources=resources,
+                                     supported_kinds=self.supported_kinds)
+        assert_equal(actual_result=[[resource["kind"] for resource in tier]
+                                    for tier in tiers],
+                     expected_result=[["Namespace"], ["Service"],
+                                      ["Deployment", "DaemonSet"]])
+
+    def test_unsupported_kind(self):
+        try:
+            split_to_apply_tiers(resources=[{"kind": "Namespace"},
+                                            {"kind": "CronJob"}],
+                                 supported_kinds=self.supported_kinds)
+            raise AssertionError("Did not get exception "
+                                 "K8sInvalidResourceBody")
+        except K8sInvalidResourceBody:
+            pass
+
+
+class TestSplitListToChunks(object):
+    """
+    Test class for splitting lists to chunks, no cluster is required.
+    """
+
+    def test_split(self):
+        assert_equal(actual_result=split_list_to_chunks(
+            list_to_slice=list(range(7)), number_of_chunks=3),
+            expected_result=[[0, 3, 6], [1, 4], [2, 5]])
+        assert_equal(actual_result=split_list_to_chunks(
+            list_to_slice=[0, 1], number_of_chunks=3),
+            expected_result=[[0], [1]])
+
+    def test_large_list(self):
+        # the recursive version went over the recursion limit
+        chunks = split_list_to_chunks(list_to_slice=list(range(100000)),
+                                      number_of_chunks=7)
+        assert_equal(actual_result=sorted(sum(chunks, [])),
+                     expected_result=list(range(100000)))
+
+
+class TestIterLines(object):
+    """
+    Test class for splitting streamed chunks to lines, no cluster is
+    required.
+    """
+
+    def test_lines_across_chunks(self):
+        chunks = [b"first li", b"ne\nsecond\n", b"\nlast"]
+        assert_equal(actual_result=list(iter_lines(chunks=chunks)),
+                     expected_result=["first line", "second", "", "last"])
+
+    def test_split_character(self):
+        data = "caf\u00e9 \u2603\n".encode()
+        chunks = [data[index:index + 1] for index in range(len(data))]
+        assert_equal(actual_result=list(iter_lines(chunks=chunks)),
+                     expected_result=["caf\u00e9 \u2603"])
+
+
+class FakeCollectionApi(object):
+    def __init__(self, names):
+        self.names = names
+        self.delete_calls = []
+
+    def list_namespaced_pod(self, _preload_content, namespace, **kwargs):
+        return FakeResponse(body={"metadata": {"resourceVersion": "5"},
+                                  "items": [raw_pod(name=name)
+                                            for name in self.names]})
+
+    def delete_collection_namespaced_pod(self, _preload_content, **kwargs):
+        self.delete_calls.append(kwargs)
+        self.names = []
+        return FakeResponse(body={"kind": "Status"})
+
+
+class TestDeleteCollection(object):
+    """
+    Test class for deleting resources by selectors with one request, no
+    cluster is required.
+    """
+
+    def test_delete_by_selectors(self):
+        api = FakeCollectionApi(names=["web-1", "web-2"])
+        names = delete_collection(
+            delete_func=api.delete_collection_namespaced_pod,
+            list_func=api.list_namespaced_pod, namespace="shop", kind="pods",
+            field_selector="status.phase==Running,metadata.labels.app==web",
+            wait=False)
+        assert_equal(actual_result=names, expected_result=["web-1", "web-2"])
+        assert_equal(actual_result=api.delete_calls,
+                     expected_result=[{"namespace": "shop",
+                                       "propagation_policy": "Foreground",
+                                       "field_selector":
+                                           "status.phase==Running",
+                                       "label_selector": "app=web"}])
+
+    def test_client_side_selector(self):
+        api = FakeCollectionApi(names=["web-1"])
+        try:
+            delete_collection(
+                delete_func=api.delete_collection_namespaced_pod,
+                list_func=api.list_namespaced_pod, namespace="shop",
+                kind="pods",
+                field_selector="metadata.owner_references[0].kind==DaemonSet")
+            raise AssertionError("Did not get exception InvalidFieldSelector")
+        except InvalidFieldSelector:
+            pass
+        assert_equal(actual_result=api.delete_calls, expected_result=[])
@@ -0,0 +1,82 @@
+from kubernetes.client import V1ListMeta, V1ObjectMeta, V1Pod, V1PodList
+
+from k8s_client.watchers import wait_for_deletion
+from tests.asserts_wrapper import assert_equal
+from tests.utils import FakeResponse
+
+
+def pod_event(event_type, name, resource_version):
+    return {"type": event_type,
+            "object": {"metadata": {"name": name, "namespace": "default",
+                                    "resourceVersion": resource_version}}}
+
+
+def gone_event():
+    return {"type": "ERROR", "object": {"code": 410, "reason": "Gone",
+                                        "message": "too old resource version"}}
+
+
+class FakeCoreApi(object):
+    """
+    list of the pods that exist and watches that send the scripted events
+    """
+
+    def __init__(self, names, watches):
+        self.names = names
+        self.watches = list(watches)
+        self.calls = []
+
+    def list_namespaced_pod(self, namespace, watch=False,
+                            resource_version=None, **kwargs) -> V1PodList:
+        if not watch:
+            self.calls.append("list")
+            return V1PodList(items=[V1Pod(metadata=V1ObjectMeta(name=name))
+                                    for name in self.names],
+                             metadata=V1ListMeta(resource_version="20"))
+        self.calls.append(("watch", resource_version))
+        return FakeResponse(events=self.watches.pop(0))
+
+
+class TestWaitForDeletion(object):
+    """
+    Test class for waiting for the deletion of resources with a watch,
+    against a fake api, no cluster is required.
+    """
+
+    def test_deleted_events(self):
+        client_core = FakeCoreApi(names=[], watches=[[
+            pod_event("DELETED", name="web-1", resource_version="6"),
+            # a keep-alive line
+            None,
+            pod_event("MODIFIED", name="web-2", resource_version="7"),
+            pod_event("DELETED", name="web-2", resource_version="8")]])
+        assert wait_for_deletion(list_func=client_core.list_namespaced_pod,
+                                 names=["web-1", "web-2"],
+                                 resource_version="5", timeout=5,
+                                 namespace="default")
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=[("watch", "5")])
+
+    def test_relist_when_gone(self):
+        # web-2 is deleted while the resourceVersion of the watch is gone,
+        # the watch from the current state would never send its deletion
+        client_core = FakeCoreApi(names=["web-3"], watches=[
+            [pod_event("DELETED", name="web-1", resource_version="6"),
+             gone_event()],
+            [pod_event("DELETED", name="web-3", resource_version="21")]])
+        assert wait_for_deletion(list_func=client_core.list_namespaced_pod,
+                                 names=["web-1", "web-2", "web-3"],
+                                 resource_version="5", timeout=5,
+                                 namespace="default")
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=[("watch", "5"), "list",
+                                      ("watch", "20")])
+
+    def test_all_deleted_when_gone(self):
+        client_core = FakeCoreApi(names=["other"], watches=[[gone_event()]])
+        assert wait_for_deletion(list_func=client_core.list_namespaced_pod,
+                                 names=["web-1", "web-2"],
+                                 resource_version="5", timeout=5,
+                                 namespace="default")
+        assert_equal(actual_result=client_core.calls,
+                     expected_result=[("watch", "5"), "list"])
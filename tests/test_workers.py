@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from k8s_client.workers import WorkerPool
+from tests.asserts_wrapper import assert_equal
+
+
+class TestWorkerPool(object):
+    """
+    Test class for the runs of the shared pool of threads, no cluster is
+    required.
+    """
+
+    def setup_method(self):
+        self.pool = WorkerPool(max_workers=4)
+
+    def teardown_method(self):
+        self.pool.shutdown()
+
+    def test_map_keeps_the_order(self):
+        def square(index):
+            time.sleep(0.01 * (5 - index))
+            return index * index
+
+        assert_equal(actual_result=self.pool.map(
+            func=square, kwargs_list=[{"index": index} for index in range(5)]),
+            expected_result=[0, 1, 4, 9, 16])
+
+    def test_more_threads_than_the_pool(self):
+        # all the runs wait for each other, so they end only if they all
+        # run at the same time
+        barrier = threading.Barrier(10, timeout=5)
+
+        def run(index):
+            barrier.wait()
+            return index
+
+        assert_equal(actual_result=self.pool.map(
+            func=run, max_threads=10,
+            kwargs_list=[{"index": index} for index in range(10)]),
+            expected_result=list(range(10)))
+        assert_equal(actual_result=sorted(
+            result for _, result, _ in self.pool.as_completed(
+                func=run, max_threads=10,
+                kwargs_list=[{"index": index} for index in range(10)])),
+            expected_result=list(range(10)))
+
+    def test_map_raises_the_first_error_and_cancels_the_rest(self):
+        started = []
+        second_started = threading.Event()
+
+        def run(index):
+            started.append(index)
+            if index == 0:
+                second_started.wait(timeout=5)
+                raise ValueError("failed")
+            second_started.set()
+            time.sleep(0.2)
+
+        with pytest.raises(ValueError):
+            self.pool.map(func=run, max_threads=2,
+                          kwargs_list=[{"index": index} for index in
+                                       range(10)])
+        time.sleep(0.3)
+        # only the runs of the window started, the queued runs did not
+        assert_equal(actual_result=sorted(started), expected_result=[0, 1])
+
+    def test_nested_map_runs_inline(self):
+        pool = WorkerPool(max_workers=2)
+        threads = []
+
+        def inner(index):
+            threads.append(threading.current_thread().name)
+            return index
+
+        def outer(index):
+            # all the threads of the pool run outer, so a nested run that
+            # waited for a thread of the pool would never end
+            time.sleep(0.05)
+            return pool.map(func=inner, kwargs_list=[
+                {"index": index * 10 + inner_index}
+                for inner_index in range(3)])
+
+        try:
+            assert_equal(actual_result=pool.map(func=outer, kwargs_list=[
+                {"index": index} for index in range(2)]),
+                expected_result=[[0, 1, 2], [10, 11, 12]])
+        finally:
+            pool.shutdown()
+        assert_equal(actual_result=len(threads), expected_result=6)
+        assert all(name.startswith("k8s-client") for name in threads)
@@ -0,0 +1,45 @@
+import json
+
+from kubernetes.client import ApiClient
+
+
+def watch_line(event):
+    """
+    Return the line of a watch event, the event is a dictionary of the api,
+    a (type, object) pair with an object dictionary or model, or None for a
+    keep-alive blank line
+    :rtype: bytes
+    """
+    if event is None:
+        return b"\n"
+    if isinstance(event, tuple):
+        event_type, obj = event
+        event = {"type": event_type,
+                 "object": ApiClient().sanitize_for_serialization(obj)}
+    return json.dumps(event).encode() + b"\n"
+
+
+class FakeResponse(object):
+    """
+    response of the fake apis, the json body of a raw read (data) or the
+    lines of the events of a watch (stream), a watch with a released event
+    stays open after its events until it is set
+    """
+
+    def __init__(self, body=None, events=(), released=None):
+        self.data = json.dumps(body).encode()
+        self.events = events
+        self.released = released
+
+    def stream(self, amt=None, decode_content=False):
+        for event in self.events:
+            yield watch_line(event=event)
+        if self.released is not None:
+            self.released.wait()
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+